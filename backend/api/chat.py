@@ -4,12 +4,17 @@ import httpx
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 
+from ..core.http_pool import get_http_pool
+
 router = APIRouter(prefix="/api", tags=["chat"])
 
+# 共有クライアントを使うのは既定のGatewayだけ（任意のURLをプールに溜めない）
+DEFAULT_GATEWAY_URL = "http://localhost:18790"
+
 
 class ChatRequest(BaseModel):
     message: str
-    gateway_url: str = "http://localhost:18790"
+    gateway_url: str = DEFAULT_GATEWAY_URL
     api_key: str = ""
 
 
@@ -17,7 +22,6 @@ class ChatRequest(BaseModel):
 async def chat_proxy(req: ChatRequest):
     """フロントエンドからのチャットリクエストをOpenClaw Gatewayに転送"""
     base_url = req.gateway_url.rstrip("/")
-    url = f"{base_url}/v1/chat/completions"
 
     headers = {"Content-Type": "application/json"}
     if req.api_key:
@@ -29,20 +33,28 @@ async def chat_proxy(req: ChatRequest):
         "user": "lobby-app",
     }
 
+    if base_url == DEFAULT_GATEWAY_URL.rstrip("/"):
+        # 既定Gatewayは共有クライアント（リクエストごとの接続確立を避ける）
+        return await _forward(get_http_pool().client(base_url, timeout=60.0), payload, headers)
+    async with httpx.AsyncClient(base_url=base_url, timeout=60.0) as client:
+        return await _forward(client, payload, headers)
+
+
+async def _forward(client: httpx.AsyncClient, payload: dict, headers: dict) -> dict:
+    """Gatewayへ転送して応答テキストを返す"""
     try:
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            resp = await client.post(url, json=payload, headers=headers)
-            resp.raise_for_status()
-            data = resp.json()
-
-            # Extract response text from OpenAI-compatible format
-            choices = data.get("choices", [])
-            if choices:
-                text = choices[0].get("message", {}).get("content", "")
-            else:
-                text = str(data)
-
-            return {"response": text}
+        resp = await client.post("/v1/chat/completions", json=payload, headers=headers)
+        resp.raise_for_status()
+        data = resp.json()
+
+        # Extract response text from OpenAI-compatible format
+        choices = data.get("choices", [])
+        if choices:
+            text = choices[0].get("message", {}).get("content", "")
+        else:
+            text = str(data)
+
+        return {"response": text}
 
     except httpx.HTTPStatusError as e:
         raise HTTPException(status_code=e.response.status_code, detail=e.response.text)
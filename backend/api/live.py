@@ -1,19 +1,39 @@
-"""Live Mode API - ライブ配信制御エンドポイント"""
+"""Live Mode API - ライブ配信制御エンドポイント
+
+``/api/live/...`` はデフォルトインスタンス、``/api/live/{instance}/...`` は名前付きインスタンスを操作する。
+名前付きインスタンスはHTTP接続プール・音声ストア・解析器を共有する（1プロセスで複数キャラクター配信）。
+"""
 
 import asyncio
 import base64
+import time
+from pathlib import Path
 from typing import Optional
 
-from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi import APIRouter, Header, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi.responses import Response, StreamingResponse
 from loguru import logger
 from pydantic import BaseModel
 
+from ..bench.replay import SessionRecorder
+from ..core.audio_store import parse_range_header
+from ..core.config import build_tts_config
+from ..core.executor import get_executor
+from ..core.gateway_pool import GatewayRoutingConfig
+from ..core.http_pool import get_http_pool
 from ..core.openclaw import LOBBY_SYSTEM_PROMPT, OpenClawConfig
-from ..core.tts import TTSConfig
+from ..core.shared_resources import SharedResources
+from ..core.tts_pool import tts_pool_stats
+from ..core.tts_scheduler import tts_scheduler_stats
+from ..modes.instances import (
+    InstanceLimitError,
+    InstanceLimits,
+    LiveInstance,
+    LiveInstanceRegistry,
+)
 from ..modes.live import (
     InputSource,
     LiveInput,
-    LiveMode,
     LiveModeConfig,
     LiveOutput,
     create_lobby_live_mode,
@@ -22,9 +42,12 @@ from ..modes.live import (
 router = APIRouter(prefix="/api/live", tags=["live"])
 
 
-# グローバルライブモードインスタンス
-_live_mode: Optional[LiveMode] = None
-_output_websockets: list[WebSocket] = []
+# ライブインスタンス（共有リソース付き）
+DEFAULT_INSTANCE = "default"
+_registry = LiveInstanceRegistry(SharedResources(http_pool=get_http_pool()))
+
+# HTTP音声配信のチャンクサイズ
+AUDIO_CHUNK_SIZE = 64 * 1024
 
 
 # === リクエスト/レスポンスモデル ===
@@ -32,9 +55,24 @@ _output_websockets: list[WebSocket] = []
 class LiveStartRequest(BaseModel):
     """ライブモード開始リクエスト"""
     gateway_url: str = "http://localhost:18789"
+    gateway_urls: list[str] = []  # 追加のOpenClaw Gateway（レイテンシで振り分け）
+    hedge_requests: bool = False  # p95を過ぎたら別のGatewayにも同じリクエストを送る
     tts_url: str = "http://localhost:8001"
     tts_voice: str = "lobby"
+    tts_endpoints: list[str] = []  # tts_url と同じ声の追加TTSサーバー（負荷分散）
+    tts_fallbacks: list[dict] = []  # 全サーバー停止時のフォールバックTTS（設定ファイルの tts.fallbacks と同じ形式）
+    tts_request_timeout: float = 120.0  # TTS 1リクエストのタイムアウト秒
     system_prompt: Optional[str] = None
+    response_cache_path: Optional[str] = None  # 定型応答キャッシュのウォームアップYAML
+    platform_rate_limits: dict[str, float] = {}  # プラットフォーム → 通常コメント上限（件/分）
+    author_rate_per_min: Optional[float] = 6.0  # 投稿者ごとの通常コメント上限（件/分、nullで無制限）
+    record_session_path: Optional[str] = None  # 入力と応答をJSONLに記録（lobby replay-live用）
+    record_audio: bool = False  # 記録にTTS音声も含める
+
+    # インスタンスごとの上限（名前付きインスタンス用）
+    max_queue_size: int = 50
+    max_inputs_per_min: Optional[float] = None
+    max_output_connections: int = 16
 
 
 class LiveInputRequest(BaseModel):
@@ -56,34 +94,117 @@ class LiveStatusResponse(BaseModel):
     """ステータスレスポンス"""
     running: bool
     queue_size: int
+    priority_queue_size: int = 0
+    platforms: dict[str, dict] = {}  # プラットフォーム別のキュー状況
     gateway_url: Optional[str] = None
+    processed: int = 0
+    dropped: dict[str, int] = {}  # 破棄理由 → 件数
+    queue_wait_ms: dict[str, float] = {}  # last / avg / max / samples
+    coalesced: int = 0
+    response_cache: dict = {}  # entries / hits / misses / hit_rate
+    audio_retention: dict = {}  # files / total_bytes / pinned / deleted
+
+
+# === インスタンス取得 ===
+
+def _get_instance(name: str) -> Optional[LiveInstance]:
+    return _registry.get(name)
+
+
+def _require_instance(name: str, running: bool = False) -> LiveInstance:
+    """インスタンス取得（なければ400）"""
+    instance = _registry.get(name)
+    if instance is None or (running and not instance.mode.is_running):
+        raise HTTPException(400, f"Live mode not running: {name}")
+    return instance
 
 
 # === エンドポイント ===
 
+@router.get("/instances")
+async def list_instances():
+    """ライブインスタンス一覧と共有リソースの状況"""
+    return {
+        "instances": [_registry.get(name).to_dict() for name in _registry.names],
+        "max_instances": _registry.max_instances,
+        "shared": _registry.shared.stats,
+    }
+
+
 @router.get("/status", response_model=LiveStatusResponse)
-async def get_status():
+@router.get("/{instance}/status", response_model=LiveStatusResponse)
+async def get_status(instance: str = DEFAULT_INSTANCE):
     """ライブモードのステータス取得"""
-    global _live_mode
-
-    if _live_mode is None:
+    live = _get_instance(instance)
+    if live is None:
         return LiveStatusResponse(running=False, queue_size=0)
 
+    live_mode = live.mode
+    stats = live_mode.stats
     return LiveStatusResponse(
-        running=_live_mode.is_running,
-        queue_size=_live_mode.queue_size,
-        gateway_url=_live_mode.config.openclaw.base_url,
+        running=live_mode.is_running,
+        queue_size=live_mode.queue_size,
+        priority_queue_size=live_mode.priority_queue_size,
+        platforms=live_mode.scheduler_stats,
+        gateway_url=live_mode.config.openclaw.base_url,
+        processed=stats["processed"],
+        dropped=stats["dropped"],
+        queue_wait_ms=stats["queue_wait_ms"],
+        coalesced=live_mode.coalescer_stats["coalesced"],
+        response_cache=live_mode.response_cache.stats,
+        audio_retention=live_mode.audio_retention.stats,
     )
 
 
-@router.post("/start")
-async def start_live_mode(request: LiveStartRequest):
-    """ライブモード開始"""
-    global _live_mode
+@router.get("/metrics")
+@router.get("/{instance}/metrics")
+async def get_metrics(traces: int = 20, instance: str = DEFAULT_INSTANCE):
+    """段階別レイテンシ（p50/p95/p99）と直近のトレース
+
+    段階: queue_wait / llm / emotion / tts / lipsync / deliver / broadcast / total
+    ``sources`` は入力種別（youtube, twitch, priority等）ごとの内訳。
+    ``executor`` はI/O・CPUプールの待ち件数と待ち時間。
+    ``prompt`` はOpenClawへのプロンプトトークン数と会話履歴・要約の状態。
+    ``http_pool`` は共有HTTPクライアントの数（接続先ごと）。
+    ``gateways`` はOpenClaw GatewayごとのEWMA・p95・ヘッジ件数。
+    ``tts_scheduler`` はTTSサーバーごとの同時実行数・待ち件数・集約件数。
+    ``tts_pool`` はTTSサーバーごとの処理中件数・失敗・サーキットブレーカーの状態。
+    ``warmup`` は開始時のウォームアップの段階別所要時間（未完了ならnull）。
+    """
+    live = _get_instance(instance)
+    if live is None:
+        raise HTTPException(404, "Live mode not initialized")
+
+    return {
+        **live.mode.latency.snapshot(traces=traces),
+        "executor": get_executor().stats,
+        "prompt": live.mode.prompt_stats,
+        "http_pool": get_http_pool().stats,
+        "gateways": live.mode.gateway_stats,
+        "tts_scheduler": tts_scheduler_stats(),
+        "tts_pool": tts_pool_stats(),
+        "warmup": live.mode.warmup_report.to_dict() if live.mode.warmup_report else None,
+    }
+
+
+@router.get("/tts")
+async def get_tts_status():
+    """TTSサーバーごとのサーキットブレーカーの状態（``lobby doctor`` からも参照）"""
+    return {"pools": tts_pool_stats()}
 
-    if _live_mode is not None and _live_mode.is_running:
+
+@router.post("/start")
+@router.post("/{instance}/start")
+async def start_live_mode(request: LiveStartRequest, instance: str = DEFAULT_INSTANCE):
+    """ライブモード開始（インスタンスがなければ作成）"""
+    existing = _get_instance(instance)
+    if existing is not None and existing.mode.is_running:
         raise HTTPException(400, "Live mode already running")
 
+    cache_path = Path(request.response_cache_path) if request.response_cache_path else None
+    if cache_path and not cache_path.exists():
+        raise HTTPException(404, f"Response cache file not found: {cache_path}")
+
     # 設定作成
     config = LiveModeConfig(
         openclaw=OpenClawConfig(
@@ -91,50 +212,97 @@ async def start_live_mode(request: LiveStartRequest):
             system_prompt=request.system_prompt or LOBBY_SYSTEM_PROMPT,
             temperature=0.9,
             max_tokens=200,
+            gateway_urls=request.gateway_urls,
+            routing=GatewayRoutingConfig(hedge=request.hedge_requests),
         ),
-        tts=TTSConfig(
-            base_url=request.tts_url,
-            voice=request.tts_voice,
-        ),
+        tts=build_tts_config({"tts": {
+            "base_url": request.tts_url,
+            "voice": request.tts_voice,
+            "endpoints": request.tts_endpoints,
+            "fallbacks": request.tts_fallbacks,
+            "request_timeout": request.tts_request_timeout,
+        }}),
+        platform_rate_limits=request.platform_rate_limits,
+        author_rate_per_min=request.author_rate_per_min,
     )
-
-    # ライブモード作成・開始
-    _live_mode = LiveMode(config)
+    if instance != DEFAULT_INSTANCE:
+        # 名前付きインスタンスは音声出力先を分ける
+        config.audio_output_dir = config.audio_output_dir / instance
+
+    # ライブモード作成・開始（停止済みの同名インスタンスは作り直す）
+    if existing is not None:
+        await _registry.remove(instance)
+    limits = InstanceLimits(
+        max_queue_size=request.max_queue_size,
+        max_inputs_per_min=request.max_inputs_per_min,
+        max_output_connections=request.max_output_connections,
+    )
+    try:
+        live = _registry.create(instance, config, limits)
+    except InstanceLimitError as e:
+        raise HTTPException(400, str(e)) from None
+    live_mode = live.mode
 
     # 出力コールバック設定
-    def on_output(output: LiveOutput):
-        asyncio.create_task(_broadcast_output(output))
+    retention = live_mode.audio_retention
 
-    _live_mode.set_output_callback(on_output)
+    latency = live_mode.latency
 
-    await _live_mode.start()
+    async def broadcast_pinned(output: LiveOutput):
+        start = time.perf_counter()
+        try:
+            await _broadcast_output(live, output)
+        finally:
+            retention.unpin(output.audio_path)
+            if output.trace is not None:
+                latency.add_span(output.trace, "broadcast", (time.perf_counter() - start) * 1000)
 
-    logger.info("Live mode started")
-    return {"status": "started", "gateway_url": request.gateway_url}
+    def on_output(output: LiveOutput):
+        # 送信完了までは音声ファイルをローテーション削除の対象外にする
+        retention.pin(output.audio_path)
+        if output.trace is not None:
+            # totalは配信まで含めて記録する
+            output.trace.pending.add("broadcast")
+        asyncio.create_task(broadcast_pinned(output))
+
+    if request.record_session_path:
+        live.recorder = SessionRecorder(Path(request.record_session_path), capture_audio=request.record_audio)
+        live.recorder.attach(live_mode)
+        live_mode.set_output_callback(live.recorder.wrap_output(on_output))
+    else:
+        live_mode.set_output_callback(on_output)
+
+    await live_mode.start()
+
+    # 応答キャッシュはバックグラウンドで合成（配信開始を待たせない）
+    if cache_path:
+        asyncio.create_task(live_mode.warm_response_cache(cache_path))
+
+    logger.info(f"Live mode started: {instance}")
+    return {
+        "status": "started",
+        "instance": instance,
+        "gateway_url": request.gateway_url,
+        "response_cache_warming": cache_path is not None,
+    }
 
 
 @router.post("/stop")
-async def stop_live_mode():
-    """ライブモード停止"""
-    global _live_mode
-
-    if _live_mode is None:
+@router.post("/{instance}/stop")
+async def stop_live_mode(instance: str = DEFAULT_INSTANCE):
+    """ライブモード停止（インスタンスを削除）"""
+    if not await _registry.remove(instance):
         raise HTTPException(400, "Live mode not running")
 
-    await _live_mode.close()
-    _live_mode = None
-
-    logger.info("Live mode stopped")
-    return {"status": "stopped"}
+    logger.info(f"Live mode stopped: {instance}")
+    return {"status": "stopped", "instance": instance}
 
 
 @router.post("/input")
-async def add_input(request: LiveInputRequest):
+@router.post("/{instance}/input")
+async def add_input(request: LiveInputRequest, instance: str = DEFAULT_INSTANCE):
     """入力をキューに追加"""
-    global _live_mode
-
-    if _live_mode is None or not _live_mode.is_running:
-        raise HTTPException(400, "Live mode not running")
+    live_mode = _require_instance(instance, running=True).mode
 
     # ソース変換
     source_map = {
@@ -155,30 +323,34 @@ async def add_input(request: LiveInputRequest):
     )
 
     # キューに追加
-    added = _live_mode.add_input(input_data)
+    added = live_mode.add_input(input_data)
 
     if not added:
-        return {"status": "filtered", "queue_size": _live_mode.queue_size}
+        return {"status": "filtered", "queue_size": live_mode.queue_size}
 
-    return {"status": "queued", "queue_size": _live_mode.queue_size}
+    return {"status": "queued", "queue_size": live_mode.queue_size}
 
 
 @router.post("/chat")
-async def chat_single(request: LiveChatRequest):
+@router.post("/{instance}/chat")
+async def chat_single(request: LiveChatRequest, instance: str = DEFAULT_INSTANCE):
     """単発チャット（即座に応答を返す）"""
-    global _live_mode
-
-    if _live_mode is None:
+    live = _get_instance(instance)
+    if live is None:
+        if instance != DEFAULT_INSTANCE:
+            raise HTTPException(404, f"Live instance not found: {instance}")
         # ライブモードが起動していない場合は一時的に作成
-        _live_mode = await create_lobby_live_mode()
+        live = _registry.register(LiveInstance(name=instance, mode=await create_lobby_live_mode()))
+    live_mode = live.mode
 
     # 単発処理
-    output = await _live_mode.process_single(request.text, request.author)
+    output = await live_mode.process_single(request.text, request.author)
 
-    # 音声をBase64エンコード（オプション）
+    # 音声をBase64エンコード（メモリ内ストアから、ディスクは読まない）
     audio_base64 = None
-    if output.audio_path and output.audio_path.exists():
-        audio_base64 = base64.b64encode(output.audio_path.read_bytes()).decode()
+    blob = live_mode.audio_store.get(output.audio_id) if output.audio_id else None
+    if blob is not None:
+        audio_base64 = base64.b64encode(blob.data).decode()
 
     return {
         "response_text": output.response_text,
@@ -187,29 +359,86 @@ async def chat_single(request: LiveChatRequest):
             "secondary": output.emotion.secondary.value if output.emotion.secondary else None,
             "intensity": output.emotion.intensity,
         },
+        "emotion_updates": [update.to_dict() for update in output.emotion_updates],
         "audio_base64": audio_base64,
+        "audio_id": output.audio_id,
         "live2d_params_count": len(output.live2d_params) if output.live2d_params else 0,
     }
 
 
+@router.get("/audio/{audio_id}")
+@router.get("/{instance}/audio/{audio_id}")
+async def get_audio(
+    audio_id: str,
+    range_header: Optional[str] = Header(None, alias="Range"),
+    instance: str = DEFAULT_INSTANCE,
+):
+    """メモリ内ストアの応答音声を配信
+
+    Rangeヘッダー指定時は206 Partial Content、それ以外はチャンク転送で返す。
+    """
+    live = _get_instance(instance)
+    if live is None:
+        raise HTTPException(404, "Live mode not initialized")
+
+    blob = live.mode.audio_store.get(audio_id)
+    if blob is None:
+        raise HTTPException(404, f"Audio not found: {audio_id}")
+
+    headers = {"Accept-Ranges": "bytes"}
+
+    if range_header:
+        byte_range = parse_range_header(range_header, blob.size)
+        if byte_range is None:
+            raise HTTPException(
+                416, "Requested range not satisfiable",
+                headers={"Content-Range": f"bytes */{blob.size}"},
+            )
+        start, end = byte_range
+        headers["Content-Range"] = f"bytes {start}-{end}/{blob.size}"
+        return Response(
+            content=blob.data[start:end + 1],
+            status_code=206,
+            media_type=blob.media_type,
+            headers=headers,
+        )
+
+    data = memoryview(blob.data)
+
+    async def _iter_chunks():
+        for offset in range(0, len(data), AUDIO_CHUNK_SIZE):
+            yield bytes(data[offset:offset + AUDIO_CHUNK_SIZE])
+
+    return StreamingResponse(_iter_chunks(), media_type=blob.media_type, headers=headers)
+
+
 @router.post("/system-prompt")
-async def set_system_prompt(prompt: str):
+@router.post("/{instance}/system-prompt")
+async def set_system_prompt(prompt: str, instance: str = DEFAULT_INSTANCE):
     """システムプロンプト変更"""
-    global _live_mode
-
-    if _live_mode is None:
+    live = _get_instance(instance)
+    if live is None:
         raise HTTPException(400, "Live mode not initialized")
 
-    _live_mode.set_system_prompt(prompt)
+    live.mode.set_system_prompt(prompt)
     return {"status": "updated", "prompt_length": len(prompt)}
 
 
 @router.websocket("/ws/output")
-async def websocket_output(websocket: WebSocket):
+@router.websocket("/{instance}/ws/output")
+async def websocket_output(
+    websocket: WebSocket,
+    binary_audio: bool = False,
+    instance: str = DEFAULT_INSTANCE,
+):
     """ライブ出力ストリーミングWebSocket
 
     ライブモードで生成された出力をリアルタイム受信
 
+    ``?binary_audio=true`` で接続すると、各出力のJSONメッセージの直後に
+    音声データをバイナリフレームで送信する（ディスク上のファイルを読む必要がない）。
+    接続後に {"action": "binary_audio", "enabled": true} でも切り替え可能。
+
     受信メッセージフォーマット:
     {
         "type": "output",
@@ -224,12 +453,27 @@ async def websocket_output(websocket: WebSocket):
             "intensity": 0.8
         },
         "audio_path": "/path/to/audio.mp3",
-        "has_live2d": true
+        "audio_id": "3f2a...",
+        "audio_url": "/api/live/audio/3f2a...",
+        "audio_size": 48213,
+        "has_live2d": true,
+        "is_filler": false
     }
+
+    is_filler が true の出力は応答待ちのつなぎリアクション（本応答が直後に届く）
+
+    インスタンスが存在しない、または同時接続数の上限に達している場合は 1013 で切断する。
     """
+    live = _get_instance(instance)
     await websocket.accept()
-    _output_websockets.append(websocket)
-    logger.info(f"Live output WebSocket connected. Total: {len(_output_websockets)}")
+    if live is None or not live.can_accept_connection:
+        await websocket.close(code=1013)
+        return
+
+    live.output_websockets.append(websocket)
+    if binary_audio:
+        live.binary_audio_websockets.add(websocket)
+    logger.info(f"Live output WebSocket connected ({instance}). Total: {len(live.output_websockets)}")
 
     try:
         while True:
@@ -239,15 +483,25 @@ async def websocket_output(websocket: WebSocket):
 
             if action == "ping":
                 await websocket.send_json({"type": "pong"})
+            elif action == "binary_audio":
+                if data.get("enabled", True):
+                    live.binary_audio_websockets.add(websocket)
+                else:
+                    live.binary_audio_websockets.discard(websocket)
 
     except WebSocketDisconnect:
-        if websocket in _output_websockets:
-            _output_websockets.remove(websocket)
-        logger.info(f"Live output WebSocket disconnected. Total: {len(_output_websockets)}")
+        live.remove_websocket(websocket)
+        logger.info(f"Live output WebSocket disconnected ({instance}). Total: {len(live.output_websockets)}")
+
+
+async def _broadcast_output(live: LiveInstance, output: LiveOutput):
+    """出力をインスタンスのWebSocketにブロードキャスト"""
+    blob = None
+    if output.audio_id:
+        blob = live.mode.audio_store.get(output.audio_id)
 
+    prefix = router.prefix if live.name == DEFAULT_INSTANCE else f"{router.prefix}/{live.name}"
 
-async def _broadcast_output(output: LiveOutput):
-    """出力をWebSocketにブロードキャスト"""
     message = {
         "type": "output",
         "input": {
@@ -261,17 +515,23 @@ async def _broadcast_output(output: LiveOutput):
             "secondary": output.emotion.secondary.value if output.emotion.secondary else None,
             "intensity": output.emotion.intensity,
         },
+        "emotion_updates": [update.to_dict() for update in output.emotion_updates],
         "audio_path": str(output.audio_path) if output.audio_path else None,
+        "audio_id": blob.id if blob else None,
+        "audio_url": f"{prefix}/audio/{blob.id}" if blob else None,
+        "audio_size": blob.size if blob else 0,
         "has_live2d": output.live2d_params is not None,
+        "is_filler": output.is_filler,
     }
 
     disconnected = []
-    for ws in _output_websockets:
+    for ws in list(live.output_websockets):
         try:
             await ws.send_json(message)
+            if blob is not None and ws in live.binary_audio_websockets:
+                await ws.send_bytes(blob.data)
         except Exception:
             disconnected.append(ws)
 
     for ws in disconnected:
-        if ws in _output_websockets:
-            _output_websockets.remove(ws)
+        live.remove_websocket(ws)
@@ -1,11 +1,14 @@
 """Lobby Backend API - FastAPI Application"""
 
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 
+from ..core.executor import shutdown_executor
+from ..core.http_pool import close_http_pool
 from .audio import router as audio_router
 from .chat import router as chat_router
 from .clip import router as clip_router
@@ -20,11 +23,23 @@ from .thumbnail import router as thumbnail_router
 from .vrm import router as vrm_router
 from .websocket import router as ws_router
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """起動/終了処理"""
+    yield
+    # 共有HTTPクライアント（keep-alive接続）を閉じる
+    await close_http_pool()
+    # ブロッキング処理用のワーカープールを終了
+    shutdown_executor(wait=False)
+
+
 # アプリケーション作成
 app = FastAPI(
     title="Lobby",
     description="AI VTuber配信・収録ソフト API",
     version="0.8.0",
+    lifespan=lifespan,
 )
 
 # CORS設定（開発用）
@@ -6,6 +6,7 @@ from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect
 from loguru import logger
 from pydantic import BaseModel
 
+from ..core.http_pool import get_http_pool
 from ..core.live_subtitle import (
     SubtitleStyle,
     subtitle_broadcaster,
@@ -290,7 +291,7 @@ def get_translator(config: Optional[TranslatorConfigRequest] = None) -> Subtitle
             context_lines=config.context_lines if config else 2,
             formal=config.formal if config else False,
         )
-        _translator = SubtitleTranslator(translator_config)
+        _translator = SubtitleTranslator(translator_config, client=get_http_pool().client(timeout=60.0))
     return _translator
 
 
@@ -6,6 +6,7 @@ from pathlib import Path
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 from loguru import logger
 
+from ..core.executor import run_cpu
 from ..core.live2d import (
     EmotionDrivenLive2D,
     Live2DConfig,
@@ -225,7 +226,7 @@ async def websocket_live2d(websocket: WebSocket):
                             })
 
                         # 感情付きフレームを生成してストリーム
-                        frames = emotion_driven.generate_speaking_frames(text, audio_path)
+                        frames = await emotion_driven.generate_speaking_frames_async(text, audio_path)
                         asyncio.create_task(manager.stream_frames(frames))
 
                         await websocket.send_json({
@@ -279,7 +280,7 @@ async def analyze_audio(audio_path: str, expression: str = "neutral"):
         expr = Live2DExpression.NEUTRAL
 
     analyzer = Live2DLipsyncAnalyzer()
-    frames = analyzer.analyze_audio(Path(audio_path), expr)
+    frames = await run_cpu(analyzer.analyze_audio, Path(audio_path), expr)
 
     # 非同期でストリーミング開始
     asyncio.create_task(manager.stream_frames(frames))
@@ -346,7 +347,7 @@ async def speak_with_emotion(text: str, audio_path: str):
         return {"error": f"Audio file not found: {audio_path}"}
 
     expression, intensity = emotion_driven.analyze_text(text)
-    frames = emotion_driven.generate_speaking_frames(text, path)
+    frames = await emotion_driven.generate_speaking_frames_async(text, path)
 
     # 非同期でストリーミング開始
     asyncio.create_task(manager.stream_frames(frames))
@@ -0,0 +1,52 @@
+"""Lobby Bench - ライブモードの負荷試験・リプレイ"""
+
+from .load import (
+    ArrivalProcess,
+    BenchConfig,
+    BurstArrivals,
+    ChatFactory,
+    ChatProfile,
+    LoadGenerator,
+    LoadReport,
+    PoissonArrivals,
+    RaidSpike,
+    bench_live_config,
+    parse_arrivals,
+    run_benchmark,
+)
+from .replay import (
+    RecordedSession,
+    SessionRecorder,
+    SessionReplayer,
+    load_session,
+    scale_live_config,
+)
+from .stubs import StubLatency, StubServer, create_openclaw_stub, create_tts_stub, silent_wav
+
+__all__ = [
+    # Load
+    "ArrivalProcess",
+    "PoissonArrivals",
+    "BurstArrivals",
+    "RaidSpike",
+    "parse_arrivals",
+    "ChatProfile",
+    "ChatFactory",
+    "LoadGenerator",
+    "LoadReport",
+    "BenchConfig",
+    "bench_live_config",
+    "run_benchmark",
+    # Replay
+    "SessionRecorder",
+    "SessionReplayer",
+    "RecordedSession",
+    "load_session",
+    "scale_live_config",
+    # Stubs
+    "StubLatency",
+    "StubServer",
+    "create_openclaw_stub",
+    "create_tts_stub",
+    "silent_wav",
+]
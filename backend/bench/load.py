@@ -0,0 +1,469 @@
+"""Load Generator - チャット洪水の負荷生成とライブ処理のスループット計測
+
+到着過程（ポアソン / 周期的なバースト / レイド時のスパイク）に従って
+合成コメントをLiveModeに投入し、スループット・破棄率・キュー長の推移・
+エンドツーエンドのレイテンシ分布を計測する。
+
+使用例:
+```python
+report = await run_benchmark(BenchConfig(
+    arrivals=RaidSpike(base_rate=5, peak_rate=50, at_sec=10, decay_sec=10),
+    duration_sec=30,
+))
+print(report.format_text())
+```
+"""
+
+import asyncio
+import copy
+import itertools
+import math
+import random
+import tempfile
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from ..core.latency import LatencyHistogram
+from ..modes.live import InputSource, LiveInput, LiveMode, LiveModeConfig, LiveOutput
+from .stubs import StubLatency, StubServer, create_openclaw_stub, create_tts_stub
+
+# === 到着過程 ===
+
+class ArrivalProcess(ABC):
+    """非定常ポアソン過程（``rate(t)`` 件/秒）
+
+    到着時刻は ``max_rate`` の定常ポアソン過程を間引いて生成する（thinning法）。
+    """
+
+    max_rate: float = 1.0
+
+    @abstractmethod
+    def rate(self, t: float) -> float:
+        """時刻 ``t`` 秒での到着レート（件/秒、``max_rate`` 以下）"""
+
+    def schedule(self, duration_sec: float, rng: random.Random) -> list[float]:
+        """0〜duration_sec の到着時刻（秒）"""
+        times: list[float] = []
+        if self.max_rate <= 0:
+            return times
+        t = 0.0
+        while True:
+            t += rng.expovariate(self.max_rate)
+            if t >= duration_sec:
+                return times
+            if rng.random() * self.max_rate <= self.rate(t):
+                times.append(t)
+
+
+@dataclass
+class PoissonArrivals(ArrivalProcess):
+    """一定レートのポアソン到着"""
+    rate_per_sec: float = 5.0
+
+    @property
+    def max_rate(self) -> float:
+        return self.rate_per_sec
+
+    def rate(self, t: float) -> float:
+        return self.rate_per_sec
+
+
+@dataclass
+class BurstArrivals(ArrivalProcess):
+    """周期的なバースト（period_sec ごとに burst_sec だけ burst_rate）"""
+    base_rate: float = 2.0
+    burst_rate: float = 30.0
+    period_sec: float = 30.0
+    burst_sec: float = 5.0
+
+    @property
+    def max_rate(self) -> float:
+        return max(self.base_rate, self.burst_rate)
+
+    def rate(self, t: float) -> float:
+        return self.burst_rate if t % self.period_sec < self.burst_sec else self.base_rate
+
+
+@dataclass
+class RaidSpike(ArrivalProcess):
+    """レイド到着時のスパイク（at_sec に peak_rate まで跳ね上がり指数減衰）"""
+    base_rate: float = 2.0
+    peak_rate: float = 50.0
+    at_sec: float = 10.0
+    decay_sec: float = 15.0
+
+    @property
+    def max_rate(self) -> float:
+        return max(self.base_rate, self.peak_rate)
+
+    def rate(self, t: float) -> float:
+        if t < self.at_sec:
+            return self.base_rate
+        return self.base_rate + (self.peak_rate - self.base_rate) * math.exp(-(t - self.at_sec) / self.decay_sec)
+
+
+def parse_arrivals(spec: str) -> ArrivalProcess:
+    """到着過程の指定文字列をパース
+
+    - ``poisson:RATE``
+    - ``burst:BASE,PEAK,PERIOD,LENGTH``
+    - ``raid:BASE,PEAK,AT,DECAY``
+
+    Raises:
+        ValueError: 形式が不正な場合
+    """
+    kind, _, args = spec.partition(":")
+    try:
+        values = [float(v) for v in args.split(",")] if args else []
+    except ValueError:
+        raise ValueError(f"Invalid arrival spec: {spec}") from None
+
+    factories = {"poisson": (PoissonArrivals, 1), "burst": (BurstArrivals, 4), "raid": (RaidSpike, 4)}
+    if kind not in factories:
+        raise ValueError(f"Unknown arrival process: {kind} (poisson, burst, raid)")
+    cls, arity = factories[kind]
+    if len(values) > arity:
+        raise ValueError(f"Too many parameters for {kind}: {spec}")
+    return cls(*values)
+
+
+# === 合成コメント ===
+
+# 定型コメント（集約対象になりやすい）
+STOCK_COMMENTS = ["草", "8888", "かわいい", "こんにちは！", "www", "おつかれ〜"]
+
+COMMENT_TEMPLATES = [
+    "{n}回目の配信おめでとう！",
+    "今日のゲームは何？（{n}）",
+    "初見です！{n}番目くらいかな",
+    "ロビィちゃんの好きな食べ物は？ #{n}",
+    "さっきの話もっと聞きたい {n}",
+]
+
+
+@dataclass
+class ChatProfile:
+    """合成コメントの構成"""
+    authors: int = 500                    # 投稿者数（Zipf分布で一部の投稿者が連投する）
+    platforms: dict[str, float] = field(default_factory=lambda: {"youtube": 0.6, "twitch": 0.4})
+    superchat_ratio: float = 0.02         # スパチャ/Bitsの割合
+    stock_ratio: float = 0.2              # 定型コメントの割合
+
+
+class ChatFactory:
+    """ChatProfileに従って合成コメント（LiveInput）を生成"""
+
+    SOURCES = {"youtube": InputSource.YOUTUBE_COMMENT, "twitch": InputSource.TWITCH_COMMENT}
+
+    def __init__(self, profile: Optional[ChatProfile] = None):
+        self.profile = profile or ChatProfile()
+        self._platforms = list(self.profile.platforms)
+        self._platform_weights = list(self.profile.platforms.values())
+        weights = [1.0 / (i + 1) for i in range(max(1, self.profile.authors))]
+        self._author_cum_weights = list(itertools.accumulate(weights))
+        self._seq = 0
+
+    def make(self, rng: random.Random) -> LiveInput:
+        self._seq += 1
+        platform = rng.choices(self._platforms, self._platform_weights)[0]
+        author = rng.choices(range(len(self._author_cum_weights)), cum_weights=self._author_cum_weights)[0]
+        metadata: dict = {"platform": platform}
+
+        if rng.random() < self.profile.superchat_ratio:
+            if platform == "twitch":
+                metadata.update(type="bits", bits=rng.choice([100, 500, 1000, 5000]))
+            else:
+                metadata.update(type="superChatEvent", amount=rng.choice([200, 500, 1000, 5000, 10000]),
+                                currency="JPY")
+            text = f"応援してます！ ({self._seq})"
+        elif rng.random() < self.profile.stock_ratio:
+            text = rng.choice(STOCK_COMMENTS)
+        else:
+            text = rng.choice(COMMENT_TEMPLATES).format(n=self._seq)
+
+        return LiveInput(
+            text=text,
+            source=self.SOURCES.get(platform, InputSource.MANUAL),
+            author=f"viewer{author}",
+            author_id=f"{platform}-{author}",
+            metadata=metadata,
+        )
+
+
+# === 計測 ===
+
+@dataclass
+class LoadReport:
+    """負荷試験の結果"""
+    duration_sec: float                   # 投入期間
+    elapsed_sec: float                    # ドレイン込みの計測時間
+    offered: int = 0                      # 投入した入力
+    accepted: int = 0                     # add_inputが受け付けた入力（集約を含む）
+    coalesced: int = 0                    # 既存の入力に集約された入力
+    outputs: int = 0                      # 応答まで完了した入力
+    errors: int = 0
+    unfinished: int = 0                   # 計測終了時にキューに残っていた入力
+    dropped: dict[str, int] = field(default_factory=dict)
+    queue_depth: list[tuple[float, int, int]] = field(default_factory=list)  # (秒, 通常, 優先)
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)      # 投入→応答（ミリ秒）
+    latency_by_kind: dict[str, LatencyHistogram] = field(default_factory=dict)
+    stages: dict[str, dict] = field(default_factory=dict)                   # LiveModeの段階別分布
+    time_scale: float = 1.0               # 加速リプレイの倍速（時間はすべて元の時間軸に換算済み）
+
+    @property
+    def throughput_per_sec(self) -> float:
+        return self.outputs / self.elapsed_sec if self.elapsed_sec > 0 else 0.0
+
+    @property
+    def offered_per_sec(self) -> float:
+        return self.offered / self.duration_sec if self.duration_sec > 0 else 0.0
+
+    @property
+    def drop_rate(self) -> float:
+        return sum(self.dropped.values()) / self.offered if self.offered else 0.0
+
+    @property
+    def max_queue_depth(self) -> int:
+        return max((normal + priority for _, normal, priority in self.queue_depth), default=0)
+
+    def to_dict(self) -> dict:
+        return {
+            "duration_sec": self.duration_sec,
+            "time_scale": self.time_scale,
+            "elapsed_sec": round(self.elapsed_sec, 2),
+            "offered": self.offered,
+            "offered_per_sec": round(self.offered_per_sec, 2),
+            "accepted": self.accepted,
+            "coalesced": self.coalesced,
+            "outputs": self.outputs,
+            "throughput_per_sec": round(self.throughput_per_sec, 2),
+            "errors": self.errors,
+            "unfinished": self.unfinished,
+            "dropped": dict(self.dropped),
+            "drop_rate": round(self.drop_rate, 4),
+            "max_queue_depth": self.max_queue_depth,
+            "queue_depth": [
+                {"t": round(t, 2), "normal": normal, "priority": priority}
+                for t, normal, priority in self.queue_depth
+            ],
+            "latency_ms": self.latency.summary(),
+            "latency_by_kind_ms": {kind: h.summary() for kind, h in self.latency_by_kind.items()},
+            "stages_ms": self.stages,
+        }
+
+    def format_text(self) -> str:
+        """人が読む用の要約"""
+        lat = self.latency.summary()
+        lines = [
+            f"offered      {self.offered} ({self.offered_per_sec:.1f}/s over {self.duration_sec:.0f}s)",
+            f"coalesced    {self.coalesced}",
+            f"throughput   {self.outputs} outputs, {self.throughput_per_sec:.2f}/s",
+            f"dropped      {sum(self.dropped.values())} ({self.drop_rate:.1%}) {self.dropped}",
+            f"errors       {self.errors}, unfinished {self.unfinished}",
+            f"queue depth  max {self.max_queue_depth}  {_sparkline([n + p for _, n, p in self.queue_depth])}",
+        ]
+        if lat["count"]:
+            lines.append(f"e2e latency  p50 {lat['p50']}ms  p95 {lat['p95']}ms  p99 {lat['p99']}ms  max {lat['max']}ms")
+        for kind, histogram in self.latency_by_kind.items():
+            s = histogram.summary()
+            lines.append(f"  {kind:<10} n={s['count']}  p50 {s['p50']}ms  p95 {s['p95']}ms  p99 {s['p99']}ms")
+        for stage, s in self.stages.items():
+            if s.get("count"):
+                lines.append(f"  stage {stage:<11} p50 {s['p50']}ms  p95 {s['p95']}ms")
+        return "\n".join(lines)
+
+
+def _sparkline(values: list[int], width: int = 40) -> str:
+    if not values:
+        return ""
+    bars = " ▁▂▃▄▅▆▇█"
+    step = max(1, math.ceil(len(values) / width))
+    buckets = [max(values[i:i + step]) for i in range(0, len(values), step)]
+    top = max(buckets) or 1
+    return "".join(bars[round(v / top * (len(bars) - 1))] for v in buckets)
+
+
+class LoadGenerator:
+    """到着過程に従ってLiveModeへ入力を投入し、結果を集計する
+
+    LiveModeの出力/エラーコールバックを使うため、計測対象のLiveModeは専有する。
+    ``time_scale`` を指定すると計測した時間にその倍率を掛ける（加速リプレイを元の時間軸に戻す）。
+    """
+
+    def __init__(
+        self,
+        live: LiveMode,
+        arrivals: Optional[ArrivalProcess] = None,
+        factory: Optional[ChatFactory] = None,
+        seed: Optional[int] = None,
+        sample_interval_sec: float = 0.25,
+        time_scale: float = 1.0,
+    ):
+        self.live = live
+        self.arrivals = arrivals
+        self.factory = factory or ChatFactory()
+        self.sample_interval_sec = sample_interval_sec
+        self.time_scale = time_scale
+        self._rng = random.Random(seed)
+        self._sent_at: dict[int, tuple[LiveInput, float]] = {}
+        self._report: Optional[LoadReport] = None
+
+    def _on_output(self, output: LiveOutput):
+        report = self._report
+        if report is None or output.is_filler:
+            return
+        report.outputs += 1
+        sent = self._sent_at.pop(id(output.input), None)
+        if sent is None:
+            return
+        ms = (time.monotonic() - sent[1]) * 1000 * self.time_scale
+        report.latency.record(ms)
+        report.latency_by_kind.setdefault(output.input.kind, LatencyHistogram()).record(ms)
+
+    def _on_error(self, _error: Exception):
+        if self._report is not None:
+            self._report.errors += 1
+
+    def _dequeued(self) -> int:
+        return sum(s["dequeued"] for s in self.live.scheduler_stats.values())
+
+    def _expired(self) -> int:
+        return sum(n for reason, n in self.live.stats["dropped"].items() if reason.startswith("expired_"))
+
+    async def _sample(self, report: LoadReport, started: float):
+        while True:
+            report.queue_depth.append((
+                (time.monotonic() - started) * self.time_scale,
+                self.live.queue_size,
+                self.live.priority_queue_size,
+            ))
+            await asyncio.sleep(self.sample_interval_sec)
+
+    def send(self, input_data: LiveInput) -> bool:
+        """1件投入（到着時刻を記録）"""
+        self._sent_at[id(input_data)] = (input_data, time.monotonic())
+        self._report.offered += 1
+        accepted = self.live.add_input(input_data)
+        if accepted:
+            self._report.accepted += 1
+        return accepted
+
+    async def run(self, duration_sec: float, drain_sec: float = 30.0) -> LoadReport:
+        """負荷を投入し、キューが捌けるまで（最大 drain_sec）待って集計"""
+        if self.arrivals is None:
+            raise ValueError("arrivals is required (use run_schedule for explicit schedules)")
+        times = self.arrivals.schedule(duration_sec, self._rng)
+        return await self.run_schedule(
+            [(t, self.factory.make(self._rng)) for t in times], duration_sec, drain_sec,
+        )
+
+    async def run_schedule(
+        self,
+        schedule: list[tuple[float, LiveInput]],
+        duration_sec: float,
+        drain_sec: float = 30.0,
+    ) -> LoadReport:
+        """(到着秒, 入力) の列を投入して集計（リプレイ等で到着列を指定する場合）"""
+        report = self._report = LoadReport(
+            duration_sec=duration_sec * self.time_scale, elapsed_sec=0.0, time_scale=self.time_scale,
+        )
+        self.live.set_output_callback(self._on_output)
+        self.live.set_error_callback(self._on_error)
+        baseline_drops = dict(self.live.stats["dropped"])
+        baseline_dequeued = self._dequeued()
+        baseline_expired = self._expired()
+        baseline_coalesced = self.live.coalescer_stats["coalesced"]
+
+        started = time.monotonic()
+        sampler = asyncio.create_task(self._sample(report, started))
+        try:
+            for at, input_data in schedule:
+                delay = started + at - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                self.send(input_data)
+
+            remaining = started + duration_sec - time.monotonic()
+            if remaining > 0:
+                await asyncio.sleep(remaining)
+
+            # ドレイン: キューが空になり、取り出した入力の処理が終わるまで
+            deadline = time.monotonic() + drain_sec
+            while time.monotonic() < deadline:
+                # 取り出し済みの入力は 応答・エラー・期限切れ のいずれかで終わる
+                idle = self.live.queue_size + self.live.priority_queue_size == 0
+                finished = report.outputs + report.errors + self._expired() - baseline_expired
+                if idle and finished >= self._dequeued() - baseline_dequeued:
+                    break
+                await asyncio.sleep(0.02)
+        finally:
+            sampler.cancel()
+            report.elapsed_sec = (time.monotonic() - started) * self.time_scale
+
+        report.unfinished = self.live.queue_size + self.live.priority_queue_size
+        report.coalesced = self.live.coalescer_stats["coalesced"] - baseline_coalesced
+        report.dropped = {
+            reason: n - baseline_drops.get(reason, 0)
+            for reason, n in self.live.stats["dropped"].items()
+            if n - baseline_drops.get(reason, 0) > 0
+        }
+        report.stages = {
+            stage: {k: (v if k == "count" else round(v * self.time_scale, 1)) for k, v in summary.items()}
+            for stage, summary in self.live.latency.snapshot(traces=0)["stages"].items()
+        }
+        self._sent_at.clear()
+        return report
+
+
+# === ベンチマーク実行 ===
+
+def bench_live_config(audio_output_dir: Path) -> LiveModeConfig:
+    """ベンチマーク用のLiveMode設定（描画・字幕・ファイル保存・つなぎリアクションなし）"""
+    config = LiveModeConfig(
+        audio_output_dir=audio_output_dir,
+        generate_live2d=False,
+        generate_subtitles=False,
+        persist_audio=False,
+        process_interval=0.02,
+    )
+    config.filler.enabled = False
+    return config
+
+
+@dataclass
+class BenchConfig:
+    """スタブサーバー + LiveMode のベンチマーク設定"""
+    arrivals: ArrivalProcess = field(default_factory=PoissonArrivals)
+    duration_sec: float = 30.0
+    drain_sec: float = 30.0
+    llm_latency: StubLatency = field(default_factory=lambda: StubLatency(mean_ms=800, jitter_ms=200))
+    tts_latency: StubLatency = field(default_factory=lambda: StubLatency(mean_ms=200, jitter_ms=50, per_char_ms=5))
+    profile: ChatProfile = field(default_factory=ChatProfile)
+    live: Optional[LiveModeConfig] = None  # 省略時は bench_live_config()
+    seed: Optional[int] = None
+    sample_interval_sec: float = 0.25
+
+
+async def run_benchmark(config: BenchConfig) -> LoadReport:
+    """スタブのOpenClaw/TTSを起動し、LiveModeに負荷を投入して計測"""
+    with tempfile.TemporaryDirectory(prefix="lobby-bench-") as tmp:
+        # スタブのURLを書き込むので呼び出し元の設定はコピーして使う
+        live_config = copy.deepcopy(config.live) if config.live else bench_live_config(Path(tmp))
+        async with (
+            StubServer(create_openclaw_stub(config.llm_latency)) as llm,
+            StubServer(create_tts_stub(config.tts_latency)) as tts,
+        ):
+            live_config.openclaw.base_url = llm.base_url
+            live_config.tts.base_url = tts.base_url
+            live_config.tts.provider = "miotts"
+
+            async with LiveMode(live_config) as live:
+                generator = LoadGenerator(
+                    live, config.arrivals, ChatFactory(config.profile),
+                    seed=config.seed, sample_interval_sec=config.sample_interval_sec,
+                )
+                await live.start()
+                return await generator.run(config.duration_sec, config.drain_sec)
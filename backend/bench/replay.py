@@ -0,0 +1,333 @@
+"""Session Replay - ライブ配信セッションの記録と加速リプレイ
+
+配信中の入力（到着時刻つき）と、任意でOpenClawの応答・段階別の所要時間・TTS音声を
+JSONLに記録し、後からスタブのOpenClaw/TTSに対して 1〜50倍速で再投入する。
+実際の混雑の形で遅延の再現やスケジューラ変更の比較ができる。
+
+記録形式（1行1イベント）:
+```
+{"type": "session", "version": 1, "started_at": "..."}
+{"type": "input", "t": 1.23, "text": "...", "source": "youtube", "author": "...", ...}
+{"type": "output", "t": 2.34, "input_text": "...", "response_text": "...", "spans_ms": {...}}
+```
+
+使用例:
+```python
+recorder = SessionRecorder(Path("sessions/2026-10-18.jsonl"))
+recorder.attach(live)
+live.set_output_callback(recorder.wrap_output(on_output))
+
+report = await SessionReplayer(load_session(path), speed=10).run()
+```
+"""
+
+import base64
+import itertools
+import json
+import tempfile
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import IO, Callable, Optional
+
+from loguru import logger
+
+from ..modes.live import InputSource, LiveInput, LiveMode, LiveModeConfig, LiveOutput
+from .load import LoadGenerator, LoadReport, bench_live_config
+from .stubs import StubLatency, StubServer, create_openclaw_stub, create_tts_stub
+
+SESSION_FORMAT_VERSION = 1
+
+
+class SessionRecorder:
+    """LiveModeの入力と応答をJSONLに記録
+
+    Args:
+        path: 記録先（親ディレクトリは自動作成、既存ファイルは上書き）
+        capture_responses: 応答文と段階別の所要時間を記録するか
+        capture_audio: TTS音声（base64）も記録するか（ファイルサイズが大きくなる）
+    """
+
+    def __init__(self, path: Path, capture_responses: bool = True, capture_audio: bool = False):
+        self.path = path
+        self.capture_responses = capture_responses
+        self.capture_audio = capture_audio
+        self.inputs = 0
+        self.outputs = 0
+        self._live: Optional[LiveMode] = None
+        self._started = time.monotonic()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._file: Optional[IO[str]] = path.open("w", encoding="utf-8")
+        self._write({
+            "type": "session",
+            "version": SESSION_FORMAT_VERSION,
+            "started_at": datetime.now().isoformat(),
+        })
+
+    def _write(self, event: dict):
+        if self._file is not None:
+            self._file.write(json.dumps(event, ensure_ascii=False, default=str) + "\n")
+
+    def _offset(self) -> float:
+        return round(time.monotonic() - self._started, 3)
+
+    def attach(self, live: LiveMode):
+        """LiveModeの入力を記録対象にする（出力は ``wrap_output`` で記録）"""
+        self._live = live
+        live.set_input_callback(self.record_input)
+
+    def record_input(self, input_data: LiveInput):
+        self.inputs += 1
+        self._write({
+            "type": "input",
+            "t": self._offset(),
+            "text": input_data.text,
+            "source": input_data.source.value,
+            "author": input_data.author,
+            "author_id": input_data.author_id,
+            "metadata": input_data.metadata,
+        })
+
+    def record_output(self, output: LiveOutput):
+        if not self.capture_responses or output.is_filler:
+            return
+        self.outputs += 1
+        event = {
+            "type": "output",
+            "t": self._offset(),
+            "input_text": output.input.text,
+            "response_text": output.response_text,
+            "emotion": output.emotion.primary.value,
+            "spans_ms": {k: round(v, 1) for k, v in output.trace.spans.items()} if output.trace else {},
+        }
+        if self.capture_audio and output.audio_id and self._live is not None:
+            blob = self._live.audio_store.get(output.audio_id)
+            if blob is not None:
+                event["audio"] = base64.b64encode(blob.data).decode()
+        self._write(event)
+
+    def wrap_output(self, callback: Optional[Callable[[LiveOutput], None]] = None) -> Callable[[LiveOutput], None]:
+        """出力を記録してから ``callback`` に渡すコールバックを返す"""
+        def on_output(output: LiveOutput):
+            self.record_output(output)
+            if callback is not None:
+                callback(output)
+        return on_output
+
+    def close(self):
+        """記録を終了"""
+        if self._live is not None:
+            self._live.set_input_callback(None)
+            self._live = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            logger.info(f"Session recorded: {self.path} ({self.inputs} inputs, {self.outputs} outputs)")
+
+    @property
+    def stats(self) -> dict:
+        return {"path": str(self.path), "inputs": self.inputs, "outputs": self.outputs}
+
+
+@dataclass
+class RecordedInput:
+    """記録された入力"""
+    at: float
+    text: str
+    source: str = InputSource.MANUAL.value
+    author: str = "Anonymous"
+    author_id: str = ""
+    metadata: dict = field(default_factory=dict)
+
+    def to_input(self) -> LiveInput:
+        """再投入用のLiveInput（毎回新しいインスタンス）"""
+        metadata = {k: v for k, v in self.metadata.items() if not k.startswith("coalesced")}
+        return LiveInput(
+            text=self.text,
+            source=InputSource(self.source),
+            author=self.author,
+            author_id=self.author_id,
+            metadata=metadata,
+        )
+
+
+@dataclass
+class RecordedOutput:
+    """記録された応答"""
+    at: float
+    input_text: str
+    response_text: str
+    emotion: str = "neutral"
+    spans_ms: dict[str, float] = field(default_factory=dict)
+    audio: Optional[bytes] = None
+
+
+@dataclass
+class RecordedSession:
+    """記録済みセッション"""
+    started_at: str = ""
+    inputs: list[RecordedInput] = field(default_factory=list)
+    outputs: list[RecordedOutput] = field(default_factory=list)
+
+    @property
+    def duration_sec(self) -> float:
+        return self.inputs[-1].at if self.inputs else 0.0
+
+
+def load_session(path: Path) -> RecordedSession:
+    """記録ファイルを読み込む
+
+    Raises:
+        ValueError: 未対応のバージョン・不正な行がある場合
+    """
+    session = RecordedSession()
+    with path.open(encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                event = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{path}:{line_no}: invalid JSON ({e})") from None
+
+            kind = event.get("type")
+            if kind == "session":
+                if event.get("version", 1) > SESSION_FORMAT_VERSION:
+                    raise ValueError(f"Unsupported session version: {event.get('version')}")
+                session.started_at = event.get("started_at", "")
+            elif kind == "input":
+                session.inputs.append(RecordedInput(
+                    at=float(event["t"]),
+                    text=event["text"],
+                    source=event.get("source", InputSource.MANUAL.value),
+                    author=event.get("author", "Anonymous"),
+                    author_id=event.get("author_id", ""),
+                    metadata=event.get("metadata") or {},
+                ))
+            elif kind == "output":
+                audio = event.get("audio")
+                session.outputs.append(RecordedOutput(
+                    at=float(event["t"]),
+                    input_text=event["input_text"],
+                    response_text=event["response_text"],
+                    emotion=event.get("emotion", "neutral"),
+                    spans_ms=event.get("spans_ms") or {},
+                    audio=base64.b64decode(audio) if audio else None,
+                ))
+
+    session.inputs.sort(key=lambda i: i.at)
+    return session
+
+
+def scale_live_config(config: LiveModeConfig, speed: float) -> LiveModeConfig:
+    """加速リプレイ用に時間に関する設定を ``speed`` 倍速に合わせる（configを書き換えて返す）"""
+    config.input_deadlines = {kind: sec / speed for kind, sec in config.input_deadlines.items()}
+    config.platform_rate_limits = {p: per_min * speed for p, per_min in config.platform_rate_limits.items()}
+    if config.author_rate_per_min:
+        config.author_rate_per_min *= speed
+    config.priority_aging_per_sec *= speed
+    config.coalescer.window_sec /= speed
+    config.process_interval /= speed
+    return config
+
+
+class SessionReplayer:
+    """記録済みセッションをスタブに対して再投入
+
+    Args:
+        session: 記録済みセッション
+        speed: 倍速（1〜50程度）。到着間隔・スタブの応答時間・期限などを 1/speed に縮める
+        recorded_latency: 記録されたOpenClaw/TTSの所要時間を再現するか（Falseまたは記録がない場合はスタブ設定）
+        llm_latency: 記録がない場合のOpenClawスタブの応答時間（元の時間軸）
+        tts_latency: 記録がない場合のTTSスタブの応答時間（元の時間軸）
+    """
+
+    def __init__(
+        self,
+        session: RecordedSession,
+        speed: float = 1.0,
+        recorded_latency: bool = True,
+        llm_latency: Optional[StubLatency] = None,
+        tts_latency: Optional[StubLatency] = None,
+    ):
+        if speed <= 0:
+            raise ValueError(f"speed must be positive: {speed}")
+        self.session = session
+        self.speed = speed
+        self.recorded_latency = recorded_latency
+        self.llm_latency = llm_latency or StubLatency(mean_ms=800, jitter_ms=200)
+        self.tts_latency = tts_latency or StubLatency(mean_ms=200, jitter_ms=50, per_char_ms=5)
+
+        self._responses: dict[str, deque[RecordedOutput]] = {}
+        self._by_response: dict[str, RecordedOutput] = {}
+        for output in session.outputs:
+            self._responses.setdefault(output.input_text, deque()).append(output)
+            self._by_response[output.response_text] = output
+        self._fallback_replies = itertools.cycle(
+            [o.response_text for o in session.outputs] or ["ありがとうっす！"]
+        )
+
+    def schedule(self) -> list[tuple[float, LiveInput]]:
+        """(投入秒, 入力) の列（倍速適用済み）"""
+        return [(rec.at / self.speed, rec.to_input()) for rec in self.session.inputs]
+
+    def _respond(self, text: str) -> str:
+        outputs = self._responses.get(text)
+        if outputs:
+            # 同じ入力が複数回ある場合は記録順に返す（最後の応答は使い回す）
+            return (outputs.popleft() if len(outputs) > 1 else outputs[0]).response_text
+        return next(self._fallback_replies)
+
+    def _llm_delay(self, text: str) -> float:
+        outputs = self._responses.get(text)
+        if self.recorded_latency and outputs and "llm" in outputs[0].spans_ms:
+            return outputs[0].spans_ms["llm"] / 1000 / self.speed
+        return self.llm_latency.sample_sec(len(text)) / self.speed
+
+    def _tts_delay(self, text: str) -> float:
+        output = self._by_response.get(text)
+        if self.recorded_latency and output and "tts" in output.spans_ms:
+            return output.spans_ms["tts"] / 1000 / self.speed
+        return self.tts_latency.sample_sec(len(text)) / self.speed
+
+    def _audio_for(self, text: str) -> Optional[bytes]:
+        output = self._by_response.get(text)
+        return output.audio if output else None
+
+    async def run(
+        self,
+        live_config: Optional[LiveModeConfig] = None,
+        drain_sec: float = 30.0,
+        sample_interval_sec: float = 0.25,
+    ) -> LoadReport:
+        """スタブを起動してセッションを再投入し、元の時間軸に換算した結果を返す
+
+        Args:
+            live_config: LiveMode設定（省略時は ``bench_live_config``）。倍速に合わせて書き換える
+            drain_sec: 投入後に処理が捌けるまで待つ最大秒数（元の時間軸）
+            sample_interval_sec: キュー長のサンプリング間隔（元の時間軸）
+        """
+        with tempfile.TemporaryDirectory(prefix="lobby-replay-") as tmp:
+            config = scale_live_config(live_config or bench_live_config(Path(tmp)), self.speed)
+            async with (
+                StubServer(create_openclaw_stub(responder=self._respond, delay_for=self._llm_delay)) as llm,
+                StubServer(create_tts_stub(audio_for=self._audio_for, delay_for=self._tts_delay)) as tts,
+            ):
+                config.openclaw.base_url = llm.base_url
+                config.tts.base_url = tts.base_url
+                config.tts.provider = "miotts"
+
+                async with LiveMode(config) as live:
+                    generator = LoadGenerator(
+                        live, arrivals=None,
+                        sample_interval_sec=sample_interval_sec / self.speed,
+                        time_scale=self.speed,
+                    )
+                    await live.start()
+                    return await generator.run_schedule(
+                        self.schedule(),
+                        self.session.duration_sec / self.speed,
+                        drain_sec / self.speed,
+                    )
@@ -0,0 +1,289 @@
+"""Stub Servers - ベンチマーク用のOpenClaw / TTSスタブサーバー
+
+実サーバーの代わりにローカルで起動し、応答時間（平均・揺らぎ・文字数比例）と
+エラー率を調整できる。LiveModeからは通常のHTTPサーバーとして見える。
+
+使用例:
+```python
+llm_app = create_openclaw_stub(StubLatency(mean_ms=800, jitter_ms=200))
+async with StubServer(llm_app) as llm:
+    config.openclaw.base_url = llm.base_url
+```
+"""
+
+import asyncio
+import base64
+import io
+import itertools
+import json
+import random
+import wave
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+import uvicorn
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import Response, StreamingResponse
+
+# スタブTTSのストリーミング応答のチャンクサイズ
+STREAM_CHUNK_SIZE = 4096
+
+# スタブの応答文（順番に返す）
+DEFAULT_REPLIES = [
+    "ありがとうっす！嬉しいっす！",
+    "なるほど〜、それは面白いっすね！",
+    "えっ、本当っすか！？びっくりしたっす！",
+    "みんなコメントありがとうっす！",
+    "うーん、ちょっと考えさせてほしいっす。",
+]
+
+
+@dataclass
+class StubLatency:
+    """スタブの応答時間とエラー率"""
+    mean_ms: float = 0.0
+    jitter_ms: float = 0.0       # ±jitter_ms の一様分布
+    per_char_ms: float = 0.0     # 入力1文字あたりの追加時間（TTS向け）
+    error_rate: float = 0.0      # 503を返す確率
+    seed: Optional[int] = None
+    _rng: random.Random = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self._rng = random.Random(self.seed)
+
+    def sample_sec(self, chars: int = 0) -> float:
+        """応答時間（秒）をサンプリング"""
+        ms = self.mean_ms + chars * self.per_char_ms
+        if self.jitter_ms:
+            ms += self._rng.uniform(-self.jitter_ms, self.jitter_ms)
+        return max(0.0, ms) / 1000
+
+    def should_fail(self) -> bool:
+        return self.error_rate > 0 and self._rng.random() < self.error_rate
+
+
+def silent_wav(duration_sec: float = 0.5, sample_rate: int = 16000) -> bytes:
+    """無音のWAVデータ（スタブTTSの応答用）"""
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(b"\x00\x00" * int(duration_sec * sample_rate))
+    return buffer.getvalue()
+
+
+def _delay(
+    latency: StubLatency,
+    delay_for: Optional[Callable[[str], Optional[float]]],
+    text: str,
+) -> float:
+    if delay_for is not None:
+        delay = delay_for(text)
+        if delay is not None:
+            return delay
+    return latency.sample_sec(len(text))
+
+
+async def _sleep_unless_disconnected(request: Request, delay: float) -> bool:
+    """``delay`` 秒待つ（先にクライアントが切断したらFalse）"""
+
+    async def disconnected():
+        while (await request.receive())["type"] != "http.disconnect":
+            pass
+
+    watcher = asyncio.create_task(disconnected())
+    done, _ = await asyncio.wait({watcher}, timeout=delay)
+    watcher.cancel()
+    return not done
+
+
+def _last_user_message(payload: dict) -> str:
+    for message in reversed(payload.get("messages", [])):
+        if message.get("role") == "user":
+            return message.get("content", "")
+    return ""
+
+
+def create_openclaw_stub(
+    latency: Optional[StubLatency] = None,
+    responder: Optional[Callable[[str], str]] = None,
+    delay_for: Optional[Callable[[str], Optional[float]]] = None,
+) -> FastAPI:
+    """OpenClaw Gateway（OpenAI互換 /v1/chat/completions）のスタブ
+
+    Args:
+        latency: 応答時間とエラー率
+        responder: 入力テキスト → 応答文（省略時は ``DEFAULT_REPLIES`` を順番に返す）
+        delay_for: 入力テキスト → 応答時間（秒）。Noneを返した場合は ``latency`` に従う
+    """
+    latency = latency or StubLatency()
+    replies = itertools.cycle(DEFAULT_REPLIES)
+    responder = responder or (lambda _text: next(replies))
+    app = FastAPI(title="OpenClaw stub")
+    app.state.requests = 0
+
+    @app.get("/health")
+    async def health():
+        return {"status": "ok"}
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        payload = await request.json()
+        app.state.requests += 1
+        user_text = _last_user_message(payload)
+
+        await asyncio.sleep(_delay(latency, delay_for, user_text))
+        if latency.should_fail():
+            raise HTTPException(503, "stub failure")
+
+        text = responder(user_text)
+        if not payload.get("stream"):
+            return {
+                "choices": [{
+                    "message": {"role": "assistant", "content": text},
+                    "finish_reason": "stop",
+                }],
+                "usage": {"prompt_tokens": len(user_text), "completion_tokens": len(text)},
+            }
+
+        async def events():
+            for char in text:
+                chunk = {"choices": [{"delta": {"content": char}}]}
+                yield f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n"
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    return app
+
+
+def create_tts_stub(
+    latency: Optional[StubLatency] = None,
+    audio_for: Optional[Callable[[str], Optional[bytes]]] = None,
+    delay_for: Optional[Callable[[str], Optional[float]]] = None,
+    presets: Optional[list[str]] = None,
+    binary_output: bool = True,
+) -> FastAPI:
+    """TTSサーバー（MioTTS /v1/tts と OpenAI互換 /v1/audio/speech）のスタブ
+
+    ストリーミング要求（MioTTSは ``output.stream``、OpenAI互換は ``stream``）には
+    音声を ``STREAM_CHUNK_SIZE`` ごとのチャンク転送で返す。
+
+    Args:
+        latency: 応答時間とエラー率（``per_char_ms`` で文字数に比例させる）
+        audio_for: テキスト → 音声データ（省略時・Noneを返した場合は0.5秒の無音WAV）
+        delay_for: テキスト → 応答時間（秒）。Noneを返した場合は ``latency`` に従う
+        presets: ``/v1/presets`` が返すプリセット（省略時は ``["lobby"]``）
+        binary_output: MioTTSで ``output.format: wav`` の要求にWAVをそのまま返す
+            （Falseなら形式によらずbase64のJSONを返す古いサーバーとして振る舞う）
+
+    ``app.state.healthy`` をFalseにすると ``/health`` が503を返す。
+    応答前にクライアントが切断したリクエストは ``app.state.aborted`` に数える。
+    """
+    latency = latency or StubLatency()
+    default_audio = silent_wav()
+    app = FastAPI(title="TTS stub")
+    app.state.requests = 0
+    app.state.batches = 0
+    app.state.healthy = True
+    app.state.aborted = 0
+
+    async def synthesize(request: Request, text: str) -> bytes:
+        app.state.requests += 1
+        if not await _sleep_unless_disconnected(request, _delay(latency, delay_for, text)):
+            app.state.aborted += 1
+            raise HTTPException(499, "client disconnected")
+        if latency.should_fail():
+            raise HTTPException(503, "stub failure")
+        audio = audio_for(text) if audio_for else None
+        return default_audio if audio is None else audio
+
+    @app.get("/health")
+    async def health():
+        if not app.state.healthy:
+            raise HTTPException(503, "stub unhealthy")
+        return {"status": "ok"}
+
+    @app.get("/v1/presets")
+    async def list_presets():
+        return {"presets": presets if presets is not None else ["lobby"]}
+
+    def chunked(audio: bytes) -> StreamingResponse:
+        async def chunks():
+            for i in range(0, len(audio), STREAM_CHUNK_SIZE):
+                yield audio[i:i + STREAM_CHUNK_SIZE]
+                await asyncio.sleep(0)
+        return StreamingResponse(chunks(), media_type="audio/wav")
+
+    @app.post("/v1/tts")
+    async def miotts(request: Request):
+        payload = await request.json()
+        audio = await synthesize(request, payload.get("text", ""))
+        output = payload.get("output") or {}
+        if output.get("stream"):
+            return chunked(audio)
+        if binary_output and output.get("format") == "wav":
+            return Response(audio, media_type="audio/wav")
+        return {"audio": base64.b64encode(audio).decode()}
+
+    @app.post("/v1/tts/batch")
+    async def miotts_batch(request: Request):
+        payload = await request.json()
+        items = payload.get("items", [])
+        app.state.batches += 1
+        audios = await asyncio.gather(*(synthesize(request, item.get("text", "")) for item in items))
+        return {"audios": [base64.b64encode(audio).decode() for audio in audios]}
+
+    @app.post("/v1/audio/speech")
+    async def openai_speech(request: Request):
+        payload = await request.json()
+        audio = await synthesize(request, payload.get("input", ""))
+        if payload.get("stream"):
+            return chunked(audio)
+        return Response(audio, media_type="audio/wav")
+
+    return app
+
+
+class StubServer:
+    """スタブアプリをローカルで起動（port=0 で空きポートを使う）"""
+
+    def __init__(self, app: FastAPI, host: str = "127.0.0.1", port: int = 0):
+        self.app = app
+        self.host = host
+        self.port = port
+        self._server: Optional[uvicorn.Server] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    async def start(self):
+        config = uvicorn.Config(
+            self.app, host=self.host, port=self.port,
+            log_level="warning", lifespan="off", access_log=False,
+        )
+        self._server = uvicorn.Server(config)
+        self._task = asyncio.create_task(self._server.serve())
+        while not self._server.started:
+            if self._task.done():
+                self._task.result()  # 起動失敗時は例外を送出
+                raise RuntimeError("Stub server exited during startup")
+            await asyncio.sleep(0.01)
+        self.port = self._server.servers[0].sockets[0].getsockname()[1]
+
+    async def stop(self):
+        if self._server is not None and self._task is not None:
+            self._server.should_exit = True
+            await self._task
+            self._server = None
+            self._task = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.stop()
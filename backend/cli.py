@@ -335,6 +335,10 @@ def serve(
 
     console.print(f"[cyan]Starting Lobby API server on {actual_host}:{actual_port}[/cyan]")
 
+    from .core.config import build_http_pool_config
+    from .core.http_pool import configure_http_pool
+    configure_http_pool(build_http_pool_config(data))
+
     from .api.main import app as api_app
     uvicorn.run(api_app, host=actual_host, port=actual_port)
 
@@ -489,18 +493,44 @@ def doctor(
     # --- TTS server ---
     console.print("\n[bold]TTS Server[/bold]")
     tts_conf = data.get("tts", {})
-    tts_url = tts_conf.get("base_url", "http://localhost:8001")
-    tts_voice = tts_conf.get("voice", "lobby")
+    tts_targets = [
+        (url, tts_conf.get("voice", "lobby"), "")
+        for url in [tts_conf.get("base_url", "http://localhost:8001"), *(tts_conf.get("endpoints") or [])]
+    ] + [
+        (fallback.get("base_url", "http://localhost:8001"), fallback.get("voice", "lobby"), "fallback ")
+        for fallback in tts_conf.get("fallbacks") or []
+    ]
+    for tts_url, tts_voice, role in tts_targets:
+        try:
+            r = httpx.get(f"{tts_url.rstrip('/').removesuffix('/v1')}/health", timeout=3)
+            if r.status_code == 200:
+                _ok(f"TTS {role}reachable: {tts_url} (voice: {tts_voice})")
+            else:
+                _warn(f"TTS {role}responded {r.status_code}: {tts_url}")
+        except httpx.ConnectError:
+            _warn(f"TTS {role}not running: {tts_url}")
+        except Exception as e:
+            _warn(f"TTS {role}check failed: {e}")
+
+    # 起動中のLobbyサーバーが持つサーキットブレーカーの状態
+    server_port = data.get("server", {}).get("port", 8100)
     try:
-        r = httpx.get(f"{tts_url.rstrip('/').removesuffix('/v1')}/health", timeout=3)
-        if r.status_code == 200:
-            _ok(f"TTS reachable: {tts_url} (voice: {tts_voice})")
-        else:
-            _warn(f"TTS responded {r.status_code}: {tts_url}")
-    except httpx.ConnectError:
-        _warn(f"TTS not running: {tts_url}")
-    except Exception as e:
-        _warn(f"TTS check failed: {e}")
+        r = httpx.get(f"http://localhost:{server_port}/api/live/tts", timeout=3)
+        r.raise_for_status()
+        pools = r.json().get("pools", {})
+        if not pools:
+            console.print("  [dim]Circuit breakers: no TTS requests yet[/dim]")
+        for pool in pools.values():
+            for endpoint in pool.get("endpoints", []):
+                circuit = endpoint.get("circuit", {})
+                state = circuit.get("state", "unknown")
+                detail = f"circuit {state}: {endpoint.get('url')} (opened {circuit.get('opens', 0)}x)"
+                if state == "closed":
+                    _ok(detail)
+                else:
+                    _warn(detail)
+    except Exception:
+        console.print(f"  [dim]Circuit breakers: Lobby server not running on port {server_port}[/dim]")
 
     # --- Frontend ---
     console.print("\n[bold]Frontend[/bold]")
@@ -762,6 +792,131 @@ def init(
     console.print("  4. lobby record-video scripts/sample.txt --config config/lobby.yaml")
 
 
+@app.command()
+def bench_live(
+    arrivals: str = typer.Option(
+        "poisson:5",
+        "--arrivals", "-a",
+        help="到着過程（poisson:RATE / burst:BASE,PEAK,PERIOD,LEN / raid:BASE,PEAK,AT,DECAY）",
+    ),
+    duration: float = typer.Option(30.0, "--duration", "-d", help="負荷を投入する秒数"),
+    drain: float = typer.Option(30.0, "--drain", help="投入後にキューが捌けるまで待つ最大秒数"),
+    llm_ms: float = typer.Option(800.0, "--llm-ms", help="スタブOpenClawの平均応答時間（ms）"),
+    llm_jitter_ms: float = typer.Option(200.0, "--llm-jitter-ms", help="スタブOpenClawの揺らぎ（±ms）"),
+    tts_ms: float = typer.Option(200.0, "--tts-ms", help="スタブTTSの基本応答時間（ms）"),
+    tts_per_char_ms: float = typer.Option(5.0, "--tts-per-char-ms", help="スタブTTSの1文字あたりの時間（ms）"),
+    error_rate: float = typer.Option(0.0, "--error-rate", help="スタブがエラーを返す確率（0〜1）"),
+    queue_size: int = typer.Option(50, "--queue-size", help="通常入力キューの上限"),
+    authors: int = typer.Option(500, "--authors", help="合成コメントの投稿者数"),
+    superchat_ratio: float = typer.Option(0.02, "--superchat-ratio", help="スパチャ/Bitsの割合"),
+    seed: Optional[int] = typer.Option(None, "--seed", help="乱数シード（再現用）"),
+    json_path: Optional[Path] = typer.Option(None, "--json", help="結果をJSONで保存"),
+):
+    """ライブモードの負荷試験 — スタブのOpenClaw/TTSに対して合成コメントを投入"""
+    import json
+    import tempfile
+
+    from .bench import (
+        BenchConfig,
+        ChatProfile,
+        StubLatency,
+        bench_live_config,
+        parse_arrivals,
+        run_benchmark,
+    )
+
+    try:
+        arrival_process = parse_arrivals(arrivals)
+    except ValueError as e:
+        console.print(f"[red]Error: {e}[/red]")
+        raise typer.Exit(1)
+
+    async def _bench():
+        with tempfile.TemporaryDirectory(prefix="lobby-bench-") as tmp:
+            live_config = bench_live_config(Path(tmp))
+            live_config.max_queue_size = queue_size
+            config = BenchConfig(
+                arrivals=arrival_process,
+                duration_sec=duration,
+                drain_sec=drain,
+                llm_latency=StubLatency(mean_ms=llm_ms, jitter_ms=llm_jitter_ms, error_rate=error_rate, seed=seed),
+                tts_latency=StubLatency(mean_ms=tts_ms, per_char_ms=tts_per_char_ms, error_rate=error_rate, seed=seed),
+                profile=ChatProfile(authors=authors, superchat_ratio=superchat_ratio),
+                live=live_config,
+                seed=seed,
+            )
+            return await run_benchmark(config)
+
+    console.print(f"[cyan]Running live benchmark: {arrivals} for {duration:.0f}s[/cyan]")
+    report = asyncio.run(_bench())
+    console.print(report.format_text(), markup=False)
+
+    if json_path:
+        json_path.parent.mkdir(parents=True, exist_ok=True)
+        json_path.write_text(json.dumps(report.to_dict(), ensure_ascii=False, indent=2), encoding="utf-8")
+        console.print(f"[green]Saved: {json_path}[/green]")
+
+
+@app.command()
+def replay_live(
+    session_path: Path = typer.Argument(..., help="記録済みセッション（JSONL）"),
+    speed: float = typer.Option(10.0, "--speed", "-s", help="倍速（1〜50）"),
+    recorded_latency: bool = typer.Option(
+        True,
+        "--recorded-latency/--stub-latency",
+        help="記録されたOpenClaw/TTSの所要時間を再現する",
+    ),
+    llm_ms: float = typer.Option(800.0, "--llm-ms", help="記録がない場合のスタブOpenClaw応答時間（ms）"),
+    tts_ms: float = typer.Option(200.0, "--tts-ms", help="記録がない場合のスタブTTS応答時間（ms）"),
+    queue_size: int = typer.Option(50, "--queue-size", help="通常入力キューの上限"),
+    drain: float = typer.Option(30.0, "--drain", help="投入後にキューが捌けるまで待つ最大秒数"),
+    json_path: Optional[Path] = typer.Option(None, "--json", help="結果をJSONで保存"),
+):
+    """記録したライブセッションをスタブに対して加速リプレイ"""
+    import json
+    import tempfile
+
+    from .bench import StubLatency, bench_live_config
+    from .bench.replay import SessionReplayer, load_session
+
+    if not session_path.exists():
+        console.print(f"[red]Error: Session not found: {session_path}[/red]")
+        raise typer.Exit(1)
+    if not 0 < speed <= 50:
+        console.print("[red]Error: --speed must be between 0 and 50[/red]")
+        raise typer.Exit(1)
+
+    try:
+        session = load_session(session_path)
+    except ValueError as e:
+        console.print(f"[red]Error: {e}[/red]")
+        raise typer.Exit(1)
+
+    async def _replay():
+        with tempfile.TemporaryDirectory(prefix="lobby-replay-") as tmp:
+            live_config = bench_live_config(Path(tmp))
+            live_config.max_queue_size = queue_size
+            replayer = SessionReplayer(
+                session,
+                speed=speed,
+                recorded_latency=recorded_latency,
+                llm_latency=StubLatency(mean_ms=llm_ms),
+                tts_latency=StubLatency(mean_ms=tts_ms),
+            )
+            return await replayer.run(live_config, drain_sec=drain)
+
+    console.print(
+        f"[cyan]Replaying {len(session.inputs)} inputs ({session.duration_sec:.0f}s) at {speed:g}x[/cyan]"
+    )
+    report = asyncio.run(_replay())
+    console.print(report.format_text(), markup=False)
+
+    if json_path:
+        json_path.parent.mkdir(parents=True, exist_ok=True)
+        json_path.write_text(json.dumps(report.to_dict(), ensure_ascii=False, indent=2), encoding="utf-8")
+        console.print(f"[green]Saved: {json_path}[/green]")
+
+
 @app.command()
 def version():
     """バージョン表示"""
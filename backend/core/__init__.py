@@ -18,13 +18,24 @@ from .avatar import (
     LipsyncConfig,
     MouthShape,
 )
+from .circuit_breaker import CircuitBreaker, CircuitBreakerConfig, CircuitOpenError
 from .clip import (
     ClipConfig,
     ClipExtractor,
     ClipManager,
     ClipResult,
 )
-from .emotion import Emotion, EmotionAnalyzer, EmotionResult
+from .coalescer import CoalescerConfig, CommentCoalescer, normalize_comment
+from .conversation import ConversationHistory, PromptStats, estimate_tokens
+from .emotion import (
+    Emotion,
+    EmotionAnalyzer,
+    EmotionResult,
+    EmotionUpdate,
+    IncrementalEmotionAnalyzer,
+    IncrementalEmotionConfig,
+)
+from .gateway_pool import GatewayPool, GatewayRoutingConfig
 from .highlight import (
     Highlight,
     HighlightConfig,
@@ -32,6 +43,8 @@ from .highlight import (
     HighlightEnabledRecorder,
     HighlightType,
 )
+from .http_pool import HttpClientPool, HttpPoolConfig, get_http_pool
+from .keyword_matcher import KeywordMatcher, compile_keywords
 from .live2d import (
     Live2DConfig,
     Live2DExpression,
@@ -75,6 +88,7 @@ from .thumbnail import (
     ThumbnailSize,
 )
 from .tts import TTSClient, TTSConfig
+from .tts_pool import TTSEndpointPool
 from .video import VideoComposer, VideoConfig, get_audio_duration_ms
 from .vrm import (
     EMOTION_TO_VRM_EXPRESSION,
@@ -123,10 +137,19 @@ __all__ = [
     # TTS
     "TTSClient",
     "TTSConfig",
+    "TTSEndpointPool",
+    "CircuitBreaker",
+    "CircuitBreakerConfig",
+    "CircuitOpenError",
     # Emotion
     "EmotionAnalyzer",
     "EmotionResult",
     "Emotion",
+    "EmotionUpdate",
+    "IncrementalEmotionAnalyzer",
+    "IncrementalEmotionConfig",
+    "KeywordMatcher",
+    "compile_keywords",
     # Avatar (PNG)
     "MouthShape",
     "Expression",
@@ -208,6 +231,21 @@ __all__ = [
     "ClipExtractor",
     "ClipManager",
     "ClipResult",
+    # Comment Coalescing
+    "CoalescerConfig",
+    "CommentCoalescer",
+    "normalize_comment",
+    # OpenClaw Gateway Routing
+    "GatewayPool",
+    "GatewayRoutingConfig",
+    # Shared HTTP Clients
+    "HttpClientPool",
+    "HttpPoolConfig",
+    "get_http_pool",
+    # Conversation History
+    "ConversationHistory",
+    "PromptStats",
+    "estimate_tokens",
     # Thumbnail Generation
     "FrameQuality",
     "ThumbnailConfig",
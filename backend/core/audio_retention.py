@@ -0,0 +1,242 @@
+"""Audio Retention - ライブ音声出力のローテーション
+
+長時間配信で ``audio_output_dir`` が無制限に増え続けないよう、
+応答音声を時間単位のサブディレクトリに振り分け、
+容量上限・保持期間を超えた古いファイルをバックグラウンドで削除する。
+
+字幕履歴やWebSocket送信待ちなど、まだ参照されているファイルは削除しない。
+"""
+
+import asyncio
+import time
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+
+from loguru import logger
+
+from .executor import run_io
+
+
+@dataclass
+class AudioRetentionConfig:
+    """音声ローテーション設定"""
+    enabled: bool = True
+    max_bytes: int = 2 * 1024 * 1024 * 1024  # 合計サイズ上限（2GB）
+    max_age_sec: float = 6 * 3600            # 保持期間
+    bucket_format: str = "%Y%m%d_%H"         # サブディレクトリ名（1時間単位）
+    sweep_interval_sec: float = 60.0         # 削除チェック間隔
+    pattern: str = "*.mp3"                   # 管理対象ファイル
+
+
+@dataclass
+class _TrackedFile:
+    size: int
+    created_at: float  # time.time()基準
+
+
+class AudioRetentionManager:
+    """音声ファイルの容量・期間管理
+
+    ``path_for()`` で出力先を決め、書き込み完了後に ``register()`` する。
+    参照中のファイルは ``pin()`` / ``unpin()`` または ``add_pin_source()`` で保護する。
+    """
+
+    def __init__(self, root: Path, config: Optional[AudioRetentionConfig] = None):
+        self.root = root
+        self.config = config or AudioRetentionConfig()
+        self._files: OrderedDict[Path, _TrackedFile] = OrderedDict()  # 古い順
+        self._total_bytes = 0
+        self._pins: Counter[Path] = Counter()
+        self._pin_sources: list[Callable[[], Iterable[Path]]] = []
+        self._task: Optional[asyncio.Task] = None
+        self._scanned = False
+        self.deleted = 0
+        self.deleted_bytes = 0
+
+    def path_for(self, prefix: str, suffix: str = ".mp3", now: Optional[datetime] = None) -> Path:
+        """新しい出力ファイルのパス（時間単位のサブディレクトリ配下）"""
+        now = now or datetime.now()
+        bucket = self.root / now.strftime(self.config.bucket_format)
+        return bucket / f"{prefix}_{now.strftime('%Y%m%d_%H%M%S_%f')}{suffix}"
+
+    def register(self, path: Path, size: int, created_at: Optional[float] = None):
+        """書き込み済みファイルを管理対象に追加"""
+        existing = self._files.pop(path, None)
+        if existing is not None:
+            self._total_bytes -= existing.size
+        if created_at is None:
+            created_at = time.time()
+        self._files[path] = _TrackedFile(size=size, created_at=created_at)
+        self._total_bytes += size
+
+    def pin(self, path: Optional[Path]):
+        """参照中として削除対象から外す（unpinと対で呼ぶ）"""
+        if path is not None:
+            self._pins[path] += 1
+
+    def unpin(self, path: Optional[Path]):
+        """pinを解除"""
+        if path is None or path not in self._pins:
+            return
+        self._pins[path] -= 1
+        if self._pins[path] <= 0:
+            del self._pins[path]
+
+    def add_pin_source(self, source: Callable[[], Iterable[Path]]):
+        """参照中のパスを返す関数を登録（字幕履歴など）"""
+        self._pin_sources.append(source)
+
+    def _pinned(self) -> set[Path]:
+        pinned = set(self._pins)
+        for source in self._pin_sources:
+            try:
+                pinned.update(source())
+            except Exception as e:
+                logger.warning(f"Audio pin source failed: {e}")
+        return pinned
+
+    async def scan(self):
+        """既存ファイルを管理対象に取り込む（前回配信の残りなど）
+
+        ``root`` 直下の時間バケットのみ対象（filler/ や cache/ は含めない）。
+        ディレクトリの走査だけをスレッドで行い、管理対象への反映はイベントループ上で行う
+        （走査中に ``register()`` されたファイルと競合しないように）。
+        """
+        found = await run_io(self._walk)
+
+        for path, size, mtime in sorted(found, key=lambda item: item[2]):
+            if path not in self._files:
+                self.register(path, size, created_at=mtime)
+        # 時系列順に並べ直す
+        self._files = OrderedDict(sorted(self._files.items(), key=lambda kv: kv[1].created_at))
+        self._scanned = True
+        logger.debug(f"Audio retention scan: {len(self._files)} files, {self._total_bytes} bytes")
+
+    def _walk(self) -> list[tuple[Path, int, float]]:
+        """時間バケット内のファイルを列挙（スレッドで実行、管理対象には触れない）"""
+        found = []
+        if not self.root.exists():
+            return found
+        for bucket in self.root.iterdir():
+            if not bucket.is_dir() or not self._is_bucket(bucket.name):
+                continue
+            for path in bucket.glob(self.config.pattern):
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                found.append((path, stat.st_size, stat.st_mtime))
+        return found
+
+    def _is_bucket(self, name: str) -> bool:
+        try:
+            datetime.strptime(name, self.config.bucket_format)
+        except ValueError:
+            return False
+        return True
+
+    def select_expired(self, now: Optional[float] = None) -> list[Path]:
+        """削除対象を古い順に選び、管理対象から外す
+
+        保持期間切れのファイルと、容量上限を超えた分の古いファイルを返す。
+        pin中のファイルはスキップする。
+        """
+        now = time.time() if now is None else now
+        pinned = self._pinned()
+        total = self._total_bytes
+        victims = []
+
+        for path, tracked in self._files.items():
+            expired = now - tracked.created_at > self.config.max_age_sec
+            over_budget = total > self.config.max_bytes
+            if not expired and not over_budget:
+                break
+            if path in pinned:
+                continue
+            victims.append(path)
+            total -= tracked.size
+
+        for path in victims:
+            self._total_bytes -= self._files.pop(path).size
+        return victims
+
+    async def sweep(self, now: Optional[float] = None) -> list[Path]:
+        """期限切れ・容量超過のファイルを削除（削除はスレッドで実行）"""
+        if not self._scanned:
+            await self.scan()
+
+        victims = self.select_expired(now)
+        if victims:
+            removed_bytes = await run_io(_delete_files, victims)
+            self.deleted += len(victims)
+            self.deleted_bytes += removed_bytes
+            logger.info(f"Audio retention: deleted {len(victims)} files ({removed_bytes} bytes)")
+        return victims
+
+    async def _sweep_loop(self):
+        while True:
+            try:
+                await self.sweep()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Audio retention sweep failed: {e}")
+            await asyncio.sleep(self.config.sweep_interval_sec)
+
+    def start(self):
+        """バックグラウンド削除を開始"""
+        if self.config.enabled and self._task is None:
+            self._task = asyncio.create_task(self._sweep_loop())
+
+    async def stop(self):
+        """バックグラウンド削除を停止"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "files": len(self._files),
+            "total_bytes": self._total_bytes,
+            "max_bytes": self.config.max_bytes,
+            "pinned": len(self._pins),
+            "deleted": self.deleted,
+            "deleted_bytes": self.deleted_bytes,
+        }
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+
+def _delete_files(paths: list[Path]) -> int:
+    """ファイル削除 + 空になったバケットの削除（スレッドで実行）"""
+    removed = 0
+    buckets = set()
+    for path in paths:
+        try:
+            removed += path.stat().st_size
+            path.unlink()
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Failed to delete {path}: {e}")
+        buckets.add(path.parent)
+
+    for bucket in buckets:
+        try:
+            bucket.rmdir()  # 空の場合のみ成功
+        except OSError:
+            pass
+    return removed
@@ -0,0 +1,157 @@
+"""Audio Blob Store - ライブ出力音声のメモリ内ストア
+
+ライブ応答の音声を1件ずつmp3ファイルに書き出す代わりに、
+サイズ上限付きのLRUストアにbytesのまま保持する。
+WebSocketのバイナリフレームやHTTP（Range対応）で直接配信できる。
+"""
+
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Optional
+
+from loguru import logger
+
+
+@dataclass
+class AudioBlob:
+    """保持中の音声データ"""
+    id: str
+    data: bytes
+    media_type: str = "audio/mpeg"
+    created_at: float = field(default_factory=time.time)
+
+    @property
+    def size(self) -> int:
+        return len(self.data)
+
+
+class AudioBlobStore:
+    """サイズ上限付きの音声ストア（LRU）
+
+    合計サイズが ``max_bytes`` を超えると、最も長く参照されていないものから破棄する。
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._blobs: OrderedDict[str, AudioBlob] = OrderedDict()
+        self._total_bytes = 0
+        self.evicted = 0
+
+    def put(
+        self,
+        data: bytes,
+        media_type: str = "audio/mpeg",
+        blob_id: Optional[str] = None,
+    ) -> str:
+        """音声を登録
+
+        Args:
+            data: 音声データ
+            media_type: MIMEタイプ
+            blob_id: 固定ID（キャッシュ済み音声など、同じIDは上書き）
+
+        Returns:
+            blob ID
+        """
+        blob_id = blob_id or uuid.uuid4().hex
+        existing = self._blobs.pop(blob_id, None)
+        if existing is not None:
+            self._total_bytes -= existing.size
+
+        blob = AudioBlob(id=blob_id, data=data, media_type=media_type)
+        self._blobs[blob_id] = blob
+        self._total_bytes += blob.size
+        self._evict()
+        return blob_id
+
+    def get(self, blob_id: str) -> Optional[AudioBlob]:
+        """音声を取得（参照順を更新）"""
+        blob = self._blobs.get(blob_id)
+        if blob is not None:
+            self._blobs.move_to_end(blob_id)
+        return blob
+
+    def remove(self, blob_id: str) -> bool:
+        """音声を削除"""
+        blob = self._blobs.pop(blob_id, None)
+        if blob is None:
+            return False
+        self._total_bytes -= blob.size
+        return True
+
+    def clear(self):
+        """全削除"""
+        self._blobs.clear()
+        self._total_bytes = 0
+
+    def _evict(self):
+        """上限を超えた分を古い順に破棄（最新の1件は残す）"""
+        while self._total_bytes > self.max_bytes and len(self._blobs) > 1:
+            _, blob = self._blobs.popitem(last=False)
+            self._total_bytes -= blob.size
+            self.evicted += 1
+            logger.debug(f"Audio blob evicted: {blob.id} ({blob.size} bytes)")
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "blobs": len(self._blobs),
+            "total_bytes": self._total_bytes,
+            "max_bytes": self.max_bytes,
+            "evicted": self.evicted,
+        }
+
+    def __contains__(self, blob_id: str) -> bool:
+        return blob_id in self._blobs
+
+    def __len__(self) -> int:
+        return len(self._blobs)
+
+
+def audio_media_type(data: bytes) -> str:
+    """音声データのMIMEタイプ（WAVヘッダーがあれば audio/wav、それ以外は audio/mpeg）"""
+    if data[:4] == b"RIFF" and data[8:12] == b"WAVE":
+        return "audio/wav"
+    return "audio/mpeg"
+
+
+def parse_range_header(range_header: str, size: int) -> Optional[tuple[int, int]]:
+    """HTTP Rangeヘッダーを解釈（単一範囲のみ対応）
+
+    Args:
+        range_header: "bytes=0-1023" 形式
+        size: 全体サイズ
+
+    Returns:
+        (start, end) 両端含む。範囲外/不正な場合はNone
+    """
+    if not range_header.startswith("bytes=") or size <= 0:
+        return None
+
+    spec = range_header[len("bytes="):].split(",")[0].strip()
+    start_str, _, end_str = spec.partition("-")
+
+    try:
+        if start_str == "":
+            # 末尾から N バイト
+            length = int(end_str)
+            if length <= 0:
+                return None
+            start = max(0, size - length)
+            end = size - 1
+        else:
+            start = int(start_str)
+            end = int(end_str) if end_str else size - 1
+    except ValueError:
+        return None
+
+    end = min(end, size - 1)
+    if start > end or start >= size:
+        return None
+    return start, end
@@ -0,0 +1,126 @@
+"""Circuit Breaker - 応答しない接続先を素早く切り離す
+
+- CLOSED: 通常。連続失敗（遅すぎる応答も失敗として数える）が ``failure_threshold`` に達したらOPEN
+- OPEN: リクエストを送らない（呼び出し側はすぐフォールバックに切り替える）。``open_sec`` 後にHALF_OPEN
+- HALF_OPEN: 試しに ``half_open_max_calls`` 件だけ送り、成功すればCLOSED、失敗すればOPENに戻す
+
+TTSサーバーごとの状態管理（``tts_pool``）で使う。
+"""
+
+import time
+from dataclasses import dataclass
+from enum import Enum
+from typing import Optional
+
+from loguru import logger
+
+
+class CircuitState(str, Enum):
+    """ブレーカーの状態"""
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(RuntimeError):
+    """ブレーカーが開いていて送れる接続先がない"""
+
+
+@dataclass
+class CircuitBreakerConfig:
+    """サーキットブレーカー設定"""
+    failure_threshold: int = 3      # 連続でこの回数失敗したら開く
+    slow_call_ms: float = 0.0       # これより遅い応答も失敗として数える（0で無効）
+    open_sec: float = 30.0          # 開いている時間（過ぎたら試しに送る）
+    half_open_max_calls: int = 1    # 半開状態で同時に送る試行リクエスト数
+
+
+class CircuitBreaker:
+    """1つの接続先のサーキットブレーカー
+
+    Args:
+        name: ログ用の名前（URLなど）
+        config: ブレーカー設定
+    """
+
+    def __init__(self, name: str, config: Optional[CircuitBreakerConfig] = None):
+        self.name = name
+        self.config = config or CircuitBreakerConfig()
+        self._state = CircuitState.CLOSED
+        self._opened_at = 0.0
+        self._half_open_calls = 0
+        self.consecutive_failures = 0
+        self.opens = 0
+        self.slow_calls = 0
+
+    def state_at(self, now: float) -> CircuitState:
+        if self._state is CircuitState.OPEN and now - self._opened_at >= self.config.open_sec:
+            return CircuitState.HALF_OPEN
+        return self._state
+
+    @property
+    def state(self) -> CircuitState:
+        return self.state_at(time.monotonic())
+
+    def allows(self, now: Optional[float] = None) -> bool:
+        """リクエストを送れるか（状態は変えない）"""
+        state = self.state_at(time.monotonic() if now is None else now)
+        if state is CircuitState.CLOSED:
+            return True
+        if state is CircuitState.HALF_OPEN:
+            return self._half_open_calls < self.config.half_open_max_calls
+        return False
+
+    def on_request(self, now: Optional[float] = None):
+        """リクエストを送る直前に呼ぶ（半開状態では試行として数える）"""
+        if self.state_at(time.monotonic() if now is None else now) is CircuitState.HALF_OPEN:
+            self._state = CircuitState.HALF_OPEN
+            self._half_open_calls += 1
+
+    def record_success(self, latency_ms: Optional[float] = None):
+        if self.config.slow_call_ms > 0 and latency_ms is not None and latency_ms > self.config.slow_call_ms:
+            # 応答はあったが遅すぎる → 失敗と同じ扱い
+            self.slow_calls += 1
+            self.record_failure()
+            return
+        if self._state is not CircuitState.CLOSED:
+            logger.info(f"Circuit closed: {self.name}")
+        self._state = CircuitState.CLOSED
+        self._half_open_calls = 0
+        self.consecutive_failures = 0
+
+    def record_failure(self):
+        self.consecutive_failures += 1
+        state = self.state
+        if state is CircuitState.HALF_OPEN or (
+            state is CircuitState.CLOSED and self.consecutive_failures >= self.config.failure_threshold
+        ):
+            self.trip()
+
+    def record_cancelled(self):
+        """試行リクエストがキャンセルされた（結果なし）"""
+        if self._state is CircuitState.HALF_OPEN and self._half_open_calls > 0:
+            self._half_open_calls -= 1
+
+    def trip(self):
+        """ブレーカーを開く"""
+        if self.state is not CircuitState.OPEN:
+            self.opens += 1
+            logger.warning(f"Circuit opened for {self.config.open_sec:.0f}s: {self.name}")
+        self._state = CircuitState.OPEN
+        self._opened_at = time.monotonic()
+        self._half_open_calls = 0
+
+    def half_open(self):
+        """開いているブレーカーをすぐ試行可能にする（ヘルスチェック成功時）"""
+        if self._state is CircuitState.OPEN:
+            self._state = CircuitState.HALF_OPEN
+            self._half_open_calls = 0
+
+    def to_dict(self) -> dict:
+        return {
+            "state": self.state.value,
+            "consecutive_failures": self.consecutive_failures,
+            "opens": self.opens,
+            "slow_calls": self.slow_calls,
+        }
@@ -0,0 +1,218 @@
+"""Comment Coalescer - 重複コメントの集約
+
+チャットが荒れた時（「草」連投、コピペ、挨拶ラッシュなど）に
+同じ内容のコメントをキュー投入前に1件へまとめる。
+
+- 全角/半角・大文字小文字の統一、連続文字の圧縮、エモートの除去で正規化
+- 正規化テキストのハッシュで完全一致を判定
+- 長文（コピペ）は文字n-gramのシングル集合（Jaccard係数）で近似一致を判定
+"""
+
+import re
+import time
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Iterable, Optional
+
+from loguru import logger
+
+# YouTubeカスタム絵文字 (:_lobbyWave: など)
+_SHORTCODE_PATTERN = re.compile(r":[\w\-]+:")
+# 同じ文字の連続 (草草草, wwww, ーーー)
+_REPEAT_PATTERN = re.compile(r"(.)\1+")
+# 記号・空白（正規化キーから除外）
+_NON_WORD_PATTERN = re.compile(r"[\W_]+")
+
+
+def normalize_comment(text: str, emotes: Iterable[str] = ()) -> str:
+    """コメントを比較用に正規化
+
+    Args:
+        text: コメント本文
+        emotes: 除去するエモート名（Twitchエモートなど）
+
+    Returns:
+        正規化済みテキスト（比較キー）
+    """
+    # 全角/半角の統一（ＡＢＣ→ABC, ｶﾀｶﾅ→カタカナ）
+    normalized = unicodedata.normalize("NFKC", text)
+
+    for emote in emotes:
+        if emote:
+            normalized = normalized.replace(emote, " ")
+    normalized = _SHORTCODE_PATTERN.sub(" ", normalized)
+    normalized = normalized.lower()
+
+    # 記号を除いたキー。記号/絵文字のみのコメントはそのまま比較する
+    key = _NON_WORD_PATTERN.sub("", normalized)
+    if not key:
+        key = "".join(normalized.split())
+
+    return _REPEAT_PATTERN.sub(r"\1", key)
+
+
+def _shingles(text: str, size: int) -> frozenset[str]:
+    """文字n-gramのシングル集合"""
+    if len(text) <= size:
+        return frozenset([text])
+    return frozenset(text[i:i + size] for i in range(len(text) - size + 1))
+
+
+def _jaccard(a: frozenset[str], b: frozenset[str]) -> float:
+    """Jaccard係数"""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+@dataclass
+class CoalescerConfig:
+    """重複集約設定"""
+    enabled: bool = True
+    window_sec: float = 10.0        # 最後の重複からこの秒数以内なら集約
+    max_entries: int = 512          # 追跡するキーの最大数
+    max_authors: int = 20           # metadataに記録する投稿者の最大数
+
+    # コピペ（近似一致）判定
+    similarity_threshold: float = 0.8  # Jaccard係数の閾値
+    shingle_size: int = 3
+    shingle_min_length: int = 12       # この長さ以上の正規化テキストのみ近似判定
+    max_similarity_candidates: int = 32  # 近似判定で比較する直近エントリ数
+
+
+@dataclass
+class _Entry:
+    """追跡中の集約先"""
+    target: Any  # LiveInput
+    last_seen: float
+    shingles: Optional[frozenset[str]] = None
+
+
+@dataclass
+class CoalescerStats:
+    """集約統計"""
+    offered: int = 0
+    coalesced: int = 0
+
+    def to_dict(self) -> dict:
+        return {"offered": self.offered, "coalesced": self.coalesced}
+
+
+class CommentCoalescer:
+    """取り込み時の重複コメント集約器
+
+    キュー投入済みの入力を正規化キーで追跡し、
+    スライディングウィンドウ内に届いた重複を既存の入力へ集約する。
+    集約先の ``metadata`` には ``coalesced_count`` と ``coalesced_authors`` が記録される。
+
+    使用例:
+    ```python
+    coalescer = CommentCoalescer()
+    if not coalescer.offer(live_input):
+        queue.append(live_input)  # 新規コメント
+    ...
+    coalescer.release(queue.popleft())  # 処理開始時に追跡解除
+    ```
+    """
+
+    def __init__(self, config: Optional[CoalescerConfig] = None):
+        self.config = config or CoalescerConfig()
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._keys_by_target: dict[int, str] = {}
+        self.stats = CoalescerStats()
+
+    def offer(self, item: Any, now: Optional[float] = None) -> bool:
+        """入力を集約器に渡す
+
+        Args:
+            item: LiveInput（text, author, metadata を持つオブジェクト）
+            now: 現在時刻（time.monotonic基準、テスト用）
+
+        Returns:
+            True: 既存の入力へ集約された（キューに追加しない）
+            False: 新規入力として追跡開始（呼び出し側でキューに追加する）
+        """
+        if not self.config.enabled:
+            return False
+
+        now = time.monotonic() if now is None else now
+        self.stats.offered += 1
+        self._expire(now)
+
+        key = normalize_comment(item.text, item.metadata.get("emotes", ()))
+        if not key:
+            return False
+
+        entry = self._entries.get(key)
+        shingles = None
+        if entry is None and len(key) >= self.config.shingle_min_length:
+            shingles = _shingles(key, self.config.shingle_size)
+            entry = self._find_similar(shingles)
+
+        if entry is not None:
+            self._merge(entry.target, item)
+            entry.last_seen = now
+            self._entries.move_to_end(self._keys_by_target[id(entry.target)])
+            self.stats.coalesced += 1
+            return True
+
+        self._entries[key] = _Entry(target=item, last_seen=now, shingles=shingles)
+        self._keys_by_target[id(item)] = key
+        while len(self._entries) > self.config.max_entries:
+            _, oldest = self._entries.popitem(last=False)
+            self._keys_by_target.pop(id(oldest.target), None)
+        return False
+
+    def release(self, item: Any):
+        """入力の追跡を解除（キューから取り出された/破棄された時）"""
+        key = self._keys_by_target.pop(id(item), None)
+        if key is not None:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """全追跡を解除"""
+        self._entries.clear()
+        self._keys_by_target.clear()
+
+    def _expire(self, now: float):
+        """ウィンドウ外のエントリを削除（last_seen順なので先頭から）"""
+        cutoff = now - self.config.window_sec
+        while self._entries:
+            key, entry = next(iter(self._entries.items()))
+            if entry.last_seen >= cutoff:
+                break
+            self._entries.popitem(last=False)
+            self._keys_by_target.pop(id(entry.target), None)
+
+    def _find_similar(self, shingles: frozenset[str]) -> Optional[_Entry]:
+        """直近のエントリから近似一致を探す"""
+        checked = 0
+        for entry in reversed(self._entries.values()):
+            if checked >= self.config.max_similarity_candidates:
+                break
+            if entry.shingles is None:
+                continue
+            checked += 1
+            if _jaccard(shingles, entry.shingles) >= self.config.similarity_threshold:
+                return entry
+        return None
+
+    def _merge(self, target: Any, item: Any):
+        """重複を集約先のmetadataに記録"""
+        metadata = target.metadata
+        if "coalesced_count" not in metadata:
+            metadata["coalesced_count"] = 1
+            metadata["coalesced_authors"] = [target.author]
+        metadata["coalesced_count"] += 1
+
+        authors = metadata["coalesced_authors"]
+        if item.author not in authors and len(authors) < self.config.max_authors:
+            authors.append(item.author)
+
+        logger.debug(
+            f"Coalesced: {item.text[:30]} (x{metadata['coalesced_count']})"
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -7,6 +7,7 @@ import yaml
 from loguru import logger
 
 from .avatar import AvatarParts, LipsyncConfig
+from .http_pool import HttpPoolConfig
 from .pipeline import BGMConfig, PipelineConfig, SubtitleConfig
 from .tts import TTSConfig
 from .video import VideoConfig
@@ -36,18 +37,40 @@ def load_config(path: Optional[Path] = None) -> dict:
 
 
 def build_tts_config(data: dict) -> TTSConfig:
-    """設定辞書からTTSConfig を生成"""
+    """設定辞書からTTSConfig を生成（``tts.fallbacks`` は同じ形式のTTS設定のリスト）"""
     tts = data.get("tts", {})
+    defaults = TTSConfig()
     return TTSConfig(
         provider=tts.get("provider", "miotts"),
         base_url=tts.get("base_url", "http://localhost:8001"),
+        endpoints=list(tts.get("endpoints") or []),
         voice=tts.get("voice", "lobby"),
         model=tts.get("model", ""),
         response_format=tts.get("response_format", "base64"),
+        binary_transport=tts.get("binary_transport", True),
+        request_timeout=tts.get("request_timeout", defaults.request_timeout),
+        live_timeout=tts.get("live_timeout", defaults.live_timeout),
+        max_failures=tts.get("max_failures", defaults.max_failures),
+        eject_sec=tts.get("eject_sec", defaults.eject_sec),
+        slow_call_ms=tts.get("slow_call_ms", defaults.slow_call_ms),
+        fallbacks=[build_tts_config({"tts": fallback}) for fallback in tts.get("fallbacks") or []],
         emotion_prompts=tts.get("emotion_prompts"),
     )
 
 
+def build_http_pool_config(data: dict) -> HttpPoolConfig:
+    """設定辞書から共有HTTPクライアント設定を生成"""
+    http = data.get("http", {})
+    defaults = HttpPoolConfig()
+    return HttpPoolConfig(
+        max_connections=http.get("max_connections", defaults.max_connections),
+        max_keepalive_connections=http.get("max_keepalive_connections", defaults.max_keepalive_connections),
+        keepalive_expiry=http.get("keepalive_expiry", defaults.keepalive_expiry),
+        connect_timeout=http.get("connect_timeout", defaults.connect_timeout),
+        http2=http.get("http2", defaults.http2),
+    )
+
+
 def build_avatar_parts(data: dict) -> AvatarParts:
     """設定辞書からAvatarPartsを生成"""
     avatar = data.get("avatar", {})
@@ -0,0 +1,185 @@
+"""Conversation History - トークン予算つきの会話履歴
+
+OpenClawへ送る会話履歴をメッセージ数ではなくトークン数で管理する。
+
+- 履歴が ``token_budget`` を超えたら古いターンから取り除き、``compact_ratio`` まで縮める
+- 取り除いたターンはバックグラウンドで要約し、実行中の要約（ローリングサマリー）に畳み込む
+- システムプロンプトは常に先頭・同一内容のまま送り、要約は別のsystemメッセージとして続ける
+
+トークン数はトークナイザーを使わない概算（日本語は1文字≒1トークン、英数字は4文字≒1トークン）。
+"""
+
+import math
+from collections import deque
+from dataclasses import dataclass
+from typing import Optional
+
+# 1メッセージあたりの役割・区切りのオーバーヘッド
+MESSAGE_OVERHEAD_TOKENS = 4
+
+SUMMARY_SYSTEM_PROMPT = (
+    "あなたは配信の会話ログの要約係です。"
+    "これまでの要約と新しい会話をまとめ、話題・リスナーの名前・約束したことを優先して残し、"
+    "{max_tokens}トークン以内の日本語の箇条書きで簡潔に要約してください。要約のみを出力してください。"
+)
+
+SUMMARY_MESSAGE_PREFIX = "これまでの会話の要約:\n"
+
+
+def estimate_tokens(text: str) -> int:
+    """テキストのトークン数を概算
+
+    CJK（かな・漢字・全角記号）は1文字1トークン、それ以外は4文字で1トークンとして数える。
+    """
+    wide = sum(1 for char in text if ord(char) >= 0x2E80)
+    return wide + math.ceil((len(text) - wide) / 4)
+
+
+def message_tokens(role: str, content: str) -> int:
+    """1メッセージのトークン数（オーバーヘッド込み）"""
+    return estimate_tokens(content) + MESSAGE_OVERHEAD_TOKENS
+
+
+@dataclass
+class _Turn:
+    role: str
+    content: str
+    tokens: int
+
+
+class ConversationHistory:
+    """トークン予算つきの会話履歴とローリングサマリー
+
+    Args:
+        token_budget: 履歴（要約を除く）の最大トークン数
+        compact_ratio: 予算超過時にこの割合まで縮める（毎ターン要約が走らないよう余裕を持たせる）
+        summary_max_tokens: 要約の最大トークン数
+    """
+
+    def __init__(self, token_budget: int = 1500, compact_ratio: float = 0.5, summary_max_tokens: int = 200):
+        self.token_budget = token_budget
+        self.compact_ratio = compact_ratio
+        self.summary_max_tokens = summary_max_tokens
+        self.summary = ""
+        self.generation = 0  # clear() ごとに増える（実行中の要約を破棄するため）
+        self._turns: deque[_Turn] = deque()
+        self._pending: list[_Turn] = []
+        self._tokens = 0
+
+    @property
+    def tokens(self) -> int:
+        """履歴（要約を除く）のトークン数"""
+        return self._tokens
+
+    @property
+    def summary_tokens(self) -> int:
+        return message_tokens("system", SUMMARY_MESSAGE_PREFIX + self.summary) if self.summary else 0
+
+    @property
+    def has_pending(self) -> bool:
+        """要約待ちのターンがあるか"""
+        return bool(self._pending)
+
+    def __len__(self) -> int:
+        return len(self._turns)
+
+    def add_turn(self, user: str, assistant: str) -> bool:
+        """1往復を追加し、予算を超えたら古いターンを要約待ちに移す
+
+        Returns:
+            要約待ちのターンがあるか
+        """
+        for role, content in (("user", user), ("assistant", assistant)):
+            turn = _Turn(role, content, message_tokens(role, content))
+            self._turns.append(turn)
+            self._tokens += turn.tokens
+
+        if self._tokens > self.token_budget:
+            target = int(self.token_budget * self.compact_ratio)
+            # user/assistantの組を崩さないよう2件ずつ取り除く（直近の1往復は残す）
+            while self._tokens > target and len(self._turns) > 2:
+                for _ in range(2):
+                    turn = self._turns.popleft()
+                    self._tokens -= turn.tokens
+                    self._pending.append(turn)
+        return self.has_pending
+
+    def take_pending(self) -> list[dict]:
+        """要約待ちのターンを取り出す"""
+        pending = [{"role": t.role, "content": t.content} for t in self._pending]
+        self._pending = []
+        return pending
+
+    def discard_pending(self) -> int:
+        """要約せずに捨てる（要約無効時・要約失敗時）"""
+        count = len(self._pending)
+        self._pending = []
+        return count
+
+    def set_summary(self, summary: str, generation: Optional[int] = None):
+        """要約を更新（``generation`` が古い場合は無視）"""
+        if generation is not None and generation != self.generation:
+            return
+        summary = summary.strip()
+        # モデルが長く返した場合も予算内に切り詰める
+        while summary and estimate_tokens(summary) > self.summary_max_tokens:
+            summary = summary[:int(len(summary) * 0.9)]
+        self.summary = summary
+
+    def summary_request(self, pending: list[dict]) -> list[dict]:
+        """要約リクエスト用のメッセージ"""
+        names = {"user": "リスナー", "assistant": "ロビィ"}
+        dialogue = "\n".join(f"{names.get(m['role'], m['role'])}: {m['content']}" for m in pending)
+        return [
+            {"role": "system", "content": SUMMARY_SYSTEM_PROMPT.format(max_tokens=self.summary_max_tokens)},
+            {"role": "user", "content": f"【これまでの要約】\n{self.summary or 'なし'}\n\n【新しい会話】\n{dialogue}"},
+        ]
+
+    def messages(self) -> list[dict]:
+        """要約（あれば）+ 履歴のメッセージ"""
+        messages = []
+        if self.summary:
+            messages.append({"role": "system", "content": SUMMARY_MESSAGE_PREFIX + self.summary})
+        messages.extend({"role": t.role, "content": t.content} for t in self._turns)
+        return messages
+
+    def clear(self):
+        """履歴・要約をクリア"""
+        self._turns.clear()
+        self._pending = []
+        self._tokens = 0
+        self.summary = ""
+        self.generation += 1
+
+
+class PromptStats:
+    """リクエストごとのプロンプトトークン数（直近 ``window`` 件）"""
+
+    def __init__(self, window: int = 200):
+        self.requests = 0
+        self.summaries = 0
+        self.summary_failures = 0
+        self.discarded_turns = 0
+        self.last_reported: Optional[int] = None
+        self._recent: deque[int] = deque(maxlen=window)
+
+    def record(self, estimated: int, reported: Optional[int] = None):
+        """1リクエスト分を記録（``reported`` はGatewayの usage.prompt_tokens）"""
+        self.requests += 1
+        self._recent.append(estimated)
+        if reported is not None:
+            self.last_reported = reported
+
+    def to_dict(self) -> dict:
+        recent = sorted(self._recent)
+        return {
+            "requests": self.requests,
+            "last": self._recent[-1] if self._recent else 0,
+            "mean": round(sum(recent) / len(recent), 1) if recent else 0.0,
+            "p95": recent[max(0, math.ceil(len(recent) * 0.95) - 1)] if recent else 0,
+            "max": recent[-1] if recent else 0,
+            "last_reported": self.last_reported,
+            "summaries": self.summaries,
+            "summary_failures": self.summary_failures,
+            "discarded_turns": self.discarded_turns,
+        }
@@ -3,7 +3,9 @@
 import re
 from dataclasses import dataclass
 from enum import Enum
-from typing import Optional
+from typing import AsyncIterator, Optional
+
+from .keyword_matcher import KeywordMatcher, compile_keywords
 
 
 class Emotion(str, Enum):
@@ -40,6 +42,15 @@ class EmotionAnalyzer:
         Emotion.SURPRISED: ["え？", "えっ", "びっくり", "驚", "!?", "？！", "😮", "😲"],
     }
 
+    def __init__(self):
+        # 全感情のキーワードを1つの照合器にまとめる（インデックス → 感情）
+        self._keyword_emotions: list[Emotion] = []
+        keywords: list[str] = []
+        for emotion, emotion_keywords in self.EMOTION_KEYWORDS.items():
+            keywords.extend(emotion_keywords)
+            self._keyword_emotions.extend([emotion] * len(emotion_keywords))
+        self._matcher: KeywordMatcher = compile_keywords(keywords)
+
     def analyze(self, text: str) -> EmotionResult:
         """テキストから感情を分析
 
@@ -66,18 +77,7 @@ class EmotionAnalyzer:
 
         # 2. キーワードベース分析
         raw_text = self.TAG_PATTERN.sub("", text)
-        scores: dict[Emotion, float] = {e: 0.0 for e in Emotion}
-
-        for emotion, keywords in self.EMOTION_KEYWORDS.items():
-            for keyword in keywords:
-                if keyword in text:
-                    scores[emotion] += 0.3
-
-        # 句読点パターン
-        if text.count("！") >= 2:
-            scores[Emotion.EXCITED] += 0.3
-        if text.count("...") >= 1:
-            scores[Emotion.SAD] += 0.2
+        scores = self.scores(text)
 
         # 最高スコアを見つける
         max_score = max(scores.values())
@@ -100,3 +100,187 @@ class EmotionAnalyzer:
             intensity=0.5,
             raw_text=raw_text,
         )
+
+    def scores(self, text: str) -> dict[Emotion, float]:
+        """キーワード・句読点による感情ごとのスコア（タグは見ない）"""
+        scores: dict[Emotion, float] = {e: 0.0 for e in Emotion}
+
+        for index in self._matcher.matches(text):
+            scores[self._keyword_emotions[index]] += 0.3
+
+        # 句読点パターン
+        if text.count("！") >= 2:
+            scores[Emotion.EXCITED] += 0.3
+        if text.count("...") >= 1:
+            scores[Emotion.SAD] += 0.2
+
+        return scores
+
+    def analyze_many(self, texts: list[str]) -> list[EmotionResult]:
+        """複数テキストをまとめて分析（プロセスプールへは1回で渡せる）"""
+        return [self.analyze(text) for text in texts]
+
+
+@dataclass
+class IncrementalEmotionConfig:
+    """ストリーミング感情分析の設定
+
+    文ごとのスコアを減衰させながら足し合わせ、表情が文ごとにちらつかないようにする。
+    """
+    decay: float = 0.5            # 1文ごとに前までのスコアに掛ける係数
+    enter_threshold: float = 0.3  # neutral から切り替えるのに必要なスコア
+    exit_threshold: float = 0.1   # これを下回ったら neutral に戻す
+    switch_margin: float = 0.2    # 別の感情へ切り替えるのに必要な現在の感情とのスコア差
+
+
+@dataclass
+class EmotionUpdate:
+    """文の区切りで表情が切り替わったことの通知"""
+    emotion: EmotionResult  # 切り替え後の感情（raw_text はきっかけになった文）
+    sentence_index: int     # 何文目か（0始まり）
+    offset: int             # 応答テキスト内での文の開始位置（文字数）
+
+    def to_dict(self) -> dict:
+        return {
+            "emotion": self.emotion.primary.value,
+            "intensity": self.emotion.intensity,
+            "secondary": self.emotion.secondary.value if self.emotion.secondary else None,
+            "sentence_index": self.sentence_index,
+            "offset": self.offset,
+            "text": self.emotion.raw_text,
+        }
+
+
+class IncrementalEmotionAnalyzer:
+    """ストリーミング中のテキストを文ごとに分析する感情分析器
+
+    ``OpenClawClient.chat_stream`` のトークン差分を ``feed`` に渡すと、文が閉じるたびに
+    その文だけを分析し、表情が切り替わったときに ``EmotionUpdate`` を返す。
+    応答全体を毎回分析し直さないため、Live2D/VRMの表情を応答の途中で切り替えられる。
+
+    Args:
+        analyzer: 文の分析に使う分析器（省略時は新規作成）
+        config: ヒステリシスの設定
+    """
+
+    # 文末（連続する記号と閉じ括弧はまとめて1つの区切り）
+    SENTENCE_END = re.compile(r"[。！？!?♪…\n]+[」』）)]*")
+
+    def __init__(
+        self,
+        analyzer: Optional[EmotionAnalyzer] = None,
+        config: Optional[IncrementalEmotionConfig] = None,
+    ):
+        self.analyzer = analyzer or EmotionAnalyzer()
+        self.config = config or IncrementalEmotionConfig()
+        self.reset()
+
+    def reset(self):
+        """次の応答の分析を始める"""
+        self._buffer = ""
+        self._scanned = 0         # _buffer 内で文末を探し終えた位置
+        self._offset = 0          # _buffer の先頭の応答テキスト内での位置
+        self._sentences = 0
+        self._running: dict[Emotion, float] = {e: 0.0 for e in Emotion}
+        self.current = EmotionResult(primary=Emotion.NEUTRAL, intensity=0.5)
+        self.updates: list[EmotionUpdate] = []
+
+    def feed(self, delta: str) -> list[EmotionUpdate]:
+        """トークン差分を追加し、閉じた文で表情が切り替わったら返す"""
+        self._buffer += delta
+        updates: list[EmotionUpdate] = []
+        while True:
+            match = self.SENTENCE_END.search(self._buffer, self._scanned)
+            if match is None:
+                self._scanned = len(self._buffer)
+                break
+            if match.end() == len(self._buffer):
+                # 「！」の後に「？」が続くかもしれないので次の差分を待つ
+                self._scanned = match.start()
+                break
+            self._consume(self._buffer[:match.end()], updates)
+            self._offset += match.end()
+            self._buffer = self._buffer[match.end():]
+            self._scanned = 0
+        return updates
+
+    def finish(self) -> list[EmotionUpdate]:
+        """ストリーム終了（残りのテキストを最後の文として分析）"""
+        updates: list[EmotionUpdate] = []
+        if self._buffer:
+            self._consume(self._buffer, updates)
+            self._offset += len(self._buffer)
+            self._buffer = ""
+            self._scanned = 0
+        return updates
+
+    def analyze_text(self, text: str) -> list[EmotionUpdate]:
+        """完成したテキストを文ごとに分析（``feed`` + ``finish``）"""
+        return self.feed(text) + self.finish()
+
+    async def track(self, deltas: AsyncIterator[str]) -> AsyncIterator[tuple[str, list[EmotionUpdate]]]:
+        """トークン差分のストリームをそのまま流しつつ表情の切り替えを添える
+
+        Yields:
+            (差分, その差分で閉じた文による切り替え)。ストリーム終了時は ("", 最後の文の切り替え)
+        """
+        async for delta in deltas:
+            yield delta, self.feed(delta)
+        updates = self.finish()
+        if updates:
+            yield "", updates
+
+    def _consume(self, sentence: str, updates: list[EmotionUpdate]):
+        """1文を分析して表情を更新"""
+        index = self._sentences
+        self._sentences += 1
+        if not sentence.strip():
+            return
+
+        config = self.config
+        current = self.current.primary
+        raw_text = self.analyzer.TAG_PATTERN.sub("", sentence)
+        tagged = self._tag(sentence)
+        scores = self.analyzer.scores(sentence) if tagged is None else {tagged: 0.8}
+        for emotion in self._running:
+            self._running[emotion] = self._running[emotion] * config.decay + scores.get(emotion, 0.0)
+        self._running[Emotion.NEUTRAL] = 0.0
+
+        ranked = sorted(self._running, key=lambda e: self._running[e], reverse=True)
+        leader = ranked[0]
+        if tagged is not None:
+            # 明示的なタグはすぐに切り替える
+            primary = tagged
+        elif current is Emotion.NEUTRAL:
+            primary = leader if self._running[leader] >= config.enter_threshold else Emotion.NEUTRAL
+        elif (
+            leader is not current
+            and self._running[leader] >= config.enter_threshold
+            and self._running[leader] >= self._running[current] + config.switch_margin
+        ):
+            primary = leader
+        elif self._running[current] < config.exit_threshold:
+            primary = Emotion.NEUTRAL
+        else:
+            primary = current
+
+        if primary is Emotion.NEUTRAL:
+            intensity = 0.5
+        else:
+            intensity = min(self._running[primary], 1.0)
+        secondary = next((e for e in ranked if e is not primary and self._running[e] > 0), None)
+        self.current = EmotionResult(primary=primary, intensity=intensity, secondary=secondary, raw_text=raw_text)
+        if primary is not current:
+            update = EmotionUpdate(emotion=self.current, sentence_index=index, offset=self._offset)
+            self.updates.append(update)
+            updates.append(update)
+
+    def _tag(self, sentence: str) -> Optional[Emotion]:
+        """文頭の感情タグ（[happy] など、無効なタグはNone）"""
+        match = self.analyzer.TAG_PATTERN.match(sentence.lstrip())
+        if match is None:
+            return None
+        try:
+            return Emotion(match.group(1).lower())
+        except ValueError:
+            return None
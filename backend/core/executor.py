@@ -0,0 +1,186 @@
+"""Blocking Executor - ブロッキング処理の実行プール
+
+ffmpeg + NumPy のリップシンク解析やファイル書き込みをイベントループ上で直接実行すると、
+その間すべてのWebSocket/HTTPハンドラが止まる。
+I/O処理はスレッドプール、CPU処理はプロセスプールで実行し、
+プールごとの待ち件数・待ち時間を記録する。
+
+使用例:
+```python
+from backend.core.executor import run_cpu, run_io
+
+frames = await run_cpu(analyzer.analyze_audio_bytes, audio)
+await run_io(path.write_bytes, audio)
+```
+"""
+
+import asyncio
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Any, Callable, Optional, TypeVar
+
+from loguru import logger
+
+T = TypeVar("T")
+
+
+@dataclass
+class ExecutorConfig:
+    """実行プール設定"""
+    io_workers: int = 8
+    cpu_workers: int = field(default_factory=lambda: max(1, min(4, (os.cpu_count() or 2) - 1)))
+    use_processes: bool = True  # Falseの場合はCPU処理もスレッドで実行（テスト/制限環境用）
+
+
+@dataclass
+class PoolStats:
+    """プールごとの統計"""
+    submitted: int = 0
+    completed: int = 0
+    failed: int = 0
+    pending: int = 0         # 投入済みで未完了（待ち + 実行中）
+    max_pending: int = 0
+    wait_ms: deque[float] = field(default_factory=lambda: deque(maxlen=200))  # 投入→開始
+    run_ms: deque[float] = field(default_factory=lambda: deque(maxlen=200))   # 開始→完了
+
+    def to_dict(self) -> dict:
+        waits, runs = list(self.wait_ms), list(self.run_ms)
+        return {
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "pending": self.pending,
+            "max_pending": self.max_pending,
+            "wait_ms_avg": round(sum(waits) / len(waits), 1) if waits else 0.0,
+            "wait_ms_max": round(max(waits), 1) if waits else 0.0,
+            "run_ms_avg": round(sum(runs) / len(runs), 1) if runs else 0.0,
+        }
+
+
+def _timed_call(fn: Callable[..., T], args: tuple, kwargs: dict) -> tuple[T, float, float]:
+    """ワーカー側で実行し、開始/終了時刻（time.time）を返す"""
+    started_at = time.time()
+    result = fn(*args, **kwargs)
+    return result, started_at, time.time()
+
+
+class WorkerPool:
+    """計測付きの実行プール"""
+
+    def __init__(self, name: str, executor: Executor):
+        self.name = name
+        self._executor = executor
+        self.stats = PoolStats()
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """関数をプールで実行して結果を待つ"""
+        loop = asyncio.get_running_loop()
+        stats = self.stats
+        stats.submitted += 1
+        stats.pending += 1
+        stats.max_pending = max(stats.max_pending, stats.pending)
+        submitted_at = time.time()
+
+        try:
+            result, started_at, finished_at = await loop.run_in_executor(
+                self._executor, partial(_timed_call, fn, args, kwargs),
+            )
+        except BaseException:
+            stats.failed += 1
+            raise
+        finally:
+            stats.pending -= 1
+
+        stats.completed += 1
+        stats.wait_ms.append(max(0.0, started_at - submitted_at) * 1000)
+        stats.run_ms.append((finished_at - started_at) * 1000)
+        return result
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+
+class BlockingExecutor:
+    """I/O用スレッドプールとCPU用プロセスプール"""
+
+    def __init__(self, config: Optional[ExecutorConfig] = None):
+        self.config = config or ExecutorConfig()
+        self.io = WorkerPool(
+            "io", ThreadPoolExecutor(self.config.io_workers, thread_name_prefix="lobby-io"),
+        )
+        self.cpu = WorkerPool("cpu", self._create_cpu_executor())
+
+    def _create_cpu_executor(self) -> Executor:
+        if self.config.use_processes:
+            try:
+                # fork はイベントループやスレッドの状態を引き継ぐため spawn を使う
+                return ProcessPoolExecutor(
+                    self.config.cpu_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            except (OSError, NotImplementedError) as e:
+                logger.warning(f"Process pool unavailable, using threads for CPU work: {e}")
+        return ThreadPoolExecutor(self.config.cpu_workers, thread_name_prefix="lobby-cpu")
+
+    @property
+    def stats(self) -> dict:
+        """プールごとの待ち件数・待ち時間"""
+        return {
+            "io": {"workers": self.config.io_workers, **self.io.stats.to_dict()},
+            "cpu": {
+                "workers": self.config.cpu_workers,
+                "processes": isinstance(self.cpu._executor, ProcessPoolExecutor),
+                **self.cpu.stats.to_dict(),
+            },
+        }
+
+    def shutdown(self, wait: bool = True):
+        self.io.shutdown(wait)
+        self.cpu.shutdown(wait)
+
+
+# シングルトンインスタンス
+_executor: Optional[BlockingExecutor] = None
+
+
+def get_executor() -> BlockingExecutor:
+    """BlockingExecutorのシングルトンを取得"""
+    global _executor
+    if _executor is None:
+        _executor = BlockingExecutor()
+    return _executor
+
+
+def configure_executor(config: ExecutorConfig) -> BlockingExecutor:
+    """設定を指定してシングルトンを作り直す（既存のプールは終了）"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False)
+    _executor = BlockingExecutor(config)
+    return _executor
+
+
+def shutdown_executor(wait: bool = True):
+    """シングルトンのプールを終了"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait)
+        _executor = None
+
+
+async def run_io(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """I/O処理（ファイル書き込み・削除など）をスレッドプールで実行"""
+    return await get_executor().io.run(fn, *args, **kwargs)
+
+
+async def run_cpu(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """CPU処理（ffmpeg + NumPyの解析など）をプロセスプールで実行
+
+    ``fn`` と引数・戻り値はpickle可能である必要がある。
+    """
+    return await get_executor().cpu.run(fn, *args, **kwargs)
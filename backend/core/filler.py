@@ -0,0 +1,107 @@
+"""Filler Reactions - LLM応答待ちの間をつなぐ短いリアクション
+
+スパチャなどを受け取ってからAI応答が再生されるまでの1〜3秒を埋めるため、
+「おっ！」「ありがとうっす！」のような短いリアクションを起動時に一度だけ合成しておき、
+入力を受けた瞬間に再生する。本応答はリアクションの直後に続けて再生される。
+"""
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from .emotion import EmotionResult
+
+# 入力metadataの "type" → リアクション種別
+REACTION_KIND_MAP: dict[str, str] = {
+    # YouTube
+    "superChatEvent": "superchat",
+    "superStickerEvent": "superchat",
+    "newSponsorEvent": "membership",
+    "memberMilestoneChatEvent": "membership",
+    # Twitch
+    "bits": "bits",
+    "subscription": "subscription",
+    "resubscription": "subscription",
+    "gift_sub": "subscription",
+    "raid": "raid",
+}
+
+
+def reaction_kind(metadata: dict) -> str:
+    """入力metadataからリアクション種別を判定（通常コメントは "comment"）"""
+    return REACTION_KIND_MAP.get(metadata.get("type", ""), "comment")
+
+
+@dataclass
+class FillerConfig:
+    """フィラー設定"""
+    enabled: bool = True
+
+    # 種別ごとのリアクション台詞（感情はテキストから自動判定、[happy] タグも可）
+    reactions: dict[str, list[str]] = field(default_factory=lambda: {
+        "superchat": ["おっ！", "ありがとうっす！", "[surprised] えっ、マジっすか！"],
+        "membership": ["ようこそっす！", "ありがとうっす！"],
+        "bits": ["おおっ！", "ありがとうっす！"],
+        "subscription": ["ありがとうっす！"],
+        "raid": ["[excited] いらっしゃいっす！"],
+        "comment": [],  # 通常コメントにはフィラーなし
+    })
+
+
+@dataclass
+class FillerClip:
+    """合成済みリアクション"""
+    kind: str
+    text: str
+    emotion: EmotionResult
+    audio: bytes = b""
+    audio_path: Optional[Path] = None
+    live2d_frames: Optional[list] = None  # list[Live2DFrame]
+
+
+class FillerBank:
+    """合成済みリアクションの保管と選択
+
+    種別と入力の感情に一致するクリップを優先し、同じクリップが続かないよう順番に選ぶ。
+    """
+
+    def __init__(self):
+        self._clips: dict[str, list[FillerClip]] = {}
+        self._cursor: dict[str, int] = {}
+
+    def add(self, clip: FillerClip):
+        """クリップを登録"""
+        self._clips.setdefault(clip.kind, []).append(clip)
+
+    def pick(self, kind: str, emotion: Optional[str] = None) -> Optional[FillerClip]:
+        """リアクションを選択
+
+        Args:
+            kind: リアクション種別（superchat, membership, bits, ...）
+            emotion: 入力の感情（一致するクリップを優先）
+
+        Returns:
+            FillerClip（該当なしはNone）
+        """
+        clips = self._clips.get(kind)
+        if not clips:
+            return None
+
+        cursor_key = kind
+        if emotion:
+            matched = [c for c in clips if c.emotion.primary.value == emotion]
+            if matched:
+                clips = matched
+                cursor_key = f"{kind}:{emotion}"
+
+        index = self._cursor.get(cursor_key, 0)
+        self._cursor[cursor_key] = index + 1
+        return clips[index % len(clips)]
+
+    def clear(self):
+        """全クリップ削除"""
+        self._clips.clear()
+        self._cursor.clear()
+
+    def __len__(self) -> int:
+        return sum(len(clips) for clips in self._clips.values())
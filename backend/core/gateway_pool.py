@@ -0,0 +1,298 @@
+"""Gateway Pool - 複数OpenClaw Gatewayのルーティングとヘッジ
+
+- 各GatewayのレイテンシをEWMAで追跡し、最も速い（処理中の件数で補正）Gatewayを選ぶ
+- 連続して失敗したGateway・ヘルスチェックに失敗したGatewayは一定時間外す
+- ヘッジ: 選んだGatewayの直近p95を過ぎても応答がなければ別のGatewayに同じリクエストを送り、
+  先に返った方を採用する（もう一方はキャンセル）
+- 失敗した場合はまだ使っていないGatewayにフェイルオーバー
+
+会話履歴は ``OpenClawClient`` 側で保持して毎回全メッセージを送るため、
+どのGatewayが応答しても会話は一貫する。採用されなかった応答は履歴に入らない。
+"""
+
+import asyncio
+import math
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Optional, TypeVar
+
+import httpx
+from loguru import logger
+
+T = TypeVar("T")
+
+
+@dataclass
+class GatewayRoutingConfig:
+    """Gatewayルーティング設定"""
+    hedge: bool = False              # p95を過ぎたら別のGatewayにも送る
+    hedge_percentile: float = 95.0
+    hedge_min_ms: float = 100.0      # ヘッジまでの最短待ち時間
+    hedge_min_samples: int = 10      # これより計測数が少ないGatewayではヘッジしない
+    ewma_alpha: float = 0.3          # EWMAの重み（新しい計測値の割合）
+    latency_window: int = 100        # p95計算に使う直近の計測数
+    max_failures: int = 3            # 連続失敗でこの回数に達したら一時的に外す
+    cooldown_sec: float = 30.0       # 外している時間
+    health_check_interval: float = 10.0  # ヘルスチェック間隔（0で無効、Gatewayが1つの場合も無効）
+    health_check_path: str = "/health"
+
+
+def _is_client_error(exc: BaseException) -> bool:
+    """Gatewayを変えても結果が変わらないエラー（4xx、429を除く）"""
+    return (
+        isinstance(exc, httpx.HTTPStatusError)
+        and 400 <= exc.response.status_code < 500
+        and exc.response.status_code != 429
+    )
+
+
+class GatewayState:
+    """1つのGatewayの状態"""
+
+    def __init__(self, url: str, alpha: float = 0.3, window: int = 100):
+        self.url = url
+        self.alpha = alpha
+        self.ewma_ms: Optional[float] = None
+        self.inflight = 0
+        self.requests = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.hedges = 0       # ヘッジとして送られた件数
+        self.hedge_wins = 0   # ヘッジとして送られて採用された件数
+        self.down_until = 0.0
+        self._recent: deque[float] = deque(maxlen=window)
+
+    def is_available(self, now: float) -> bool:
+        return now >= self.down_until
+
+    @property
+    def score(self) -> float:
+        """小さいほど優先（未計測のGatewayは0で、まず試される）"""
+        return (self.ewma_ms or 0.0) * (1 + self.inflight)
+
+    @property
+    def samples(self) -> int:
+        return len(self._recent)
+
+    def record_success(self, latency_ms: float):
+        self.ewma_ms = latency_ms if self.ewma_ms is None else (
+            self.alpha * latency_ms + (1 - self.alpha) * self.ewma_ms
+        )
+        self._recent.append(latency_ms)
+        self.consecutive_failures = 0
+        self.down_until = 0.0
+
+    def record_cancelled(self, elapsed_ms: float):
+        """キャンセルされたリクエスト（少なくとも ``elapsed_ms`` はかかる）をEWMAに反映"""
+        if self.ewma_ms is None or elapsed_ms > self.ewma_ms:
+            self.ewma_ms = elapsed_ms if self.ewma_ms is None else (
+                self.alpha * elapsed_ms + (1 - self.alpha) * self.ewma_ms
+            )
+
+    def record_failure(self, now: float, max_failures: int, cooldown_sec: float):
+        self.failures += 1
+        self.consecutive_failures += 1
+        if self.consecutive_failures >= max_failures:
+            self.mark_down(now, cooldown_sec)
+
+    def mark_down(self, now: float, cooldown_sec: float):
+        if self.is_available(now):
+            logger.warning(f"OpenClaw gateway marked down for {cooldown_sec:.0f}s: {self.url}")
+        self.down_until = now + cooldown_sec
+
+    def mark_up(self):
+        self.consecutive_failures = 0
+        self.down_until = 0.0
+
+    def percentile(self, p: float) -> Optional[float]:
+        if not self._recent:
+            return None
+        ordered = sorted(self._recent)
+        return ordered[max(0, math.ceil(len(ordered) * p / 100) - 1)]
+
+    def to_dict(self, now: Optional[float] = None) -> dict:
+        p95 = self.percentile(95)
+        return {
+            "url": self.url,
+            "available": self.is_available(time.monotonic() if now is None else now),
+            "ewma_ms": round(self.ewma_ms, 1) if self.ewma_ms is not None else None,
+            "p95_ms": round(p95, 1) if p95 is not None else None,
+            "inflight": self.inflight,
+            "requests": self.requests,
+            "failures": self.failures,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+        }
+
+
+class GatewayPool:
+    """複数Gatewayへのリクエスト振り分け
+
+    Args:
+        urls: GatewayのURL（先頭が優先、重複は除く）
+        config: ルーティング設定
+    """
+
+    def __init__(self, urls: list[str], config: Optional[GatewayRoutingConfig] = None):
+        self.config = config or GatewayRoutingConfig()
+        self.gateways = [
+            GatewayState(url, self.config.ewma_alpha, self.config.latency_window)
+            for url in dict.fromkeys(urls)
+        ]
+        if not self.gateways:
+            raise ValueError("At least one gateway URL is required")
+        self.failovers = 0
+        self._health_task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self.gateways)
+
+    def pick(self, exclude: tuple[GatewayState, ...] | list[GatewayState] = ()) -> Optional[GatewayState]:
+        """次に使うGateway（使えるGatewayがなければ外しているものも含めて選ぶ）"""
+        candidates = [g for g in self.gateways if g not in exclude]
+        if not candidates:
+            return None
+        now = time.monotonic()
+        available = [g for g in candidates if g.is_available(now)] or candidates
+        # 同点なら先に登録されたGateway
+        return min(available, key=lambda g: g.score)
+
+    def hedge_delay(self, gateway: GatewayState) -> Optional[float]:
+        """ヘッジを送るまでの秒数（ヘッジしない場合はNone）"""
+        if not self.config.hedge or len(self.gateways) < 2 or gateway.samples < self.config.hedge_min_samples:
+            return None
+        threshold = gateway.percentile(self.config.hedge_percentile) or 0.0
+        return max(threshold, self.config.hedge_min_ms) / 1000
+
+    async def _timed(self, gateway: GatewayState, fn: Callable[[str], Awaitable[T]]) -> T:
+        start = time.monotonic()
+        try:
+            result = await fn(gateway.url)
+        except asyncio.CancelledError:
+            # ヘッジで負けた・期限切れ → 遅いGatewayが未計測のまま優先され続けないようにする
+            gateway.record_cancelled((time.monotonic() - start) * 1000)
+            raise
+        except Exception as e:
+            if not _is_client_error(e):
+                gateway.record_failure(time.monotonic(), self.config.max_failures, self.config.cooldown_sec)
+            raise
+        else:
+            gateway.record_success((time.monotonic() - start) * 1000)
+            return result
+        finally:
+            gateway.inflight -= 1
+
+    async def call(
+        self,
+        fn: Callable[[str], Awaitable[T]],
+        hedge: bool = True,
+        discard: Optional[Callable[[T], Awaitable[None]]] = None,
+    ) -> T:
+        """Gatewayを選んで ``fn(url)`` を実行（ヘッジ・フェイルオーバーつき）
+
+        Args:
+            fn: GatewayのURLを受け取ってリクエストするコルーチン関数
+            hedge: p95を過ぎたら別のGatewayにも送るか（設定で無効なら送らない）
+            discard: 採用されなかった結果の後始末（ストリームを閉じるなど）
+        """
+        tried: list[GatewayState] = []
+        tasks: dict[asyncio.Task, GatewayState] = {}
+        last_error: Optional[BaseException] = None
+
+        def launch(gateway: GatewayState):
+            tried.append(gateway)
+            gateway.inflight += 1
+            gateway.requests += 1
+            tasks[asyncio.create_task(self._timed(gateway, fn))] = gateway
+
+        first = self.pick()
+        launch(first)
+        delay = self.hedge_delay(first) if hedge else None
+        hedged = False
+
+        try:
+            while tasks:
+                timeout = delay if delay is not None and not hedged else None
+                done, _ = await asyncio.wait(tasks, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    # p95を過ぎても応答がない → 別のGatewayにも送る
+                    hedged = True
+                    backup = self.pick(exclude=tried)
+                    if backup is not None:
+                        backup.hedges += 1
+                        launch(backup)
+                    continue
+
+                for task in done:
+                    gateway = tasks.pop(task)
+                    error = task.exception()
+                    if error is None:
+                        if hedged and gateway is not first:
+                            gateway.hedge_wins += 1
+                        return task.result()
+                    if _is_client_error(error):
+                        raise error
+                    last_error = error
+
+                if not tasks:
+                    backup = self.pick(exclude=tried)
+                    if backup is not None:
+                        self.failovers += 1
+                        logger.warning(f"OpenClaw gateway failed, failing over to {backup.url}: {last_error}")
+                        launch(backup)
+        finally:
+            for task in tasks:
+                task.cancel()
+            if tasks:
+                results = await asyncio.gather(*tasks, return_exceptions=True)
+                if discard is not None:
+                    for result in results:
+                        if not isinstance(result, BaseException):
+                            await discard(result)
+
+        raise last_error or RuntimeError("No OpenClaw gateway available")
+
+    async def check_health(self, probe: Callable[[str], Awaitable[bool]]):
+        """全Gatewayのヘルスチェック（失敗したGatewayは ``cooldown_sec`` 外す）"""
+        async def check(gateway: GatewayState):
+            try:
+                ok = await probe(gateway.url)
+            except Exception:
+                ok = False
+            if ok:
+                gateway.mark_up()
+            else:
+                gateway.mark_down(time.monotonic(), self.config.cooldown_sec)
+
+        await asyncio.gather(*(check(g) for g in self.gateways))
+
+    def start_health_checks(self, probe: Callable[[str], Awaitable[bool]]):
+        """定期ヘルスチェック開始（Gatewayが1つ・間隔0の場合は何もしない）"""
+        if len(self.gateways) < 2 or self.config.health_check_interval <= 0:
+            return
+        if self._health_task is not None and not self._health_task.done():
+            return
+
+        async def loop():
+            while True:
+                await asyncio.sleep(self.config.health_check_interval)
+                await self.check_health(probe)
+
+        self._health_task = asyncio.create_task(loop())
+
+    async def stop(self):
+        """定期ヘルスチェック停止"""
+        if self._health_task is not None:
+            self._health_task.cancel()
+            await asyncio.gather(self._health_task, return_exceptions=True)
+            self._health_task = None
+
+    @property
+    def stats(self) -> dict:
+        now = time.monotonic()
+        return {
+            "gateways": [g.to_dict(now) for g in self.gateways],
+            "hedge": self.config.hedge,
+            "failovers": self.failovers,
+        }
@@ -13,18 +13,27 @@ Used for:
 - Thumbnail selection
 """
 
+import asyncio
 import json
 import logging
+import shutil
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
-from typing import Callable, Optional
+from typing import AsyncIterable, AsyncIterator, Callable, Optional
 
 import numpy as np
 
+from .executor import run_io
+from .keyword_matcher import compile_keywords
+from .video import get_audio_duration_ms
+
 logger = logging.getLogger(__name__)
 
+# Bytes of ffmpeg error output kept for the decode failure message
+_FFMPEG_STDERR_TAIL = 4096
+
 
 class HighlightType(str, Enum):
     """Types of highlight events."""
@@ -75,6 +84,8 @@ class HighlightConfig:
     audio_threshold: float = 0.7          # RMS threshold for spike (0-1)
     audio_window_ms: int = 500            # Window for audio analysis
     audio_min_duration_ms: int = 1000     # Minimum highlight duration
+    audio_block_sec: float = 10.0         # Audio decoded per block (memory stays constant)
+    audio_decode_rate: int = 16000        # Sample rate when decoding through ffmpeg
 
     # Emotion analysis
     emotion_threshold: float = 0.7        # Emotion intensity threshold
@@ -118,6 +129,7 @@ class HighlightDetector:
 
     def __init__(self, config: Optional[HighlightConfig] = None):
         self.config = config or HighlightConfig()
+        self._keywords = compile_keywords(self.config.highlight_keywords, ignore_case=True)
         self.highlights: list[Highlight] = []
         self._chat_buffer: list[tuple[int, dict]] = []  # (timestamp_ms, chat_data)
         self._is_recording = False
@@ -235,20 +247,18 @@ class HighlightDetector:
             self.highlights.append(highlight)
             logger.debug(f"Superchat received at {highlight.timestamp_str}")
 
-        # Check for keyword
-        text = message.get("text", "").lower()
-        for keyword in self.config.highlight_keywords:
-            if keyword.lower() in text:
-                highlight = Highlight(
-                    timestamp_ms=timestamp_ms,
-                    duration_ms=1000,
-                    highlight_type=HighlightType.KEYWORD,
-                    score=0.6,
-                    label=f"Keyword: {keyword}",
-                    metadata={"keyword": keyword, "text": message.get("text")}
-                )
-                self.highlights.append(highlight)
-                break  # Only one keyword highlight per message
+        # Check for keyword (only one keyword highlight per message)
+        keyword = self._keywords.first(message.get("text", ""))
+        if keyword is not None:
+            highlight = Highlight(
+                timestamp_ms=timestamp_ms,
+                duration_ms=1000,
+                highlight_type=HighlightType.KEYWORD,
+                score=0.6,
+                label=f"Keyword: {keyword}",
+                metadata={"keyword": keyword, "text": message.get("text")}
+            )
+            self.highlights.append(highlight)
 
         # Check for burst
         if len(self._chat_buffer) >= self.config.chat_burst_threshold:
@@ -306,60 +316,191 @@ class HighlightDetector:
 
     # === Post-Recording Analysis ===
 
-    async def analyze_audio_file(self, audio_path: Path) -> list[Highlight]:
+    async def analyze_audio_file(
+        self,
+        audio_path: Path,
+        progress_callback: Optional[Callable[[int, Optional[int]], None]] = None,
+    ) -> list[Highlight]:
         """
         Analyze an audio file for highlights.
 
+        The file is decoded block by block, so memory use does not grow with its length.
+        Files soundfile cannot read (MP3 on older libsndfile, video containers such as
+        MP4/MKV) are decoded through an ffmpeg pipe.
+
         Args:
-            audio_path: Path to audio file (WAV, MP3, etc.)
+            audio_path: Path to audio or video file (WAV, MP3, MP4, etc.)
+            progress_callback: Called after each block with (processed_ms, total_ms or None)
 
         Returns:
             List of detected highlights
         """
-        try:
-            import soundfile as sf
-        except ImportError:
-            logger.warning("soundfile not installed. Install with: pip install soundfile")
+        logger.info(f"Analyzing audio file: {audio_path}")
+
+        source = await self._open_audio(Path(audio_path))
+        if source is None:
             return []
+        sample_rate, total_frames, blocks = source
 
-        logger.info(f"Analyzing audio file: {audio_path}")
+        return await self.analyze_audio_blocks(blocks, sample_rate, total_frames, progress_callback)
 
-        # Load audio
-        audio_data, sample_rate = sf.read(audio_path)
-        if len(audio_data.shape) > 1:
-            audio_data = audio_data.mean(axis=1)  # Convert stereo to mono
+    async def analyze_audio_blocks(
+        self,
+        blocks: AsyncIterable[np.ndarray],
+        sample_rate: int,
+        total_frames: Optional[int] = None,
+        progress_callback: Optional[Callable[[int, Optional[int]], None]] = None,
+    ) -> list[Highlight]:
+        """
+        Detect audio spikes from a stream of sample blocks.
 
-        # Normalize
-        audio_data = audio_data / (np.max(np.abs(audio_data)) + 1e-10)
+        Window RMS is computed per block (vectorized) while tracking the running peak;
+        the windows are normalized by the final peak at the end, which matches
+        normalizing the whole file first without holding it in memory.
 
-        # Process in chunks
-        window_samples = int(self.config.audio_window_ms * sample_rate / 1000)
-        highlights = []
+        Args:
+            blocks: Sample blocks, shape (frames,) or (frames, channels)
+            sample_rate: Sample rate of the blocks
+            total_frames: Total frames if known (for progress)
+            progress_callback: Called after each block with (processed_ms, total_ms or None)
 
-        for i in range(0, len(audio_data), window_samples):
-            chunk = audio_data[i:i + window_samples]
-            if len(chunk) < window_samples // 2:
+        Returns:
+            List of detected highlights
+        """
+        window_samples = max(1, int(self.config.audio_window_ms * sample_rate / 1000))
+        total_ms = int(total_frames / sample_rate * 1000) if total_frames else None
+
+        pending = np.empty(0, dtype=np.float32)  # Samples not yet filling a window
+        window_rms: list[np.ndarray] = []
+        peak = 0.0
+        processed = 0
+
+        async for block in blocks:
+            block = np.asarray(block, dtype=np.float32)
+            if block.ndim > 1:
+                block = block.mean(axis=1)  # Convert stereo to mono
+            if not len(block):
                 continue
 
-            timestamp_ms = int(i / sample_rate * 1000)
+            peak = max(peak, float(np.abs(block).max()))
+            processed += len(block)
 
-            # Calculate RMS
-            rms = np.sqrt(np.mean(chunk ** 2))
+            if len(pending):
+                block = np.concatenate([pending, block])
+            whole = len(block) // window_samples * window_samples
+            if whole:
+                windows = block[:whole].reshape(-1, window_samples).astype(np.float64)
+                window_rms.append(np.sqrt(np.mean(windows ** 2, axis=1)))
+            pending = block[whole:]
 
-            if rms >= self.config.audio_threshold:
-                highlight = Highlight(
-                    timestamp_ms=timestamp_ms,
+            if progress_callback:
+                progress_callback(int(processed / sample_rate * 1000), total_ms)
+
+        # Trailing partial window (skipped if shorter than half a window)
+        if len(pending) and len(pending) >= window_samples // 2:
+            window_rms.append(np.sqrt(np.mean(pending.astype(np.float64) ** 2, keepdims=True)))
+
+        highlights = []
+        if window_rms:
+            # Normalize
+            rms_values = np.concatenate(window_rms) / (peak + 1e-10)
+            for index in np.flatnonzero(rms_values >= self.config.audio_threshold):
+                rms = float(rms_values[index])
+                highlights.append(Highlight(
+                    timestamp_ms=int(index * window_samples / sample_rate * 1000),
                     duration_ms=self.config.audio_window_ms,
                     highlight_type=HighlightType.AUDIO_SPIKE,
                     score=min(1.0, rms / self.config.audio_threshold),
                     label="Loud moment",
-                    metadata={"rms": float(rms)}
-                )
-                highlights.append(highlight)
+                    metadata={"rms": rms}
+                ))
 
-        logger.info(f"Found {len(highlights)} audio highlights")
+        logger.info(f"Found {len(highlights)} audio highlights ({processed / sample_rate:.0f}s of audio)")
         return highlights
 
+    async def _open_audio(
+        self, audio_path: Path
+    ) -> Optional[tuple[int, Optional[int], AsyncIterator[np.ndarray]]]:
+        """Open an audio source as (sample_rate, total_frames, blocks), or None if undecodable."""
+        try:
+            import soundfile as sf
+        except ImportError:
+            sf = None
+
+        if sf is not None:
+            try:
+                sound_file = sf.SoundFile(str(audio_path))
+            except Exception as e:
+                logger.info(f"soundfile cannot read {audio_path.name} ({e}), decoding with ffmpeg")
+            else:
+                return sound_file.samplerate, sound_file.frames, self._soundfile_blocks(sound_file)
+
+        ffmpeg = shutil.which("ffmpeg")
+        if ffmpeg is None:
+            if sf is None:
+                logger.warning("soundfile not installed. Install with: pip install soundfile")
+            logger.warning("ffmpeg not found in PATH, cannot decode audio")
+            return None
+
+        duration_ms = await get_audio_duration_ms(audio_path)
+        sample_rate = self.config.audio_decode_rate
+        total_frames = int(duration_ms * sample_rate / 1000) or None
+        return sample_rate, total_frames, self._ffmpeg_blocks(ffmpeg, audio_path, sample_rate)
+
+    async def _soundfile_blocks(self, sound_file) -> AsyncIterator[np.ndarray]:
+        """Read blocks from an open soundfile (reads run in the I/O pool)."""
+        block_frames = max(1, int(self.config.audio_block_sec * sound_file.samplerate))
+        try:
+            while True:
+                block = await run_io(sound_file.read, block_frames, dtype="float32", always_2d=True)
+                if not len(block):
+                    break
+                yield block
+        finally:
+            sound_file.close()
+
+    async def _ffmpeg_blocks(self, ffmpeg: str, audio_path: Path, sample_rate: int) -> AsyncIterator[np.ndarray]:
+        """Decode the audio track to mono float32 through an ffmpeg pipe."""
+        process = await asyncio.create_subprocess_exec(
+            ffmpeg, "-v", "error", "-nostdin",
+            "-i", str(audio_path),
+            "-vn", "-ac", "1", "-ar", str(sample_rate),
+            "-f", "f32le", "-",
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        block_bytes = max(4, int(self.config.audio_block_sec * sample_rate) * 4)
+        remainder = b""
+        # Drain stderr while decoding; a full stderr pipe would block ffmpeg. Keep only the tail.
+        stderr_tail = bytearray()
+
+        async def drain_stderr():
+            while chunk := await process.stderr.read(4096):
+                stderr_tail.extend(chunk)
+                del stderr_tail[:-_FFMPEG_STDERR_TAIL]
+
+        drain = asyncio.create_task(drain_stderr())
+        try:
+            while True:
+                data = await process.stdout.read(block_bytes)
+                if not data:
+                    break
+                data = remainder + data
+                usable = len(data) // 4 * 4
+                remainder = data[usable:]
+                if usable:
+                    yield np.frombuffer(data[:usable], dtype="<f4")
+
+            await drain
+            if await process.wait() != 0:
+                stderr = stderr_tail.decode(errors="replace").strip()
+                raise RuntimeError(f"ffmpeg failed to decode {audio_path}: {stderr}")
+        finally:
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+            drain.cancel()
+
     async def analyze_session_log(self, log_path: Path) -> list[Highlight]:
         """
         Analyze a session log file for highlights.
@@ -397,18 +538,16 @@ class HighlightDetector:
                     ))
 
             elif event_type == "chat":
-                text = event.get("text", "").lower()
-                for keyword in self.config.highlight_keywords:
-                    if keyword.lower() in text:
-                        highlights.append(Highlight(
-                            timestamp_ms=timestamp_ms,
-                            duration_ms=1000,
-                            highlight_type=HighlightType.KEYWORD,
-                            score=0.6,
-                            label=f"Keyword: {keyword}",
-                            metadata=event
-                        ))
-                        break
+                keyword = self._keywords.first(event.get("text", ""))
+                if keyword is not None:
+                    highlights.append(Highlight(
+                        timestamp_ms=timestamp_ms,
+                        duration_ms=1000,
+                        highlight_type=HighlightType.KEYWORD,
+                        score=0.6,
+                        label=f"Keyword: {keyword}",
+                        metadata=event
+                    ))
 
                 if event.get("amount"):
                     highlights.append(Highlight(
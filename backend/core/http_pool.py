@@ -0,0 +1,155 @@
+"""HTTP Client Pool - プロセス全体で共有するHTTPクライアント
+
+OpenClaw・TTS・字幕翻訳・チャットプロキシ・YouTubeなどのサブシステムが
+接続先ごとに同じクライアント（コネクションプール）を使い回し、
+ホットパスでのTCP/TLSハンドシェイクを避ける。
+
+- httpxクライアントは (base_url, ヘッダー, タイムアウト) ごとに1つ
+- keep-alive・接続数の上限は ``HttpPoolConfig`` で調整、HTTP/2は ``h2`` がある場合のみ有効
+- YouTube用にaiohttpのセッションも1つ共有
+- 終了はアプリのlifespanで ``close_http_pool()`` を呼ぶ
+
+コネクションはイベントループに紐づくため、別のループから使われた場合は
+クライアントを作り直す（CLIやテストで ``asyncio.run`` を繰り返す場合）。
+"""
+
+import asyncio
+import importlib.util
+from dataclasses import dataclass
+from typing import Optional
+
+import aiohttp
+import httpx
+from loguru import logger
+
+
+@dataclass
+class HttpPoolConfig:
+    """共有HTTPクライアント設定"""
+    max_connections: int = 100            # 接続先ごとの最大同時接続数
+    max_keepalive_connections: int = 20   # 接続先ごとに保持するアイドル接続数
+    keepalive_expiry: float = 60.0        # アイドル接続を保持する秒数
+    connect_timeout: float = 5.0          # 接続確立のタイムアウト
+    http2: bool = False                   # HTTP/2を使う（h2パッケージが必要）
+
+
+def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+class HttpClientPool:
+    """接続先ごとの共有HTTPクライアント"""
+
+    def __init__(self, config: Optional[HttpPoolConfig] = None):
+        self.configure(config or HttpPoolConfig())
+        self._clients: dict[tuple, tuple[Optional[asyncio.AbstractEventLoop], httpx.AsyncClient]] = {}
+        self._aiohttp: Optional[aiohttp.ClientSession] = None
+        self._aiohttp_loop: Optional[asyncio.AbstractEventLoop] = None
+        self.created = 0
+
+    def configure(self, config: HttpPoolConfig):
+        """設定を変更（以降に作るクライアントから適用）"""
+        self.config = config
+        self._http2 = config.http2 and importlib.util.find_spec("h2") is not None
+        if config.http2 and not self._http2:
+            logger.warning("HTTP/2 requested but 'h2' is not installed; using HTTP/1.1")
+
+    def client(
+        self,
+        base_url: str = "",
+        headers: Optional[dict[str, str]] = None,
+        timeout: float = 30.0,
+    ) -> httpx.AsyncClient:
+        """接続先ごとの共有クライアント（呼び出し側では閉じない）"""
+        key = (base_url, tuple(sorted((headers or {}).items())), timeout)
+        loop = _running_loop()
+        entry = self._clients.get(key)
+        if entry is not None:
+            owner, client = entry
+            if not client.is_closed and (owner is None or loop is None or owner is loop):
+                if owner is None and loop is not None:
+                    self._clients[key] = (loop, client)
+                return client
+
+        client = httpx.AsyncClient(
+            base_url=base_url,
+            headers=headers,
+            timeout=httpx.Timeout(timeout, connect=min(timeout, self.config.connect_timeout)),
+            limits=httpx.Limits(
+                max_connections=self.config.max_connections,
+                max_keepalive_connections=self.config.max_keepalive_connections,
+                keepalive_expiry=self.config.keepalive_expiry,
+            ),
+            http2=self._http2,
+        )
+        self._clients[key] = (loop, client)
+        self.created += 1
+        logger.debug(f"Pooled HTTP client created: {base_url or '(no base url)'}")
+        return client
+
+    async def aiohttp_session(self) -> aiohttp.ClientSession:
+        """aiohttpの共有セッション（YouTube連携用）"""
+        loop = asyncio.get_running_loop()
+        if self._aiohttp is None or self._aiohttp.closed or self._aiohttp_loop is not loop:
+            self._aiohttp = aiohttp.ClientSession(connector=aiohttp.TCPConnector(
+                limit=self.config.max_connections,
+                keepalive_timeout=self.config.keepalive_expiry,
+            ))
+            self._aiohttp_loop = loop
+        return self._aiohttp
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "clients": sum(1 for _, client in self._clients.values() if not client.is_closed),
+            "created": self.created,
+            "http2": self._http2,
+            "aiohttp_session": self._aiohttp is not None and not self._aiohttp.closed,
+        }
+
+    async def close(self):
+        """すべての共有クライアントを閉じる"""
+        loop = _running_loop()
+        for owner, client in self._clients.values():
+            # 終了済みのループに紐づくクライアントは閉じられないので破棄するだけ
+            if owner is None or owner is loop:
+                await client.aclose()
+        self._clients.clear()
+        if self._aiohttp is not None and not self._aiohttp.closed and self._aiohttp_loop is loop:
+            await self._aiohttp.close()
+        self._aiohttp = None
+        self._aiohttp_loop = None
+
+
+# プロセス全体の共有プール
+_pool: Optional[HttpClientPool] = None
+
+
+def get_http_pool() -> HttpClientPool:
+    """共有HTTPクライアントプール取得（初回呼び出しで生成）"""
+    global _pool
+    if _pool is None:
+        _pool = HttpClientPool()
+    return _pool
+
+
+def configure_http_pool(config: HttpPoolConfig) -> HttpClientPool:
+    """共有プールを設定（アプリ起動時、クライアントを使い始める前に呼ぶ）"""
+    pool = get_http_pool()
+    if pool.stats["clients"]:
+        logger.warning("HTTP pool reconfigured while clients are in use; existing clients keep old settings")
+    pool.configure(config)
+    return pool
+
+
+async def close_http_pool():
+    """共有プールのクライアントを閉じる（アプリ終了時）
+
+    プール自体は参照を持つ側（``SharedResources`` など）で使い続けられるよう残し、
+    次に使われた時にクライアントを作り直す。
+    """
+    if _pool is not None:
+        await _pool.close()
@@ -0,0 +1,113 @@
+"""Keyword Matcher - 多数のキーワードを1回の走査で照合する（Aho-Corasick法）
+
+``keyword in text`` をキーワードの数だけ繰り返すと、NGワードが数百語になったときに
+コメント1件ごとの照合が O(キーワード数 × 文字数) になる。
+キーワードからトライとfailureリンクを一度だけ組み立て、テキストを先頭から1文字ずつ
+たどるだけで全キーワードの出現を調べる（O(文字数 + 一致数)）。
+
+- ``EmotionAnalyzer``: 感情キーワード
+- ``LiveMode``: NGワード（``blocked_words``）
+- ``HighlightDetector``: ハイライトキーワード（``highlight_keywords``）
+
+同じキーワード一覧からの照合器は ``compile_keywords`` でプロセス内で共有する
+（pickleされた照合器もプロセスプール側で作り直さずに再利用する）。
+"""
+
+from collections import deque
+from functools import lru_cache
+from typing import Iterable, Optional
+
+
+class KeywordMatcher:
+    """Aho-Corasick法による複数キーワードの照合器
+
+    Args:
+        keywords: キーワード（インデックスは一覧の順、空文字は照合しない）
+        ignore_case: 大文字・小文字を区別しない
+    """
+
+    def __init__(self, keywords: Iterable[str], ignore_case: bool = False):
+        self.keywords: tuple[str, ...] = tuple(keywords)
+        self.ignore_case = ignore_case
+
+        # 状態0が根。_goto[状態][文字] → 次の状態
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        # その状態で終わるキーワードのインデックス（failureリンク先の分も含む）
+        self._output: list[tuple[int, ...]] = [()]
+
+        for index, keyword in enumerate(self.keywords):
+            if not keyword:
+                continue
+            state = 0
+            for char in self._normalize(keyword):
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append(())
+                    self._goto[state][char] = next_state
+                state = next_state
+            self._output[state] += (index,)
+
+        # 幅優先でfailureリンクを張る
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                self._output[next_state] += self._output[self._fail[next_state]]
+
+    def __len__(self) -> int:
+        return len(self.keywords)
+
+    def __reduce__(self):
+        # プロセスプールに渡すときはキーワードだけ送り、受け取った側では共有の照合器を使う
+        return compile_keywords, (self.keywords, self.ignore_case)
+
+    def _normalize(self, text: str) -> str:
+        return text.lower() if self.ignore_case else text
+
+    def _states(self, text: str):
+        """テキストをたどって、キーワードが終わる位置の出力を順に返す"""
+        goto, fail, output = self._goto, self._fail, self._output
+        state = 0
+        for char in self._normalize(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                yield output[state]
+
+    def contains_any(self, text: str) -> bool:
+        """いずれかのキーワードを含むか（最初の一致で打ち切る）"""
+        for _ in self._states(text):
+            return True
+        return False
+
+    def matches(self, text: str) -> set[int]:
+        """含まれるキーワードのインデックス"""
+        found: set[int] = set()
+        for indices in self._states(text):
+            found.update(indices)
+        return found
+
+    def first(self, text: str) -> Optional[str]:
+        """含まれるキーワードのうち一覧で最も前のもの（なければNone）"""
+        found = self.matches(text)
+        return self.keywords[min(found)] if found else None
+
+
+@lru_cache(maxsize=64)
+def _compile(keywords: tuple[str, ...], ignore_case: bool) -> KeywordMatcher:
+    return KeywordMatcher(keywords, ignore_case)
+
+
+def compile_keywords(keywords: Iterable[str], ignore_case: bool = False) -> KeywordMatcher:
+    """キーワード一覧の照合器を取得（同じ一覧なら組み立て済みのものを返す）"""
+    return _compile(tuple(keywords), ignore_case)
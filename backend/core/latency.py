@@ -0,0 +1,238 @@
+"""Latency Tracing - ライブ応答の段階別レイテンシ計測
+
+1入力ごとにキュー待ち / OpenClaw（最初のトークンまでと完成まで） / TTS / リップシンク解析 / 配信の各段階を計測し、
+段階別・入力種別ごとの直近の分布（p50/p95/p99）を保持する。
+
+分布はHDR Histogram風の対数バケットで記録するため、
+サンプル数に関係なくメモリ使用量は一定で、相対誤差は ``precision`` 以内に収まる。
+"""
+
+import math
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Iterator, Optional
+
+
+@dataclass
+class LatencyConfig:
+    """レイテンシ計測設定"""
+    enabled: bool = True
+    window_sec: float = 300.0   # 分布の集計期間（直近5分）
+    slices: int = 5             # 集計期間の分割数（古いスライスから捨てる）
+    precision: float = 0.02     # バケットの相対誤差（2%）
+    max_traces: int = 100       # 保持する直近トレース数
+
+
+class LatencyHistogram:
+    """対数バケットのヒストグラム（ミリ秒）"""
+
+    def __init__(self, precision: float = 0.02):
+        self._log_base = math.log1p(precision)
+        self._base = 1.0 + precision
+        self._buckets: dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def _index(self, value: float) -> int:
+        if value <= 1.0:
+            return 0
+        return math.ceil(math.log(value) / self._log_base)
+
+    def record(self, value_ms: float):
+        """値を記録"""
+        value_ms = max(0.0, value_ms)
+        index = self._index(value_ms)
+        self._buckets[index] = self._buckets.get(index, 0) + 1
+        self.count += 1
+        self.total += value_ms
+        self.min = min(self.min, value_ms)
+        self.max = max(self.max, value_ms)
+
+    def merge(self, other: "LatencyHistogram"):
+        """別のヒストグラムを合算"""
+        for index, n in other._buckets.items():
+            self._buckets[index] = self._buckets.get(index, 0) + n
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def percentile(self, p: float) -> float:
+        """パーセンタイル値（バケット上限、最大値でクランプ）"""
+        if self.count == 0:
+            return 0.0
+        target = max(1, math.ceil(self.count * p / 100))
+        seen = 0
+        for index in sorted(self._buckets):
+            seen += self._buckets[index]
+            if seen >= target:
+                upper = self._base ** index if index > 0 else 1.0
+                return min(upper, self.max)
+        return self.max
+
+    def summary(self) -> dict:
+        """p50/p95/p99などの要約"""
+        if self.count == 0:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "mean": round(self.total / self.count, 1),
+            "min": round(self.min, 1),
+            "p50": round(self.percentile(50), 1),
+            "p95": round(self.percentile(95), 1),
+            "p99": round(self.percentile(99), 1),
+            "max": round(self.max, 1),
+        }
+
+
+class RollingHistogram:
+    """直近 ``window_sec`` のみを集計するヒストグラム
+
+    期間を ``slices`` 個に分割し、期限を過ぎたスライスから捨てる。
+    """
+
+    def __init__(self, window_sec: float = 300.0, slices: int = 5, precision: float = 0.02):
+        self.precision = precision
+        self._slice_sec = window_sec / max(1, slices)
+        self._slices: deque[tuple[float, LatencyHistogram]] = deque(maxlen=max(1, slices))
+
+    def _current(self, now: float) -> LatencyHistogram:
+        if not self._slices or now - self._slices[-1][0] >= self._slice_sec:
+            self._slices.append((now, LatencyHistogram(self.precision)))
+        return self._slices[-1][1]
+
+    def record(self, value_ms: float, now: Optional[float] = None):
+        now = time.monotonic() if now is None else now
+        self._current(now).record(value_ms)
+
+    def snapshot(self, now: Optional[float] = None) -> LatencyHistogram:
+        """集計期間内のスライスを合算したヒストグラム"""
+        now = time.monotonic() if now is None else now
+        window = self._slice_sec * (self._slices.maxlen or 1)
+        merged = LatencyHistogram(self.precision)
+        for started_at, histogram in self._slices:
+            if now - started_at < window:
+                merged.merge(histogram)
+        return merged
+
+
+@dataclass
+class LatencyTrace:
+    """1入力分のトレース"""
+    source: str
+    text: str = ""
+    started_at: datetime = field(default_factory=datetime.now)
+    spans: dict[str, float] = field(default_factory=dict)  # 段階 → ミリ秒
+    outcome: str = "pending"
+    nested: set[str] = field(default_factory=set)   # 他の段階に含まれる段階（totalに足さない）
+    pending: set[str] = field(default_factory=set)  # 後から追加される段階（揃うまでtotalを記録しない）
+    _recorded: bool = field(default=False, repr=False)
+
+    @contextmanager
+    def span(self, stage: str) -> Iterator[None]:
+        """段階の所要時間を計測（例外時も記録）"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.spans[stage] = (time.perf_counter() - start) * 1000
+
+    def add_nested(self, stage: str, ms: float):
+        """他の段階の内訳を記録（例: ``llm`` のうち最初のトークンまで）"""
+        self.spans[stage] = ms
+        self.nested.add(stage)
+
+    @property
+    def total_ms(self) -> float:
+        return sum(ms for stage, ms in self.spans.items() if stage not in self.nested)
+
+    def to_dict(self) -> dict:
+        return {
+            "source": self.source,
+            "text": self.text,
+            "started_at": self.started_at.isoformat(),
+            "outcome": self.outcome,
+            "spans_ms": {stage: round(ms, 1) for stage, ms in self.spans.items()},
+            "total_ms": round(self.total_ms, 1),
+        }
+
+
+class LatencyTracker:
+    """トレースを集計し、段階別・入力種別ごとの分布を保持"""
+
+    def __init__(self, config: Optional[LatencyConfig] = None):
+        self.config = config or LatencyConfig()
+        self._stages: dict[str, RollingHistogram] = {}
+        self._sources: dict[tuple[str, str], RollingHistogram] = {}
+        self._traces: deque[LatencyTrace] = deque(maxlen=self.config.max_traces)
+
+    def _histogram(self, table: dict, key) -> RollingHistogram:
+        histogram = table.get(key)
+        if histogram is None:
+            histogram = table[key] = RollingHistogram(
+                self.config.window_sec, self.config.slices, self.config.precision,
+            )
+        return histogram
+
+    def _record_span(self, source: str, stage: str, ms: float, now: float):
+        self._histogram(self._stages, stage).record(ms, now)
+        self._histogram(self._sources, (source, stage)).record(ms, now)
+
+    def record(self, trace: LatencyTrace, now: Optional[float] = None):
+        """完了したトレースを記録（``pending`` の段階が残っていればtotalは ``add_span`` で記録）"""
+        if not self.config.enabled:
+            return
+        now = time.monotonic() if now is None else now
+        for stage, ms in trace.spans.items():
+            self._record_span(trace.source, stage, ms, now)
+        if not trace.pending:
+            self._record_span(trace.source, "total", trace.total_ms, now)
+        trace._recorded = True
+        self._traces.append(trace)
+
+    def add_span(self, trace: LatencyTrace, stage: str, ms: float, now: Optional[float] = None):
+        """トレースに後から段階を追加（WebSocket配信など非同期に完了するもの）
+
+        ``pending`` の段階がすべて揃った時点でtotalを記録する。
+        """
+        if not self.config.enabled:
+            return
+        now = time.monotonic() if now is None else now
+        trace.spans[stage] = ms
+        was_pending = stage in trace.pending
+        trace.pending.discard(stage)
+        if not trace._recorded:
+            # record() がまとめて記録する
+            return
+        self._record_span(trace.source, stage, ms, now)
+        if was_pending and not trace.pending:
+            self._record_span(trace.source, "total", trace.total_ms, now)
+
+    def snapshot(self, traces: int = 20, now: Optional[float] = None) -> dict:
+        """段階別・入力種別ごとの分布と直近トレース"""
+        now = time.monotonic() if now is None else now
+        sources: dict[str, dict] = {}
+        for (source, stage), histogram in self._sources.items():
+            sources.setdefault(source, {})[stage] = histogram.snapshot(now).summary()
+
+        recent = list(self._traces)[-traces:] if traces > 0 else []
+        return {
+            "window_sec": self.config.window_sec,
+            "stages": {
+                stage: histogram.snapshot(now).summary()
+                for stage, histogram in self._stages.items()
+            },
+            "sources": sources,
+            "traces": [trace.to_dict() for trace in reversed(recent)],
+        }
+
+    def clear(self):
+        """全記録を削除"""
+        self._stages.clear()
+        self._sources.clear()
+        self._traces.clear()
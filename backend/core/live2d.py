@@ -1,9 +1,10 @@
 """Live2D Avatar Engine - Live2Dモデル用パラメータ生成"""
 
+import io
 from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
 import numpy as np
 from loguru import logger
@@ -141,6 +142,22 @@ class Live2DConfig:
     )
 
 
+def _read_wav_bytes(audio_data: bytes) -> Optional[tuple[int, np.ndarray]]:
+    """WAVデータをメモリ上で読む（WAVでない・読めない形式ならNone）"""
+    if audio_data[:4] != b"RIFF" or audio_data[8:12] != b"WAVE":
+        return None
+    try:
+        sample_rate, samples = wavfile.read(io.BytesIO(audio_data))
+    except ValueError:
+        return None
+    if samples.dtype == np.uint8:
+        # 8bit（符号なし）はffmpegで変換する
+        return None
+    if samples.ndim > 1:
+        samples = samples.mean(axis=1)
+    return sample_rate, samples
+
+
 class Live2DLipsyncAnalyzer:
     """音声からLive2Dリップシンクパラメータを生成"""
 
@@ -199,9 +216,69 @@ class Live2DLipsyncAnalyzer:
             logger.error(f"Failed to load audio: {e}")
             return self._generate_idle_frames(1000, expression)
 
+        return self._frames_from_samples(samples, sample_rate, expression)
+
+    def analyze_audio_bytes(
+        self,
+        audio_data: bytes,
+        expression: Live2DExpression = Live2DExpression.NEUTRAL,
+    ) -> list[Live2DFrame]:
+        """メモリ上の音声データからLive2Dフレームを生成（ファイルを経由しない）
+
+        WAV（MioTTSのバイナリ応答など）はffmpegを通さずバッファのまま読む。
+
+        Args:
+            audio_data: 音声データ（mp3, wav など ffmpeg が読める形式）
+            expression: 表情プリセット
+
+        Returns:
+            Live2DFrameのリスト
+        """
+        if not HAS_SCIPY_AUDIO:
+            logger.warning("scipy not available, returning idle frames")
+            return self._generate_idle_frames(1000, expression)
+
+        samples_and_rate = _read_wav_bytes(audio_data)
+        if samples_and_rate is not None:
+            sample_rate, samples = samples_and_rate
+            return self._frames_from_samples(samples, sample_rate, expression)
+
+        try:
+            import shutil
+            import subprocess
+
+            ffmpeg = shutil.which("ffmpeg")
+            if not ffmpeg:
+                logger.error("ffmpeg not found")
+                return self._generate_idle_frames(1000, expression)
+
+            # パイプ入出力でwavに変換
+            cmd = [
+                ffmpeg, "-i", "pipe:0",
+                "-ar", "16000",
+                "-ac", "1",
+                "-f", "wav",
+                "pipe:1",
+            ]
+            result = subprocess.run(cmd, input=audio_data, capture_output=True, check=True)
+            sample_rate, samples = wavfile.read(io.BytesIO(result.stdout))
+
+        except Exception as e:
+            logger.error(f"Failed to decode audio: {e}")
+            return self._generate_idle_frames(1000, expression)
+
+        return self._frames_from_samples(samples, sample_rate, expression)
+
+    def _frames_from_samples(
+        self,
+        samples: np.ndarray,
+        sample_rate: int,
+        expression: Live2DExpression,
+    ) -> list[Live2DFrame]:
+        """PCMサンプルからフレームを生成"""
         # 正規化
         samples = samples.astype(np.float32)
-        max_amplitude = np.abs(samples).max()
+        max_amplitude = np.abs(samples).max() if len(samples) else 0.0
         if max_amplitude > 0:
             samples = samples / max_amplitude
 
@@ -454,6 +531,22 @@ class EmotionDrivenLive2D:
 
         return frames
 
+    async def generate_speaking_frames_async(
+        self,
+        text: str,
+        audio_path: Path,
+    ) -> list[Live2DFrame]:
+        """``generate_speaking_frames`` の非同期版（音声解析をCPUプールで実行）"""
+        from .executor import run_cpu
+
+        expression, intensity = self.analyze_text(text)
+        logger.info(f"Detected emotion: {expression.value} (intensity: {intensity:.2f})")
+
+        frames = await run_cpu(self.lipsync_analyzer.analyze_audio, audio_path, expression)
+        self._apply_intensity(frames, intensity)
+
+        return frames
+
     def _apply_intensity(
         self,
         frames: list[Live2DFrame],
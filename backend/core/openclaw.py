@@ -1,11 +1,19 @@
 """OpenClaw Gateway Client - AI応答生成連携"""
 
+import asyncio
+import json
+from contextlib import AsyncExitStack
 from dataclasses import dataclass, field
 from typing import AsyncIterator, Optional
 
 import httpx
 from loguru import logger
 
+from .conversation import ConversationHistory, PromptStats, message_tokens
+from .gateway_pool import GatewayPool, GatewayRoutingConfig
+from .http_pool import HttpClientPool, get_http_pool
+from .warmup import WarmupReport
+
 
 @dataclass
 class OpenClawConfig:
@@ -21,6 +29,15 @@ class OpenClawConfig:
     # ストリーミング設定
     stream: bool = True
 
+    # 会話履歴（トークン予算）
+    history_token_budget: int = 1500   # 要約を除く履歴の最大トークン数
+    summarize_history: bool = True     # 予算から溢れたターンをバックグラウンドで要約する
+    summary_max_tokens: int = 200      # 要約の最大トークン数
+
+    # 複数Gateway（base_url に加えて使うGateway、ヘッジ・ヘルスチェック設定）
+    gateway_urls: list[str] = field(default_factory=list)
+    routing: GatewayRoutingConfig = field(default_factory=GatewayRoutingConfig)
+
 
 @dataclass
 class Message:
@@ -37,45 +54,200 @@ class CompletionResult:
     usage: dict = field(default_factory=dict)
 
 
+class _GatewayStream:
+    """ストリーミング応答（最初の本文チャンクまで受信済み）
+
+    ヘッジは最初のトークンが届くまでの時間で判定するため、
+    Gatewayごとに最初の本文チャンクまで読んでから採用を決める。
+    """
+
+    def __init__(self):
+        self._stack = AsyncExitStack()
+        self._lines: Optional[AsyncIterator[str]] = None
+        self._buffer: list[dict] = []
+        self._done = False
+
+    async def open(self, client: httpx.AsyncClient, payload: dict) -> "_GatewayStream":
+        try:
+            response = await self._stack.enter_async_context(
+                client.stream("POST", "/v1/chat/completions", json=payload)
+            )
+            response.raise_for_status()
+            self._lines = response.aiter_lines()
+            while (data := await self._read()) is not None:
+                self._buffer.append(data)
+                if _delta_content(data):
+                    break
+        except BaseException:
+            await self.aclose()
+            raise
+        return self
+
+    async def _read(self) -> Optional[dict]:
+        """次のSSEイベント（[DONE]・終端ならNone）"""
+        while not self._done and self._lines is not None:
+            try:
+                line = await anext(self._lines)
+            except StopAsyncIteration:
+                break
+            if not line.startswith("data: "):
+                continue
+
+            data_str = line[6:]  # "data: " を除去
+            if data_str == "[DONE]":
+                break
+            try:
+                return json.loads(data_str)
+            except json.JSONDecodeError:
+                continue
+        self._done = True
+        return None
+
+    async def events(self) -> AsyncIterator[dict]:
+        while self._buffer:
+            yield self._buffer.pop(0)
+        while (data := await self._read()) is not None:
+            yield data
+
+    async def aclose(self):
+        await self._stack.aclose()
+
+
+def _delta_content(data: dict) -> str:
+    return (data.get("choices") or [{}])[0].get("delta", {}).get("content", "")
+
+
+def build_headers(config: OpenClawConfig) -> dict[str, str]:
+    """Gatewayへのリクエストヘッダー（共有HTTPクライアント生成にも使用）"""
+    headers = {"Content-Type": "application/json"}
+    if config.api_key:
+        headers["Authorization"] = f"Bearer {config.api_key}"
+    return headers
+
+
 class OpenClawClient:
     """OpenClaw Gateway連携クライアント
 
     OpenClawのchatCompletions APIを使ってAI応答を生成。
     ライブモードでコメントやマイク入力に対して応答を得る。
+    ``gateway_urls`` を指定すると複数のGatewayに振り分ける（``GatewayPool``）。
     """
 
-    def __init__(self, config: Optional[OpenClawConfig] = None):
+    def __init__(
+        self,
+        config: Optional[OpenClawConfig] = None,
+        client: Optional[httpx.AsyncClient] = None,
+        http_pool: Optional[HttpClientPool] = None,
+    ):
+        """
+        Args:
+            config: 接続設定
+            client: base_url用のHTTPクライアント（省略時は共有プールから、close() で閉じない）
+            http_pool: Gateway用の共有クライアントプール（省略時はプロセス全体のプール）
+        """
         self.config = config or OpenClawConfig()
-        self._client: Optional[httpx.AsyncClient] = None
-        self._conversation: list[Message] = []
+        self._client: Optional[httpx.AsyncClient] = client
+        self._http_pool = http_pool or get_http_pool()
+        self._gateways = GatewayPool([self.config.base_url, *self.config.gateway_urls], self.config.routing)
+        self._history = ConversationHistory(
+            token_budget=self.config.history_token_budget,
+            summary_max_tokens=self.config.summary_max_tokens,
+        )
+        self._prompt_stats = PromptStats()
+        self._summary_task: Optional[asyncio.Task] = None
 
     async def _get_client(self) -> httpx.AsyncClient:
-        """HTTPクライアント取得（遅延初期化）"""
-        if self._client is None:
-            headers = {"Content-Type": "application/json"}
-            if self.config.api_key:
-                headers["Authorization"] = f"Bearer {self.config.api_key}"
-
-            self._client = httpx.AsyncClient(
-                base_url=self.config.base_url,
-                headers=headers,
-                timeout=httpx.Timeout(self.config.timeout),
-            )
-        return self._client
+        """base_url用のHTTPクライアント（指定がなければ共有プールから）"""
+        if self._client is not None:
+            return self._client
+        return await self._client_for(self.config.base_url)
+
+    async def _client_for(self, url: str) -> httpx.AsyncClient:
+        """Gatewayごとのクライアント（共有プールから取得）"""
+        if url == self.config.base_url and self._client is not None:
+            return self._client
+        return self._http_pool.client(url, build_headers(self.config), self.config.timeout)
+
+    async def _probe(self, url: str) -> bool:
+        """Gatewayのヘルスチェック"""
+        client = await self._client_for(url)
+        response = await client.get(self.config.routing.health_check_path, timeout=5.0)
+        return response.status_code < 500
+
+    async def _post(self, payload: dict, hedge: bool = True) -> dict:
+        """非ストリーミングのリクエスト（Gatewayの選択・ヘッジ・フェイルオーバーつき）"""
+        async def send(url: str) -> dict:
+            client = await self._client_for(url)
+            response = await client.post("/v1/chat/completions", json=payload)
+            response.raise_for_status()
+            return response.json()
+
+        self._gateways.start_health_checks(self._probe)
+        return await self._gateways.call(send, hedge=hedge)
+
+    async def _open_stream(self, payload: dict) -> _GatewayStream:
+        """ストリーミングのリクエスト（最初のトークンが速いGatewayを採用）"""
+        async def open_stream(url: str) -> _GatewayStream:
+            return await _GatewayStream().open(await self._client_for(url), payload)
+
+        self._gateways.start_health_checks(self._probe)
+        return await self._gateways.call(open_stream, discard=_GatewayStream.aclose)
+
+    async def warm_up(self, report: Optional[WarmupReport] = None) -> WarmupReport:
+        """全Gatewayに疎通確認を送ってHTTPクライアントの作成・接続確立を済ませる
+
+        Args:
+            report: 所要時間の記録先（省略時は新規作成）
+        """
+        report = report or WarmupReport()
+
+        async def ping(url: str):
+            if not await self._probe(url):
+                raise RuntimeError(f"health check failed: {url}")
+
+        self._gateways.start_health_checks(self._probe)
+        await asyncio.gather(*(
+            report.measure(f"gateway {gateway.url}", lambda url=gateway.url: ping(url))
+            for gateway in self._gateways.gateways
+        ))
+        return report
+
+    @property
+    def gateway_stats(self) -> dict:
+        """GatewayごとのEWMA・p95・ヘッジ件数"""
+        return self._gateways.stats
 
     def set_system_prompt(self, prompt: str):
         """システムプロンプト設定（キャラクター設定など）"""
         self.config.system_prompt = prompt
-        self._conversation = []  # 会話リセット
+        self._history.clear()  # 会話リセット
         logger.info(f"System prompt set ({len(prompt)} chars)")
 
     def clear_conversation(self):
         """会話履歴クリア"""
-        self._conversation = []
+        self._history.clear()
         logger.info("Conversation cleared")
 
+    @property
+    def history(self) -> ConversationHistory:
+        """会話履歴（トークン予算つき）"""
+        return self._history
+
+    @property
+    def prompt_stats(self) -> dict:
+        """リクエストごとのプロンプトトークン数と履歴の状態"""
+        return {
+            **self._prompt_stats.to_dict(),
+            "history_tokens": self._history.tokens,
+            "history_turns": len(self._history),
+            "summary_tokens": self._history.summary_tokens,
+        }
+
     def _build_messages(self, user_input: str) -> list[dict]:
-        """API用メッセージリスト構築"""
+        """API用メッセージリスト構築
+
+        システムプロンプト（常に同一内容で先頭）→ 会話の要約 → 予算内の履歴 → 新しい入力
+        """
         messages = []
 
         # システムプロンプト
@@ -85,12 +257,8 @@ class OpenClawClient:
                 "content": self.config.system_prompt,
             })
 
-        # 会話履歴
-        for msg in self._conversation:
-            messages.append({
-                "role": msg.role,
-                "content": msg.content,
-            })
+        # 会話の要約 + 履歴
+        messages.extend(self._history.messages())
 
         # 新しいユーザー入力
         messages.append({
@@ -109,7 +277,6 @@ class OpenClawClient:
         Returns:
             CompletionResult
         """
-        client = await self._get_client()
         messages = self._build_messages(user_input)
 
         payload = {
@@ -121,27 +288,21 @@ class OpenClawClient:
         if self.config.model:
             payload["model"] = self.config.model
 
-        logger.debug(f"OpenClaw request: {user_input[:50]}...")
+        prompt_tokens = _prompt_tokens(messages)
+        logger.debug(f"OpenClaw request ({prompt_tokens} tokens): {user_input[:50]}...")
 
         try:
-            response = await client.post("/v1/chat/completions", json=payload)
-            response.raise_for_status()
-            data = response.json()
+            data = await self._post(payload)
 
             # 応答を抽出
             choice = data.get("choices", [{}])[0]
             text = choice.get("message", {}).get("content", "")
             finish_reason = choice.get("finish_reason")
             usage = data.get("usage", {})
+            self._prompt_stats.record(prompt_tokens, usage.get("prompt_tokens"))
 
             # 会話履歴に追加
-            self._conversation.append(Message(role="user", content=user_input))
-            self._conversation.append(Message(role="assistant", content=text))
-
-            # 履歴が長くなりすぎたら古いものを削除
-            max_history = 20
-            if len(self._conversation) > max_history * 2:
-                self._conversation = self._conversation[-(max_history * 2):]
+            self._add_turn(user_input, text)
 
             logger.info(f"OpenClaw response: {text[:50]}...")
 
@@ -161,13 +322,14 @@ class OpenClawClient:
     async def chat_stream(self, user_input: str) -> AsyncIterator[str]:
         """AI応答を生成（ストリーミング）
 
+        ``IncrementalEmotionAnalyzer.track`` に渡すと文ごとの表情の切り替えも得られる。
+
         Args:
             user_input: ユーザー入力
 
         Yields:
             テキストチャンク
         """
-        client = await self._get_client()
         messages = self._build_messages(user_input)
 
         payload = {
@@ -179,40 +341,31 @@ class OpenClawClient:
         if self.config.model:
             payload["model"] = self.config.model
 
-        logger.debug(f"OpenClaw stream request: {user_input[:50]}...")
+        prompt_tokens = _prompt_tokens(messages)
+        logger.debug(f"OpenClaw stream request ({prompt_tokens} tokens): {user_input[:50]}...")
 
         full_response = ""
+        reported_tokens: Optional[int] = None
 
         try:
-            async with client.stream(
-                "POST",
-                "/v1/chat/completions",
-                json=payload,
-            ) as response:
-                response.raise_for_status()
-
-                async for line in response.aiter_lines():
-                    if not line.startswith("data: "):
-                        continue
-
-                    data_str = line[6:]  # "data: " を除去
-                    if data_str == "[DONE]":
-                        break
-
-                    try:
-                        import json
-                        data = json.loads(data_str)
-                        delta = data.get("choices", [{}])[0].get("delta", {})
-                        content = delta.get("content", "")
-                        if content:
-                            full_response += content
-                            yield content
-                    except json.JSONDecodeError:
-                        continue
+            stream = await self._open_stream(payload)
+            try:
+                async for data in stream.events():
+                    # 最終チャンクにusageを含むGatewayもある
+                    usage = data.get("usage") or {}
+                    if "prompt_tokens" in usage:
+                        reported_tokens = usage["prompt_tokens"]
+                    content = _delta_content(data)
+                    if content:
+                        full_response += content
+                        yield content
+            finally:
+                await stream.aclose()
+
+            self._prompt_stats.record(prompt_tokens, reported_tokens)
 
             # 会話履歴に追加
-            self._conversation.append(Message(role="user", content=user_input))
-            self._conversation.append(Message(role="assistant", content=full_response))
+            self._add_turn(user_input, full_response)
 
             logger.info(f"OpenClaw stream complete: {full_response[:50]}...")
 
@@ -223,11 +376,56 @@ class OpenClawClient:
             logger.error(f"OpenClaw stream failed: {e}")
             raise
 
+    def _add_turn(self, user_input: str, response: str):
+        """履歴に1往復を追加し、予算から溢れたターンを要約に回す"""
+        if not self._history.add_turn(user_input, response):
+            return
+        if not self.config.summarize_history:
+            self._prompt_stats.discarded_turns += self._history.discard_pending()
+            return
+        if self._summary_task is None or self._summary_task.done():
+            self._summary_task = asyncio.create_task(self._compact_history())
+
+    async def _compact_history(self):
+        """要約待ちのターンをローリングサマリーに畳み込む（バックグラウンド）"""
+        while self._history.has_pending:
+            generation = self._history.generation
+            pending = self._history.take_pending()
+            payload = {
+                "messages": self._history.summary_request(pending),
+                "stream": False,
+                "max_tokens": self.config.summary_max_tokens,
+                "temperature": 0.2,
+            }
+            if self.config.model:
+                payload["model"] = self.config.model
+
+            try:
+                # 要約は急がないのでヘッジしない
+                data = await self._post(payload, hedge=False)
+                choice = data.get("choices", [{}])[0]
+                summary = choice.get("message", {}).get("content", "")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # 要約できなかったターンは単純に切り捨てる（既存の要約は維持）
+                self._prompt_stats.summary_failures += 1
+                self._prompt_stats.discarded_turns += len(pending)
+                logger.warning(f"Conversation summary failed, dropped {len(pending)} messages: {e}")
+                continue
+
+            if summary.strip():
+                self._history.set_summary(summary, generation)
+                self._prompt_stats.summaries += 1
+                logger.debug(f"Conversation summarized ({self._history.summary_tokens} tokens)")
+
     async def close(self):
         """クライアントを閉じる"""
-        if self._client:
-            await self._client.aclose()
-            self._client = None
+        if self._summary_task is not None and not self._summary_task.done():
+            self._summary_task.cancel()
+            await asyncio.gather(self._summary_task, return_exceptions=True)
+        self._summary_task = None
+        await self._gateways.stop()
 
     async def __aenter__(self):
         return self
@@ -236,6 +434,11 @@ class OpenClawClient:
         await self.close()
 
 
+def _prompt_tokens(messages: list[dict]) -> int:
+    """送信するメッセージ全体の概算トークン数"""
+    return sum(message_tokens(m["role"], m["content"]) for m in messages)
+
+
 # デフォルトのロビィ用システムプロンプト
 LOBBY_SYSTEM_PROMPT = """あなたは「倉土ロビィ」（くらうど ロビィ）、16歳のロブスターから転生した女の子のVTuberです。
 
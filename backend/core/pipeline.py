@@ -1,5 +1,7 @@
 """Recording Pipeline - 収録ワークフロー統合"""
 
+import asyncio
+import tempfile
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Callable, Optional
@@ -15,9 +17,12 @@ from .avatar import (
     LipsyncConfig,
 )
 from .emotion import Emotion
+from .executor import run_io
 from .subtitle import SubtitleFormat, SubtitleGenerator
 from .tts import TTSClient, TTSConfig
+from .tts_scheduler import TTSPriority
 from .video import VideoComposer, VideoConfig, get_audio_duration_ms
+from .warmup import WarmupConfig, WarmupReport, run_warmup, warmup_wav
 
 
 @dataclass
@@ -57,6 +62,7 @@ class PipelineConfig:
     background_image: Optional[Path] = None
     subtitle: SubtitleConfig = field(default_factory=SubtitleConfig)
     bgm: BGMConfig = field(default_factory=BGMConfig)
+    warmup: WarmupConfig = field(default_factory=WarmupConfig)
 
     @classmethod
     def default(cls, avatar_parts: AvatarParts) -> "PipelineConfig":
@@ -91,12 +97,59 @@ class RecordingPipeline:
         self._lipsync = LipsyncAnalyzer(config.lipsync)
         self._renderer = AvatarRenderer(config.avatar_parts)
         self._composer = VideoComposer(config.video)
+        self.warmup_report: Optional[WarmupReport] = None
+
+    async def warm_up(self, script: Optional[Script] = None) -> WarmupReport:
+        """台本で使う感情のTTSダミー合成とリップシンク解析を一度ずつ実行
+
+        Args:
+            script: 台本（省略時は ``config.warmup.emotions``、未指定ならすべての感情）
+
+        Returns:
+            段階別の所要時間（``warmup_report`` でも参照できる）
+        """
+        warmup = self.config.warmup
+        emotions = warmup.emotions
+        if script is not None:
+            emotions = list(dict.fromkeys(line.emotion.value for line in script.lines))
+        report = WarmupReport()
+
+        # process_line と同じくこのプロセス内で解析する（読み込み・初回実行を済ませる）
+        def lipsync():
+            with tempfile.TemporaryDirectory() as tmp:
+                audio_path = Path(tmp) / "warmup.wav"
+                audio_path.write_bytes(warmup_wav())
+                self._lipsync.analyze_audio(audio_path)
+
+        steps = [
+            self._tts.warm_up(report, warmup.text, emotions),
+            report.measure("lipsync", lambda: run_io(lipsync)),
+        ]
+        self.warmup_report = await run_warmup("Recording", steps, report, warmup.timeout)
+        return self.warmup_report
+
+    async def synthesize_line(self, line: ScriptLine, line_index: int, work_dir: Path) -> Path:
+        """1行の音声を生成して保存
+
+        Returns:
+            音声ファイルのパス
+        """
+        audio_path = work_dir / "audio" / f"{line_index:04d}.mp3"
+        logger.info(f"[{line_index}] TTS: {line.text[:30]}...")
+        await self._tts.synthesize(
+            text=line.text,
+            emotion=line.emotion.value,
+            output_path=audio_path,
+            priority=TTSPriority.RECORDING,
+        )
+        return audio_path
 
     async def process_line(
         self,
         line: ScriptLine,
         line_index: int,
         work_dir: Path,
+        audio_path: Optional[Path] = None,
     ) -> LineResult:
         """1行を処理
 
@@ -104,21 +157,16 @@ class RecordingPipeline:
             line: 台本の行
             line_index: 行番号（0始まり）
             work_dir: 作業ディレクトリ
+            audio_path: 生成済みの音声（省略時はここでTTS生成）
 
         Returns:
             LineResult
         """
-        prefix = f"{line_index:04d}"
-        audio_path = work_dir / "audio" / f"{prefix}.mp3"
-        frames_dir = work_dir / "frames" / prefix
+        frames_dir = work_dir / "frames" / f"{line_index:04d}"
 
         # 1. TTS生成
-        logger.info(f"[{line_index}] TTS: {line.text[:30]}...")
-        await self._tts.synthesize(
-            text=line.text,
-            emotion=line.emotion.value,
-            output_path=audio_path,
-        )
+        if audio_path is None:
+            audio_path = await self.synthesize_line(line, line_index, work_dir)
 
         # 2. リップシンク解析
         logger.info(f"[{line_index}] Lipsync analysis...")
@@ -181,13 +229,30 @@ class RecordingPipeline:
 
         logger.info(f"Processing script: {script.title} ({total} lines)")
 
-        # 各行を処理
-        for i, line in enumerate(script.lines):
+        if self.config.warmup.enabled:
             if progress_callback:
-                progress_callback(i + 1, total, f"Processing line {i + 1}...")
+                progress_callback(0, total, "Warming up...")
+            await self.warm_up(script)
 
-            result = await self.process_line(line, i, work_dir)
-            results.append(result)
+        # TTSは全行を先に投げておく（同時実行数はスケジューラがTTSサーバーの台数に応じて制限）
+        audio_tasks = [
+            asyncio.create_task(self.synthesize_line(line, i, work_dir))
+            for i, line in enumerate(script.lines)
+        ]
+
+        # 各行を処理
+        try:
+            for i, line in enumerate(script.lines):
+                if progress_callback:
+                    progress_callback(i + 1, total, f"Processing line {i + 1}...")
+
+                audio_path = await audio_tasks[i]
+                result = await self.process_line(line, i, work_dir, audio_path=audio_path)
+                results.append(result)
+        finally:
+            for task in audio_tasks:
+                task.cancel()
+            await asyncio.gather(*audio_tasks, return_exceptions=True)
 
         # 字幕を生成
         subtitle_paths: dict[SubtitleFormat, Path] = {}
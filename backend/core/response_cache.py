@@ -0,0 +1,164 @@
+"""Response Cache - 定型コメント用の応答キャッシュ
+
+挨拶や定番の質問など頻出コメントに対して、
+応答テキスト + 合成済み音声 + Live2Dフレームをまとめて保持する。
+ヒット時はOpenClaw / TTS / リップシンク解析をすべて省略できる。
+
+ウォームアップ用YAML例:
+```yaml
+entries:
+  - inputs: ["おはロビィ", "おはよう"]
+    responses:
+      - "おはロビィっす！今日も来てくれてありがとうっす！"
+      - "おはロビィ！朝から元気っすね！"
+  - inputs: ["何歳？"]
+    responses: ["16歳っす！前世はロブスターっすけどね！"]
+```
+"""
+
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+import yaml
+from loguru import logger
+
+from .coalescer import normalize_comment
+from .emotion import EmotionResult, EmotionUpdate
+
+
+@dataclass
+class ResponseCacheConfig:
+    """応答キャッシュ設定"""
+    enabled: bool = True
+    ttl_sec: float = 6 * 3600       # エントリの有効期限
+    max_variants: int = 4           # 1キーあたりの応答バリエーション数
+    max_entries: int = 512          # キーの最大数
+
+
+@dataclass
+class CachedResponse:
+    """キャッシュされた応答（合成済み）"""
+    text: str
+    emotion: EmotionResult
+    audio: bytes = b""
+    audio_path: Optional[Path] = None
+    live2d_frames: Optional[list] = None  # list[Live2DFrame]
+    emotion_updates: list[EmotionUpdate] = field(default_factory=list)  # 文ごとの表情の切り替え
+    created_at: float = field(default_factory=time.monotonic)
+
+
+@dataclass
+class WarmEntry:
+    """ウォームアップ定義の1エントリ"""
+    inputs: list[str]
+    responses: list[str]
+
+
+@dataclass
+class _Slot:
+    variants: list[CachedResponse] = field(default_factory=list)
+    next_index: int = 0
+
+
+class ResponseCache:
+    """正規化入力テキストをキーにした応答キャッシュ
+
+    1キーに複数の応答バリエーションを持ち、ヒットするたびに順番に返す。
+    """
+
+    def __init__(self, config: Optional[ResponseCacheConfig] = None):
+        self.config = config or ResponseCacheConfig()
+        self._slots: dict[str, _Slot] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(text: str) -> str:
+        """キャッシュキー（正規化テキスト）"""
+        return normalize_comment(text)
+
+    def get(self, text: str, now: Optional[float] = None) -> Optional[CachedResponse]:
+        """キャッシュ済み応答を取得（期限切れは破棄）"""
+        if not self.config.enabled:
+            return None
+
+        key = self.make_key(text)
+        slot = self._slots.get(key)
+        if slot is not None:
+            now = time.monotonic() if now is None else now
+            slot.variants = [
+                v for v in slot.variants if now - v.created_at < self.config.ttl_sec
+            ]
+            if not slot.variants:
+                del self._slots[key]
+                slot = None
+
+        if slot is None:
+            self.misses += 1
+            return None
+
+        variant = slot.variants[slot.next_index % len(slot.variants)]
+        slot.next_index += 1
+        self.hits += 1
+        return variant
+
+    def put(self, text: str, response: CachedResponse):
+        """応答を登録（バリエーション上限を超えたら古いものから置換）"""
+        key = self.make_key(text)
+        if not key:
+            return
+
+        slot = self._slots.get(key)
+        if slot is None:
+            if len(self._slots) >= self.config.max_entries:
+                # 最も古く登録されたキーを削除
+                del self._slots[next(iter(self._slots))]
+            slot = self._slots[key] = _Slot()
+
+        slot.variants.append(response)
+        if len(slot.variants) > self.config.max_variants:
+            slot.variants.pop(0)
+
+    def clear(self):
+        """全エントリ削除"""
+        self._slots.clear()
+
+    @property
+    def stats(self) -> dict:
+        """ヒット率などの統計"""
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._slots),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+        }
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+
+def load_warm_entries(path: Path) -> list[WarmEntry]:
+    """ウォームアップ定義YAMLを読み込み
+
+    トップレベルが ``entries:`` のマッピング、またはエントリのリストを受け付ける。
+    """
+    with path.open(encoding="utf-8") as f:
+        data = yaml.safe_load(f) or []
+
+    if isinstance(data, dict):
+        data = data.get("entries", [])
+
+    entries = []
+    for item in data:
+        inputs = item.get("inputs") or ([item["input"]] if item.get("input") else [])
+        responses = item.get("responses") or ([item["response"]] if item.get("response") else [])
+        if not inputs or not responses:
+            logger.warning(f"Skipping cache entry without inputs/responses: {item}")
+            continue
+        entries.append(WarmEntry(inputs=list(inputs), responses=list(responses)))
+
+    logger.info(f"Loaded {len(entries)} response cache entries: {path}")
+    return entries
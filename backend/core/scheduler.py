@@ -0,0 +1,368 @@
+"""Input Scheduler - 複数配信プラットフォームの入力スケジューリング
+
+YouTube / Twitch など複数のチャットを1つのLiveModeで同時に扱うため、
+プラットフォームごとのレーンに入力を振り分け、ラウンドロビンで交互に取り出す。
+
+- スパチャ/Bits等の優先入力は通常入力より先に、重み（金額・Bits・ティア）の大きい順に取り出す。
+  待ち時間に応じて重みを加算（エージング）し、少額の入力が取り残されないようにする
+- 通常入力はプラットフォームごとの流量上限（件/分）を超えた分を後回しにする
+- 通常入力は投稿者ごとのトークンバケットを超えた分を受け付けない（連投対策）
+- キューが満杯のときは最も多く積まれているプラットフォームの最古の入力を押し出す
+  （優先入力はそのプラットフォームで最も重みの小さい入力）
+
+いずれの操作も入力件数 n に対して O(log n)（ヒープ + 遅延削除）。
+"""
+
+import heapq
+import itertools
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Generic, Iterator, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass
+class RateCap:
+    """トークンバケットによる流量上限"""
+    per_min: float
+    burst: float = 0.0  # 0の場合は per_min / 6（10秒分）
+    tokens: float = field(init=False)
+    updated_at: Optional[float] = field(default=None, init=False)
+
+    def __post_init__(self):
+        if self.burst <= 0:
+            self.burst = max(1.0, self.per_min / 6)
+        self.tokens = self.burst
+
+    def _refill(self, now: float):
+        if self.updated_at is not None:
+            self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.per_min / 60)
+        self.updated_at = now
+
+    def available(self, now: float) -> bool:
+        self._refill(now)
+        return self.tokens >= 1.0
+
+    def consume(self, now: float):
+        self._refill(now)
+        self.tokens -= 1.0
+
+
+@dataclass
+class LaneStats:
+    """プラットフォーム別の統計"""
+    enqueued: int = 0
+    dequeued: int = 0
+    evicted: int = 0
+    rate_limited: int = 0  # 流量上限で後回しにした回数
+    author_limited: int = 0  # 投稿者ごとの上限で受け付けなかった件数
+
+    def to_dict(self) -> dict:
+        return {
+            "enqueued": self.enqueued,
+            "dequeued": self.dequeued,
+            "evicted": self.evicted,
+            "rate_limited": self.rate_limited,
+            "author_limited": self.author_limited,
+        }
+
+
+class _WeightedEntry(Generic[T]):
+    """優先キューの要素
+
+    時刻 t での優先度は ``weight + aging_per_sec * (t - enqueued_at)``。
+    ``rank = weight - aging_per_sec * enqueued_at`` は時刻によらない定数なので、
+    rank の順序がそのまま優先度の順序になりヒープで扱える。
+    """
+
+    __slots__ = ("rank", "seq", "item", "platform", "alive")
+
+    def __init__(self, rank: float, seq: int, item: T, platform: str):
+        self.rank = rank
+        self.seq = seq
+        self.item = item
+        self.platform = platform
+        self.alive = True
+
+
+class PriorityLane(Generic[T]):
+    """プラットフォームの優先レーン（重み付きキューへのビュー）"""
+
+    def __init__(self, scheduler: "FairScheduler[T]", platform: str):
+        self._scheduler = scheduler
+        self.platform = platform
+
+    def append(self, item: T, weight: float = 1.0):
+        self._scheduler.push(item, self.platform, priority=True, weight=weight)
+
+    def __iter__(self) -> Iterator[T]:
+        return self._scheduler._iter_priority(self.platform)
+
+    def __len__(self) -> int:
+        return self._scheduler._priority_counts.get(self.platform, 0)
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+
+class FairScheduler(Generic[T]):
+    """プラットフォーム間で公平に入力を取り出すスケジューラ
+
+    Args:
+        max_size: 通常入力の上限（全プラットフォーム合計）
+        priority_max_size: プラットフォームごとの優先入力の上限
+        aging_per_sec: 優先入力が1秒待つごとに加算する重み
+        author_rate_per_min: 投稿者ごとの通常入力の上限（件/分、Noneで無制限）
+        author_burst: 投稿者ごとの連投許容数
+        max_authors: 保持する投稿者バケット数（古いものから破棄）
+    """
+
+    def __init__(
+        self,
+        max_size: int = 50,
+        priority_max_size: int = 20,
+        aging_per_sec: float = 0.05,
+        author_rate_per_min: Optional[float] = None,
+        author_burst: float = 3.0,
+        max_authors: int = 10000,
+    ):
+        self.max_size = max_size
+        self.priority_max_size = priority_max_size
+        self.aging_per_sec = aging_per_sec
+        self.author_rate_per_min = author_rate_per_min
+        self.author_burst = author_burst
+        self.max_authors = max_authors
+        self._lanes: dict[str, deque[T]] = {}
+        self._rate_caps: dict[str, RateCap] = {}
+        self._stats: dict[str, LaneStats] = {}
+        self._order: list[str] = []  # ラウンドロビン順
+        self._cursor = 0
+
+        # 優先入力: 全体の最大ヒープ（取り出し用）+ プラットフォームごとの最小ヒープ（押し出し用）
+        self._priority_heap: list[tuple[float, int, _WeightedEntry[T]]] = []
+        self._platform_heaps: dict[str, list[tuple[float, int, _WeightedEntry[T]]]] = {}
+        self._priority_counts: dict[str, int] = {}
+        self._priority_size = 0
+        self._seq = itertools.count()
+
+        # 投稿者ごとのトークンバケット（LRU）
+        self._authors: OrderedDict[str, RateCap] = OrderedDict()
+
+    def _register(self, platform: str):
+        if platform not in self._stats:
+            self._stats[platform] = LaneStats()
+            self._lanes[platform] = deque()
+            self._platform_heaps[platform] = []
+            self._priority_counts[platform] = 0
+            self._order.append(platform)
+
+    def lane(self, platform: str, priority: bool = False) -> "deque[T] | PriorityLane[T]":
+        """プラットフォームのレーン（なければ作成）"""
+        self._register(platform)
+        return PriorityLane(self, platform) if priority else self._lanes[platform]
+
+    def set_rate_limit(self, platform: str, per_min: Optional[float], burst: float = 0.0):
+        """通常入力の流量上限を設定（None/0で解除）"""
+        self._register(platform)
+        if per_min:
+            self._rate_caps[platform] = RateCap(per_min=per_min, burst=burst)
+        else:
+            self._rate_caps.pop(platform, None)
+
+    def _author_allows(self, author: str, now: float) -> bool:
+        """投稿者のトークンを1つ消費（上限超過ならFalse）"""
+        cap = self._authors.get(author)
+        if cap is None:
+            cap = RateCap(per_min=self.author_rate_per_min, burst=self.author_burst)
+            self._authors[author] = cap
+            if len(self._authors) > self.max_authors:
+                self._authors.popitem(last=False)
+        else:
+            self._authors.move_to_end(author)
+        if not cap.available(now):
+            return False
+        cap.consume(now)
+        return True
+
+    def push(
+        self,
+        item: T,
+        platform: str,
+        priority: bool = False,
+        weight: float = 1.0,
+        author: Optional[str] = None,
+        now: Optional[float] = None,
+    ) -> Optional[T]:
+        """入力を追加
+
+        Args:
+            item: 入力
+            platform: レーン名
+            priority: 優先入力か
+            weight: 優先入力の重み（大きいほど先に取り出す）
+            author: 投稿者キー（通常入力の連投制限に使用）
+            now: 現在時刻（time.monotonic基準、テスト用）
+
+        Returns:
+            押し出された入力（満杯でなければNone）。
+            追加した入力自体が受け付けられなかった場合はその入力を返す
+        """
+        self._register(platform)
+        stats = self._stats[platform]
+        now = time.monotonic() if now is None else now
+
+        if priority:
+            stats.enqueued += 1
+            return self._push_priority(item, platform, weight, now)
+
+        if author and self.author_rate_per_min and not self._author_allows(author, now):
+            stats.author_limited += 1
+            return item
+
+        stats.enqueued += 1
+        evicted = None
+        if self.normal_size >= self.max_size:
+            # 最も多く積んでいるプラットフォームから押し出す
+            victim = max(self._order, key=lambda p: len(self._lanes[p]))
+            if self._lanes[victim]:
+                evicted = self._lanes[victim].popleft()
+                self._stats[victim].evicted += 1
+        self._lanes[platform].append(item)
+        return evicted
+
+    def _push_priority(self, item: T, platform: str, weight: float, now: float) -> Optional[T]:
+        rank = weight - self.aging_per_sec * now
+        evicted = None
+
+        if self._priority_counts[platform] >= self.priority_max_size:
+            lowest = self._peek_lowest(platform)
+            if lowest is not None and lowest.rank >= rank:
+                # 既存の入力の方が優先度が高いので新しい入力を受け付けない
+                self._stats[platform].evicted += 1
+                return item
+            if lowest is not None:
+                heapq.heappop(self._platform_heaps[platform])
+                self._discard(lowest)
+                self._stats[platform].evicted += 1
+                evicted = lowest.item
+
+        seq = next(self._seq)
+        entry = _WeightedEntry(rank, seq, item, platform)
+        heapq.heappush(self._priority_heap, (-rank, seq, entry))
+        heapq.heappush(self._platform_heaps[platform], (rank, -seq, entry))
+        self._priority_counts[platform] += 1
+        self._priority_size += 1
+        if evicted is not None:
+            self._compact(platform)
+        return evicted
+
+    def _discard(self, entry: _WeightedEntry[T]):
+        entry.alive = False
+        self._priority_counts[entry.platform] -= 1
+        self._priority_size -= 1
+
+    def _peek_lowest(self, platform: str) -> Optional[_WeightedEntry[T]]:
+        """プラットフォームで最も優先度の低い入力（取り出し済みの要素は捨てる）"""
+        heap = self._platform_heaps[platform]
+        while heap and not heap[0][2].alive:
+            heapq.heappop(heap)
+        return heap[0][2] if heap else None
+
+    def _pop_priority(self) -> Optional[T]:
+        heap = self._priority_heap
+        while heap:
+            _, _, entry = heapq.heappop(heap)
+            if not entry.alive:
+                continue
+            self._discard(entry)
+            self._stats[entry.platform].dequeued += 1
+            self._compact(entry.platform)
+            return entry.item
+        return None
+
+    def _compact(self, platform: str):
+        """取り出し・押し出し済みの要素がたまったらヒープを作り直す（全体の最大ヒープも同じ基準）"""
+        heap = self._platform_heaps[platform]
+        if len(heap) > 2 * self._priority_counts[platform] + 64:
+            self._platform_heaps[platform] = [e for e in heap if e[2].alive]
+            heapq.heapify(self._platform_heaps[platform])
+        if len(self._priority_heap) > 2 * self._priority_size + 64:
+            self._priority_heap = [e for e in self._priority_heap if e[2].alive]
+            heapq.heapify(self._priority_heap)
+
+    def _iter_priority(self, platform: str) -> Iterator[T]:
+        """プラットフォームの優先入力（順不同）"""
+        return (e[2].item for e in self._platform_heaps.get(platform, []) if e[2].alive)
+
+    def _next_from(self, lanes: dict[str, deque[T]], cursor: int, now: Optional[float]):
+        """cursor位置から順に取り出せるレーンを探す（now指定時は流量上限を適用）"""
+        count = len(self._order)
+        for offset in range(count):
+            index = (cursor + offset) % count
+            platform = self._order[index]
+            lane = lanes[platform]
+            if not lane:
+                continue
+            if now is not None:
+                cap = self._rate_caps.get(platform)
+                if cap is not None and not cap.available(now):
+                    self._stats[platform].rate_limited += 1
+                    continue
+                if cap is not None:
+                    cap.consume(now)
+            self._stats[platform].dequeued += 1
+            return lane.popleft(), (index + 1) % count
+        return None, cursor
+
+    def pop(self, now: Optional[float] = None) -> Optional[T]:
+        """次の入力を取り出す（優先入力 → 通常レーン）
+
+        Returns:
+            入力（取り出せるものがなければNone）
+        """
+        if not self._order:
+            return None
+
+        item = self._pop_priority()
+        if item is not None:
+            return item
+
+        now = time.monotonic() if now is None else now
+        item, self._cursor = self._next_from(self._lanes, self._cursor, now)
+        return item
+
+    def clear(self):
+        """全レーンを空にする"""
+        for lane in self._lanes.values():
+            lane.clear()
+        self._priority_heap.clear()
+        for platform, heap in self._platform_heaps.items():
+            heap.clear()
+            self._priority_counts[platform] = 0
+        self._priority_size = 0
+
+    @property
+    def normal_size(self) -> int:
+        return sum(len(lane) for lane in self._lanes.values())
+
+    @property
+    def priority_size(self) -> int:
+        return self._priority_size
+
+    @property
+    def stats(self) -> dict:
+        """プラットフォーム別の件数と統計"""
+        return {
+            platform: {
+                "queued": len(self._lanes[platform]),
+                "priority_queued": self._priority_counts[platform],
+                "rate_limit_per_min": cap.per_min if (cap := self._rate_caps.get(platform)) else None,
+                **self._stats[platform].to_dict(),
+            }
+            for platform in self._order
+        }
+
+    def __len__(self) -> int:
+        return self.normal_size + self.priority_size
@@ -0,0 +1,66 @@
+"""Shared Resources - 複数のLiveModeインスタンスで共有するリソース
+
+1プロセスで複数キャラクターを配信する場合に、
+HTTP接続プール・音声ストア・感情分析器・リップシンク解析器を
+インスタンス間で共有してメモリと接続数を抑える。
+"""
+
+from typing import Optional
+
+import httpx
+
+from .audio_store import AudioBlobStore
+from .emotion import EmotionAnalyzer
+from .http_pool import HttpClientPool, HttpPoolConfig
+from .live2d import Live2DConfig, Live2DLipsyncAnalyzer
+
+
+class SharedResources:
+    """インスタンス間で共有するリソース
+
+    HTTPクライアントは (base_url, ヘッダー) ごとに1つ作り、同じ接続先のインスタンスで使い回す。
+    共有クライアントは ``close()`` でまとめて閉じる（各インスタンス側では閉じない）。
+    ``http_pool`` にプロセス全体のプール（``get_http_pool()``）を渡した場合、
+    そのプールはアプリのlifespanで閉じるため ``close()`` では閉じない。
+    """
+
+    def __init__(
+        self,
+        audio_store_max_bytes: int = 256 * 1024 * 1024,
+        max_connections: int = 100,
+        http_pool: Optional[HttpClientPool] = None,
+    ):
+        self.audio_store = AudioBlobStore(audio_store_max_bytes)
+        self.emotion = EmotionAnalyzer()
+        self._live2d: Optional[Live2DLipsyncAnalyzer] = None
+        self._owns_pool = http_pool is None
+        self.http_pool = http_pool or HttpClientPool(HttpPoolConfig(max_connections=max_connections))
+
+    @property
+    def live2d(self) -> Live2DLipsyncAnalyzer:
+        """リップシンク解析器（初回利用時に生成）"""
+        if self._live2d is None:
+            self._live2d = Live2DLipsyncAnalyzer(Live2DConfig())
+        return self._live2d
+
+    def http_client(
+        self,
+        base_url: str = "",
+        headers: Optional[dict[str, str]] = None,
+        timeout: float = 30.0,
+    ) -> httpx.AsyncClient:
+        """接続先ごとの共有HTTPクライアント"""
+        return self.http_pool.client(base_url, headers, timeout)
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "http_clients": self.http_pool.stats["clients"],
+            "audio_store": self.audio_store.stats,
+        }
+
+    async def close(self):
+        """共有HTTPクライアントを閉じる"""
+        if self._owns_pool:
+            await self.http_pool.close()
+        self.audio_store.clear()
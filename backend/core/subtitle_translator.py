@@ -80,21 +80,32 @@ class SubtitleTranslator:
     LLMを使った高品質な翻訳を実現。
     """
 
-    def __init__(self, config: Optional[TranslatorConfig] = None):
+    def __init__(
+        self,
+        config: Optional[TranslatorConfig] = None,
+        client: Optional[httpx.AsyncClient] = None,
+    ):
+        """
+        Args:
+            config: 翻訳設定
+            client: 共有HTTPクライアント（指定時は close() で閉じない）
+        """
         self.config = config or TranslatorConfig()
-        self._client: Optional[httpx.AsyncClient] = None
+        self._client: Optional[httpx.AsyncClient] = client
+        self._owns_client = client is None
 
     async def _get_client(self) -> httpx.AsyncClient:
         """HTTPクライアント取得"""
         if self._client is None:
             self._client = httpx.AsyncClient(timeout=60.0)
+            self._owns_client = True
         return self._client
 
     async def close(self):
         """クライアントクローズ"""
-        if self._client:
+        if self._client and self._owns_client:
             await self._client.aclose()
-            self._client = None
+        self._client = None
 
     def _get_language_name(self, code: str) -> str:
         """言語コードから言語名を取得"""
@@ -2,29 +2,57 @@
 
 import asyncio
 import base64
-from dataclasses import dataclass
+import json
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional
+from typing import AsyncIterator, Optional
 
 import httpx
 from loguru import logger
 
+from .executor import run_io
+from .http_pool import get_http_pool
+from .tts_pool import TTSEndpointPool, get_tts_pool
+from .tts_scheduler import TTSPriority, TTSScheduler, get_tts_scheduler
+from .warmup import WarmupReport
+
 
 @dataclass
 class TTSConfig:
     """TTS設定"""
     provider: str = "miotts"  # "qwen3-tts", "miotts", or "openai"
     base_url: str = "http://localhost:8001"
+    endpoints: list[str] = field(default_factory=list)  # base_url と同じ声の追加TTSサーバー（負荷分散）
     voice: str = "lobby"  # MioTTS preset_id or OpenAI voice
     api_key: str = "not-needed"
     model: str = ""
     response_format: str = "base64"  # MioTTS: "wav" or "base64" (base64 returns JSON)
+    binary_transport: bool = True  # MioTTS: base64設定でも対応サーバーにはWAVをバイナリで要求する（自動判定）
+    stream_format: str = "wav"  # synthesize_stream() で要求する形式（"wav" / "pcm" / "mp3"）
+    stream_chunk_size: int = 4096  # synthesize_stream() が返すチャンクの目安サイズ
 
     # リトライ設定
     max_retries: int = 3           # 最大リトライ回数
     retry_base_delay: float = 1.0  # リトライ基本待機秒（指数バックオフ）
     retry_max_delay: float = 30.0  # リトライ最大待機秒
 
+    # スケジューラ設定（接続先ごとに共有、最初に使った設定が有効）
+    max_in_flight: int = 4         # サーバー1台あたりの同時リクエスト数
+    batch_size: int = 1            # 一括合成でまとめる最大件数（MioTTS /v1/tts/batch 対応サーバーのみ、1で無効）
+    batch_max_chars: int = 40      # 一括合成の対象にするテキストの最大文字数
+
+    request_timeout: float = 120.0  # 1リクエストのタイムアウト秒（共有クライアント指定時はそちらの設定）
+    live_timeout: float = 10.0      # ライブ配信の応答（TTSPriority.LIVE）の1リクエストのタイムアウト秒（0で request_timeout）
+
+    # サーバーごとのサーキットブレーカー・複数サーバー構成（endpoints 指定時）
+    max_failures: int = 3              # 連続失敗でこの回数に達したらブレーカーを開く（送らない）
+    eject_sec: float = 30.0            # ブレーカーを開いている時間（過ぎたら試しに1件送る）
+    slow_call_ms: float = 0.0          # これより遅い応答も失敗として数える（0で無効）
+    health_check_interval: float = 10.0  # ヘルスチェック・プリセット取得の間隔（0で無効）
+
+    # フォールバック（主系が失敗・ブレーカーが開いている間に順に試す別のTTS）
+    fallbacks: list["TTSConfig"] = field(default_factory=list)
+
     # 感情マッピング
     emotion_prompts: dict[str, str] | None = None
 
@@ -39,6 +67,11 @@ class TTSConfig:
                 "neutral": "",
             }
 
+    @property
+    def urls(self) -> list[str]:
+        """全TTSサーバーのURL（base_url が先頭、重複は除く）"""
+        return list(dict.fromkeys([self.base_url, *self.endpoints]))
+
 
 class TTSClient:
     """マルチプロバイダーTTS APIクライアント"""
@@ -46,9 +79,22 @@ class TTSClient:
     # リトライ対象のHTTPステータスコード
     _RETRYABLE_STATUS_CODES = {502, 503, 504, 429}
 
-    def __init__(self, config: TTSConfig | None = None):
+    def __init__(self, config: TTSConfig | None = None, client: httpx.AsyncClient | None = None):
+        """
+        Args:
+            config: TTS設定
+            client: HTTPクライアント（省略時は共有プールのクライアント、どちらも close() で閉じない）
+        """
         self.config = config or TTSConfig()
-        self._client = httpx.AsyncClient(timeout=120.0)
+        self._http_client = client
+        self._fallbacks: Optional[list["TTSClient"]] = None
+
+    @property
+    def _client(self) -> httpx.AsyncClient:
+        """HTTPクライアント（指定がなければ共有プールから、イベントループごとに取得）"""
+        if self._http_client is not None:
+            return self._http_client
+        return get_http_pool().client(timeout=self.config.request_timeout)
 
     async def _retry_with_backoff(self, func, description: str = "request"):
         """指数バックオフ付きリトライラッパー
@@ -71,8 +117,8 @@ class TTSClient:
                 last_exc = e
                 if e.response.status_code not in self._RETRYABLE_STATUS_CODES:
                     raise  # リトライ不可能なエラーは即座に送出
-                if attempt >= self.config.max_retries:
-                    raise
+                if attempt >= self.config.max_retries or self.pool.is_open:
+                    raise  # ブレーカーが開いたら待たずにフォールバックへ
                 delay = min(
                     self.config.retry_base_delay * (2 ** attempt),
                     self.config.retry_max_delay,
@@ -84,7 +130,7 @@ class TTSClient:
                 await asyncio.sleep(delay)
             except (httpx.ConnectError, httpx.ConnectTimeout) as e:
                 last_exc = e
-                if attempt >= self.config.max_retries:
+                if attempt >= self.config.max_retries or self.pool.is_open:
                     raise
                 delay = min(
                     self.config.retry_base_delay * (2 ** attempt),
@@ -97,60 +143,341 @@ class TTSClient:
                 await asyncio.sleep(delay)
         raise last_exc  # unreachable but satisfies type checker
 
+    @property
+    def scheduler(self) -> TTSScheduler:
+        """接続先ごとの共有スケジューラ"""
+        return get_tts_scheduler(self.config)
+
+    @property
+    def pool(self) -> TTSEndpointPool:
+        """接続先ごとの共有サーバープール（複数台なら定期ヘルスチェックも開始）"""
+        pool = get_tts_pool(self.config)
+        if pool.needs_health_checks:
+            # ヘルスチェックはこのクライアントを閉じた後も続くので共有HTTPクライアントを使う
+            pool.start_health_checks(TTSClient(self.config, client=get_http_pool().client(timeout=10.0)))
+        return pool
+
+    @property
+    def fallbacks(self) -> list["TTSClient"]:
+        """フォールバック先のクライアント（``config.fallbacks`` の順）"""
+        if self._fallbacks is None:
+            self._fallbacks = [TTSClient(config) for config in self.config.fallbacks]
+        return self._fallbacks
+
+    async def _with_fallback(self, primary, fallback, description: str):
+        """主系で失敗したらフォールバック先を順に試す
+
+        Args:
+            primary: 主系で実行するasync callable
+            fallback: フォールバック先のクライアントを受け取るasync callable
+            description: ログ用の説明
+        """
+        try:
+            return await primary()
+        except Exception as e:
+            if not self.config.fallbacks:
+                raise
+            last_exc: Exception = e
+        for client in self.fallbacks:
+            logger.warning(
+                f"TTS {description} failed ({type(last_exc).__name__}: {last_exc}), "
+                f"falling back to {client.config.provider} {client.config.base_url}"
+            )
+            try:
+                return await fallback(client)
+            except Exception as e:
+                last_exc = e
+        raise last_exc
+
+    @property
+    def supports_batch(self) -> bool:
+        """一括合成を使うか"""
+        return self.config.provider == "miotts" and self.config.batch_size > 1
+
     async def synthesize(
         self,
         text: str,
         emotion: str = "neutral",
         output_path: Optional[Path] = None,
+        priority: TTSPriority = TTSPriority.NORMAL,
     ) -> bytes:
         """テキストを音声に変換
 
+        接続先ごとのスケジューラを通すため、同時実行数の上限を超える分は優先度順に待つ。
+
         Args:
             text: 変換するテキスト
             emotion: 感情タグ（happy, sad, excited, angry, surprised, neutral）
             output_path: 出力ファイルパス（指定時はファイルにも保存）
+            priority: 優先度（ライブ配信 > 単発 > 収録）
 
         Returns:
             音声データ（bytes）
         """
+        audio_data = await self.scheduler.submit(self, text, emotion, priority)
+
+        if output_path:
+            await run_io(_write_file, output_path, audio_data)
+            logger.info(f"Audio saved: {output_path}")
+
+        return audio_data
+
+    def _timeout(self, priority: TTSPriority):
+        """1リクエストのタイムアウト（ライブ配信の応答はハングしたサーバーを早めに失敗とみなす）"""
+        if priority == TTSPriority.LIVE and self.config.live_timeout > 0:
+            return self.config.live_timeout
+        return httpx.USE_CLIENT_DEFAULT
+
+    async def _synthesize_with_retry(
+        self, text: str, emotion: str, priority: TTSPriority = TTSPriority.NORMAL,
+    ) -> bytes:
+        """1件の音声合成（リトライ・フォールバックつき、スケジューラから呼ばれる）"""
+        return await self._with_fallback(
+            lambda: self._synthesize_primary(text, emotion, priority),
+            lambda client: client._synthesize_with_retry(text, emotion, priority),
+            description="synthesis",
+        )
+
+    async def _synthesize_primary(self, text: str, emotion: str, priority: TTSPriority) -> bytes:
+        """主系サーバーでの音声合成（リトライつき）"""
         if self.config.provider == "miotts":
             audio_data = await self._retry_with_backoff(
-                lambda: self._synthesize_miotts(text, emotion),
+                lambda: self.pool.call(
+                    lambda url: self._synthesize_miotts(text, emotion, url, priority), self.config.voice,
+                ),
                 description=f"MioTTS ({text[:30]}...)" if len(text) > 30 else f"MioTTS ({text})",
             )
         else:
             audio_data = await self._retry_with_backoff(
-                lambda: self._synthesize_openai(text, emotion),
+                lambda: self.pool.call(
+                    lambda url: self._synthesize_openai(text, emotion, url, priority), self.config.voice,
+                ),
                 description=f"OpenAI TTS ({text[:30]}...)" if len(text) > 30 else f"OpenAI TTS ({text})",
             )
+        return audio_data
 
-        if output_path:
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-            output_path.write_bytes(audio_data)
-            logger.info(f"Audio saved: {output_path}")
+    async def _synthesize_batch(
+        self, items: list[tuple[str, str]], priority: TTSPriority = TTSPriority.NORMAL,
+    ) -> list[bytes]:
+        """複数テキストを1リクエストで合成（MioTTS /v1/tts/batch、スケジューラから呼ばれる）
 
-        return audio_data
+        一括合成の応答は複数の音声を1つのJSONで返す形式しかないため、``binary_transport`` は使わず
+        常にbase64で受け取る（対象は ``batch_max_chars`` 以下の短いテキストのみ）。
+        """
+        payload = {"items": [self._miotts_payload(text, self.config.response_format) for text, _ in items]}
+
+        async def request(base_url: str) -> list[bytes]:
+            response = await self._client.post(
+                f"{base_url}/v1/tts/batch", json=payload, timeout=self._timeout(priority),
+            )
+            response.raise_for_status()
+            audios = response.json().get("audios", [])
+            if len(audios) != len(items):
+                raise ValueError(f"Unexpected MioTTS batch response: {len(audios)} audios for {len(items)} texts")
+            return [base64.b64decode(audio) for audio in audios]
+
+        async def fallback(client: "TTSClient") -> list[bytes]:
+            # フォールバック先は一括合成に対応しているとは限らないので1件ずつ
+            return list(await asyncio.gather(
+                *(client._synthesize_with_retry(text, emotion, priority) for text, emotion in items)
+            ))
+
+        logger.debug(f"MioTTS batch request: {len(items)} texts")
+        return await self._with_fallback(
+            lambda: self._retry_with_backoff(
+                lambda: self.pool.call(request, self.config.voice),
+                description=f"MioTTS batch ({len(items)} texts)",
+            ),
+            fallback,
+            description="batch synthesis",
+        )
+
+    async def synthesize_stream(
+        self,
+        text: str,
+        emotion: str = "neutral",
+    ) -> AsyncIterator[bytes]:
+        """テキストを音声に変換（ストリーミング）
+
+        サーバーが生成した順に音声チャンクを返すので、最初のチャンクから再生・リップシンク解析を始められる。
+        - OpenAI互換: ``stream: true`` で ``/v1/audio/speech`` のチャンク転送を読む
+        - MioTTS: ``output.stream`` を指定したチャンク転送（JSONで返すサーバーは一括で返す）
 
-    async def _synthesize_miotts(self, text: str, emotion: str) -> bytes:
-        """MioTTS APIで音声合成"""
-        url = f"{self.config.base_url}/v1/tts"
+        最初のチャンクを受け取る前の失敗のみリトライし、それでも失敗した場合
+        （ブレーカーが開いている場合を含む）はフォールバック先のストリームに切り替える。
+
+        Args:
+            text: 変換するテキスト
+            emotion: 感情タグ
 
-        payload = {
+        Yields:
+            音声データのチャンク（``stream_format`` 形式）
+        """
+        if self.config.provider == "miotts":
+            path = "/v1/tts"
+            payload = self._miotts_payload(text, self.config.stream_format)
+            payload["output"]["stream"] = True
+            headers = None
+            label = "MioTTS stream"
+        else:
+            path = "/v1/audio/speech"
+            payload = self._openai_payload(text, emotion, self.config.stream_format)
+            payload["stream"] = True
+            headers = self._openai_headers()
+            label = "OpenAI TTS stream"
+
+        pool = self.pool
+        endpoint = None
+
+        async def open_stream() -> httpx.Response:
+            nonlocal endpoint
+            endpoint = pool.lease(self.config.voice)
+            try:
+                request = self._client.build_request("POST", f"{endpoint.url}{path}", json=payload, headers=headers)
+                response = await self._client.send(request, stream=True)
+            except BaseException as e:
+                pool.release(endpoint, e)
+                raise
+            try:
+                response.raise_for_status()
+            except httpx.HTTPStatusError as e:
+                await response.aclose()
+                pool.release(endpoint, e)
+                raise
+            return response
+
+        logger.debug(f"{label} request: {text[:50]}...")
+        try:
+            response = await self._retry_with_backoff(
+                open_stream,
+                description=f"{label} ({text[:30]}...)" if len(text) > 30 else f"{label} ({text})",
+            )
+        except Exception as e:
+            if not self.config.fallbacks:
+                raise
+            last_exc: Exception = e
+            for client in self.fallbacks:
+                logger.warning(
+                    f"{label} failed ({type(last_exc).__name__}: {last_exc}), "
+                    f"falling back to {client.config.provider} {client.config.base_url}"
+                )
+                started = False
+                try:
+                    async for chunk in client.synthesize_stream(text, emotion):
+                        started = True
+                        yield chunk
+                    return
+                except Exception as fallback_exc:
+                    if started:
+                        raise  # 途中まで返したストリームはやり直せない
+                    last_exc = fallback_exc
+            raise last_exc
+
+        error: Optional[BaseException] = None
+        try:
+            if _is_json_response(response):
+                # チャンク転送に対応していないサーバー → base64のJSONを一括で返す
+                result = json.loads(await response.aread())
+                if "audio" not in result:
+                    raise ValueError(f"Unexpected TTS stream response: {result}")
+                yield base64.b64decode(result["audio"])
+                return
+
+            async for chunk in response.aiter_bytes(self.config.stream_chunk_size):
+                yield chunk
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            await response.aclose()
+            pool.release(endpoint, error)
+
+    def _miotts_payload(self, text: str, output_format: str) -> dict:
+        return {
             "text": text,
             "reference": {
                 "type": "preset",
                 "preset_id": self.config.voice,
             },
             "output": {
-                "format": self.config.response_format,
+                "format": output_format,
             },
         }
 
+    def _openai_payload(self, text: str, emotion: str, response_format: str) -> dict:
+        # 感情プロンプトを適用
+        emotion_prompt = self.config.emotion_prompts.get(emotion, "")
+        if emotion_prompt:
+            full_text = f"[{emotion_prompt}]{text}"
+        else:
+            full_text = text
+
+        return {
+            "model": self.config.model or "tts-1",
+            "voice": self.config.voice,
+            "input": full_text,
+            "response_format": response_format,
+        }
+
+    def _openai_headers(self) -> dict[str, str]:
+        return {
+            "Authorization": f"Bearer {self.config.api_key}",
+            "Content-Type": "application/json",
+        }
+
+    def _miotts_format(self, base_url: str) -> str:
+        """リクエストする形式（base64設定でもバイナリ対応サーバーにはWAVを直接要求する）"""
+        if (
+            self.config.binary_transport
+            and self.config.response_format == "base64"
+            and _binary_support.get(base_url, True)
+        ):
+            return "wav"
+        return self.config.response_format
+
+    async def _synthesize_miotts(
+        self,
+        text: str,
+        emotion: str,
+        base_url: Optional[str] = None,
+        priority: TTSPriority = TTSPriority.NORMAL,
+    ) -> bytes:
+        """MioTTS APIで音声合成
+
+        バイナリ応答（``binary_transport``）に対応したサーバーからはWAVをそのまま受け取り、
+        base64のJSONを返すサーバーでは以降base64で要求する（サーバーごとに自動判定）。
+        """
+        base_url = base_url or self.config.base_url
+        url = f"{base_url}/v1/tts"
+        output_format = self._miotts_format(base_url)
+
+        payload = self._miotts_payload(text, output_format)
+        timeout = self._timeout(priority)
+
         logger.debug(f"MioTTS request: {text[:50]}... (preset: {self.config.voice})")
 
         try:
-            response = await self._client.post(url, json=payload)
-            response.raise_for_status()
+            async with self._client.stream("POST", url, json=payload, timeout=timeout) as response:
+                rejected = output_format != self.config.response_format and await _rejects_format(response)
+                if not rejected:
+                    if response.is_error:
+                        await response.aread()  # エラー本文は例外から参照できるよう読んでおく
+                    response.raise_for_status()
+                    if not _is_json_response(response):
+                        # WAVはチャンクごとに読む（本文全体を一時的に二重に持たない）
+                        _set_binary_support(base_url, True)
+                        return await _read_body(response)
+                    await response.aread()
+            if rejected:
+                # 形式を受け付けないサーバー → base64で送り直す
+                _set_binary_support(base_url, False)
+                payload = self._miotts_payload(text, self.config.response_format)
+                response = await self._client.post(url, json=payload, timeout=timeout)
+                response.raise_for_status()
+
+            if output_format != self.config.response_format:
+                # 形式の指定を無視してJSONを返すサーバー
+                _set_binary_support(base_url, False)
             result = response.json()
 
             # MioTTSはbase64でオーディオを返す
@@ -164,33 +491,22 @@ class TTSClient:
             logger.error(f"MioTTS error: {e}")
             raise
 
-    async def _synthesize_openai(self, text: str, emotion: str) -> bytes:
+    async def _synthesize_openai(
+        self,
+        text: str,
+        emotion: str,
+        base_url: Optional[str] = None,
+        priority: TTSPriority = TTSPriority.NORMAL,
+    ) -> bytes:
         """OpenAI互換APIで音声合成（Qwen3-TTS等）"""
-        # 感情プロンプトを適用
-        emotion_prompt = self.config.emotion_prompts.get(emotion, "")
-        if emotion_prompt:
-            full_text = f"[{emotion_prompt}]{text}"
-        else:
-            full_text = text
-
-        url = f"{self.config.base_url}/v1/audio/speech"
-
-        payload = {
-            "model": self.config.model or "tts-1",
-            "voice": self.config.voice,
-            "input": full_text,
-            "response_format": self.config.response_format,
-        }
-
-        headers = {
-            "Authorization": f"Bearer {self.config.api_key}",
-            "Content-Type": "application/json",
-        }
+        url = f"{base_url or self.config.base_url}/v1/audio/speech"
+        payload = self._openai_payload(text, emotion, self.config.response_format)
+        headers = self._openai_headers()
 
         logger.debug(f"OpenAI TTS request: {text[:50]}... (emotion: {emotion})")
 
         try:
-            response = await self._client.post(url, json=payload, headers=headers)
+            response = await self._client.post(url, json=payload, headers=headers, timeout=self._timeout(priority))
             response.raise_for_status()
             return response.content
 
@@ -198,31 +514,71 @@ class TTSClient:
             logger.error(f"OpenAI TTS error: {e}")
             raise
 
-    async def check_health(self) -> bool:
-        """TTSサーバーの状態を確認"""
+    async def check_health(self, base_url: Optional[str] = None) -> bool:
+        """TTSサーバーの状態を確認（``base_url`` 省略時は ``config.base_url``）"""
+        base_url = base_url or self.config.base_url
         try:
             if self.config.provider == "miotts":
-                response = await self._client.get(f"{self.config.base_url}/health")
+                response = await self._client.get(f"{base_url}/health")
             else:
-                response = await self._client.get(f"{self.config.base_url}/v1/models")
+                response = await self._client.get(f"{base_url}/v1/models")
             return response.status_code == 200
         except Exception:
             return False
 
-    async def list_presets(self) -> list[str]:
-        """MioTTSプリセット一覧を取得"""
+    async def list_presets(self, base_url: Optional[str] = None) -> list[str]:
+        """MioTTSプリセット一覧を取得（``base_url`` 省略時は ``config.base_url``）"""
         if self.config.provider != "miotts":
             return []
         try:
-            response = await self._client.get(f"{self.config.base_url}/v1/presets")
+            response = await self._client.get(f"{base_url or self.config.base_url}/v1/presets")
             response.raise_for_status()
             return response.json().get("presets", [])
         except Exception:
             return []
 
+    async def warm_up(
+        self,
+        report: Optional[WarmupReport] = None,
+        text: str = "こんにちは",
+        emotions: Optional[list[str]] = None,
+    ) -> WarmupReport:
+        """全サーバーで短いダミー音声を合成して声の読み込み・接続確立を済ませる
+
+        スケジューラ・キャッシュを通さずサーバーごとに直接送る。MioTTSは感情で声が変わらないため1回、
+        OpenAI互換は感情プロンプトごとに1回。フォールバック先も1回ずつ合成する。
+
+        Args:
+            report: 所要時間の記録先（省略時は新規作成）
+            text: 合成するテキスト
+            emotions: 使う感情（None = ``emotion_prompts`` のすべて）
+        """
+        report = report or WarmupReport()
+        # プールの作成・ヘルスチェック（プリセット取得）の開始
+        pool = self.pool
+        if self.config.provider == "miotts":
+            emotions = ["neutral"]
+        else:
+            # 同じプロンプトになる感情は1回でよい
+            by_prompt: dict[str, str] = {}
+            for emotion in emotions or list(self.config.emotion_prompts):
+                by_prompt.setdefault(self.config.emotion_prompts.get(emotion, ""), emotion)
+            emotions = list(by_prompt.values())
+        synthesize = self._synthesize_miotts if self.config.provider == "miotts" else self._synthesize_openai
+
+        steps = [
+            report.measure(f"tts {url} {emotion}", lambda url=url, emotion=emotion: synthesize(text, emotion, url))
+            for url in (endpoint.url for endpoint in pool.endpoints)
+            for emotion in emotions
+        ]
+        steps += [client.warm_up(report, text, ["neutral"]) for client in self.fallbacks]
+        await asyncio.gather(*steps)
+        return report
+
     async def close(self):
-        """クライアントを閉じる"""
-        await self._client.aclose()
+        """クライアントを閉じる（HTTPクライアントは共有なので閉じない）"""
+        for client in self._fallbacks or []:
+            await client.close()
 
     async def __aenter__(self):
         return self
@@ -237,3 +593,57 @@ DEFAULT_CONFIG = TTSConfig(
     base_url="http://localhost:8001",
     voice="lobby",
 )
+
+
+# 入力エラーのステータス（本文が形式に触れているときだけ形式の拒否とみなす）
+_FORMAT_ERROR_STATUS = {400, 422}
+
+# サーバー（base_url）ごとのバイナリ応答対応状況（未確認のサーバーは対応とみなして試す）
+_binary_support: dict[str, bool] = {}
+
+
+def _set_binary_support(base_url: str, supported: bool):
+    if _binary_support.get(base_url) != supported:
+        logger.info(f"MioTTS {'binary WAV' if supported else 'base64 JSON'} transport: {base_url}")
+    _binary_support[base_url] = supported
+
+
+async def _rejects_format(response: httpx.Response) -> bool:
+    """バイナリ形式の指定を受け付けなかった応答か
+
+    415、または400/422でエラー本文が形式（``output.format``）に触れている場合のみ。
+    テキストが長すぎるなど別の理由の400でサーバーをbase64専用と判定しない。
+    """
+    if response.status_code == 415:
+        return True
+    if response.status_code not in _FORMAT_ERROR_STATUS:
+        return False
+    await response.aread()
+    return "format" in response.text.lower()
+
+
+def _is_json_response(response: httpx.Response) -> bool:
+    return response.headers.get("content-type", "").startswith("application/json")
+
+
+async def _read_body(response: httpx.Response) -> bytes:
+    """ストリーミング応答の本文を読む
+
+    Content-Length が分かれば1つのバッファを確保してチャンクを順に書き込む
+    （チャンクのリストを溜めてから連結しない）。
+    """
+    length = response.headers.get("content-length", "")
+    size = int(length) if length.isdigit() and "content-encoding" not in response.headers else 0
+    buffer = bytearray(size)
+    offset = 0
+    async for chunk in response.aiter_bytes():
+        buffer[offset:offset + len(chunk)] = chunk  # 確保した長さを超えた分は伸ばす
+        offset += len(chunk)
+    del buffer[offset:]
+    return bytes(buffer)
+
+
+def _write_file(path: Path, data: bytes):
+    """音声ファイル書き込み（I/Oプールで実行）"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
@@ -0,0 +1,282 @@
+"""TTS Pool - 複数TTSサーバーへの負荷分散
+
+同じ声のTTSサーバー（MioTTSのGPUマシンなど）を複数台並べて使う。
+
+- 処理中のリクエストが最も少ないサーバーを選ぶ（同数なら順番に回す）
+- 声のプリセットを持っているサーバーを優先（``list_presets`` の結果、未取得のサーバーは候補に含める）
+- サーバーごとのサーキットブレーカー: 連続して失敗した（遅すぎる応答を含む）サーバー・
+  ヘルスチェック（``check_health``）に失敗したサーバーには一定時間送らず、
+  時間が過ぎるかヘルスチェックが通れば試しに1件送って戻すか判断する
+- 失敗したリクエストはまだ使っていないサーバーに送り直す
+- すべてのブレーカーが開いていれば待たずに ``CircuitOpenError``（``TTSClient`` はフォールバック先へ）
+
+接続先は ``TTSConfig.base_url`` と ``TTSConfig.endpoints``。
+スケジューラの同時実行数はサーバーの台数に比例して増えるため、収録のスループットも台数に比例する。
+``TTSClient`` から自動的に使われる。
+"""
+
+import asyncio
+import time
+from typing import TYPE_CHECKING, Awaitable, Callable, Optional, TypeVar
+
+import httpx
+from loguru import logger
+
+from .circuit_breaker import CircuitBreaker, CircuitBreakerConfig, CircuitOpenError
+
+if TYPE_CHECKING:
+    from .tts import TTSClient, TTSConfig
+
+T = TypeVar("T")
+
+
+def _is_client_error(exc: BaseException) -> bool:
+    """サーバーを変えても結果が変わらないエラー（4xx、429を除く）"""
+    return (
+        isinstance(exc, httpx.HTTPStatusError)
+        and 400 <= exc.response.status_code < 500
+        and exc.response.status_code != 429
+    )
+
+
+class TTSEndpoint:
+    """1台のTTSサーバーの状態"""
+
+    def __init__(self, url: str, breaker: Optional[CircuitBreakerConfig] = None):
+        self.url = url
+        self.breaker = CircuitBreaker(f"TTS {url}", breaker)
+        self.outstanding = 0
+        self.requests = 0
+        self.failures = 0
+        self.presets: Optional[frozenset[str]] = None  # None = 未取得（どの声も扱えるとみなす）
+
+    def is_available(self, now: float) -> bool:
+        return self.breaker.allows(now)
+
+    def serves(self, voice: Optional[str]) -> bool:
+        return not voice or self.presets is None or voice in self.presets
+
+    def to_dict(self, now: Optional[float] = None) -> dict:
+        return {
+            "url": self.url,
+            "available": self.is_available(time.monotonic() if now is None else now),
+            "outstanding": self.outstanding,
+            "requests": self.requests,
+            "failures": self.failures,
+            "ejections": self.breaker.opens,
+            "circuit": self.breaker.to_dict(),
+            "presets": sorted(self.presets) if self.presets is not None else None,
+        }
+
+
+class TTSEndpointPool:
+    """複数TTSサーバーへのリクエスト振り分け
+
+    Args:
+        urls: TTSサーバーのURL（重複は除く）
+        breaker: サーバーごとのサーキットブレーカー設定
+        health_check_interval: ヘルスチェック間隔（0で無効、サーバーが1台の場合も無効）
+    """
+
+    def __init__(
+        self,
+        urls: list[str],
+        breaker: Optional[CircuitBreakerConfig] = None,
+        health_check_interval: float = 10.0,
+    ):
+        self.endpoints = [TTSEndpoint(url, breaker) for url in dict.fromkeys(urls)]
+        if not self.endpoints:
+            raise ValueError("At least one TTS server URL is required")
+        self.health_check_interval = health_check_interval
+        self.loop = asyncio.get_running_loop()
+        self.failovers = 0
+        self.rejected = 0  # ブレーカーがすべて開いていて送らなかった件数
+        self._turn = 0
+        self._health_task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self.endpoints)
+
+    @property
+    def is_open(self) -> bool:
+        """すべてのサーバーのブレーカーが開いている（送れるサーバーがない）"""
+        now = time.monotonic()
+        return not any(e.is_available(now) for e in self.endpoints)
+
+    def pick(
+        self,
+        voice: Optional[str] = None,
+        exclude: tuple[TTSEndpoint, ...] | list[TTSEndpoint] = (),
+    ) -> Optional[TTSEndpoint]:
+        """次に使うサーバー（ブレーカーが閉じたサーバーのうち、声を持つもの → 処理中の件数が最少のもの）"""
+        now = time.monotonic()
+        candidates = [e for e in self.endpoints if e not in exclude and e.is_available(now)]
+        if not candidates:
+            return None
+        candidates = [e for e in candidates if e.serves(voice)] or candidates
+        least = min(e.outstanding for e in candidates)
+        tied = [e for e in candidates if e.outstanding == least]
+        # 同数なら順番に回す（逐次のリクエストも全台に分散させる）
+        endpoint = tied[self._turn % len(tied)]
+        self._turn += 1
+        return endpoint
+
+    def acquire(
+        self,
+        voice: Optional[str] = None,
+        exclude: tuple[TTSEndpoint, ...] | list[TTSEndpoint] = (),
+    ) -> Optional[TTSEndpoint]:
+        """サーバーを選んで処理中として数える（終わったら ``release`` を呼ぶ）"""
+        endpoint = self.pick(voice, exclude)
+        if endpoint is not None:
+            endpoint.breaker.on_request()
+            endpoint.outstanding += 1
+            endpoint.requests += 1
+        return endpoint
+
+    def lease(self, voice: Optional[str] = None) -> TTSEndpoint:
+        """``acquire`` と同じだが、送れるサーバーがなければ ``CircuitOpenError``"""
+        endpoint = self.acquire(voice)
+        if endpoint is None:
+            self.rejected += 1
+            raise CircuitOpenError("All TTS circuit breakers are open")
+        return endpoint
+
+    def release(
+        self,
+        endpoint: TTSEndpoint,
+        error: Optional[BaseException] = None,
+        latency_ms: Optional[float] = None,
+    ):
+        """リクエスト完了（``error`` がサーバー側の失敗ならブレーカーに失敗として数える）"""
+        endpoint.outstanding -= 1
+        if error is None:
+            endpoint.breaker.record_success(latency_ms)
+        elif isinstance(error, Exception) and not _is_client_error(error):
+            endpoint.failures += 1
+            endpoint.breaker.record_failure()
+        else:
+            # キャンセル・ストリームの途中終了・4xxはサーバーの状態と無関係
+            endpoint.breaker.record_cancelled()
+
+    async def call(self, fn: Callable[[str], Awaitable[T]], voice: Optional[str] = None) -> T:
+        """サーバーを選んで ``fn(url)`` を実行（失敗したら別のサーバーへ）
+
+        Args:
+            fn: サーバーのURLを受け取ってリクエストするコルーチン関数
+            voice: 使う声（プリセットを持つサーバーを優先）
+
+        Raises:
+            CircuitOpenError: すべてのサーバーのブレーカーが開いている
+        """
+        tried: list[TTSEndpoint] = []
+        last_error: Optional[Exception] = None
+        while (endpoint := self.acquire(voice, exclude=tried)) is not None:
+            if tried:
+                self.failovers += 1
+                logger.warning(f"TTS server failed, failing over to {endpoint.url}: {last_error}")
+            tried.append(endpoint)
+            start = time.monotonic()
+            try:
+                result = await fn(endpoint.url)
+            except BaseException as e:
+                self.release(endpoint, e)
+                if not isinstance(e, Exception) or _is_client_error(e):
+                    raise
+                last_error = e
+            else:
+                self.release(endpoint, latency_ms=(time.monotonic() - start) * 1000)
+                return result
+        if last_error is not None:
+            raise last_error
+        self.rejected += 1
+        raise CircuitOpenError("All TTS circuit breakers are open")
+
+    async def check_health(self, prober: "TTSClient"):
+        """全サーバーのヘルスチェックとプリセット取得
+
+        失敗したサーバーのブレーカーは開き、開いていたサーバーが応答したら半開にして実リクエストで試す。
+        """
+        async def check(endpoint: TTSEndpoint):
+            if not await prober.check_health(endpoint.url):
+                endpoint.breaker.trip()
+                return
+            endpoint.breaker.half_open()
+            presets = await prober.list_presets(endpoint.url)
+            # 空（OpenAI互換・取得失敗）なら声での絞り込みはしない
+            endpoint.presets = frozenset(presets) if presets else None
+
+        await asyncio.gather(*(check(e) for e in self.endpoints))
+
+    @property
+    def needs_health_checks(self) -> bool:
+        """定期ヘルスチェックを開始すべきか（複数台・間隔あり・未開始）"""
+        return (
+            len(self.endpoints) > 1
+            and self.health_check_interval > 0
+            and (self._health_task is None or self._health_task.done())
+        )
+
+    def start_health_checks(self, prober: "TTSClient"):
+        """定期ヘルスチェック開始（サーバーが1台・間隔0・開始済みの場合は何もしない）"""
+        if not self.needs_health_checks:
+            return
+
+        async def loop():
+            while True:
+                try:
+                    await self.check_health(prober)
+                except Exception as e:
+                    logger.warning(f"TTS health check failed: {e}")
+                await asyncio.sleep(self.health_check_interval)
+
+        self._health_task = self.loop.create_task(loop())
+
+    async def stop(self):
+        """定期ヘルスチェック停止"""
+        if self._health_task is not None:
+            self._health_task.cancel()
+            await asyncio.gather(self._health_task, return_exceptions=True)
+            self._health_task = None
+
+    @property
+    def stats(self) -> dict:
+        now = time.monotonic()
+        return {
+            "endpoints": [e.to_dict(now) for e in self.endpoints],
+            "failovers": self.failovers,
+            "rejected": self.rejected,
+        }
+
+
+# 接続先 (provider, URL一覧) ごとのプール
+_pools: dict[tuple[str, tuple[str, ...]], TTSEndpointPool] = {}
+
+
+def get_tts_pool(config: "TTSConfig") -> TTSEndpointPool:
+    """接続先ごとのサーバープール取得
+
+    ヘルスチェックのタスクがイベントループに紐づくため、別のループから使われた場合は作り直す。
+    """
+    urls = tuple(config.urls)
+    key = (config.provider, urls)
+    pool = _pools.get(key)
+    if pool is None or pool.loop is not asyncio.get_running_loop():
+        pool = TTSEndpointPool(
+            list(urls),
+            breaker=CircuitBreakerConfig(
+                failure_threshold=config.max_failures,
+                slow_call_ms=config.slow_call_ms,
+                open_sec=config.eject_sec,
+            ),
+            health_check_interval=config.health_check_interval,
+        )
+        _pools[key] = pool
+        if len(pool) > 1:
+            logger.info(f"TTS pool created: {config.provider} {len(pool)} servers")
+    return pool
+
+
+def tts_pool_stats() -> dict:
+    """全プールの状況（サーバーごとの処理中件数・ブレーカーの状態）"""
+    return {f"{provider}:{urls[0]}": pool.stats for (provider, urls), pool in _pools.items()}
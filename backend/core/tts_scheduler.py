@@ -0,0 +1,259 @@
+"""TTS Scheduler - TTSサーバーごとの同時実行数制御・優先度・集約
+
+ライブモード・収録・CLIが同じTTSサーバーに同時にリクエストしても
+サーバーを溢れさせないよう、接続先 (provider, base_url) ごとにリクエストを並べる。
+
+- 同時実行数の上限（``TTSConfig.max_in_flight`` × サーバーの台数）
+- 優先度クラス: LIVE > NORMAL > RECORDING（同じクラス内は到着順）
+- 同じ内容（声・テキスト・感情）の待機中/実行中のリクエストは1回の合成にまとめる
+- 一括合成に対応したサーバー（``TTSConfig.batch_size`` > 1）では短いテキストを1リクエストにまとめる
+
+``TTSClient.synthesize`` から自動的に使われる。
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import TYPE_CHECKING, Optional
+
+from loguru import logger
+
+if TYPE_CHECKING:
+    from .tts import TTSClient, TTSConfig
+
+
+class TTSPriority(IntEnum):
+    """TTSリクエストの優先度（小さいほど先）"""
+    LIVE = 0        # ライブ配信の応答
+    NORMAL = 1      # API・CLIからの単発合成
+    RECORDING = 2   # 台本収録などのバッチ処理
+
+
+@dataclass(eq=False)
+class _Job:
+    key: tuple
+    client: "TTSClient"
+    text: str
+    emotion: str
+    priority: TTSPriority
+    future: asyncio.Future
+    enqueued: float = field(default_factory=time.monotonic)
+    waiters: int = 1
+    started: bool = False
+    batch: list["_Job"] = field(default_factory=list)  # 一緒に実行中の依頼（自身を含む）
+    task: Optional[asyncio.Task] = None
+
+
+class TTSScheduler:
+    """1つのTTSサーバー向けのリクエストスケジューラ
+
+    Args:
+        max_in_flight: 同時に送るリクエスト数（一括合成は1件と数える）
+        batch_size: 一括合成でまとめる最大件数（1で無効）
+        batch_max_chars: 一括合成の対象にするテキストの最大文字数
+    """
+
+    def __init__(self, max_in_flight: int = 4, batch_size: int = 1, batch_max_chars: int = 40):
+        self.max_in_flight = max(1, max_in_flight)
+        self.batch_size = max(1, batch_size)
+        self.batch_max_chars = batch_max_chars
+        self.loop = asyncio.get_running_loop()
+        self._heap: list[tuple[int, int, _Job]] = []
+        self._jobs: dict[tuple, _Job] = {}
+        self._seq = itertools.count()
+        self._in_flight = 0
+        self._tasks: set[asyncio.Task] = set()
+
+        self.submitted = 0
+        self.coalesced = 0
+        self.batches = 0
+        self.batched_items = 0
+        self.max_pending = 0
+        self._wait_ms: dict[TTSPriority, float] = {}
+
+    @property
+    def pending(self) -> int:
+        return sum(1 for job in self._jobs.values() if not job.started)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @staticmethod
+    def job_key(client: "TTSClient", text: str, emotion: str) -> tuple:
+        config = client.config
+        return (config.voice, config.model, config.response_format, text, emotion)
+
+    async def submit(
+        self,
+        client: "TTSClient",
+        text: str,
+        emotion: str = "neutral",
+        priority: TTSPriority = TTSPriority.NORMAL,
+    ) -> bytes:
+        """合成を依頼して結果を待つ（キャンセルされても同じ内容を待つ他の呼び出しには影響しない）
+
+        最後の待ち手がキャンセルされた依頼は、未実行なら取り消し、実行中なら
+        （一括合成では同じリクエストの全件が不要になった時点で）リクエストを中断する。
+        """
+        self.submitted += 1
+        key = self.job_key(client, text, emotion)
+        job = self._jobs.get(key)
+        if job is not None:
+            self.coalesced += 1
+            job.waiters += 1
+            if priority < job.priority and not job.started:
+                # 優先度の高い依頼が来たら並び直す（古いエントリは取り出し時に読み飛ばす）
+                job.priority = priority
+                heapq.heappush(self._heap, (priority, next(self._seq), job))
+        else:
+            job = _Job(key, client, text, emotion, priority, self.loop.create_future())
+            self._jobs[key] = job
+            heapq.heappush(self._heap, (priority, next(self._seq), job))
+            self.max_pending = max(self.max_pending, self.pending)
+        self._dispatch()
+
+        try:
+            return await asyncio.shield(job.future)
+        except asyncio.CancelledError:
+            job.waiters -= 1
+            if job.waiters == 0 and not job.started:
+                # 誰も待っていない未実行の依頼は取り消す
+                self._jobs.pop(key, None)
+                job.future.cancel()
+            elif job.waiters == 0 and all(item.waiters == 0 for item in job.batch):
+                # 誰も待っていない実行中のリクエストは中断して枠を空ける
+                for item in job.batch:
+                    if self._jobs.get(item.key) is item:
+                        del self._jobs[item.key]
+                job.task.cancel()
+            raise
+
+    def _pop(self) -> Optional[_Job]:
+        while self._heap:
+            priority, _, job = heapq.heappop(self._heap)
+            if job.started or job.future.done() or priority != job.priority:
+                continue
+            return job
+        return None
+
+    def _batchable(self, job: _Job) -> bool:
+        return (
+            self.batch_size > 1
+            and job.client.supports_batch
+            and len(job.text) <= self.batch_max_chars
+        )
+
+    def _take_batch(self, first: _Job) -> list[_Job]:
+        """``first`` と同じクライアント設定・優先度の短いテキストを集める"""
+        batch = [first]
+        if not self._batchable(first):
+            return batch
+        skipped = []
+        while len(batch) < self.batch_size:
+            job = self._pop()
+            if job is None:
+                break
+            if job.priority == first.priority and job.key[:3] == first.key[:3] and self._batchable(job):
+                batch.append(job)
+            else:
+                skipped.append(job)
+        for job in skipped:
+            heapq.heappush(self._heap, (job.priority, next(self._seq), job))
+        return batch
+
+    def _dispatch(self):
+        while self._in_flight < self.max_in_flight:
+            job = self._pop()
+            if job is None:
+                return
+            batch = self._take_batch(job)
+            now = time.monotonic()
+            for item in batch:
+                item.started = True
+                wait_ms = (now - item.enqueued) * 1000
+                previous = self._wait_ms.get(item.priority)
+                self._wait_ms[item.priority] = wait_ms if previous is None else 0.8 * previous + 0.2 * wait_ms
+            self._in_flight += 1
+            task = self.loop.create_task(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+            for item in batch:
+                item.batch = batch
+                item.task = task
+
+    async def _run(self, batch: list[_Job]):
+        try:
+            if len(batch) == 1:
+                job = batch[0]
+                results = [await job.client._synthesize_with_retry(job.text, job.emotion, job.priority)]
+            else:
+                self.batches += 1
+                self.batched_items += len(batch)
+                results = await batch[0].client._synthesize_batch(
+                    [(job.text, job.emotion) for job in batch], batch[0].priority,
+                )
+        except asyncio.CancelledError:
+            for job in batch:
+                job.future.cancel()
+            raise
+        except Exception as e:
+            for job in batch:
+                if not job.future.done():
+                    if job.waiters > 0:
+                        job.future.set_exception(e)
+                    else:
+                        job.future.cancel()
+        else:
+            for job, audio in zip(batch, results):
+                if not job.future.done():
+                    job.future.set_result(audio)
+        finally:
+            for job in batch:
+                if self._jobs.get(job.key) is job:
+                    del self._jobs[job.key]
+            self._in_flight -= 1
+            self._dispatch()
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "in_flight": self._in_flight,
+            "max_in_flight": self.max_in_flight,
+            "pending": self.pending,
+            "max_pending": self.max_pending,
+            "submitted": self.submitted,
+            "coalesced": self.coalesced,
+            "batches": self.batches,
+            "batched_items": self.batched_items,
+            "queue_wait_ms": {p.name.lower(): round(ms, 1) for p, ms in self._wait_ms.items()},
+        }
+
+
+# 接続先 (provider, base_url) ごとのスケジューラ
+_schedulers: dict[tuple[str, str], TTSScheduler] = {}
+
+
+def get_tts_scheduler(config: "TTSConfig") -> TTSScheduler:
+    """接続先ごとのスケジューラ取得（最初に使った設定の上限で生成）
+
+    複数台構成（``TTSConfig.endpoints``）では同時実行数の上限を台数倍にする。
+
+    スケジューラはイベントループに紐づくため、別のループから使われた場合は作り直す。
+    """
+    key = (config.provider, config.base_url)
+    scheduler = _schedulers.get(key)
+    if scheduler is None or scheduler.loop is not asyncio.get_running_loop():
+        max_in_flight = config.max_in_flight * len(config.urls)
+        scheduler = TTSScheduler(max_in_flight, config.batch_size, config.batch_max_chars)
+        _schedulers[key] = scheduler
+        logger.debug(f"TTS scheduler created: {config.provider} {config.base_url} (max_in_flight={max_in_flight})")
+    return scheduler
+
+
+def tts_scheduler_stats() -> dict:
+    """全スケジューラの状況（接続先ごと）"""
+    return {f"{provider}:{base_url}": s.stats for (provider, base_url), s in _schedulers.items()}
@@ -0,0 +1,101 @@
+"""Warm-up - 起動直後の最初の応答を速くする事前処理
+
+ライブ開始・収録開始の直後は、TTSサーバー側の声プリセットの読み込み、
+HTTP接続の確立、NumPy/SciPyの初回実行などが重なって最初の応答だけ遅くなる。
+開始時にダミーの合成・解析・疎通確認を一度ずつ流しておき、各段階の所要時間を記録する。
+
+- ``LiveMode.start()`` がバックグラウンドで実行（``/api/live/metrics`` の ``warmup``）
+- ``RecordingPipeline.process_script()`` が台本の処理前に実行
+"""
+
+import asyncio
+import io
+import math
+import struct
+import time
+import wave
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Optional, TypeVar
+
+from loguru import logger
+
+T = TypeVar("T")
+
+
+@dataclass
+class WarmupConfig:
+    """ウォームアップ設定"""
+    enabled: bool = True
+    text: str = "こんにちは"              # TTSのダミー合成に使うテキスト
+    emotions: Optional[list[str]] = None  # 事前合成する感情（None = 設定済みのすべての感情）
+    timeout: float = 30.0                 # 全体の上限秒数
+
+
+@dataclass
+class WarmupReport:
+    """ウォームアップの段階別の所要時間"""
+    steps: dict[str, float] = field(default_factory=dict)   # 段階名 → ms
+    errors: dict[str, str] = field(default_factory=dict)    # 段階名 → エラー
+    total_ms: Optional[float] = None
+    _started: float = field(default_factory=time.monotonic, repr=False)
+
+    async def measure(self, step: str, fn: Callable[[], Awaitable[T]]) -> Optional[T]:
+        """``fn()`` を実行して所要時間を記録（失敗してもエラーを記録して続ける）"""
+        start = time.monotonic()
+        try:
+            return await fn()
+        except Exception as e:
+            self.errors[step] = f"{type(e).__name__}: {e}"
+            logger.warning(f"Warm-up step failed: {step}: {e}")
+            return None
+        finally:
+            self.steps[step] = round((time.monotonic() - start) * 1000, 1)
+
+    def finish(self, label: str) -> "WarmupReport":
+        self.total_ms = round((time.monotonic() - self._started) * 1000, 1)
+        slowest = sorted(self.steps.items(), key=lambda item: item[1], reverse=True)[:3]
+        logger.info(
+            f"{label} warm-up done in {self.total_ms:.0f}ms "
+            f"({len(self.steps) - len(self.errors)}/{len(self.steps)} ok; slowest: "
+            + ", ".join(f"{name} {ms:.0f}ms" for name, ms in slowest) + ")"
+        )
+        return self
+
+    def to_dict(self) -> dict:
+        return {
+            "total_ms": self.total_ms,
+            "steps": dict(self.steps),
+            "errors": dict(self.errors),
+        }
+
+
+async def run_warmup(
+    label: str,
+    steps: list[Awaitable],
+    report: WarmupReport,
+    timeout: float,
+) -> WarmupReport:
+    """ウォームアップの各段階を並行に実行（``timeout`` を過ぎたら打ち切る）"""
+    async def run_all():
+        # gatherのFutureを直接wait_forに渡すと、キャンセル時に例外が回収されずに警告が出る
+        await asyncio.gather(*steps)
+
+    try:
+        await asyncio.wait_for(run_all(), timeout)
+    except asyncio.TimeoutError:
+        report.errors["timeout"] = f"warm-up exceeded {timeout:.0f}s"
+        logger.warning(f"{label} warm-up timed out after {timeout:.0f}s")
+    return report.finish(label)
+
+
+def warmup_wav(duration_sec: float = 0.3, sample_rate: int = 16000) -> bytes:
+    """リップシンク解析のウォームアップ用の短い音声（220Hzのサイン波、16bit mono WAV）"""
+    frames = int(duration_sec * sample_rate)
+    samples = (int(8000 * math.sin(2 * math.pi * 220 * i / sample_rate)) for i in range(frames))
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(struct.pack(f"<{frames}h", *samples))
+    return buffer.getvalue()
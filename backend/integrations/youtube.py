@@ -158,9 +158,19 @@ class YouTubeChat:
     ```
     """
 
-    def __init__(self, config: Optional[YouTubeChatConfig] = None):
+    def __init__(
+        self,
+        config: Optional[YouTubeChatConfig] = None,
+        session: Optional[aiohttp.ClientSession] = None,
+    ):
+        """
+        Args:
+            config: 接続設定
+            session: 共有aiohttpセッション（指定時は close() で閉じない）
+        """
         self.config = config or YouTubeChatConfig()
-        self._session: Optional[aiohttp.ClientSession] = None
+        self._session: Optional[aiohttp.ClientSession] = session
+        self._owns_session = session is None
         self._live_chat_id: Optional[str] = None
         self._next_page_token: Optional[str] = None
         self._running = False
@@ -186,6 +196,7 @@ class YouTubeChat:
         """セッション確保"""
         if self._session is None or self._session.closed:
             self._session = aiohttp.ClientSession()
+            self._owns_session = True
 
     async def connect(self, video_id_or_url: str) -> bool:
         """配信に接続
@@ -353,7 +364,7 @@ class YouTubeChat:
     async def close(self):
         """リソース解放"""
         self.stop()
-        if self._session and not self._session.closed:
+        if self._session and self._owns_session and not self._session.closed:
             await self._session.close()
 
     async def __aenter__(self):
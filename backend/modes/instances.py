@@ -0,0 +1,175 @@
+"""Live Instances - 1プロセスで複数キャラクターを配信するための名前付きLiveMode管理
+
+各インスタンスは独立したLiveMode（会話履歴・入力キュー・応答キャッシュ）を持ち、
+HTTP接続プール・音声ストア・解析器は ``SharedResources`` で共有する。
+
+使用例:
+```python
+registry = LiveInstanceRegistry()
+lobby = registry.create("lobby", LiveModeConfig(...))
+mio = registry.create("mio", LiveModeConfig(...), InstanceLimits(max_queue_size=20))
+await lobby.mode.start()
+```
+"""
+
+import re
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import TYPE_CHECKING, Optional
+
+from loguru import logger
+
+from ..core.shared_resources import SharedResources
+from .live import LiveMode, LiveModeConfig
+
+if TYPE_CHECKING:
+    from fastapi import WebSocket
+
+    from ..bench.replay import SessionRecorder
+
+# インスタンス名（URLパスに使うため英数字・_・- のみ）
+INSTANCE_NAME_PATTERN = re.compile(r"^[A-Za-z0-9_-]{1,32}$")
+
+# /api/live 直下のエンドポイントと衝突する名前
+RESERVED_INSTANCE_NAMES = {"status", "start", "stop", "input", "chat", "metrics", "audio", "ws", "instances"}
+
+
+class InstanceLimitError(Exception):
+    """インスタンス数や名前の制約違反"""
+
+
+@dataclass
+class InstanceLimits:
+    """インスタンスごとのリソース上限"""
+    max_queue_size: int = 50                 # 通常入力キューの上限
+    max_priority_queue_size: int = 20        # プラットフォームごとの優先入力上限
+    max_inputs_per_min: Optional[float] = None  # プラットフォームごとの通常コメント上限（件/分）
+    max_output_connections: int = 16        # 出力WebSocketの同時接続数
+
+    def apply(self, config: LiveModeConfig):
+        """LiveModeConfigに上限を反映"""
+        config.max_queue_size = min(config.max_queue_size, self.max_queue_size)
+        config.priority_queue_size = min(config.priority_queue_size, self.max_priority_queue_size)
+        if self.max_inputs_per_min:
+            for platform in ("youtube", "twitch", "microphone", "manual"):
+                current = config.platform_rate_limits.get(platform)
+                config.platform_rate_limits[platform] = (
+                    min(current, self.max_inputs_per_min) if current else self.max_inputs_per_min
+                )
+
+
+@dataclass
+class LiveInstance:
+    """名前付きライブインスタンス"""
+    name: str
+    mode: LiveMode
+    limits: InstanceLimits = field(default_factory=InstanceLimits)
+    created_at: datetime = field(default_factory=datetime.now)
+
+    # 出力WebSocket（インスタンスごと）
+    output_websockets: list["WebSocket"] = field(default_factory=list)
+    binary_audio_websockets: set["WebSocket"] = field(default_factory=set)
+
+    # セッション記録（リプレイ用、任意）
+    recorder: Optional["SessionRecorder"] = None
+
+    @property
+    def can_accept_connection(self) -> bool:
+        return len(self.output_websockets) < self.limits.max_output_connections
+
+    def remove_websocket(self, websocket: "WebSocket"):
+        if websocket in self.output_websockets:
+            self.output_websockets.remove(websocket)
+        self.binary_audio_websockets.discard(websocket)
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "running": self.mode.is_running,
+            "queue_size": self.mode.queue_size,
+            "created_at": self.created_at.isoformat(),
+            "output_connections": len(self.output_websockets),
+            "recording": self.recorder.stats if self.recorder else None,
+            "limits": {
+                "max_queue_size": self.limits.max_queue_size,
+                "max_priority_queue_size": self.limits.max_priority_queue_size,
+                "max_inputs_per_min": self.limits.max_inputs_per_min,
+                "max_output_connections": self.limits.max_output_connections,
+            },
+        }
+
+
+class LiveInstanceRegistry:
+    """名前付きライブインスタンスの管理"""
+
+    def __init__(self, shared: Optional[SharedResources] = None, max_instances: int = 16):
+        self.shared = shared or SharedResources()
+        self.max_instances = max_instances
+        self._instances: dict[str, LiveInstance] = {}
+
+    def create(
+        self,
+        name: str,
+        config: Optional[LiveModeConfig] = None,
+        limits: Optional[InstanceLimits] = None,
+        mode_cls: type[LiveMode] = LiveMode,
+    ) -> LiveInstance:
+        """インスタンスを作成
+
+        Raises:
+            InstanceLimitError: 名前が不正・重複、またはインスタンス数の上限
+        """
+        if not INSTANCE_NAME_PATTERN.match(name) or name in RESERVED_INSTANCE_NAMES:
+            raise InstanceLimitError(f"Invalid instance name: {name!r}")
+        if name in self._instances:
+            raise InstanceLimitError(f"Instance already exists: {name}")
+        if len(self._instances) >= self.max_instances:
+            raise InstanceLimitError(f"Too many instances (max {self.max_instances})")
+
+        config = config or LiveModeConfig()
+        limits = limits or InstanceLimits()
+        limits.apply(config)
+
+        instance = LiveInstance(
+            name=name,
+            mode=mode_cls(config, shared=self.shared, name=name),
+            limits=limits,
+        )
+        self._instances[name] = instance
+        logger.info(f"Live instance created: {name}")
+        return instance
+
+    def register(self, instance: LiveInstance) -> LiveInstance:
+        """作成済みのインスタンスを登録（テストや独自構成のLiveMode用）"""
+        self._instances[instance.name] = instance
+        return instance
+
+    def get(self, name: str) -> Optional[LiveInstance]:
+        return self._instances.get(name)
+
+    async def remove(self, name: str) -> bool:
+        """インスタンスを停止して削除"""
+        instance = self._instances.pop(name, None)
+        if instance is None:
+            return False
+        await instance.mode.close()
+        if instance.recorder is not None:
+            instance.recorder.close()
+        logger.info(f"Live instance removed: {name}")
+        return True
+
+    @property
+    def names(self) -> list[str]:
+        return list(self._instances)
+
+    async def close(self):
+        """全インスタンスと共有リソースを解放"""
+        for name in list(self._instances):
+            await self.remove(name)
+        await self.shared.close()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._instances
+
+    def __len__(self) -> int:
+        return len(self._instances)
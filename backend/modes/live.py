@@ -4,22 +4,48 @@ OpenClaw Gateway + YouTube/Twitchコメント → AI応答 → TTS → アバタ
 """
 
 import asyncio
+import math
+import time
 from collections import deque
+from contextlib import aclosing
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
-from typing import Callable, Optional
+from typing import Any, Callable, Optional
 
 from loguru import logger
 
-from ..core.emotion import EmotionAnalyzer, EmotionResult
+from ..core.audio_retention import AudioRetentionConfig, AudioRetentionManager
+from ..core.audio_store import AudioBlobStore, audio_media_type
+from ..core.coalescer import CoalescerConfig, CommentCoalescer
+from ..core.emotion import (
+    EmotionAnalyzer,
+    EmotionResult,
+    EmotionUpdate,
+    IncrementalEmotionAnalyzer,
+    IncrementalEmotionConfig,
+)
+from ..core.executor import run_cpu, run_io
+from ..core.filler import FillerBank, FillerClip, FillerConfig, reaction_kind
+from ..core.keyword_matcher import compile_keywords
+from ..core.latency import LatencyConfig, LatencyTrace, LatencyTracker
 from ..core.live2d import Live2DLipsyncAnalyzer
 from ..core.live_subtitle import LiveSubtitleManager, SubtitleConfig
-from ..core.openclaw import LOBBY_SYSTEM_PROMPT, OpenClawClient, OpenClawConfig
+from ..core.openclaw import LOBBY_SYSTEM_PROMPT, OpenClawClient, OpenClawConfig, build_headers
+from ..core.response_cache import (
+    CachedResponse,
+    ResponseCache,
+    ResponseCacheConfig,
+    load_warm_entries,
+)
+from ..core.scheduler import FairScheduler, PriorityLane
+from ..core.shared_resources import SharedResources
 from ..core.tts import TTSClient, TTSConfig
-from ..integrations.twitch import TwitchChat, TwitchChatConfig, TwitchMessage
-from ..integrations.youtube import YouTubeChat, YouTubeChatConfig, YouTubeComment
+from ..core.tts_scheduler import TTSPriority
+from ..core.warmup import WarmupConfig, WarmupReport, run_warmup, warmup_wav
+from ..integrations.twitch import TwitchChat, TwitchChatConfig, TwitchMessage, TwitchMessageType
+from ..integrations.youtube import CommentType, YouTubeChat, YouTubeChatConfig, YouTubeComment
 
 
 class InputSource(Enum):
@@ -40,6 +66,85 @@ class LiveInput:
     timestamp: datetime = field(default_factory=datetime.now)
     metadata: dict = field(default_factory=dict)  # スパチャ金額など
 
+    # 応答期限（time.monotonic基準、キュー投入時に設定）
+    enqueued_at: Optional[float] = None
+    deadline: Optional[float] = None
+
+    @property
+    def platform(self) -> str:
+        """スケジューラのレーン名（attach_sourceで付けた名前、なければソース種別）"""
+        return self.metadata.get("platform") or self.source.value
+
+    @property
+    def is_priority(self) -> bool:
+        """スパチャ/Bits/サブスク等の優先入力か"""
+        return bool(self.metadata.get("type"))
+
+    @property
+    def author_key(self) -> str:
+        """投稿者ごとの連投制限に使うキー（配信者自身の入力・匿名入力は空文字）"""
+        if self.source in (InputSource.MANUAL, InputSource.MICROPHONE):
+            return ""
+        if self.author_id:
+            return f"{self.platform}:{self.author_id}"
+        if self.author and self.author != "Anonymous":
+            return f"{self.platform}:{self.author}"
+        return ""
+
+    @property
+    def priority_weight(self) -> float:
+        """優先入力の重み（スパチャ金額・Bits・サブスクティアを円換算して対数スケール）"""
+        value = _support_value_jpy(self.metadata)
+        return 1.0 + math.log10(1.0 + value / 100)
+
+    @property
+    def kind(self) -> str:
+        """期限設定用の入力種別（スパチャ/Bits/サブスク等は "priority"）"""
+        if self.is_priority:
+            return "priority"
+        return self.source.value
+
+    def remaining_sec(self, now: Optional[float] = None) -> Optional[float]:
+        """期限までの残り秒数（期限なしはNone）"""
+        if self.deadline is None:
+            return None
+        return self.deadline - (time.monotonic() if now is None else now)
+
+
+class DeadlineExceededError(Exception):
+    """入力の応答期限切れ"""
+
+    def __init__(self, stage: str):
+        super().__init__(f"Deadline exceeded at {stage}")
+        self.stage = stage
+
+
+@dataclass
+class LiveStats:
+    """ライブモード統計（負荷制御の可視化用）"""
+    processed: int = 0
+    dropped: dict[str, int] = field(default_factory=dict)  # 理由 → 件数
+    queue_wait_ms: deque[float] = field(default_factory=lambda: deque(maxlen=200))
+
+    def record_drop(self, reason: str):
+        self.dropped[reason] = self.dropped.get(reason, 0) + 1
+
+    def record_queue_wait(self, wait_ms: float):
+        self.queue_wait_ms.append(wait_ms)
+
+    def to_dict(self) -> dict:
+        waits = list(self.queue_wait_ms)
+        return {
+            "processed": self.processed,
+            "dropped": dict(self.dropped),
+            "queue_wait_ms": {
+                "last": round(waits[-1], 1) if waits else 0.0,
+                "avg": round(sum(waits) / len(waits), 1) if waits else 0.0,
+                "max": round(max(waits), 1) if waits else 0.0,
+                "samples": len(waits),
+            },
+        }
+
 
 @dataclass
 class LiveOutput:
@@ -47,9 +152,13 @@ class LiveOutput:
     input: LiveInput
     response_text: str
     emotion: EmotionResult
-    audio_path: Optional[Path] = None
+    audio_path: Optional[Path] = None  # persist_audio時のみ（書き込みは非同期）
     live2d_params: Optional[list] = None  # list[Live2DFrame]
     timestamp: datetime = field(default_factory=datetime.now)
+    audio_id: Optional[str] = None  # AudioBlobStore上のID
+    is_filler: bool = False  # 応答待ちのつなぎリアクション（本応答が直後に続く）
+    emotion_updates: list[EmotionUpdate] = field(default_factory=list)  # 応答の途中での表情の切り替え（文単位）
+    trace: Optional[LatencyTrace] = None  # 段階別レイテンシ（配信時間は後から追加）
 
 
 @dataclass
@@ -61,15 +170,57 @@ class LiveModeConfig:
 
     # キュー設定
     max_queue_size: int = 50
+    priority_queue_size: int = 20  # プラットフォームごとの優先入力（スパチャ等）の上限
     process_interval: float = 0.5  # 処理間隔（秒）
 
+    # プラットフォームごとの通常コメント流量上限（件/分）。未指定は無制限
+    # 例: {"youtube": 20, "twitch": 10}
+    platform_rate_limits: dict[str, float] = field(default_factory=dict)
+
+    # 投稿者ごとの通常コメント上限（件/分、Noneで無制限）と連投許容数
+    author_rate_per_min: Optional[float] = 6.0
+    author_burst: float = 3.0
+
+    # 優先入力（スパチャ等）が1秒待つごとに加算する重み（少額の入力の取り残し防止）
+    priority_aging_per_sec: float = 0.05
+
     # フィルタリング
     min_input_length: int = 1
     max_input_length: int = 200
     blocked_words: list[str] = field(default_factory=list)
 
+    # 重複コメント集約
+    coalescer: CoalescerConfig = field(default_factory=CoalescerConfig)
+
+    # 応答期限（秒）: 入力種別ごと。期限を過ぎた入力は破棄、処理中ならLLM/TTSを打ち切る
+    # 種別: youtube / twitch / microphone / manual / priority（スパチャ・Bits・サブスク等）
+    input_deadlines: dict[str, float] = field(default_factory=lambda: {
+        "youtube": 20.0,
+        "twitch": 20.0,
+        "microphone": 30.0,
+        "priority": 300.0,
+    })
+
+    # 定型コメント用の応答キャッシュ
+    response_cache: ResponseCacheConfig = field(default_factory=ResponseCacheConfig)
+
+    # LLM応答待ちの間に再生するリアクション（起動時に合成）
+    filler: FillerConfig = field(default_factory=FillerConfig)
+
+    # 段階別レイテンシ計測（/api/live/metrics）
+    latency: LatencyConfig = field(default_factory=LatencyConfig)
+
+    # 応答の途中で表情を切り替えるための文ごとの感情分析（ヒステリシス）
+    emotion_updates: IncrementalEmotionConfig = field(default_factory=IncrementalEmotionConfig)
+
+    # 開始時のウォームアップ（TTS・Gateway・解析処理、所要時間は /api/live/metrics の warmup）
+    warmup: WarmupConfig = field(default_factory=WarmupConfig)
+
     # 出力設定
     audio_output_dir: Path = field(default_factory=lambda: Path("./output/live"))
+    persist_audio: bool = True  # 応答音声をディスクにも保存（バックグラウンド書き込み）
+    audio_retention: AudioRetentionConfig = field(default_factory=AudioRetentionConfig)
+    audio_store_max_bytes: int = 64 * 1024 * 1024  # メモリ内音声ストアの上限
     generate_live2d: bool = True
     generate_subtitles: bool = True  # リアルタイム字幕生成
 
@@ -82,26 +233,81 @@ class LiveMode:
     のパイプラインで処理する。
     """
 
-    def __init__(self, config: Optional[LiveModeConfig] = None):
+    def __init__(
+        self,
+        config: Optional[LiveModeConfig] = None,
+        shared: Optional[SharedResources] = None,
+        name: str = "default",
+    ):
+        """
+        Args:
+            config: ライブモード設定
+            shared: 複数インスタンスで共有するリソース（HTTP接続プール・音声ストア等）
+            name: インスタンス名（共有音声ストアでの固定IDの区別に使う）
+        """
         self.config = config or LiveModeConfig()
+        self.name = name
+        self._shared = shared
 
         # クライアント初期化
-        self._openclaw = OpenClawClient(self.config.openclaw)
-        self._tts = TTSClient(self.config.tts)
-        self._emotion = EmotionAnalyzer()
+        if shared is not None:
+            self._openclaw = OpenClawClient(
+                self.config.openclaw,
+                client=shared.http_client(
+                    self.config.openclaw.base_url,
+                    headers=build_headers(self.config.openclaw),
+                    timeout=self.config.openclaw.timeout,
+                ),
+                http_pool=shared.http_pool,
+            )
+            self._tts = TTSClient(self.config.tts, client=shared.http_client(timeout=self.config.tts.request_timeout))
+            self._emotion = shared.emotion
+        else:
+            self._openclaw = OpenClawClient(self.config.openclaw)
+            self._tts = TTSClient(self.config.tts)
+            self._emotion = EmotionAnalyzer()
         self._live2d: Optional[Live2DLipsyncAnalyzer] = None
 
         if self.config.generate_live2d:
-            from ..core.live2d import Live2DConfig
-            self._live2d = Live2DLipsyncAnalyzer(Live2DConfig())
+            if shared is not None:
+                self._live2d = shared.live2d
+            else:
+                from ..core.live2d import Live2DConfig
+                self._live2d = Live2DLipsyncAnalyzer(Live2DConfig())
 
         # 字幕マネージャー
         self._subtitle: Optional[LiveSubtitleManager] = None
         if self.config.generate_subtitles:
             self._subtitle = LiveSubtitleManager(self.config.subtitle)
 
-        # 入力キュー
-        self._input_queue: deque[LiveInput] = deque(maxlen=self.config.max_queue_size)
+        # 入力キュー（プラットフォームごとのレーンを交互に取り出す）
+        self._scheduler: FairScheduler[LiveInput] = FairScheduler(
+            max_size=self.config.max_queue_size,
+            priority_max_size=self.config.priority_queue_size,
+            aging_per_sec=self.config.priority_aging_per_sec,
+            author_rate_per_min=self.config.author_rate_per_min,
+            author_burst=self.config.author_burst,
+        )
+        for platform, per_min in self.config.platform_rate_limits.items():
+            self._scheduler.set_rate_limit(platform, per_min)
+        self._sources: dict[str, ChatSource] = {}
+        self._coalescer = CommentCoalescer(self.config.coalescer)
+        self._blocked_words = compile_keywords(self.config.blocked_words, ignore_case=True)
+        self._stats = LiveStats()
+        self._latency = LatencyTracker(self.config.latency)
+        self._response_cache = ResponseCache(self.config.response_cache)
+        self._fillers = FillerBank()
+        if shared is not None:
+            self._audio_store = shared.audio_store
+        else:
+            self._audio_store = AudioBlobStore(self.config.audio_store_max_bytes)
+        self._persist_tasks: set[asyncio.Task] = set()
+        self._retention = AudioRetentionManager(self.config.audio_output_dir, self.config.audio_retention)
+        if self._subtitle:
+            self._retention.add_pin_source(self._subtitle_audio_paths)
+        self._filler_task: Optional[asyncio.Task] = None
+        self._warmup_task: Optional[asyncio.Task] = None
+        self._warmup_report: Optional[WarmupReport] = None
 
         # 状態
         self._running = False
@@ -110,6 +316,7 @@ class LiveMode:
         # コールバック
         self._on_output: Optional[Callable[[LiveOutput], None]] = None
         self._on_error: Optional[Callable[[Exception], None]] = None
+        self._on_input: Optional[Callable[[LiveInput], None]] = None
 
         # 出力ディレクトリ作成
         self.config.audio_output_dir.mkdir(parents=True, exist_ok=True)
@@ -126,6 +333,10 @@ class LiveMode:
         """エラーコールバック設定"""
         self._on_error = callback
 
+    def set_input_callback(self, callback: Optional[Callable[[LiveInput], None]]):
+        """入力到着コールバック設定（フィルタ・集約の前に呼ばれる。セッション記録用）"""
+        self._on_input = callback
+
     @property
     def subtitle_manager(self) -> Optional[LiveSubtitleManager]:
         """字幕マネージャーを取得"""
@@ -141,24 +352,136 @@ class LiveMode:
         if self._subtitle:
             self._subtitle.set_clear_callback(callback)
 
-    def add_input(self, input_data: LiveInput) -> bool:
+    def add_input(self, input_data: LiveInput, priority: Optional[bool] = None) -> bool:
         """入力をキューに追加
 
+        Args:
+            input_data: 入力
+            priority: 優先キューに入れるか（Noneの場合はスパチャ等を自動判定）
+
         Returns:
             True if added, False if filtered/full
         """
+        if self._on_input:
+            self._on_input(input_data)
+
+        if priority is None:
+            priority = input_data.is_priority
+
+        if priority:
+            # スパチャ等はフィルタ・集約せずに優先キューへ
+            self._stamp_deadline(input_data)
+            evicted = self._scheduler.push(
+                input_data, input_data.platform, priority=True, weight=input_data.priority_weight,
+            )
+            if evicted is not None:
+                self._stats.record_drop("priority_queue_full")
+            if evicted is input_data:
+                logger.info(f"Priority input dropped (queue full): {input_data.author}: {input_data.text[:30]}")
+                return False
+            logger.info(f"Priority input queued: [{input_data.platform}] {input_data.author}: {input_data.text[:30]}")
+            return True
+
         # フィルタリング
         if not self._should_process(input_data):
             logger.debug(f"Input filtered: {input_data.text[:30]}")
+            self._stats.record_drop("filtered")
             return False
 
-        # キュー追加
-        try:
-            self._input_queue.append(input_data)
-            logger.info(f"Input queued: [{input_data.source.value}] {input_data.author}: {input_data.text[:30]}")
+        # 重複コメントは既存の入力に集約
+        if self._coalescer.offer(input_data):
             return True
-        except Exception:
+
+        # キュー追加（満杯なら最も多く積まれているプラットフォームの最古の入力が押し出される）
+        self._stamp_deadline(input_data)
+        evicted = self._scheduler.push(input_data, input_data.platform, author=input_data.author_key)
+        if evicted is input_data:
+            # 投稿者ごとの上限を超えた連投
+            logger.debug(f"Input rate-limited: {input_data.author}: {input_data.text[:30]}")
+            self._coalescer.release(input_data)
+            self._stats.record_drop("author_rate_limited")
             return False
+        if evicted is not None:
+            self._coalescer.release(evicted)
+            self._stats.record_drop("queue_full")
+        logger.info(f"Input queued: [{input_data.platform}] {input_data.author}: {input_data.text[:30]}")
+        return True
+
+    def attach_source(
+        self,
+        source: Any,
+        name: Optional[str] = None,
+        converter: Optional[Callable[[Any], Optional[LiveInput]]] = None,
+        rate_limit_per_min: Optional[float] = None,
+        prioritize: bool = True,
+    ) -> str:
+        """チャットソースを接続（YouTubeChat, TwitchChat, モックなど）
+
+        ``source.stream()`` が返す要素を ``converter`` でLiveInputに変換してキューに追加する。
+        converter省略時はYouTubeComment / TwitchMessage / LiveInput を自動判定。
+
+        Args:
+            source: ``stream()`` を持つチャットクライアント（接続済み）
+            name: レーン名（省略時はソース種別。同じプラットフォームを複数つなぐ場合に指定）
+            converter: 要素 → LiveInput 変換関数（Noneを返すと無視）
+            rate_limit_per_min: 通常コメントの流量上限（件/分）
+            prioritize: スパチャ/Bits等を優先キューに入れるか
+
+        Returns:
+            ソース名
+        """
+        handle = ChatSource(
+            source=source,
+            name=name,
+            converter=converter or chat_item_to_input,
+            prioritize=prioritize,
+        )
+        key = name or f"source{len(self._sources)}"
+        if key in self._sources:
+            raise ValueError(f"Source already attached: {key}")
+        self._sources[key] = handle
+
+        if rate_limit_per_min is not None:
+            if name is None:
+                raise ValueError("rate_limit_per_min requires a source name")
+            self._scheduler.set_rate_limit(name, rate_limit_per_min)
+
+        if self._running:
+            handle.task = asyncio.create_task(self._source_loop(key, handle))
+        logger.info(f"Chat source attached: {key}")
+        return key
+
+    async def detach_source(self, name: str):
+        """チャットソースを切断"""
+        handle = self._sources.pop(name, None)
+        if handle is None:
+            return
+        await handle.stop()
+        logger.info(f"Chat source detached: {name}")
+
+    async def _source_loop(self, key: str, handle: "ChatSource"):
+        """チャットソースのストリームを読み、入力キューに追加"""
+        try:
+            async for item in handle.source.stream():
+                if not self._running:
+                    break
+                live_input = handle.converter(item)
+                if live_input is None:
+                    continue
+                if handle.name:
+                    live_input.metadata["platform"] = handle.name
+                self.add_input(live_input, priority=handle.prioritize and live_input.is_priority)
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.error(f"Chat source error ({key}): {e}")
+            if self._on_error:
+                self._on_error(e)
+
+    @property
+    def sources(self) -> list[str]:
+        """接続中のチャットソース名"""
+        return list(self._sources)
 
     def _should_process(self, input_data: LiveInput) -> bool:
         """入力を処理すべきか判定"""
@@ -171,40 +494,123 @@ class LiveMode:
             return False
 
         # NGワードチェック
-        text_lower = text.lower()
-        for word in self.config.blocked_words:
-            if word.lower() in text_lower:
-                return False
+        if self._blocked_words.contains_any(text):
+            return False
 
         return True
 
+    def _stamp_deadline(self, input_data: LiveInput):
+        """キュー投入時刻と応答期限を設定"""
+        now = time.monotonic()
+        input_data.enqueued_at = now
+        budget = self.config.input_deadlines.get(input_data.kind)
+        input_data.deadline = now + budget if budget else None
+
+    async def _within_deadline(self, input_data: LiveInput, coro, stage: str):
+        """入力の残り期限内でコルーチンを実行（超過時は打ち切り）"""
+        remaining = input_data.remaining_sec()
+        if remaining is None:
+            return await coro
+        if remaining <= 0:
+            coro.close()
+            raise DeadlineExceededError(stage)
+        try:
+            return await asyncio.wait_for(coro, timeout=remaining)
+        except asyncio.TimeoutError:
+            raise DeadlineExceededError(stage) from None
+
+    async def _chat(self, text: str, trace: LatencyTrace) -> str:
+        """OpenClawで応答を生成
+
+        ストリーミング設定（``openclaw.stream``）では最初のトークンまでの時間を
+        ``llm_ttft`` として記録する（``llm`` は応答の完成までの時間）。
+        """
+        if not self.config.openclaw.stream:
+            return (await self._openclaw.chat(text)).text
+
+        start = time.perf_counter()
+        chunks: list[str] = []
+        async with aclosing(self._openclaw.chat_stream(text)) as stream:
+            async for chunk in stream:
+                if not chunks:
+                    trace.add_nested("llm_ttft", (time.perf_counter() - start) * 1000)
+                chunks.append(chunk)
+        return "".join(chunks)
+
+    def _dequeue(self) -> Optional[LiveInput]:
+        """次の入力を取り出す（優先入力 → プラットフォーム間で交互に通常入力）"""
+        input_data = self._scheduler.pop()
+        if input_data is not None:
+            self._coalescer.release(input_data)
+        return input_data
+
     async def start(self):
         """処理ループ開始"""
         if self._running:
             return
 
         self._running = True
+        if self.config.warmup.enabled and self._warmup_report is None:
+            # 処理ループは待たせない（最初の入力より先に終わればよい）
+            self._warmup_task = asyncio.create_task(self.warm_up())
+        if self.config.filler.enabled and not len(self._fillers):
+            self._filler_task = asyncio.create_task(self.prepare_fillers())
+        if self.config.persist_audio:
+            self._retention.start()
+        for key, handle in self._sources.items():
+            if handle.task is None:
+                handle.task = asyncio.create_task(self._source_loop(key, handle))
         self._processing_task = asyncio.create_task(self._process_loop())
         logger.info("Live mode started")
 
     async def stop(self):
         """処理ループ停止"""
         self._running = False
+        for handle in self._sources.values():
+            await handle.stop()
+        if self._filler_task and not self._filler_task.done():
+            self._filler_task.cancel()
+            await asyncio.gather(self._filler_task, return_exceptions=True)
+        if self._warmup_task and not self._warmup_task.done():
+            self._warmup_task.cancel()
+            await asyncio.gather(self._warmup_task, return_exceptions=True)
         if self._processing_task:
             self._processing_task.cancel()
             try:
                 await self._processing_task
             except asyncio.CancelledError:
                 pass
+        await self._retention.stop()
         logger.info("Live mode stopped")
 
+    async def warm_up(self) -> WarmupReport:
+        """最初の応答が遅くならないよう各段階を一度ずつ実行
+
+        Gatewayへの疎通確認、使う感情ごとのTTSダミー合成、感情分析、リップシンク解析を並行に行う。
+        ``start()`` がバックグラウンドで呼ぶ。
+
+        Returns:
+            段階別の所要時間（``warmup_report`` でも参照できる）
+        """
+        warmup = self.config.warmup
+        report = WarmupReport()
+        steps = [
+            self._openclaw.warm_up(report),
+            self._tts.warm_up(report, warmup.text, warmup.emotions),
+            report.measure("emotion", lambda: run_cpu(self._emotion.analyze, warmup.text)),
+        ]
+        if self._live2d:
+            steps.append(report.measure("lipsync", lambda: run_cpu(self._live2d.analyze_audio_bytes, warmup_wav())))
+        self._warmup_report = await run_warmup("Live mode", steps, report, warmup.timeout)
+        return self._warmup_report
+
     async def _process_loop(self):
         """メイン処理ループ"""
         while self._running:
             try:
-                # キューから取得
-                if self._input_queue:
-                    input_data = self._input_queue.popleft()
+                # キューから取得（流量上限で取り出せない場合も待機）
+                input_data = self._dequeue()
+                if input_data is not None:
                     await self._process_input(input_data)
                 else:
                     await asyncio.sleep(self.config.process_interval)
@@ -218,70 +624,289 @@ class LiveMode:
 
     async def _process_input(self, input_data: LiveInput):
         """1つの入力を処理"""
+        trace = LatencyTrace(source=input_data.kind, text=input_data.text[:50])
+
+        # キュー待ち時間と期限チェック
+        if input_data.enqueued_at is not None:
+            queue_wait_ms = (time.monotonic() - input_data.enqueued_at) * 1000
+            self._stats.record_queue_wait(queue_wait_ms)
+            trace.spans["queue_wait"] = queue_wait_ms
+        remaining = input_data.remaining_sec()
+        if remaining is not None and remaining <= 0:
+            logger.info(f"Input expired in queue: {input_data.text[:30]}")
+            self._stats.record_drop("expired_queue")
+            trace.outcome = "expired_queue"
+            self._latency.record(trace)
+            return
+
         logger.info(f"Processing: {input_data.text[:50]}")
 
         try:
-            # 1. OpenClawでAI応答生成
-            result = await self._openclaw.chat(input_data.text)
-            response_text = result.text
+            # 0. 定型コメントはキャッシュ済み応答を即座に返す
+            cached = self._response_cache.get(input_data.text)
+            if cached is not None:
+                logger.info(f"Response cache hit: {input_data.text[:30]}")
+                trace.outcome = "cache_hit"
+                with trace.span("deliver"):
+                    await self._deliver_output(
+                        input_data, cached.text, cached.emotion,
+                        cached.audio_path, cached.live2d_frames,
+                        audio_id=self._store_audio_once(cached.audio_path, cached.audio),
+                        emotion_updates=cached.emotion_updates,
+                        trace=trace,
+                    )
+                return
+
+            # 応答生成中の間をつなぐリアクションを先に再生
+            self._play_filler(input_data)
 
-            # 2. 感情分析
-            emotion = self._emotion.analyze(response_text)
+            # 1. OpenClawでAI応答生成
+            with trace.span("llm"):
+                response_text = await self._within_deadline(
+                    input_data, self._chat(input_data.text, trace), "llm",
+                )
 
-            # 3. TTS生成
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
-            audio_path = self.config.audio_output_dir / f"live_{timestamp}.mp3"
-            await self._tts.synthesize(
-                text=response_text,
-                emotion=emotion.primary.value,
-                output_path=audio_path,
-            )
+            # 2. 感情分析（全体の感情 + 文ごとの表情の切り替え）
+            with trace.span("emotion"):
+                emotion = self._emotion.analyze(response_text)
+                emotion_updates = self._emotion_updates(response_text)
+
+            # 3. TTS生成（音声はメモリ上で扱い、ディスク保存はバックグラウンド）
+            with trace.span("tts"):
+                audio = await self._within_deadline(
+                    input_data,
+                    self._tts.synthesize(
+                        text=response_text,
+                        emotion=emotion.primary.value,
+                        priority=TTSPriority.LIVE,
+                    ),
+                    "tts",
+                )
+            audio_id = self._audio_store.put(audio, media_type=audio_media_type(audio))
+            audio_path = None
+            if self.config.persist_audio:
+                audio_path = self._retention.path_for("live")
+                self._persist_audio(audio_path, audio)
 
             # 4. Live2Dパラメータ生成
             live2d_params = None
-            if self._live2d and audio_path.exists():
-                live2d_params = self._live2d.analyze_audio(audio_path)
-
-            # 5. リアルタイム字幕表示
-            if self._subtitle:
-                # 音声の長さに基づいて字幕表示時間を設定
-                duration_ms = None
-                if live2d_params:
-                    # フレームの最後のタイムスタンプを使用
-                    duration_ms = live2d_params[-1].timestamp_ms if live2d_params else None
-
-                await self._subtitle.show_subtitle(
-                    text=response_text,
-                    speaker="",  # アバター名を設定可能
-                    emotion=emotion.primary.value,
-                    duration_ms=duration_ms,
-                    metadata={
-                        "input_author": input_data.author,
-                        "input_text": input_data.text[:50],
-                        "source": input_data.source.value,
-                    },
+            if self._live2d and audio:
+                with trace.span("lipsync"):
+                    live2d_params = await run_cpu(self._live2d.analyze_audio_bytes, audio)
+
+            # 5. 字幕表示 + 出力
+            trace.outcome = "ok"
+            with trace.span("deliver"):
+                await self._deliver_output(
+                    input_data, response_text, emotion, audio_path, live2d_params,
+                    audio_id=audio_id,
+                    emotion_updates=emotion_updates,
+                    trace=trace,
                 )
 
-            # 出力オブジェクト作成
-            output = LiveOutput(
-                input=input_data,
-                response_text=response_text,
-                emotion=emotion,
-                audio_path=audio_path,
-                live2d_params=live2d_params,
-            )
-
-            # コールバック呼び出し
-            if self._on_output:
-                self._on_output(output)
-
-            logger.info(f"Output ready: {response_text[:50]}")
+        except DeadlineExceededError as e:
+            logger.info(f"Input dropped ({e}): {input_data.text[:30]}")
+            self._stats.record_drop(f"expired_{e.stage}")
+            trace.outcome = f"expired_{e.stage}"
 
         except Exception as e:
             logger.error(f"Failed to process input: {e}")
+            trace.outcome = "error"
             if self._on_error:
                 self._on_error(e)
 
+        finally:
+            self._latency.record(trace)
+
+    async def _deliver_output(
+        self,
+        input_data: LiveInput,
+        response_text: str,
+        emotion: EmotionResult,
+        audio_path: Optional[Path],
+        live2d_params: Optional[list],
+        audio_id: Optional[str] = None,
+        emotion_updates: Optional[list[EmotionUpdate]] = None,
+        trace: Optional[LatencyTrace] = None,
+    ) -> LiveOutput:
+        """リアルタイム字幕を表示し、出力コールバックを呼ぶ"""
+        if self._subtitle:
+            # 音声の長さに基づいて字幕表示時間を設定（フレームの最後のタイムスタンプ）
+            duration_ms = live2d_params[-1].timestamp_ms if live2d_params else None
+
+            await self._subtitle.show_subtitle(
+                text=response_text,
+                speaker="",  # アバター名を設定可能
+                emotion=emotion.primary.value,
+                duration_ms=duration_ms,
+                metadata={
+                    "input_author": input_data.author,
+                    "input_text": input_data.text[:50],
+                    "source": input_data.source.value,
+                    "audio_path": str(audio_path) if audio_path else None,
+                },
+            )
+
+        output = LiveOutput(
+            input=input_data,
+            response_text=response_text,
+            emotion=emotion,
+            audio_path=audio_path,
+            live2d_params=live2d_params,
+            audio_id=audio_id,
+            emotion_updates=emotion_updates or [],
+            trace=trace,
+        )
+
+        if self._on_output:
+            self._on_output(output)
+
+        self._stats.processed += 1
+        logger.info(f"Output ready: {response_text[:50]}")
+        return output
+
+    def _store_audio_once(self, audio_path: Optional[Path], audio: bytes) -> Optional[str]:
+        """事前合成済み音声をファイル名ベースの固定IDでストアに登録
+
+        音声ストアはインスタンス間で共有されるため、IDにはインスタンス名を含める
+        （同じファイル名でも別のキャラクターの声を返さない）。
+        """
+        if not audio or audio_path is None:
+            return None
+        blob_id = f"{self.name}.{audio_path.stem}"
+        if blob_id not in self._audio_store:
+            self._audio_store.put(audio, media_type=audio_media_type(audio), blob_id=blob_id)
+        return blob_id
+
+    def _persist_audio(self, audio_path: Path, audio: bytes):
+        """音声をバックグラウンドでディスクに書き込む"""
+        task = asyncio.create_task(self._write_and_register(audio_path, audio))
+        self._persist_tasks.add(task)
+        task.add_done_callback(self._persist_tasks.discard)
+
+    async def _write_and_register(self, audio_path: Path, audio: bytes):
+        """書き込み完了後にローテーション管理対象へ登録"""
+        await run_io(_write_audio_file, audio_path, audio)
+        self._retention.register(audio_path, len(audio))
+
+    def _subtitle_audio_paths(self) -> list[Path]:
+        """字幕履歴が参照している音声ファイル"""
+        return [
+            Path(sub.metadata["audio_path"])
+            for sub in self._subtitle.history
+            if sub.metadata.get("audio_path")
+        ]
+
+    def _play_filler(self, input_data: LiveInput) -> Optional[FillerClip]:
+        """入力種別と感情に合うリアクションを即座に出力"""
+        if not self.config.filler.enabled or not self._on_output:
+            return None
+
+        emotion = self._emotion.analyze(input_data.text).primary.value
+        clip = self._fillers.pick(reaction_kind(input_data.metadata), emotion)
+        if clip is None:
+            return None
+
+        self._on_output(LiveOutput(
+            input=input_data,
+            response_text=clip.text,
+            emotion=clip.emotion,
+            audio_path=clip.audio_path,
+            live2d_params=clip.live2d_frames,
+            audio_id=self._store_audio_once(clip.audio_path, clip.audio),
+            is_filler=True,
+        ))
+        logger.debug(f"Filler: {clip.text}")
+        return clip
+
+    async def prepare_fillers(self) -> int:
+        """リアクション台詞を合成してフィラーバンクに登録
+
+        Returns:
+            登録したクリップ数
+        """
+        filler_dir = self.config.audio_output_dir / "filler"
+        count = 0
+
+        for kind, phrases in self.config.filler.reactions.items():
+            for i, phrase in enumerate(phrases):
+                emotion = self._emotion.analyze(phrase)
+                text = emotion.raw_text or phrase
+                audio_path = filler_dir / f"{kind}_{i:02d}.mp3"
+                try:
+                    audio = await self._tts.synthesize(
+                        text=text,
+                        emotion=emotion.primary.value,
+                        output_path=audio_path,
+                        priority=TTSPriority.RECORDING,  # 事前生成は配信中の応答を優先
+                    )
+                    live2d_params = None
+                    if self._live2d and audio_path.exists():
+                        live2d_params = await run_cpu(self._live2d.analyze_audio, audio_path)
+                except Exception as e:
+                    logger.warning(f"Failed to prepare filler {phrase!r}: {e}")
+                    continue
+
+                self._fillers.add(FillerClip(
+                    kind=kind,
+                    text=text,
+                    emotion=emotion,
+                    audio=audio,
+                    audio_path=audio_path,
+                    live2d_frames=live2d_params,
+                ))
+                count += 1
+
+        logger.info(f"Filler reactions ready: {count}")
+        return count
+
+    async def warm_response_cache(self, path: Path) -> int:
+        """YAML定義から応答キャッシュを事前生成（TTS + Live2Dまで合成）
+
+        Args:
+            path: ウォームアップ定義YAML
+
+        Returns:
+            キャッシュに登録した応答数
+        """
+        entries = load_warm_entries(path)
+        cache_dir = self.config.audio_output_dir / "cache"
+        count = 0
+
+        for i, entry in enumerate(entries):
+            for j, response_text in enumerate(entry.responses):
+                try:
+                    emotion = self._emotion.analyze(response_text)
+                    emotion_updates = self._emotion_updates(response_text)
+                    audio_path = cache_dir / f"cache_{i:03d}_{j:02d}.mp3"
+                    audio = await self._tts.synthesize(
+                        text=response_text,
+                        emotion=emotion.primary.value,
+                        output_path=audio_path,
+                        priority=TTSPriority.RECORDING,  # 事前生成は配信中の応答を優先
+                    )
+                    live2d_params = None
+                    if self._live2d and audio_path.exists():
+                        live2d_params = await run_cpu(self._live2d.analyze_audio, audio_path)
+                except Exception as e:
+                    logger.warning(f"Failed to warm cache entry {entry.inputs[0]!r}: {e}")
+                    continue
+
+                cached = CachedResponse(
+                    text=response_text,
+                    emotion=emotion,
+                    audio=audio,
+                    audio_path=audio_path,
+                    live2d_frames=live2d_params,
+                    emotion_updates=emotion_updates,
+                )
+                for input_text in entry.inputs:
+                    self._response_cache.put(input_text, cached)
+                count += 1
+
+        logger.info(f"Response cache warmed: {count} responses, {len(self._response_cache)} keys")
+        return count
+
     async def process_single(self, text: str, author: str = "User") -> LiveOutput:
         """単発処理（テスト/対話モード用）"""
         input_data = LiveInput(
@@ -293,18 +918,22 @@ class LiveMode:
         # 直接処理
         result = await self._openclaw.chat(text)
         emotion = self._emotion.analyze(result.text)
+        emotion_updates = self._emotion_updates(result.text)
 
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
-        audio_path = self.config.audio_output_dir / f"single_{timestamp}.mp3"
-        await self._tts.synthesize(
+        audio = await self._tts.synthesize(
             text=result.text,
             emotion=emotion.primary.value,
-            output_path=audio_path,
+            priority=TTSPriority.LIVE,
         )
+        audio_id = self._audio_store.put(audio, media_type=audio_media_type(audio))
+        audio_path = None
+        if self.config.persist_audio:
+            audio_path = self._retention.path_for("single")
+            self._persist_audio(audio_path, audio)
 
         live2d_params = None
-        if self._live2d and audio_path.exists():
-            live2d_params = self._live2d.analyze_audio(audio_path)
+        if self._live2d and audio:
+            live2d_params = await run_cpu(self._live2d.analyze_audio_bytes, audio)
 
         # 字幕表示
         if self._subtitle:
@@ -324,12 +953,77 @@ class LiveMode:
             emotion=emotion,
             audio_path=audio_path,
             live2d_params=live2d_params,
+            audio_id=audio_id,
+            emotion_updates=emotion_updates,
         )
 
+    def _emotion_updates(self, text: str) -> list[EmotionUpdate]:
+        """応答テキストを文ごとに分析した表情の切り替え
+
+        ライブモードは応答全体を受け取ってから合成するため、切り替えは応答の完成後に
+        出力と一緒に返す（感情分析の段階で1回だけ計算する）。
+        """
+        return IncrementalEmotionAnalyzer(self._emotion, self.config.emotion_updates).analyze_text(text)
+
     @property
     def queue_size(self) -> int:
-        """現在のキューサイズ"""
-        return len(self._input_queue)
+        """現在のキューサイズ（通常入力）"""
+        return self._scheduler.normal_size
+
+    @property
+    def priority_queue_size(self) -> int:
+        """優先入力（スパチャ等）の待ち件数"""
+        return self._scheduler.priority_size
+
+    @property
+    def scheduler_stats(self) -> dict:
+        """プラットフォーム別のキュー状況"""
+        return self._scheduler.stats
+
+    @property
+    def coalescer_stats(self) -> dict:
+        """重複集約の統計"""
+        return self._coalescer.stats.to_dict()
+
+    @property
+    def audio_store(self) -> AudioBlobStore:
+        """メモリ内音声ストア"""
+        return self._audio_store
+
+    @property
+    def latency(self) -> LatencyTracker:
+        """段階別レイテンシ"""
+        return self._latency
+
+    @property
+    def audio_retention(self) -> AudioRetentionManager:
+        """音声ファイルのローテーション管理"""
+        return self._retention
+
+    @property
+    def response_cache(self) -> ResponseCache:
+        """応答キャッシュ"""
+        return self._response_cache
+
+    @property
+    def warmup_report(self) -> Optional[WarmupReport]:
+        """開始時のウォームアップの所要時間（未完了ならNone）"""
+        return self._warmup_report
+
+    @property
+    def gateway_stats(self) -> dict:
+        """OpenClaw GatewayごとのEWMA・p95・ヘッジ件数"""
+        return self._openclaw.gateway_stats
+
+    @property
+    def prompt_stats(self) -> dict:
+        """OpenClawへのプロンプトトークン数と会話履歴の状態"""
+        return self._openclaw.prompt_stats
+
+    @property
+    def stats(self) -> dict:
+        """処理件数・破棄件数（理由別）・キュー待ち時間"""
+        return self._stats.to_dict()
 
     @property
     def is_running(self) -> bool:
@@ -339,6 +1033,11 @@ class LiveMode:
     async def close(self):
         """リソース解放"""
         await self.stop()
+        for handle in self._sources.values():
+            await handle.close()
+        # 書き込み中の音声ファイルを完了させる
+        if self._persist_tasks:
+            await asyncio.gather(*self._persist_tasks, return_exceptions=True)
         await self._openclaw.close()
         await self._tts.close()
 
@@ -349,10 +1048,150 @@ class LiveMode:
         await self.close()
 
 
+def _write_audio_file(audio_path: Path, audio: bytes):
+    """音声ファイル書き込み（I/Oプールで実行）"""
+    audio_path.parent.mkdir(parents=True, exist_ok=True)
+    audio_path.write_bytes(audio)
+
+
+@dataclass
+class ChatSource:
+    """LiveModeに接続されたチャットソース"""
+    source: Any
+    converter: Callable[[Any], Optional[LiveInput]]
+    name: Optional[str] = None
+    prioritize: bool = True
+    task: Optional[asyncio.Task] = None
+
+    async def stop(self):
+        """ストリーム読み取りを停止"""
+        if hasattr(self.source, "stop"):
+            self.source.stop()
+        if self.task:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+
+    async def close(self):
+        """ソースを閉じる"""
+        await self.stop()
+        if hasattr(self.source, "close"):
+            await self.source.close()
+
+
+# 優先入力の重み付け用のおおよその円換算レート（厳密な為替ではなく順位付け用）
+CURRENCY_TO_JPY = {
+    "JPY": 1.0, "USD": 150.0, "EUR": 160.0, "GBP": 190.0, "AUD": 100.0, "CAD": 110.0,
+    "KRW": 0.11, "TWD": 4.7, "HKD": 19.0, "PHP": 2.6, "IDR": 0.0095, "INR": 1.8,
+}
+BITS_TO_JPY = 1.5                                   # 100 Bits ≒ $1
+SUB_TIER_TO_JPY = {"1000": 750.0, "2000": 1500.0, "3000": 3750.0, "Prime": 750.0}
+MEMBERSHIP_JPY = 490.0
+MEMBERSHIP_TYPES = (CommentType.MEMBERSHIP.value, CommentType.MEMBER_MILESTONE.value)
+
+
+def _support_value_jpy(metadata: dict) -> float:
+    """スパチャ/Bits/サブスク/メンバーシップ/レイドの金額換算（円）"""
+    if metadata.get("amount"):
+        rate = CURRENCY_TO_JPY.get(metadata.get("currency") or "JPY", 1.0)
+        return float(metadata["amount"]) * rate
+    if metadata.get("bits"):
+        return metadata["bits"] * BITS_TO_JPY
+    if metadata.get("sub_tier"):
+        return SUB_TIER_TO_JPY.get(str(metadata["sub_tier"]), SUB_TIER_TO_JPY["1000"])
+    if metadata.get("membership_months") is not None or metadata.get("type") in MEMBERSHIP_TYPES:
+        return MEMBERSHIP_JPY
+    if metadata.get("viewer_count"):
+        return 500.0 + metadata["viewer_count"] * 10.0
+    return 0.0
+
+
+def youtube_comment_to_input(comment: YouTubeComment) -> LiveInput:
+    """YouTubeコメント → LiveInput（スパチャ/メンバーシップはtype付き）"""
+    metadata: dict = {"profile_image": comment.author_profile_image}
+
+    if comment.comment_type != CommentType.TEXT:
+        metadata["type"] = comment.comment_type.value
+        if comment.amount:
+            metadata["amount"] = comment.amount
+            metadata["currency"] = comment.currency
+        if comment.membership_months:
+            metadata["membership_months"] = comment.membership_months
+
+    return LiveInput(
+        text=comment.text,
+        source=InputSource.YOUTUBE_COMMENT,
+        author=comment.author_name,
+        author_id=comment.author_channel_id,
+        timestamp=comment.published_at,
+        metadata=metadata,
+    )
+
+
+def twitch_message_to_input(message: TwitchMessage) -> LiveInput:
+    """Twitchメッセージ → LiveInput（Bits/サブスク/レイドはtype付き）"""
+    text = message.text
+    message_type = message.message_type
+
+    if message_type == TwitchMessageType.BITS:
+        metadata = {
+            "type": "bits",
+            "bits": message.bits,
+            "badges": [b.name for b in message.badges],
+        }
+    elif message_type in (TwitchMessageType.SUB, TwitchMessageType.RESUB, TwitchMessageType.GIFT_SUB):
+        text = text or "サブスクありがとう！"
+        metadata = {
+            "type": message_type.value,
+            "sub_months": message.sub_months,
+            "sub_tier": message.sub_tier,
+        }
+    elif message_type == TwitchMessageType.RAID:
+        text = f"レイドありがとう！{message.raid_viewer_count}人も来てくれたっす！"
+        metadata = {
+            "type": "raid",
+            "viewer_count": message.raid_viewer_count,
+        }
+    else:
+        metadata = {
+            "badges": [b.name for b in message.badges],
+            "emotes": [e.name for e in message.emotes],
+            "color": message.color,
+            "is_subscriber": message.is_subscriber,
+            "is_moderator": message.is_moderator,
+            "is_vip": message.is_vip,
+        }
+
+    return LiveInput(
+        text=text,
+        source=InputSource.TWITCH_COMMENT,
+        author=message.author_display_name,
+        author_id=message.author_id,
+        timestamp=message.timestamp,
+        metadata=metadata,
+    )
+
+
+def chat_item_to_input(item: Any) -> Optional[LiveInput]:
+    """チャットソースの要素をLiveInputに変換（種別を自動判定）"""
+    if isinstance(item, LiveInput):
+        return item
+    if isinstance(item, YouTubeComment):
+        return youtube_comment_to_input(item)
+    if isinstance(item, TwitchMessage):
+        return twitch_message_to_input(item)
+    logger.warning(f"Unsupported chat item: {type(item).__name__}")
+    return None
+
+
 class YouTubeLiveMode(LiveMode):
     """YouTube Live連携モード
 
-    LiveModeにYouTubeコメント取得を統合。
+    ``attach_source`` でYouTubeChatを接続するLiveMode。
+    TwitchChat等を追加で ``attach_source`` すれば同時配信にも対応する。
 
     使用例:
     ```python
@@ -363,13 +1202,10 @@ class YouTubeLiveMode(LiveMode):
     ```
     """
 
-    def __init__(self, config: Optional[LiveModeConfig] = None):
-        super().__init__(config)
-        self._youtube: Optional[YouTubeChat] = None
-        self._youtube_task: Optional[asyncio.Task] = None
-
-        # スパチャ優先処理用
-        self._priority_queue: deque[LiveInput] = deque(maxlen=20)
+    @property
+    def _priority_queue(self) -> PriorityLane[LiveInput]:
+        """スパチャ用の優先キュー（YouTubeレーン）"""
+        return self._scheduler.lane(InputSource.YOUTUBE_COMMENT.value, priority=True)
 
     async def connect_youtube(
         self,
@@ -388,124 +1224,24 @@ class YouTubeLiveMode(LiveMode):
             接続成功かどうか
         """
         yt_config = YouTubeChatConfig(api_key=api_key)
-        self._youtube = YouTubeChat(yt_config)
+        # 共有リソースがあればaiohttpセッションも共有プールのものを使う
+        session = await self._shared.http_pool.aiohttp_session() if self._shared is not None else None
+        youtube = YouTubeChat(yt_config, session=session)
 
-        success = await self._youtube.connect(video_id_or_url)
+        success = await youtube.connect(video_id_or_url)
         if not success:
             logger.error("Failed to connect to YouTube live chat")
             return False
 
-        # コールバック設定
-        if prioritize_super_chat:
-            self._youtube.set_super_chat_callback(self._on_youtube_super_chat)
-        self._youtube.set_comment_callback(self._on_youtube_comment)
-
+        self.attach_source(youtube, name="youtube", prioritize=prioritize_super_chat)
         logger.info(f"Connected to YouTube: {video_id_or_url}")
         return True
 
-    def _on_youtube_comment(self, comment: YouTubeComment):
-        """通常コメント受信時"""
-        live_input = LiveInput(
-            text=comment.text,
-            source=InputSource.YOUTUBE_COMMENT,
-            author=comment.author_name,
-            author_id=comment.author_channel_id,
-            timestamp=comment.published_at,
-            metadata={"profile_image": comment.author_profile_image},
-        )
-        self.add_input(live_input)
-
-    def _on_youtube_super_chat(self, comment: YouTubeComment):
-        """スパチャ/メンバーシップ受信時（優先キュー）"""
-        metadata = {
-            "profile_image": comment.author_profile_image,
-            "type": comment.comment_type.value,
-        }
-
-        if comment.amount:
-            metadata["amount"] = comment.amount
-            metadata["currency"] = comment.currency
-
-        if comment.membership_months:
-            metadata["membership_months"] = comment.membership_months
-
-        live_input = LiveInput(
-            text=comment.text,
-            source=InputSource.YOUTUBE_COMMENT,
-            author=comment.author_name,
-            author_id=comment.author_channel_id,
-            timestamp=comment.published_at,
-            metadata=metadata,
-        )
-
-        # 優先キューに追加
-        self._priority_queue.append(live_input)
-        logger.info(f"[SuperChat] {comment.author_name}: {comment.text} ({comment.amount} {comment.currency})")
-
-    async def start(self):
-        """処理ループ + YouTubeストリーム開始"""
-        if self._youtube:
-            self._youtube_task = asyncio.create_task(self._youtube_stream_loop())
-        await super().start()
-
-    async def _youtube_stream_loop(self):
-        """YouTubeコメントストリームループ"""
-        try:
-            async for comment in self._youtube.stream():
-                if not self._running:
-                    break
-                # コールバック内で処理済み
-        except asyncio.CancelledError:
-            pass
-        except Exception as e:
-            logger.error(f"YouTube stream error: {e}")
-
-    async def _process_loop(self):
-        """メイン処理ループ（スパチャ優先）"""
-        while self._running:
-            try:
-                # 優先キュー（スパチャ）を先に処理
-                if self._priority_queue:
-                    input_data = self._priority_queue.popleft()
-                    await self._process_input(input_data)
-                # 通常キュー
-                elif self._input_queue:
-                    input_data = self._input_queue.popleft()
-                    await self._process_input(input_data)
-                else:
-                    await asyncio.sleep(self.config.process_interval)
-            except asyncio.CancelledError:
-                break
-            except Exception as e:
-                logger.error(f"Process loop error: {e}")
-                if self._on_error:
-                    self._on_error(e)
-                await asyncio.sleep(1.0)
-
-    async def stop(self):
-        """全ループ停止"""
-        if self._youtube:
-            self._youtube.stop()
-        if self._youtube_task:
-            self._youtube_task.cancel()
-            try:
-                await self._youtube_task
-            except asyncio.CancelledError:
-                pass
-        await super().stop()
-
-    async def close(self):
-        """リソース解放"""
-        await self.stop()
-        if self._youtube:
-            await self._youtube.close()
-        await super().close()
-
 
 class TwitchLiveMode(LiveMode):
     """Twitch連携モード
 
-    LiveModeにTwitchチャット取得を統合。
+    ``attach_source`` でTwitchChatを接続するLiveMode。
 
     使用例:
     ```python
@@ -523,13 +1259,10 @@ class TwitchLiveMode(LiveMode):
     ```
     """
 
-    def __init__(self, config: Optional[LiveModeConfig] = None):
-        super().__init__(config)
-        self._twitch: Optional[TwitchChat] = None
-        self._twitch_task: Optional[asyncio.Task] = None
-
-        # Bits/サブスク優先処理用
-        self._priority_queue: deque[LiveInput] = deque(maxlen=20)
+    @property
+    def _priority_queue(self) -> PriorityLane[LiveInput]:
+        """Bits/サブスク用の優先キュー（Twitchレーン）"""
+        return self._scheduler.lane(InputSource.TWITCH_COMMENT.value, priority=True)
 
     async def connect_twitch(
         self,
@@ -554,151 +1287,17 @@ class TwitchLiveMode(LiveMode):
             nick=nick,
             channel=channel,
         )
-        self._twitch = TwitchChat(twitch_config)
+        twitch = TwitchChat(twitch_config)
 
-        success = await self._twitch.connect()
+        success = await twitch.connect()
         if not success:
             logger.error("Failed to connect to Twitch chat")
             return False
 
-        # コールバック設定
-        self._twitch.set_message_callback(self._on_twitch_message)
-        if prioritize_bits:
-            self._twitch.set_bits_callback(self._on_twitch_bits)
-            self._twitch.set_sub_callback(self._on_twitch_sub)
-            self._twitch.set_raid_callback(self._on_twitch_raid)
-
+        self.attach_source(twitch, name="twitch", prioritize=prioritize_bits)
         logger.info(f"Connected to Twitch: #{channel}")
         return True
 
-    def _on_twitch_message(self, message: TwitchMessage):
-        """通常メッセージ受信時"""
-        live_input = LiveInput(
-            text=message.text,
-            source=InputSource.TWITCH_COMMENT,
-            author=message.author_display_name,
-            author_id=message.author_id,
-            timestamp=message.timestamp,
-            metadata={
-                "badges": [b.name for b in message.badges],
-                "emotes": [e.name for e in message.emotes],
-                "color": message.color,
-                "is_subscriber": message.is_subscriber,
-                "is_moderator": message.is_moderator,
-                "is_vip": message.is_vip,
-            },
-        )
-        self.add_input(live_input)
-
-    def _on_twitch_bits(self, message: TwitchMessage):
-        """Bits受信時（優先キュー）"""
-        live_input = LiveInput(
-            text=message.text,
-            source=InputSource.TWITCH_COMMENT,
-            author=message.author_display_name,
-            author_id=message.author_id,
-            timestamp=message.timestamp,
-            metadata={
-                "type": "bits",
-                "bits": message.bits,
-                "badges": [b.name for b in message.badges],
-            },
-        )
-        self._priority_queue.append(live_input)
-        logger.info(f"[Bits] {message.author_display_name}: {message.text} ({message.bits} bits)")
-
-    def _on_twitch_sub(self, message: TwitchMessage):
-        """サブスク受信時（優先キュー）"""
-        live_input = LiveInput(
-            text=message.text or "サブスクありがとう！",
-            source=InputSource.TWITCH_COMMENT,
-            author=message.author_display_name,
-            author_id=message.author_id,
-            timestamp=message.timestamp,
-            metadata={
-                "type": message.message_type.value,
-                "sub_months": message.sub_months,
-                "sub_tier": message.sub_tier,
-            },
-        )
-        self._priority_queue.append(live_input)
-        logger.info(f"[Sub] {message.author_display_name}: {message.sub_months}ヶ月 (Tier {message.sub_tier})")
-
-    def _on_twitch_raid(self, message: TwitchMessage):
-        """レイド受信時（優先キュー）"""
-        live_input = LiveInput(
-            text=f"レイドありがとう！{message.raid_viewer_count}人も来てくれたっす！",
-            source=InputSource.TWITCH_COMMENT,
-            author=message.author_display_name,
-            author_id=message.author_id,
-            timestamp=message.timestamp,
-            metadata={
-                "type": "raid",
-                "viewer_count": message.raid_viewer_count,
-            },
-        )
-        self._priority_queue.append(live_input)
-        logger.info(f"[Raid] {message.author_display_name}: {message.raid_viewer_count}人")
-
-    async def start(self):
-        """処理ループ + Twitchストリーム開始"""
-        if self._twitch:
-            self._twitch_task = asyncio.create_task(self._twitch_stream_loop())
-        await super().start()
-
-    async def _twitch_stream_loop(self):
-        """Twitchチャットストリームループ"""
-        try:
-            async for message in self._twitch.stream():
-                if not self._running:
-                    break
-                # コールバック内で処理済み
-        except asyncio.CancelledError:
-            pass
-        except Exception as e:
-            logger.error(f"Twitch stream error: {e}")
-
-    async def _process_loop(self):
-        """メイン処理ループ（Bits/サブスク優先）"""
-        while self._running:
-            try:
-                # 優先キュー（Bits/サブスク）を先に処理
-                if self._priority_queue:
-                    input_data = self._priority_queue.popleft()
-                    await self._process_input(input_data)
-                # 通常キュー
-                elif self._input_queue:
-                    input_data = self._input_queue.popleft()
-                    await self._process_input(input_data)
-                else:
-                    await asyncio.sleep(self.config.process_interval)
-            except asyncio.CancelledError:
-                break
-            except Exception as e:
-                logger.error(f"Process loop error: {e}")
-                if self._on_error:
-                    self._on_error(e)
-                await asyncio.sleep(1.0)
-
-    async def stop(self):
-        """全ループ停止"""
-        if self._twitch:
-            self._twitch.stop()
-        if self._twitch_task:
-            self._twitch_task.cancel()
-            try:
-                await self._twitch_task
-            except asyncio.CancelledError:
-                pass
-        await super().stop()
-
-    async def close(self):
-        """リソース解放"""
-        await self.stop()
-        if self._twitch:
-            await self._twitch.close()
-        await super().close()
-
 
 async def create_lobby_live_mode(
     gateway_url: str = "http://localhost:18789",
@@ -10,6 +10,7 @@ from loguru import logger
 
 from ..core.emotion import Emotion, EmotionAnalyzer
 from ..core.tts import TTSClient, TTSConfig
+from ..core.tts_scheduler import TTSPriority
 from ..core.video import get_audio_duration_ms
 
 
@@ -157,40 +158,52 @@ class RecordingMode:
 
         logger.info(f"Recording script: {script.title} ({total} lines)")
 
-        for i, line in enumerate(script.lines, 1):
-            if progress_callback:
-                progress_callback(i, total)
-
-            audio_path = audio_dir / f"{i:04d}.mp3"
-
-            logger.info(f"[{i}/{total}] {line.text[:30]}... ({line.emotion.value})")
-
-            try:
-                audio_data = await tts.synthesize(
-                    text=line.text,
-                    emotion=line.emotion.value,
-                    output_path=audio_path,
-                )
-
-                # ffprobeで正確な長さを取得
-                duration_ms = await get_audio_duration_ms(audio_path)
-                if duration_ms <= 0:
-                    # フォールバック: バイト数からの概算
-                    duration_ms = int(len(audio_data) / 32)
-
-                yield RecordingResult(
-                    line=line,
-                    audio_path=audio_path,
-                    duration_ms=duration_ms,
-                )
-
-            except Exception as e:
-                logger.error(f"Failed to synthesize line {i}: {e}")
-                raise
-
-            # 次の行までの待機
-            if line.wait_after > 0:
-                await asyncio.sleep(line.wait_after)
+        # TTSは全行を先に投げておく（同時実行数はスケジューラがTTSサーバーの台数に応じて制限）
+        audio_tasks = [
+            asyncio.create_task(tts.synthesize(
+                text=line.text,
+                emotion=line.emotion.value,
+                output_path=audio_dir / f"{i:04d}.mp3",
+                priority=TTSPriority.RECORDING,
+            ))
+            for i, line in enumerate(script.lines, 1)
+        ]
+
+        try:
+            for i, line in enumerate(script.lines, 1):
+                if progress_callback:
+                    progress_callback(i, total)
+
+                audio_path = audio_dir / f"{i:04d}.mp3"
+
+                logger.info(f"[{i}/{total}] {line.text[:30]}... ({line.emotion.value})")
+
+                try:
+                    audio_data = await audio_tasks[i - 1]
+
+                    # ffprobeで正確な長さを取得
+                    duration_ms = await get_audio_duration_ms(audio_path)
+                    if duration_ms <= 0:
+                        # フォールバック: バイト数からの概算
+                        duration_ms = int(len(audio_data) / 32)
+
+                    yield RecordingResult(
+                        line=line,
+                        audio_path=audio_path,
+                        duration_ms=duration_ms,
+                    )
+
+                except Exception as e:
+                    logger.error(f"Failed to synthesize line {i}: {e}")
+                    raise
+
+                # 次の行までの待機
+                if line.wait_after > 0:
+                    await asyncio.sleep(line.wait_after)
+        finally:
+            for task in audio_tasks:
+                task.cancel()
+            await asyncio.gather(*audio_tasks, return_exceptions=True)
 
         logger.info(f"Recording complete: {audio_dir}")
 
@@ -0,0 +1,140 @@
+"""Tests for Audio Retention"""
+
+import asyncio
+import os
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import AsyncMock
+
+import pytest
+
+from backend.core.audio_retention import AudioRetentionConfig, AudioRetentionManager
+from backend.core.openclaw import CompletionResult, OpenClawConfig
+from backend.modes.live import InputSource, LiveInput, LiveMode, LiveModeConfig
+
+
+def _write(manager: AudioRetentionManager, name: str, size: int, created_at: float) -> Path:
+    path = manager.root / "20260101_00" / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"x" * size)
+    manager.register(path, size, created_at=created_at)
+    return path
+
+
+class TestAudioRetentionManager:
+    """AudioRetentionManager tests"""
+
+    def test_path_for_buckets_by_hour(self, tmp_path):
+        manager = AudioRetentionManager(tmp_path)
+        path = manager.path_for("live", now=datetime(2026, 3, 1, 14, 5, 6))
+        assert path.parent == tmp_path / "20260301_14"
+        assert path.name.startswith("live_20260301_140506_")
+
+    @pytest.mark.asyncio
+    async def test_byte_budget_deletes_oldest(self, tmp_path):
+        manager = AudioRetentionManager(tmp_path, AudioRetentionConfig(max_bytes=25))
+        manager._scanned = True
+        a = _write(manager, "a.mp3", 10, 1.0)
+        b = _write(manager, "b.mp3", 10, 2.0)
+        c = _write(manager, "c.mp3", 10, 3.0)
+
+        deleted = await manager.sweep(now=4.0)
+
+        assert deleted == [a]
+        assert not a.exists() and b.exists() and c.exists()
+        assert manager.total_bytes == 20
+        assert manager.stats["deleted_bytes"] == 10
+
+    @pytest.mark.asyncio
+    async def test_max_age(self, tmp_path):
+        manager = AudioRetentionManager(tmp_path, AudioRetentionConfig(max_age_sec=100))
+        manager._scanned = True
+        old = _write(manager, "old.mp3", 1, 0.0)
+        new = _write(manager, "new.mp3", 1, 150.0)
+
+        assert await manager.sweep(now=160.0) == [old]
+        assert new.exists()
+
+    @pytest.mark.asyncio
+    async def test_pinned_files_survive(self, tmp_path):
+        manager = AudioRetentionManager(tmp_path, AudioRetentionConfig(max_bytes=5))
+        manager._scanned = True
+        a = _write(manager, "a.mp3", 10, 1.0)
+        b = _write(manager, "b.mp3", 10, 2.0)
+        manager.pin(a)
+        manager.add_pin_source(lambda: [b])
+
+        assert await manager.sweep(now=3.0) == []
+
+        manager.unpin(a)
+        assert await manager.sweep(now=3.0) == [a]
+        assert b.exists()
+
+    @pytest.mark.asyncio
+    async def test_empty_bucket_removed(self, tmp_path):
+        manager = AudioRetentionManager(tmp_path, AudioRetentionConfig(max_age_sec=1))
+        manager._scanned = True
+        path = _write(manager, "a.mp3", 1, 0.0)
+
+        await manager.sweep(now=10.0)
+        assert not path.parent.exists()
+
+    @pytest.mark.asyncio
+    async def test_scan_picks_up_previous_files(self, tmp_path):
+        bucket = tmp_path / "20250101_00"
+        bucket.mkdir()
+        stale = bucket / "live_old.mp3"
+        stale.write_bytes(b"x" * 4)
+        os.utime(stale, (0, 0))
+        # フィラー等のキャッシュ音声はバケット外なので対象外
+        (tmp_path / "filler").mkdir()
+        (tmp_path / "filler" / "superchat_00.mp3").write_bytes(b"x")
+
+        manager = AudioRetentionManager(tmp_path, AudioRetentionConfig(max_age_sec=60))
+        assert await manager.sweep(now=1000.0) == [stale]
+        assert (tmp_path / "filler" / "superchat_00.mp3").exists()
+
+    @pytest.mark.asyncio
+    async def test_register_during_scan(self, tmp_path):
+        bucket = tmp_path / "20250101_00"
+        bucket.mkdir()
+        stale = bucket / "live_old.mp3"
+        stale.write_bytes(b"x" * 4)
+        os.utime(stale, (0, 0))
+        fresh = bucket / "live_new.mp3"
+        fresh.write_bytes(b"x" * 7)
+
+        manager = AudioRetentionManager(tmp_path)
+        scan = asyncio.create_task(manager.scan())
+        await asyncio.sleep(0)  # 走査はスレッドで実行中
+        manager.register(fresh, 7, created_at=2000.0)
+        await scan
+
+        assert list(manager._files) == [stale, fresh]
+        assert manager._files[fresh].created_at == 2000.0
+        assert manager.total_bytes == 11
+
+
+class TestLiveModeRetention:
+    """LiveMode integration"""
+
+    @pytest.mark.asyncio
+    async def test_output_registered_and_pinned_by_subtitle(self, tmp_path):
+        live = LiveMode(LiveModeConfig(
+            openclaw=OpenClawConfig(stream=False),
+            audio_output_dir=tmp_path / "audio",
+            generate_live2d=False,
+            audio_retention=AudioRetentionConfig(max_bytes=0),
+        ))
+        live._tts.synthesize = AsyncMock(return_value=b"mp3")
+        live._openclaw.chat = AsyncMock(return_value=CompletionResult(text="どうもっす"))
+
+        await live._process_input(LiveInput(text="こんにちは", source=InputSource.YOUTUBE_COMMENT))
+        await live.close()
+
+        assert len(live.audio_retention) == 1
+        # 字幕履歴が参照しているので容量超過でも削除されない
+        assert await live.audio_retention.sweep() == []
+
+        live.subtitle_manager.clear_history()
+        assert len(await live.audio_retention.sweep()) == 1
@@ -0,0 +1,144 @@
+"""Tests for Audio Blob Store"""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi import HTTPException
+
+import backend.api.live as live_api
+from backend.core.audio_store import AudioBlobStore, audio_media_type, parse_range_header
+from backend.core.openclaw import CompletionResult, OpenClawConfig
+from backend.core.warmup import warmup_wav
+from backend.modes.instances import LiveInstance, LiveInstanceRegistry
+from backend.modes.live import InputSource, LiveInput, LiveMode, LiveModeConfig
+
+
+class TestAudioBlobStore:
+    """AudioBlobStore tests"""
+
+    def test_put_get(self):
+        store = AudioBlobStore()
+        blob_id = store.put(b"abc")
+        blob = store.get(blob_id)
+        assert blob.data == b"abc"
+        assert blob.size == 3
+        assert blob.media_type == "audio/mpeg"
+
+    def test_lru_eviction(self):
+        store = AudioBlobStore(max_bytes=10)
+        a = store.put(b"x" * 4)
+        b = store.put(b"x" * 4)
+        store.get(a)  # aを最近参照に
+        store.put(b"x" * 4)
+
+        assert a in store
+        assert b not in store
+        assert store.total_bytes == 8
+        assert store.evicted == 1
+
+    def test_oversized_blob_kept(self):
+        store = AudioBlobStore(max_bytes=4)
+        blob_id = store.put(b"x" * 8)
+        assert blob_id in store
+
+    def test_fixed_id_overwrite(self):
+        store = AudioBlobStore()
+        store.put(b"old", blob_id="cache_000_00")
+        store.put(b"newer", blob_id="cache_000_00")
+        assert len(store) == 1
+        assert store.total_bytes == 5
+        assert store.get("cache_000_00").data == b"newer"
+
+    def test_remove(self):
+        store = AudioBlobStore()
+        blob_id = store.put(b"abc")
+        assert store.remove(blob_id) is True
+        assert store.remove(blob_id) is False
+        assert store.total_bytes == 0
+
+
+class TestParseRangeHeader:
+    """parse_range_header tests"""
+
+    def test_explicit_range(self):
+        assert parse_range_header("bytes=0-9", 100) == (0, 9)
+
+    def test_open_ended(self):
+        assert parse_range_header("bytes=90-", 100) == (90, 99)
+
+    def test_suffix(self):
+        assert parse_range_header("bytes=-10", 100) == (90, 99)
+
+    def test_clamped_end(self):
+        assert parse_range_header("bytes=50-500", 100) == (50, 99)
+
+    def test_unsatisfiable(self):
+        assert parse_range_header("bytes=100-", 100) is None
+        assert parse_range_header("bytes=9-3", 100) is None
+        assert parse_range_header("items=0-1", 100) is None
+        assert parse_range_header("bytes=a-b", 100) is None
+
+
+class TestLiveModeAudioDelivery:
+    """LiveMode / API integration"""
+
+    @pytest.fixture
+    def live(self, tmp_path):
+        return LiveMode(LiveModeConfig(
+            openclaw=OpenClawConfig(stream=False),
+            audio_output_dir=tmp_path / "audio",
+            generate_live2d=False,
+            generate_subtitles=False,
+            persist_audio=False,
+        ))
+
+    @pytest.mark.asyncio
+    async def test_output_served_from_memory(self, live, tmp_path):
+        live._tts.synthesize = AsyncMock(return_value=b"mp3-bytes")
+        live._openclaw.chat = AsyncMock(return_value=CompletionResult(text="どうもっす"))
+        callback = MagicMock()
+        live.set_output_callback(callback)
+
+        await live._process_input(LiveInput(text="こんにちは", source=InputSource.YOUTUBE_COMMENT))
+
+        output = callback.call_args[0][0]
+        assert output.audio_path is None
+        assert live.audio_store.get(output.audio_id).data == b"mp3-bytes"
+        assert not (tmp_path / "audio").exists() or not any((tmp_path / "audio").iterdir())
+
+    @pytest.mark.asyncio
+    async def test_wav_output_media_type(self, live):
+        live._tts.synthesize = AsyncMock(return_value=warmup_wav())
+        live._openclaw.chat = AsyncMock(return_value=CompletionResult(text="どうもっす"))
+        callback = MagicMock()
+        live.set_output_callback(callback)
+
+        await live._process_input(LiveInput(text="こんにちは", source=InputSource.YOUTUBE_COMMENT))
+
+        blob = live.audio_store.get(callback.call_args[0][0].audio_id)
+        assert blob.media_type == "audio/wav"
+        assert audio_media_type(b"ID3mp3-bytes") == "audio/mpeg"
+
+    @pytest.mark.asyncio
+    async def test_range_endpoint(self, live, monkeypatch):
+        blob_id = live.audio_store.put(b"0123456789")
+        monkeypatch.setattr(live_api, "_registry", _registry_with(live))
+
+        response = await live_api.get_audio(blob_id, range_header="bytes=2-5")
+        assert response.status_code == 206
+        assert response.body == b"2345"
+        assert response.headers["content-range"] == "bytes 2-5/10"
+
+        with pytest.raises(HTTPException) as exc:
+            await live_api.get_audio("missing", range_header=None)
+        assert exc.value.status_code == 404
+
+        with pytest.raises(HTTPException) as exc:
+            await live_api.get_audio(blob_id, range_header="bytes=20-")
+        assert exc.value.status_code == 416
+
+
+def _registry_with(live: LiveMode) -> LiveInstanceRegistry:
+    registry = LiveInstanceRegistry()
+    registry.register(LiveInstance(name=live_api.DEFAULT_INSTANCE, mode=live))
+    return registry
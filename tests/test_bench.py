@@ -0,0 +1,206 @@
+"""Tests for live benchmark (stubs / load generator)"""
+
+import json
+import random
+
+import httpx
+import pytest
+from typer.testing import CliRunner
+
+from backend.bench import (
+    ArrivalProcess,
+    BenchConfig,
+    BurstArrivals,
+    ChatFactory,
+    ChatProfile,
+    LoadGenerator,
+    PoissonArrivals,
+    RaidSpike,
+    StubLatency,
+    StubServer,
+    bench_live_config,
+    create_openclaw_stub,
+    create_tts_stub,
+    parse_arrivals,
+    run_benchmark,
+)
+from backend.cli import app
+from backend.core.openclaw import OpenClawClient, OpenClawConfig
+from backend.core.tts import TTSClient, TTSConfig
+from backend.modes.live import LiveMode
+
+FAST = StubLatency(mean_ms=5)
+
+
+class TestArrivals:
+    """到着過程"""
+
+    def test_poisson_rate(self):
+        times = PoissonArrivals(50).schedule(20.0, random.Random(1))
+        assert 900 < len(times) < 1100
+        assert times == sorted(times)
+        assert all(0 <= t < 20.0 for t in times)
+
+    def test_burst_concentrates_arrivals(self):
+        times = BurstArrivals(base_rate=1, burst_rate=50, period_sec=10, burst_sec=2).schedule(
+            20.0, random.Random(2),
+        )
+        in_burst = sum(1 for t in times if t % 10 < 2)
+        assert in_burst > 0.8 * len(times)
+
+    def test_raid_spike_decays(self):
+        raid = RaidSpike(base_rate=2, peak_rate=50, at_sec=5, decay_sec=5)
+        assert raid.rate(4.9) == 2
+        assert raid.rate(5.0) == 50
+        assert raid.rate(10.0) < raid.rate(6.0)
+
+        times = raid.schedule(20.0, random.Random(3))
+        before = sum(1 for t in times if t < 5)
+        after = sum(1 for t in times if 5 <= t < 10)
+        assert after > 5 * before
+
+    def test_rate_required(self):
+        class NoRate(ArrivalProcess):
+            pass
+
+        with pytest.raises(TypeError):
+            NoRate()
+
+    def test_parse(self):
+        assert parse_arrivals("poisson:20") == PoissonArrivals(20)
+        assert parse_arrivals("raid:1,40,3,8") == RaidSpike(1, 40, 3, 8)
+        assert parse_arrivals("burst") == BurstArrivals()
+
+        with pytest.raises(ValueError):
+            parse_arrivals("flood:10")
+        with pytest.raises(ValueError):
+            parse_arrivals("poisson:fast")
+        with pytest.raises(ValueError):
+            parse_arrivals("poisson:1,2")
+
+
+class TestChatFactory:
+    """合成コメント"""
+
+    def test_mix(self):
+        factory = ChatFactory(ChatProfile(authors=50, superchat_ratio=0.1))
+        rng = random.Random(4)
+        inputs = [factory.make(rng) for _ in range(500)]
+
+        assert {i.platform for i in inputs} == {"youtube", "twitch"}
+        priority = [i for i in inputs if i.is_priority]
+        assert 20 < len(priority) < 90
+        assert all(i.priority_weight > 1.0 for i in priority)
+        # Zipf分布なので上位の投稿者に偏る
+        top = sum(1 for i in inputs if i.author == "viewer0")
+        assert top > 500 / 50
+
+
+class TestStubs:
+    """スタブサーバー"""
+
+    @pytest.mark.asyncio
+    async def test_openclaw_and_tts_clients(self):
+        async with (
+            StubServer(create_openclaw_stub(FAST, responder=lambda text: f"echo:{text}")) as llm,
+            StubServer(create_tts_stub(FAST, audio_for=lambda text: text.encode())) as tts,
+        ):
+            client = OpenClawClient(OpenClawConfig(base_url=llm.base_url))
+            result = await client.chat("こんにちは")
+            chunks = [chunk async for chunk in client.chat_stream("ストリーム")]
+            await client.close()
+
+            tts_client = TTSClient(TTSConfig(base_url=tts.base_url, max_retries=0))
+            audio = await tts_client.synthesize("音声")
+            await tts_client.close()
+
+        assert result.text == "echo:こんにちは"
+        assert "".join(chunks) == "echo:ストリーム"
+        assert audio == "音声".encode()
+
+    @pytest.mark.asyncio
+    async def test_error_rate(self):
+        async with StubServer(create_tts_stub(StubLatency(error_rate=1.0))) as tts:
+            async with httpx.AsyncClient() as client:
+                response = await client.post(f"{tts.base_url}/v1/tts", json={"text": "x"})
+        assert response.status_code == 503
+
+
+class TestLoadGenerator:
+    """LoadGenerator + LiveMode"""
+
+    @pytest.mark.asyncio
+    async def test_run_benchmark(self):
+        report = await run_benchmark(BenchConfig(
+            arrivals=PoissonArrivals(20),
+            duration_sec=1.0,
+            drain_sec=5.0,
+            llm_latency=FAST,
+            tts_latency=FAST,
+            seed=5,
+            sample_interval_sec=0.05,
+        ))
+
+        assert report.offered > 5
+        assert report.outputs > 0
+        assert report.unfinished == 0
+        assert report.latency.count == report.outputs
+        assert report.queue_depth
+        assert report.stages["llm"]["count"] == report.outputs
+        data = report.to_dict()
+        assert data["latency_ms"]["count"] == report.outputs
+        assert "throughput" in report.format_text()
+
+    @pytest.mark.asyncio
+    async def test_caller_config_untouched(self, tmp_path):
+        live_config = bench_live_config(tmp_path)
+        base_url = live_config.openclaw.base_url
+        await run_benchmark(BenchConfig(
+            arrivals=PoissonArrivals(5), duration_sec=0.2, drain_sec=2.0,
+            llm_latency=FAST, tts_latency=FAST, live=live_config,
+        ))
+
+        assert live_config.openclaw.base_url == base_url
+
+    @pytest.mark.asyncio
+    async def test_overload_drops(self, tmp_path):
+        slow = StubLatency(mean_ms=100)
+        config = bench_live_config(tmp_path)
+        config.max_queue_size = 3
+        async with (
+            StubServer(create_openclaw_stub(slow)) as llm,
+            StubServer(create_tts_stub(FAST)) as tts,
+        ):
+            config.openclaw.base_url = llm.base_url
+            config.tts.base_url = tts.base_url
+            async with LiveMode(config) as live:
+                await live.start()
+                generator = LoadGenerator(
+                    live, PoissonArrivals(100), ChatFactory(ChatProfile(superchat_ratio=0)), seed=6,
+                )
+                report = await generator.run(duration_sec=0.5, drain_sec=5.0)
+
+        assert report.dropped.get("queue_full", 0) > 0
+        assert report.drop_rate > 0
+        assert report.max_queue_depth <= 3
+
+
+class TestBenchCLI:
+    """lobby bench-live"""
+
+    def test_bench_live_json(self, tmp_path):
+        out = tmp_path / "bench.json"
+        result = CliRunner().invoke(app, [
+            "bench-live", "--arrivals", "poisson:10", "--duration", "0.5", "--drain", "3",
+            "--llm-ms", "5", "--llm-jitter-ms", "0", "--tts-ms", "5", "--tts-per-char-ms", "0",
+            "--seed", "7", "--json", str(out),
+        ])
+
+        assert result.exit_code == 0, result.output
+        data = json.loads(out.read_text())
+        assert data["offered"] > 0
+        assert "latency_ms" in data
+
+    def test_invalid_arrivals(self):
+        result = CliRunner().invoke(app, ["bench-live", "--arrivals", "flood:1"])
+        assert result.exit_code == 1
@@ -0,0 +1,207 @@
+"""Tests for TTS circuit breakers and fallback providers"""
+
+import time
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+from typer.testing import CliRunner
+
+from backend.api.live import get_tts_status
+from backend.bench import StubLatency, StubServer, create_tts_stub
+from backend.cli import app as cli_app
+from backend.core.circuit_breaker import (
+    CircuitBreaker,
+    CircuitBreakerConfig,
+    CircuitOpenError,
+    CircuitState,
+)
+from backend.core.config import build_tts_config
+from backend.core.tts import TTSClient, TTSConfig
+from backend.core.tts_scheduler import TTSPriority
+
+
+class TestCircuitBreaker:
+    """CircuitBreaker tests"""
+
+    def test_opens_after_failures(self):
+        breaker = CircuitBreaker("tts", CircuitBreakerConfig(failure_threshold=2))
+        breaker.record_failure()
+        assert breaker.state is CircuitState.CLOSED
+        breaker.record_failure()
+        assert breaker.state is CircuitState.OPEN
+        assert not breaker.allows()
+        assert breaker.opens == 1
+
+    def test_success_resets_failures(self):
+        breaker = CircuitBreaker("tts", CircuitBreakerConfig(failure_threshold=2))
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        assert breaker.state is CircuitState.CLOSED
+
+    def test_half_open_probe(self):
+        breaker = CircuitBreaker("tts", CircuitBreakerConfig(failure_threshold=1, open_sec=0))
+        breaker.record_failure()
+        assert breaker.state is CircuitState.HALF_OPEN
+
+        # 試行は1件だけ
+        breaker.on_request()
+        assert not breaker.allows()
+        breaker.record_success()
+        assert breaker.state is CircuitState.CLOSED
+
+    def test_failed_probe_reopens(self):
+        breaker = CircuitBreaker("tts", CircuitBreakerConfig(failure_threshold=3, open_sec=60))
+        breaker.trip()
+        breaker.half_open()
+        breaker.on_request()
+        breaker.record_failure()
+        assert breaker.state is CircuitState.OPEN
+        assert breaker.opens == 2
+
+    def test_slow_calls_count_as_failures(self):
+        breaker = CircuitBreaker("tts", CircuitBreakerConfig(failure_threshold=2, slow_call_ms=100))
+        breaker.record_success(latency_ms=50)
+        breaker.record_success(latency_ms=500)
+        breaker.record_success(latency_ms=800)
+        assert breaker.state is CircuitState.OPEN
+        assert breaker.slow_calls == 2
+
+
+class TestTTSFallback:
+    """TTSClient のブレーカーとフォールバック"""
+
+    @pytest.mark.asyncio
+    async def test_fallback_without_waiting_for_retries(self):
+        down = create_tts_stub(StubLatency(error_rate=1.0))
+        backup = create_tts_stub(audio_for=lambda text: b"backup")
+        async with StubServer(down) as primary, StubServer(backup) as fallback:
+            client = TTSClient(TTSConfig(
+                base_url=primary.base_url, max_failures=1, retry_base_delay=10,
+                fallbacks=[TTSConfig(base_url=fallback.base_url)],
+            ))
+            start = time.monotonic()
+            first = await client.synthesize("一回目")
+            second = await client.synthesize("二回目")
+            elapsed = time.monotonic() - start
+            stats = client.pool.stats
+            await client.close()
+
+        assert first == second == b"backup"
+        # ブレーカーが開いた後は主系に送らない
+        assert down.state.requests == 1
+        assert elapsed < 5
+        assert stats["endpoints"][0]["circuit"]["state"] == "open"
+        assert stats["rejected"] == 1
+
+    @pytest.mark.asyncio
+    async def test_hung_server_times_out_to_fallback(self):
+        hung = create_tts_stub(StubLatency(mean_ms=1000))
+        backup = create_tts_stub(audio_for=lambda text: b"backup")
+        async with StubServer(hung) as primary, StubServer(backup) as fallback:
+            client = TTSClient(TTSConfig(
+                base_url=primary.base_url, request_timeout=0.1,
+                fallbacks=[TTSConfig(base_url=fallback.base_url)],
+            ))
+            start = time.monotonic()
+            audio = await client.synthesize("テスト")
+            elapsed = time.monotonic() - start
+            await client.close()
+
+        assert audio == b"backup"
+        assert elapsed < 1
+
+    @pytest.mark.asyncio
+    async def test_hung_server_live_timeout(self):
+        hung = create_tts_stub(delay_for=lambda text: 30.0)
+        backup = create_tts_stub(audio_for=lambda text: b"backup")
+        async with StubServer(hung) as primary, StubServer(backup) as fallback:
+            # request_timeout は既定（120秒）のまま、ライブ配信の応答だけ早めに見切る
+            client = TTSClient(TTSConfig(
+                base_url=primary.base_url, live_timeout=0.2,
+                fallbacks=[TTSConfig(base_url=fallback.base_url)],
+            ))
+            start = time.monotonic()
+            audio = await client.synthesize("テスト", priority=TTSPriority.LIVE)
+            elapsed = time.monotonic() - start
+            failures = client.pool.endpoints[0].failures
+            await client.close()
+
+        assert audio == b"backup"
+        assert elapsed < 2
+        assert failures == 1
+
+    @pytest.mark.asyncio
+    async def test_live_timeout_only_for_live(self):
+        slow = create_tts_stub(delay_for=lambda text: 0.3, audio_for=lambda text: b"slow")
+        async with StubServer(slow) as primary:
+            client = TTSClient(TTSConfig(base_url=primary.base_url, live_timeout=0.1, max_retries=0))
+            assert await client.synthesize("収録", priority=TTSPriority.RECORDING) == b"slow"
+            with pytest.raises(httpx.ReadTimeout):
+                await client.synthesize("ライブ", priority=TTSPriority.LIVE)
+            await client.close()
+
+    @pytest.mark.asyncio
+    async def test_open_without_fallback_fails_fast(self):
+        down = create_tts_stub(StubLatency(error_rate=1.0))
+        async with StubServer(down) as primary:
+            client = TTSClient(TTSConfig(base_url=primary.base_url, max_failures=1, retry_base_delay=10))
+            with pytest.raises(httpx.HTTPStatusError):
+                await client.synthesize("一回目")
+            with pytest.raises(CircuitOpenError):
+                await client.synthesize("二回目")
+            await client.close()
+
+        assert down.state.requests == 1
+
+    @pytest.mark.asyncio
+    async def test_stream_falls_back(self):
+        down = create_tts_stub(StubLatency(error_rate=1.0))
+        backup = create_tts_stub(audio_for=lambda text: b"streamed")
+        async with StubServer(down) as primary, StubServer(backup) as fallback:
+            client = TTSClient(TTSConfig(
+                base_url=primary.base_url, max_failures=1,
+                fallbacks=[TTSConfig(base_url=fallback.base_url)],
+            ))
+            chunks = [chunk async for chunk in client.synthesize_stream("テスト")]
+            await client.close()
+
+        assert b"".join(chunks) == b"streamed"
+
+    @pytest.mark.asyncio
+    async def test_status_api(self):
+        async with StubServer(create_tts_stub()) as tts:
+            client = TTSClient(TTSConfig(base_url=tts.base_url))
+            await client.synthesize("テスト")
+            status = await get_tts_status()
+            await client.close()
+
+        endpoints = status["pools"][f"miotts:{tts.base_url}"]["endpoints"]
+        assert endpoints[0]["circuit"]["state"] == "closed"
+
+    def test_build_config_fallbacks(self):
+        config = build_tts_config({"tts": {
+            "slow_call_ms": 5000,
+            "live_timeout": 5,
+            "fallbacks": [{"provider": "openai", "base_url": "http://backup", "voice": "alloy"}],
+        }})
+        assert config.slow_call_ms == 5000
+        assert config.live_timeout == 5
+        assert TTSConfig().live_timeout == 10.0
+        assert config.fallbacks[0].provider == "openai"
+        assert config.fallbacks[0].voice == "alloy"
+
+
+def test_doctor_shows_circuit_state():
+    def fake_get(url: str, timeout: float = 0):
+        response = MagicMock(status_code=200)
+        response.json.return_value = {"pools": {"miotts:http://tts": {"endpoints": [
+            {"url": "http://tts", "circuit": {"state": "open", "opens": 2}},
+        ]}}}
+        return response
+
+    with patch("httpx.get", side_effect=fake_get):
+        result = CliRunner().invoke(cli_app, ["doctor"])
+
+    assert "circuit open: http://tts (opened 2x)" in result.output
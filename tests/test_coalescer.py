@@ -0,0 +1,98 @@
+"""Tests for Comment Coalescer"""
+
+from backend.core.coalescer import CoalescerConfig, CommentCoalescer, normalize_comment
+from backend.modes.live import InputSource, LiveInput, LiveMode, LiveModeConfig
+
+
+def _input(text: str, author: str = "User", **metadata) -> LiveInput:
+    return LiveInput(text=text, source=InputSource.YOUTUBE_COMMENT, author=author, metadata=metadata)
+
+
+class TestNormalizeComment:
+    """normalize_comment tests"""
+
+    def test_width_and_case(self):
+        assert normalize_comment("ＬＯＢＢＹ") == normalize_comment("lobby")
+
+    def test_repeated_chars(self):
+        assert normalize_comment("草草草草") == normalize_comment("草")
+        assert normalize_comment("wwwwww") == normalize_comment("ww")
+
+    def test_punctuation_ignored(self):
+        assert normalize_comment("おはロビィ！！") == normalize_comment("おはロビィ")
+
+    def test_emotes_removed(self):
+        assert normalize_comment("Kappa 草", emotes=["Kappa"]) == normalize_comment("草")
+        assert normalize_comment(":_lobbyWave: おはロビィ") == normalize_comment("おはロビィ")
+
+    def test_symbol_only_comment(self):
+        assert normalize_comment("😂😂😂") == "😂"
+
+
+class TestCommentCoalescer:
+    """CommentCoalescer tests"""
+
+    def test_duplicate_merged(self):
+        coalescer = CommentCoalescer()
+        first = _input("草", author="A")
+
+        assert coalescer.offer(first, now=0.0) is False
+        assert coalescer.offer(_input("草草草", author="B"), now=1.0) is True
+        assert coalescer.offer(_input("ｗ草", author="C"), now=2.0) is False
+
+        assert first.metadata["coalesced_count"] == 2
+        assert first.metadata["coalesced_authors"] == ["A", "B"]
+        assert coalescer.stats.coalesced == 1
+
+    def test_window_expiry(self):
+        coalescer = CommentCoalescer(CoalescerConfig(window_sec=5.0))
+        assert coalescer.offer(_input("おはロビィ"), now=0.0) is False
+        assert coalescer.offer(_input("おはロビィ"), now=4.0) is True
+        # 最後の重複から5秒以上空いたら新規扱い
+        assert coalescer.offer(_input("おはロビィ"), now=9.5) is False
+
+    def test_release_starts_new_entry(self):
+        coalescer = CommentCoalescer()
+        first = _input("かわいい")
+        coalescer.offer(first, now=0.0)
+        coalescer.release(first)
+        assert coalescer.offer(_input("かわいい"), now=1.0) is False
+        assert "coalesced_count" not in first.metadata
+
+    def test_copy_pasta_near_duplicate(self):
+        coalescer = CommentCoalescer()
+        pasta = "ロビィちゃんの配信を見ると元気が出るので毎日見ています"
+        assert coalescer.offer(_input(pasta), now=0.0) is False
+        assert coalescer.offer(_input(pasta + "よ"), now=1.0) is True
+
+    def test_disabled(self):
+        coalescer = CommentCoalescer(CoalescerConfig(enabled=False))
+        coalescer.offer(_input("草"), now=0.0)
+        assert coalescer.offer(_input("草"), now=0.1) is False
+
+    def test_max_authors(self):
+        coalescer = CommentCoalescer(CoalescerConfig(max_authors=3))
+        first = _input("888", author="U0")
+        coalescer.offer(first, now=0.0)
+        for i in range(1, 10):
+            coalescer.offer(_input("888", author=f"U{i}"), now=0.1 * i)
+        assert first.metadata["coalesced_count"] == 10
+        assert len(first.metadata["coalesced_authors"]) == 3
+
+
+class TestLiveModeCoalescing:
+    """LiveMode integration"""
+
+    def test_flood_takes_one_slot(self, tmp_path):
+        live = LiveMode(LiveModeConfig(audio_output_dir=tmp_path, generate_live2d=False))
+
+        for i in range(30):
+            assert live.add_input(_input("草", author=f"User{i}")) is True
+
+        assert live.queue_size == 1
+        queued = live._dequeue()
+        assert queued.metadata["coalesced_count"] == 30
+
+        # 取り出し後の重複は新しいキュー項目になる
+        live.add_input(_input("草"))
+        assert live.queue_size == 1
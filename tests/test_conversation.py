@@ -0,0 +1,145 @@
+"""Tests for token-budgeted conversation history"""
+
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from backend.bench import StubLatency, StubServer, create_openclaw_stub
+from backend.core.conversation import ConversationHistory, PromptStats, estimate_tokens
+from backend.core.openclaw import OpenClawClient, OpenClawConfig
+
+SUMMARY_MARK = "【これまでの要約】"
+
+
+class TestEstimateTokens:
+    """estimate_tokens tests"""
+
+    def test_cjk_and_ascii(self):
+        assert estimate_tokens("") == 0
+        assert estimate_tokens("こんにちは") == 5
+        assert estimate_tokens("hello world!") == 3
+        assert estimate_tokens("草www") == 2
+
+
+class TestConversationHistory:
+    """ConversationHistory tests"""
+
+    def test_compacts_oldest_pairs(self):
+        history = ConversationHistory(token_budget=100, compact_ratio=0.5)
+        for i in range(4):
+            assert history.add_turn(f"質問{i}" * 3, f"回答{i}" * 3) is False
+
+        assert history.add_turn("質問4" * 3, "回答4" * 3) is True
+        assert history.tokens <= 50
+        pending = history.take_pending()
+        assert pending[0] == {"role": "user", "content": "質問0" * 3}
+        assert len(pending) % 2 == 0
+        # 直近のターンは残る
+        assert history.messages()[-1]["content"] == "回答4" * 3
+        assert not history.has_pending
+
+    def test_keeps_latest_turn_even_if_over_budget(self):
+        history = ConversationHistory(token_budget=10)
+        history.add_turn("長い質問" * 10, "長い回答" * 10)
+        assert len(history) == 2
+        assert not history.has_pending
+
+    def test_summary_message_and_generation(self):
+        history = ConversationHistory(summary_max_tokens=10)
+        generation = history.generation
+        history.set_summary("リスナーAと猫の話をした" * 5, generation)
+        assert estimate_tokens(history.summary) <= 10
+        assert history.messages()[0]["role"] == "system"
+
+        history.clear()
+        history.set_summary("古い要約", generation)
+        assert history.summary == ""
+        assert history.messages() == []
+
+    def test_summary_request(self):
+        history = ConversationHistory()
+        messages = history.summary_request([{"role": "user", "content": "やあ"}])
+        assert messages[0]["role"] == "system"
+        assert "リスナー: やあ" in messages[1]["content"]
+
+    def test_prompt_stats(self):
+        stats = PromptStats()
+        for tokens in (10, 20, 30):
+            stats.record(tokens)
+        stats.record(40, reported=42)
+        data = stats.to_dict()
+        assert data["requests"] == 4
+        assert data["last"] == 40
+        assert data["max"] == 40
+        assert data["mean"] == 25.0
+        assert data["last_reported"] == 42
+
+
+class TestOpenClawHistory:
+    """OpenClawClient + 要約"""
+
+    @pytest.mark.asyncio
+    async def test_prompt_bounded_with_rolling_summary(self):
+        prompts: list[int] = []
+
+        def respond(text: str) -> str:
+            if text.startswith(SUMMARY_MARK):
+                return "・リスナーと雑談した"
+            return "そうなんすね！" * 5
+
+        app = create_openclaw_stub(StubLatency(mean_ms=1), responder=respond)
+        async with StubServer(app) as llm:
+            client = OpenClawClient(OpenClawConfig(
+                base_url=llm.base_url, system_prompt="ロビィです", history_token_budget=120,
+            ))
+            for i in range(12):
+                chunks = [c async for c in client.chat_stream(f"コメント{i}番目です")]
+                assert chunks
+                prompts.append(client.prompt_stats["last"])
+                await asyncio.sleep(0.02)  # バックグラウンドの要約を進める
+            messages = client._build_messages("次")
+            stats = client.prompt_stats
+            await client.close()
+
+        # 固定のシステムプロンプトが先頭、要約が続く
+        assert messages[0] == {"role": "system", "content": "ロビィです"}
+        assert "リスナーと雑談した" in messages[1]["content"]
+        assert stats["summaries"] >= 1
+        assert stats["requests"] == 12
+        assert stats["history_tokens"] <= 120
+        assert max(prompts) < 250
+
+    @pytest.mark.asyncio
+    async def test_summary_failure_truncates(self):
+        def respond(text: str) -> str:
+            if text.startswith(SUMMARY_MARK):
+                raise HTTPException(503, "summary broke")
+            return "はいっす"
+
+        app = create_openclaw_stub(StubLatency(mean_ms=1), responder=respond)
+        async with StubServer(app) as llm:
+            client = OpenClawClient(OpenClawConfig(base_url=llm.base_url, history_token_budget=40))
+            for i in range(6):
+                await client.chat(f"コメント{i}です、よろしく")
+                await asyncio.sleep(0.02)
+            stats = client.prompt_stats
+            await client.close()
+
+        assert stats["summary_failures"] >= 1
+        assert stats["discarded_turns"] > 0
+        assert stats["last_reported"] is not None
+        assert client.history.summary == ""
+
+    @pytest.mark.asyncio
+    async def test_summarize_disabled(self):
+        async with StubServer(create_openclaw_stub(StubLatency(mean_ms=1))) as llm:
+            client = OpenClawClient(OpenClawConfig(
+                base_url=llm.base_url, history_token_budget=40, summarize_history=False,
+            ))
+            for i in range(6):
+                await client.chat(f"コメント{i}です、よろしく")
+            await client.close()
+
+        assert client.prompt_stats["discarded_turns"] > 0
+        assert llm.app.state.requests == 6
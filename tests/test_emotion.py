@@ -1,6 +1,8 @@
 """Emotion Analyzer Tests"""
 
-from backend.core.emotion import Emotion, EmotionAnalyzer
+import pytest
+
+from backend.core.emotion import Emotion, EmotionAnalyzer, IncrementalEmotionAnalyzer
 
 
 class TestEmotionAnalyzer:
@@ -41,3 +43,56 @@ class TestEmotionAnalyzer:
         result = self.analyzer.analyze("[invalid] テスト")
         # Invalid tags should fall back to keyword analysis
         assert result.raw_text == "テスト"
+
+
+class TestIncrementalEmotionAnalyzer:
+    def _stream(self, analyzer, text, size=2):
+        updates = []
+        for i in range(0, len(text), size):
+            updates += analyzer.feed(text[i:i + size])
+        return updates + analyzer.finish()
+
+    def test_switches_per_sentence(self):
+        analyzer = IncrementalEmotionAnalyzer()
+        text = "こんにちは。今日はすごい！！マジでやばいっす！"
+        updates = self._stream(analyzer, text)
+        assert [u.emotion.primary for u in updates] == [Emotion.EXCITED]
+        assert updates[0].sentence_index == 1
+        assert text[updates[0].offset:].startswith("今日は")
+
+    def test_waits_for_end_of_punctuation(self):
+        analyzer = IncrementalEmotionAnalyzer()
+        assert analyzer.feed("すごい！") == []
+        # 「！」の後に続く記号も同じ文
+        updates = analyzer.feed("！次")
+        assert updates[0].emotion.raw_text == "すごい！！"
+
+    def test_hysteresis_holds_expression(self):
+        analyzer = IncrementalEmotionAnalyzer()
+        updates = self._stream(analyzer, "マジでやばい！！すごい！ふつうの話。別の話。")
+        assert [u.emotion.primary for u in updates] == [Emotion.EXCITED]
+        # 平文が続くと neutral に戻る
+        updates = self._stream(analyzer, "まだ話す。もう少し。")
+        assert [u.emotion.primary for u in updates] == [Emotion.NEUTRAL]
+
+    def test_tag_switches_immediately(self):
+        analyzer = IncrementalEmotionAnalyzer()
+        updates = analyzer.analyze_text("[sad] さようなら。[happy] またね！")
+        assert [u.emotion.primary for u in updates] == [Emotion.SAD, Emotion.HAPPY]
+        assert updates[1].emotion.raw_text == "またね！"
+
+    def test_same_as_whole_text_updates(self):
+        text = "今日はすごい！！えっ、びっくり！？悲しい..."
+        assert self._stream(IncrementalEmotionAnalyzer(), text, size=1) == IncrementalEmotionAnalyzer().analyze_text(text)
+
+    @pytest.mark.asyncio
+    async def test_track_stream(self):
+        async def deltas():
+            for chunk in ["やった", "！楽しい", "！"]:
+                yield chunk
+
+        analyzer = IncrementalEmotionAnalyzer()
+        items = [item async for item in analyzer.track(deltas())]
+        assert "".join(delta for delta, _ in items) == "やった！楽しい！"
+        assert [u.emotion.primary for _, updates in items for u in updates] == [Emotion.HAPPY]
+        assert analyzer.current.primary == Emotion.HAPPY
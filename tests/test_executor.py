@@ -0,0 +1,110 @@
+"""Tests for Blocking Executor"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+import backend.core.executor as executor_module
+from backend.core.executor import (
+    BlockingExecutor,
+    ExecutorConfig,
+    run_cpu,
+    run_io,
+    shutdown_executor,
+)
+
+
+def _slow_square(x: int) -> int:
+    time.sleep(0.05)
+    return x * x
+
+
+def _fail():
+    raise ValueError("boom")
+
+
+@pytest.fixture
+def thread_executor(monkeypatch):
+    """プロセスを使わない実行プールをシングルトンとして差し込む"""
+    executor = BlockingExecutor(ExecutorConfig(io_workers=2, cpu_workers=2, use_processes=False))
+    monkeypatch.setattr(executor_module, "_executor", executor)
+    yield executor
+    executor.shutdown()
+
+
+class TestWorkerPool:
+    """WorkerPool tests"""
+
+    @pytest.mark.asyncio
+    async def test_runs_off_event_loop(self, thread_executor):
+        loop_thread = threading.get_ident()
+        worker_thread = await run_io(threading.get_ident)
+
+        assert worker_thread != loop_thread
+        assert thread_executor.io.stats.completed == 1
+
+    @pytest.mark.asyncio
+    async def test_loop_stays_responsive(self, thread_executor):
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.005)
+                ticks += 1
+
+        task = asyncio.create_task(ticker())
+        results = await asyncio.gather(*(run_cpu(_slow_square, i) for i in range(4)))
+        task.cancel()
+
+        assert results == [0, 1, 4, 9]
+        assert ticks > 5
+
+    @pytest.mark.asyncio
+    async def test_queue_depth_and_wait(self, thread_executor):
+        await asyncio.gather(*(run_cpu(_slow_square, i) for i in range(6)))
+
+        stats = thread_executor.stats["cpu"]
+        assert stats["submitted"] == 6
+        assert stats["completed"] == 6
+        assert stats["pending"] == 0
+        assert stats["max_pending"] == 6
+        # ワーカー2つに6件投入したので後続は待たされる
+        assert stats["wait_ms_max"] >= 40
+        assert stats["processes"] is False
+
+    @pytest.mark.asyncio
+    async def test_failure_counted_and_raised(self, thread_executor):
+        with pytest.raises(ValueError):
+            await run_io(_fail)
+
+        stats = thread_executor.io.stats
+        assert stats.failed == 1
+        assert stats.pending == 0
+
+
+class TestProcessPool:
+    """Process pool tests"""
+
+    @pytest.mark.asyncio
+    async def test_cpu_work_runs_in_process(self):
+        executor = BlockingExecutor(ExecutorConfig(cpu_workers=1))
+        try:
+            assert executor.stats["cpu"]["processes"] is True
+            assert await executor.cpu.run(_slow_square, 7) == 49
+        finally:
+            executor.shutdown()
+
+
+class TestSingleton:
+    """get_executor tests"""
+
+    def test_shutdown_resets(self, monkeypatch):
+        monkeypatch.setattr(executor_module, "_executor", None)
+        first = executor_module.get_executor()
+        assert executor_module.get_executor() is first
+
+        shutdown_executor()
+        assert executor_module._executor is None
@@ -0,0 +1,110 @@
+"""Tests for Filler Reactions"""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from backend.core.emotion import Emotion, EmotionResult
+from backend.core.filler import FillerBank, FillerClip, FillerConfig, reaction_kind
+from backend.core.openclaw import CompletionResult, OpenClawConfig
+from backend.modes.live import InputSource, LiveInput, LiveMode, LiveModeConfig
+
+
+def _clip(kind: str, text: str, emotion: Emotion = Emotion.NEUTRAL) -> FillerClip:
+    return FillerClip(kind=kind, text=text, emotion=EmotionResult(primary=emotion, intensity=0.5))
+
+
+class TestReactionKind:
+    """reaction_kind tests"""
+
+    def test_youtube_types(self):
+        assert reaction_kind({"type": "superChatEvent"}) == "superchat"
+        assert reaction_kind({"type": "newSponsorEvent"}) == "membership"
+
+    def test_twitch_types(self):
+        assert reaction_kind({"type": "bits"}) == "bits"
+        assert reaction_kind({"type": "resubscription"}) == "subscription"
+        assert reaction_kind({"type": "raid"}) == "raid"
+
+    def test_plain_comment(self):
+        assert reaction_kind({}) == "comment"
+
+
+class TestFillerBank:
+    """FillerBank tests"""
+
+    def test_pick_rotates(self):
+        bank = FillerBank()
+        bank.add(_clip("superchat", "おっ！"))
+        bank.add(_clip("superchat", "ありがとうっす！"))
+
+        picked = [bank.pick("superchat").text for _ in range(3)]
+        assert picked == ["おっ！", "ありがとうっす！", "おっ！"]
+
+    def test_pick_prefers_emotion(self):
+        bank = FillerBank()
+        bank.add(_clip("superchat", "おっ！"))
+        bank.add(_clip("superchat", "えっ、マジっすか！", Emotion.SURPRISED))
+
+        assert bank.pick("superchat", "surprised").text == "えっ、マジっすか！"
+        # 一致する感情がなければ種別内から選ぶ
+        assert bank.pick("superchat", "sad") is not None
+
+    def test_unknown_kind(self):
+        bank = FillerBank()
+        assert bank.pick("comment") is None
+
+
+class TestLiveModeFiller:
+    """LiveMode integration"""
+
+    @pytest.fixture
+    def live(self, tmp_path):
+        return LiveMode(LiveModeConfig(
+            openclaw=OpenClawConfig(stream=False),
+            audio_output_dir=tmp_path / "audio",
+            generate_live2d=False,
+            generate_subtitles=False,
+            filler=FillerConfig(reactions={"superchat": ["おっ！", "[happy] ありがとうっす！"]}),
+        ))
+
+    @pytest.mark.asyncio
+    async def test_prepare_fillers(self, live):
+        live._tts.synthesize = AsyncMock(return_value=b"audio")
+
+        assert await live.prepare_fillers() == 2
+        texts = [call.kwargs["text"] for call in live._tts.synthesize.call_args_list]
+        assert texts == ["おっ！", "ありがとうっす！"]
+
+    @pytest.mark.asyncio
+    async def test_filler_precedes_response(self, live):
+        live._tts.synthesize = AsyncMock(return_value=b"audio")
+        await live.prepare_fillers()
+        live._openclaw.chat = AsyncMock(return_value=CompletionResult(text="スパチャありがとうっす！"))
+
+        outputs = []
+        live.set_output_callback(outputs.append)
+
+        superchat = LiveInput(
+            text="頑張って！",
+            source=InputSource.YOUTUBE_COMMENT,
+            metadata={"type": "superChatEvent", "amount": 500},
+        )
+        await live._process_input(superchat)
+
+        assert [o.is_filler for o in outputs] == [True, False]
+        assert outputs[1].response_text == "スパチャありがとうっす！"
+        assert live.stats["processed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_no_filler_for_comment(self, live):
+        live._tts.synthesize = AsyncMock(return_value=b"audio")
+        await live.prepare_fillers()
+        live._openclaw.chat = AsyncMock(return_value=CompletionResult(text="どうもっす"))
+        callback = MagicMock()
+        live.set_output_callback(callback)
+
+        await live._process_input(LiveInput(text="こんにちは", source=InputSource.YOUTUBE_COMMENT))
+
+        assert callback.call_count == 1
+        assert callback.call_args[0][0].is_filler is False
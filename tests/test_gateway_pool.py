@@ -0,0 +1,157 @@
+"""Tests for multi-gateway OpenClaw routing"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from backend.bench import StubLatency, StubServer, create_openclaw_stub
+from backend.core.gateway_pool import GatewayPool, GatewayRoutingConfig
+from backend.core.openclaw import OpenClawClient, OpenClawConfig
+
+
+def _status_error(status: int) -> httpx.HTTPStatusError:
+    request = httpx.Request("POST", "http://gateway/v1/chat/completions")
+    return httpx.HTTPStatusError("error", request=request, response=httpx.Response(status, request=request))
+
+
+class TestGatewayPool:
+    """GatewayPool tests"""
+
+    def test_pick_by_ewma_and_availability(self):
+        pool = GatewayPool(["http://a", "http://b", "http://a"])
+        assert len(pool) == 2
+        a, b = pool.gateways
+        assert pool.pick() is a  # 未計測なら登録順
+
+        a.record_success(300)
+        b.record_success(100)
+        assert pool.pick() is b
+        b.inflight = 5
+        assert pool.pick() is a
+
+        b.inflight = 0
+        for _ in range(3):
+            b.record_failure(0.0, max_failures=3, cooldown_sec=1e9)
+        assert pool.pick() is a
+        assert pool.pick(exclude=[a]) is b  # 外していても他になければ使う
+
+        with pytest.raises(ValueError):
+            GatewayPool([])
+
+    def test_hedge_delay(self):
+        pool = GatewayPool(["http://a", "http://b"], GatewayRoutingConfig(hedge=True, hedge_min_samples=5))
+        a = pool.gateways[0]
+        for ms in (100, 200, 300, 400):
+            a.record_success(ms)
+        assert pool.hedge_delay(a) is None
+        a.record_success(1000)
+        assert pool.hedge_delay(a) == pytest.approx(1.0)
+
+        assert GatewayPool(["http://a"], GatewayRoutingConfig(hedge=True, hedge_min_samples=0)).hedge_delay(a) is None
+
+    @pytest.mark.asyncio
+    async def test_failover(self):
+        pool = GatewayPool(["http://a", "http://b"])
+
+        async def fn(url: str) -> str:
+            if url == "http://a":
+                raise httpx.ConnectError("refused")
+            return url
+
+        assert await pool.call(fn) == "http://b"
+        assert pool.failovers == 1
+        assert pool.gateways[0].failures == 1
+
+    @pytest.mark.asyncio
+    async def test_client_error_not_retried(self):
+        pool = GatewayPool(["http://a", "http://b"])
+        calls = []
+
+        async def fn(url: str) -> str:
+            calls.append(url)
+            raise _status_error(400)
+
+        with pytest.raises(httpx.HTTPStatusError):
+            await pool.call(fn)
+        assert calls == ["http://a"]
+        assert pool.gateways[0].failures == 0
+
+    @pytest.mark.asyncio
+    async def test_hedge_takes_first_answer(self):
+        pool = GatewayPool(["http://slow", "http://fast"], GatewayRoutingConfig(
+            hedge=True, hedge_min_samples=0, hedge_min_ms=20,
+        ))
+        discarded = []
+
+        async def fn(url: str) -> str:
+            await asyncio.sleep(1.0 if url == "http://slow" else 0.01)
+            return url
+
+        async def discard(result: str):
+            discarded.append(result)
+
+        assert await pool.call(fn, discard=discard) == "http://fast"
+        slow, fast = pool.gateways
+        assert (fast.hedges, fast.hedge_wins) == (1, 1)
+        assert slow.inflight == 0
+        assert discarded == []  # 遅い方はキャンセル済み
+        # キャンセルまでの時間が遅い方のEWMAに反映され、次は速い方が選ばれる
+        assert slow.ewma_ms >= 20
+        assert pool.pick() is fast
+
+        # ヘッジ無効の呼び出しは待つ
+        fast.ewma_ms = 1e6
+        assert await pool.call(fn, hedge=False) == "http://slow"
+
+    @pytest.mark.asyncio
+    async def test_health_check(self):
+        pool = GatewayPool(["http://a", "http://b"])
+
+        async def probe(url: str) -> bool:
+            if url == "http://b":
+                raise httpx.ConnectError("refused")
+            return True
+
+        await pool.check_health(probe)
+        assert [g["available"] for g in pool.stats["gateways"]] == [True, False]
+
+
+class TestOpenClawMultiGateway:
+    """OpenClawClient + 複数Gateway"""
+
+    @pytest.mark.asyncio
+    async def test_hedged_chat_keeps_single_history(self):
+        routing = GatewayRoutingConfig(hedge=True, hedge_min_samples=0, hedge_min_ms=50)
+        async with (
+            StubServer(create_openclaw_stub(StubLatency(mean_ms=500), responder=lambda t: "slow")) as slow,
+            StubServer(create_openclaw_stub(StubLatency(mean_ms=1), responder=lambda t: "fast")) as fast,
+        ):
+            client = OpenClawClient(OpenClawConfig(
+                base_url=slow.base_url, gateway_urls=[fast.base_url], routing=routing,
+            ))
+            result = await client.chat("こんにちは")
+            chunks = [c async for c in client.chat_stream("ストリーム")]
+            messages = client._build_messages("次")
+            stats = client.gateway_stats
+            await client.close()
+
+        assert result.text == "fast"
+        assert "".join(chunks) == "fast"
+        # 採用された応答だけが履歴に入る
+        assert [m["content"] for m in messages] == ["こんにちは", "fast", "ストリーム", "fast", "次"]
+        assert stats["gateways"][1]["hedge_wins"] == 1
+        # 2回目は速いGatewayが最初に選ばれる
+        assert stats["gateways"][0]["requests"] == 1
+
+    @pytest.mark.asyncio
+    async def test_failover_to_second_gateway(self):
+        async with StubServer(create_openclaw_stub(StubLatency(), responder=lambda t: "ok")) as llm:
+            client = OpenClawClient(OpenClawConfig(
+                base_url="http://127.0.0.1:9", gateway_urls=[llm.base_url], timeout=2.0,
+            ))
+            chunks = [c async for c in client.chat_stream("やあ")]
+            await client.close()
+
+        assert "".join(chunks) == "ok"
+        assert client.gateway_stats["failovers"] == 1
@@ -0,0 +1,143 @@
+"""Tests for streaming audio analysis in HighlightDetector"""
+
+import asyncio
+import importlib.util
+import shutil
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+from scipy.io import wavfile
+
+from backend.core.highlight import HighlightConfig, HighlightDetector, HighlightType
+
+SAMPLE_RATE = 8000
+
+
+def _signal(seconds: float, loud: list[tuple[float, float]], channels: int = 1) -> np.ndarray:
+    """Quiet noise with loud sections at the given (start_sec, end_sec) ranges."""
+    rng = np.random.default_rng(0)
+    samples = rng.normal(0, 0.05, int(seconds * SAMPLE_RATE)).astype(np.float32)
+    for start, end in loud:
+        section = slice(int(start * SAMPLE_RATE), int(end * SAMPLE_RATE))
+        t = np.arange(section.stop - section.start) / SAMPLE_RATE
+        samples[section] = 0.9 * np.sin(2 * np.pi * 440 * t)
+    if channels > 1:
+        samples = np.stack([samples] * channels, axis=1)
+    return samples
+
+
+def _reference(detector: HighlightDetector, audio: np.ndarray) -> list[tuple[int, float]]:
+    """Whole-file analysis (load everything, normalize, then window RMS)."""
+    if audio.ndim > 1:
+        audio = audio.mean(axis=1)
+    audio = audio.astype(np.float64) / (np.max(np.abs(audio)) + 1e-10)
+    window = int(detector.config.audio_window_ms * SAMPLE_RATE / 1000)
+    result = []
+    for i in range(0, len(audio), window):
+        chunk = audio[i:i + window]
+        if len(chunk) < window // 2:
+            continue
+        rms = np.sqrt(np.mean(chunk ** 2))
+        if rms >= detector.config.audio_threshold:
+            result.append((int(i / SAMPLE_RATE * 1000), rms))
+    return result
+
+
+async def _blocks(audio: np.ndarray, size: int):
+    for i in range(0, len(audio), size):
+        yield audio[i:i + size]
+
+
+class TestStreamingAudioAnalysis:
+    """HighlightDetector.analyze_audio_blocks"""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("block_size", [1000, 4000, 12345, 10 ** 6])
+    async def test_matches_whole_file_analysis(self, block_size):
+        detector = HighlightDetector(HighlightConfig(audio_threshold=0.3))
+        audio = _signal(20.2, [(3.0, 4.0), (12.5, 13.0)])
+
+        highlights = await detector.analyze_audio_blocks(_blocks(audio, block_size), SAMPLE_RATE)
+
+        expected = _reference(detector, audio)
+        assert [h.timestamp_ms for h in highlights] == [ts for ts, _ in expected]
+        assert [h.metadata["rms"] for h in highlights] == pytest.approx([rms for _, rms in expected], rel=1e-5)
+        assert all(h.highlight_type == HighlightType.AUDIO_SPIKE for h in highlights)
+        assert {h.timestamp_ms for h in highlights} >= {3000, 3500, 12500}
+
+    @pytest.mark.asyncio
+    async def test_stereo_and_progress(self):
+        detector = HighlightDetector(HighlightConfig(audio_threshold=0.3))
+        audio = _signal(5.0, [(1.0, 2.0)], channels=2)
+        progress = []
+
+        highlights = await detector.analyze_audio_blocks(
+            _blocks(audio, SAMPLE_RATE), SAMPLE_RATE, total_frames=len(audio),
+            progress_callback=lambda done, total: progress.append((done, total)),
+        )
+
+        assert [h.timestamp_ms for h in highlights] == [ts for ts, _ in _reference(detector, audio)]
+        assert progress == [(1000 * i, 5000) for i in range(1, 6)]
+
+    @pytest.mark.asyncio
+    async def test_silence(self):
+        detector = HighlightDetector()
+        silent = np.zeros(SAMPLE_RATE * 2, dtype=np.float32)
+        assert await detector.analyze_audio_blocks(_blocks(silent, 1000), SAMPLE_RATE) == []
+
+    @pytest.mark.asyncio
+    async def test_no_decoder(self, tmp_path, monkeypatch):
+        if importlib.util.find_spec("soundfile") is not None:
+            pytest.skip("soundfile installed")
+        monkeypatch.setattr(shutil, "which", lambda name: None)
+        assert await HighlightDetector().analyze_audio_file(tmp_path / "missing.wav") == []
+
+
+    @pytest.mark.asyncio
+    async def test_ffmpeg_stderr_flood(self, tmp_path):
+        # Stand-in for ffmpeg that floods stderr past the pipe buffer before failing
+        fake_ffmpeg = tmp_path / "ffmpeg"
+        fake_ffmpeg.write_text(
+            f"#!{sys.executable}\n"
+            "import sys\n"
+            "sys.stderr.write('noise\\n' * 50000 + 'real error')\n"
+            "sys.stderr.flush()\n"
+            "sys.stdout.buffer.write(b'\\0' * 4000)\n"
+            "sys.exit(1)\n"
+        )
+        fake_ffmpeg.chmod(0o755)
+        blocks = HighlightDetector()._ffmpeg_blocks(str(fake_ffmpeg), tmp_path / "vod.mkv", SAMPLE_RATE)
+
+        async def consume():
+            return [block async for block in blocks]
+
+        with pytest.raises(RuntimeError, match="real error$"):
+            await asyncio.wait_for(consume(), timeout=10)
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg not installed")
+class TestAudioFileDecoding:
+    """analyze_audio_file with real files"""
+
+    @pytest.mark.asyncio
+    async def test_video_container(self, tmp_path):
+        audio = _signal(6.0, [(2.0, 3.0)])
+        wav_path = tmp_path / "audio.wav"
+        wavfile.write(wav_path, SAMPLE_RATE, (audio / np.abs(audio).max() * 30000).astype(np.int16))
+        video_path = tmp_path / "vod.mkv"
+        subprocess.run(
+            ["ffmpeg", "-v", "error", "-f", "lavfi", "-i", "color=black:s=64x64:d=6",
+             "-i", str(wav_path), "-shortest", "-c:v", "libx264", "-c:a", "aac", str(video_path)],
+            check=True,
+        )
+        progress = []
+
+        highlights = await HighlightDetector(HighlightConfig(audio_threshold=0.3)).analyze_audio_file(
+            video_path, progress_callback=lambda done, total: progress.append(done),
+        )
+
+        assert highlights
+        assert all(1500 <= h.timestamp_ms <= 3000 for h in highlights)
+        assert progress and progress[-1] >= 5000
@@ -0,0 +1,137 @@
+"""Tests for the process-wide HTTP client pool"""
+
+import asyncio
+
+import pytest
+
+import backend.api.chat as chat_api
+from backend.api.chat import ChatRequest, chat_proxy
+from backend.bench import StubLatency, StubServer, create_openclaw_stub
+from backend.core.config import build_http_pool_config
+from backend.core.http_pool import HttpClientPool, HttpPoolConfig, close_http_pool, get_http_pool
+from backend.core.openclaw import OpenClawClient
+from backend.core.shared_resources import SharedResources
+from backend.core.tts import TTSClient
+from backend.integrations.youtube import YouTubeChat, YouTubeChatConfig
+
+
+class TestHttpClientPool:
+    """HttpClientPool tests"""
+
+    @pytest.mark.asyncio
+    async def test_client_per_endpoint(self):
+        pool = HttpClientPool(HttpPoolConfig(max_keepalive_connections=5))
+        a = pool.client("http://gateway-a", {"Authorization": "Bearer x"})
+        assert pool.client("http://gateway-a", {"Authorization": "Bearer x"}) is a
+        assert pool.client("http://gateway-a") is not a
+        assert pool.client("http://gateway-b", {"Authorization": "Bearer x"}) is not a
+        assert pool.stats["clients"] == 3
+
+        await pool.close()
+        assert a.is_closed
+        assert pool.stats["clients"] == 0
+
+    def test_new_client_per_event_loop(self):
+        pool = HttpClientPool()
+
+        async def get():
+            return pool.client("http://gateway")
+
+        first = asyncio.run(get())
+        second = asyncio.run(get())
+        assert first is not second
+        asyncio.run(pool.close())
+
+    def test_client_created_outside_loop_is_adopted(self):
+        pool = HttpClientPool()
+        client = pool.client("http://gateway")
+
+        async def get():
+            return pool.client("http://gateway")
+
+        assert asyncio.run(get()) is client
+
+    def test_http2_requires_h2(self, monkeypatch):
+        monkeypatch.setattr("importlib.util.find_spec", lambda name: None)
+        pool = HttpClientPool(HttpPoolConfig(http2=True))
+        assert pool.stats["http2"] is False
+        assert not pool.client().is_closed
+
+    @pytest.mark.asyncio
+    async def test_aiohttp_session_shared(self):
+        pool = HttpClientPool()
+        session = await pool.aiohttp_session()
+        assert await pool.aiohttp_session() is session
+
+        chat = YouTubeChat(YouTubeChatConfig(api_key="dummy"), session=session)
+        await chat.close()
+        assert not session.closed
+
+        await pool.close()
+        assert session.closed
+
+    def test_build_config(self):
+        config = build_http_pool_config({"http": {"max_connections": 10, "http2": True}})
+        assert config.max_connections == 10
+        assert config.http2 is True
+        assert build_http_pool_config({}) == HttpPoolConfig()
+
+
+class TestSharedResourcesPool:
+    """SharedResources + 外部プール"""
+
+    @pytest.mark.asyncio
+    async def test_external_pool_not_closed(self):
+        pool = HttpClientPool()
+        shared = SharedResources(http_pool=pool)
+        client = shared.http_client("http://gateway")
+        assert pool.client("http://gateway") is client
+
+        await shared.close()
+        assert not client.is_closed
+        await pool.close()
+
+
+class TestClientDefaults:
+    """OpenClaw/TTSクライアントは既定で共有プールを使う"""
+
+    @pytest.mark.asyncio
+    async def test_clients_share_pool(self):
+        first, second = OpenClawClient(), OpenClawClient()
+        assert await first._get_client() is await second._get_client()
+        assert TTSClient()._client is TTSClient()._client
+
+        client = await first._get_client()
+        await first.close()
+        assert not client.is_closed
+
+
+class TestChatProxyPool:
+    """/api/chat が共有クライアントを使う"""
+
+    @pytest.mark.asyncio
+    async def test_reuses_client(self, monkeypatch):
+        pool = get_http_pool()
+        app = create_openclaw_stub(StubLatency(mean_ms=1), responder=lambda text: f"echo:{text}")
+        async with StubServer(app) as llm:
+            monkeypatch.setattr(chat_api, "DEFAULT_GATEWAY_URL", llm.base_url)
+            first = await chat_proxy(ChatRequest(message="やあ", gateway_url=llm.base_url))
+            created = pool.created
+            second = await chat_proxy(ChatRequest(message="また", gateway_url=llm.base_url + "/"))
+            assert pool.created == created
+            await close_http_pool()
+
+        assert first == {"response": "echo:やあ"}
+        assert second == {"response": "echo:また"}
+        assert get_http_pool() is pool
+
+    @pytest.mark.asyncio
+    async def test_other_gateway_not_pooled(self):
+        pool = get_http_pool()
+        app = create_openclaw_stub(StubLatency(mean_ms=1), responder=lambda text: f"echo:{text}")
+        async with StubServer(app) as llm:
+            clients = pool.stats["clients"]
+            result = await chat_proxy(ChatRequest(message="やあ", gateway_url=llm.base_url))
+
+        assert result == {"response": "echo:やあ"}
+        assert pool.stats["clients"] == clients
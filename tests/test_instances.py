@@ -0,0 +1,147 @@
+"""Tests for named live instances"""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+import backend.api.live as live_api
+from backend.core.openclaw import OpenClawConfig
+from backend.core.shared_resources import SharedResources
+from backend.modes.instances import (
+    InstanceLimitError,
+    InstanceLimits,
+    LiveInstanceRegistry,
+)
+from backend.modes.live import InputSource, LiveInput, LiveModeConfig
+
+
+def _config(tmp_path, name: str, gateway: str = "http://localhost:18789") -> LiveModeConfig:
+    return LiveModeConfig(
+        openclaw=OpenClawConfig(base_url=gateway),
+        audio_output_dir=tmp_path / name,
+        generate_live2d=False,
+        generate_subtitles=False,
+    )
+
+
+class TestSharedResources:
+    """SharedResources tests"""
+
+    @pytest.mark.asyncio
+    async def test_http_client_shared_per_endpoint(self):
+        shared = SharedResources()
+        a = shared.http_client("http://gateway-a")
+        assert shared.http_client("http://gateway-a") is a
+        assert shared.http_client("http://gateway-b") is not a
+
+        await shared.close()
+        assert a.is_closed
+
+
+class TestLiveInstanceRegistry:
+    """LiveInstanceRegistry tests"""
+
+    @pytest.mark.asyncio
+    async def test_instances_share_pools(self, tmp_path):
+        registry = LiveInstanceRegistry()
+        lobby = registry.create("lobby", _config(tmp_path, "lobby"))
+        mio = registry.create("mio", _config(tmp_path, "mio"))
+
+        assert lobby.mode._openclaw._client is mio.mode._openclaw._client
+        assert lobby.mode._tts._client is mio.mode._tts._client
+        assert lobby.mode.audio_store is mio.mode.audio_store
+        # 会話とキューはインスタンスごと
+        assert lobby.mode._openclaw is not mio.mode._openclaw
+        lobby.mode.add_input(LiveInput(text="こんにちは", source=InputSource.YOUTUBE_COMMENT))
+        assert (lobby.mode.queue_size, mio.mode.queue_size) == (1, 0)
+
+        # インスタンスを閉じても共有クライアントは閉じない
+        client = lobby.mode._openclaw._client
+        await registry.remove("lobby")
+        assert not client.is_closed
+
+        await registry.close()
+        assert client.is_closed
+        assert len(registry) == 0
+
+    @pytest.mark.asyncio
+    async def test_cached_audio_not_shared_between_instances(self, tmp_path):
+        registry = LiveInstanceRegistry(SharedResources())
+        lobby = registry.create("lobby", _config(tmp_path, "lobby"))
+        mio = registry.create("mio", _config(tmp_path, "mio"))
+        for instance, voice in ((lobby, b"lobby-voice"), (mio, b"mio-voice")):
+            instance.mode._tts.synthesize = AsyncMock(return_value=voice)
+            instance.mode._openclaw.chat = AsyncMock()
+        cache = tmp_path / "cache.yaml"
+        cache.write_text("- inputs: [おはロビィ]\n  responses: [おはようっす！]\n", encoding="utf-8")
+
+        audio = {}
+        for instance in (lobby, mio):
+            await instance.mode.warm_response_cache(cache)
+            callback = MagicMock()
+            instance.mode.set_output_callback(callback)
+            await instance.mode._process_input(LiveInput(text="おはロビィ", source=InputSource.YOUTUBE_COMMENT))
+            output = callback.call_args[0][0]
+            # 同じファイル名（cache_000_00）でも各インスタンスの声を返す
+            audio[instance.name] = instance.mode.audio_store.get(output.audio_id).data
+
+        assert audio == {"lobby": b"lobby-voice", "mio": b"mio-voice"}
+        await registry.close()
+
+    @pytest.mark.asyncio
+    async def test_start_request_tts_settings(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        registry = LiveInstanceRegistry(SharedResources())
+        monkeypatch.setattr(live_api, "_registry", registry)
+        request = live_api.LiveStartRequest(
+            tts_url="http://127.0.0.1:9",
+            tts_endpoints=["http://127.0.0.1:10"],
+            tts_fallbacks=[{"provider": "openai", "base_url": "http://127.0.0.1:11", "voice": "alloy"}],
+            tts_request_timeout=15.0,
+        )
+
+        await live_api.start_live_mode(request, instance="lobby")
+        live = registry.get("lobby").mode
+        tts = live.config.tts
+        assert tts.endpoints == ["http://127.0.0.1:10"]
+        assert tts.request_timeout == 15.0
+        assert [(f.provider, f.voice) for f in tts.fallbacks] == [("openai", "alloy")]
+        assert live._tts._client.timeout.read == 15.0
+
+        await live_api.stop_live_mode(instance="lobby")
+        await registry.close()
+
+    def test_limits_applied(self, tmp_path):
+        registry = LiveInstanceRegistry()
+        config = _config(tmp_path, "lobby")
+        config.platform_rate_limits = {"youtube": 60}
+        instance = registry.create("lobby", config, InstanceLimits(max_queue_size=2, max_inputs_per_min=30))
+
+        assert instance.mode.config.max_queue_size == 2
+        assert instance.mode.config.platform_rate_limits["youtube"] == 30
+        assert instance.mode.config.platform_rate_limits["twitch"] == 30
+        for i in range(4):
+            instance.mode.add_input(LiveInput(text=f"コメント{i}", source=InputSource.TWITCH_COMMENT))
+        assert instance.mode.queue_size == 2
+
+    def test_name_and_count_limits(self, tmp_path):
+        registry = LiveInstanceRegistry(max_instances=1)
+        with pytest.raises(InstanceLimitError):
+            registry.create("bad name!", _config(tmp_path, "x"))
+        with pytest.raises(InstanceLimitError):
+            registry.create("status", _config(tmp_path, "x"))
+
+        registry.create("lobby", _config(tmp_path, "lobby"))
+        with pytest.raises(InstanceLimitError):
+            registry.create("lobby", _config(tmp_path, "lobby"))
+        with pytest.raises(InstanceLimitError):
+            registry.create("mio", _config(tmp_path, "mio"))
+
+    def test_connection_limit(self, tmp_path):
+        registry = LiveInstanceRegistry()
+        instance = registry.create(
+            "lobby", _config(tmp_path, "lobby"), InstanceLimits(max_output_connections=1),
+        )
+        assert instance.can_accept_connection
+        instance.output_websockets.append(object())
+        assert not instance.can_accept_connection
@@ -0,0 +1,74 @@
+"""Tests for the Aho-Corasick keyword matcher"""
+
+import pickle
+import random
+
+from backend.core.emotion import Emotion, EmotionAnalyzer
+from backend.core.highlight import HighlightConfig, HighlightDetector, HighlightType
+from backend.core.keyword_matcher import KeywordMatcher, compile_keywords
+
+
+class TestKeywordMatcher:
+    """KeywordMatcher tests"""
+
+    def test_overlapping_keywords(self):
+        matcher = KeywordMatcher(["he", "she", "his", "hers"])
+        assert matcher.matches("ushers") == {0, 1, 3}
+        assert matcher.matches("this") == {2}
+        assert matcher.matches("nothing") == set()
+
+    def test_matches_naive_search(self):
+        rng = random.Random(0)
+        alphabet = "abcあい！"
+        keywords = ["".join(rng.choices(alphabet, k=rng.randint(1, 4))) for _ in range(50)]
+        matcher = KeywordMatcher(keywords)
+        for _ in range(200):
+            text = "".join(rng.choices(alphabet, k=rng.randint(0, 30)))
+            expected = {i for i, keyword in enumerate(keywords) if keyword in text}
+            assert matcher.matches(text) == expected
+            assert matcher.contains_any(text) == bool(expected)
+
+    def test_ignore_case(self):
+        matcher = KeywordMatcher(["NG", "wow"], ignore_case=True)
+        assert matcher.contains_any("これはngワード")
+        assert matcher.first("WOW!") == "wow"
+        assert not KeywordMatcher(["NG"]).contains_any("ng")
+
+    def test_first_follows_keyword_order(self):
+        matcher = KeywordMatcher(["すごい", "草"])
+        assert matcher.first("草すごい") == "すごい"
+        assert matcher.first("草") == "草"
+        assert matcher.first("なし") is None
+
+    def test_empty_keywords(self):
+        matcher = KeywordMatcher(["", "a"])
+        assert matcher.matches("b") == set()
+        assert not KeywordMatcher([]).contains_any("anything")
+
+    def test_compiled_once_and_pickled_by_keywords(self):
+        matcher = compile_keywords(["NG", "禁止"], ignore_case=True)
+        assert compile_keywords(["NG", "禁止"], ignore_case=True) is matcher
+        assert pickle.loads(pickle.dumps(matcher)) is matcher
+        assert len(pickle.dumps(matcher)) < 200
+
+
+class TestKeywordUsers:
+    """感情分析・NGワード・ハイライトでの利用"""
+
+    def test_analyze_many(self):
+        analyzer = EmotionAnalyzer()
+        texts = ["マジっすか！やばいっすね！！", "なんだか寂しいっす...", "こんにちは"]
+        results = analyzer.analyze_many(texts)
+        assert [r.primary for r in results] == [Emotion.EXCITED, Emotion.SAD, Emotion.NEUTRAL]
+        assert results == [analyzer.analyze(text) for text in texts]
+
+    def test_emotion_scores_each_keyword_once(self):
+        result = EmotionAnalyzer().analyze("嬉しい嬉しい嬉しい")
+        assert result.primary == Emotion.HAPPY
+        assert result.intensity == 0.3
+
+    def test_highlight_keyword_label(self):
+        detector = HighlightDetector(HighlightConfig(highlight_keywords=["神", "WOW"]))
+        detector.process_chat_message({"author": "a", "text": "wow 神"}, timestamp_ms=1000)
+        keywords = [h for h in detector.highlights if h.highlight_type == HighlightType.KEYWORD]
+        assert [h.label for h in keywords] == ["Keyword: 神"]
@@ -0,0 +1,173 @@
+"""Tests for Latency Tracing"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+import backend.api.live as live_api
+from backend.core.latency import (
+    LatencyConfig,
+    LatencyHistogram,
+    LatencyTrace,
+    LatencyTracker,
+    RollingHistogram,
+)
+from backend.core.openclaw import CompletionResult, OpenClawConfig
+from backend.modes.instances import LiveInstance, LiveInstanceRegistry
+from backend.modes.live import InputSource, LiveInput, LiveMode, LiveModeConfig
+
+
+class TestLatencyHistogram:
+    """LatencyHistogram tests"""
+
+    def test_percentiles_within_precision(self):
+        histogram = LatencyHistogram(precision=0.02)
+        for ms in range(1, 1001):
+            histogram.record(float(ms))
+
+        assert histogram.count == 1000
+        assert histogram.percentile(50) == pytest.approx(500, rel=0.02)
+        assert histogram.percentile(95) == pytest.approx(950, rel=0.02)
+        assert histogram.percentile(99) == pytest.approx(990, rel=0.02)
+        assert histogram.percentile(100) == 1000
+
+    def test_empty(self):
+        assert LatencyHistogram().summary() == {"count": 0}
+
+    def test_merge(self):
+        a, b = LatencyHistogram(), LatencyHistogram()
+        a.record(10)
+        b.record(1000)
+        a.merge(b)
+        assert a.count == 2
+        assert a.max == 1000
+        assert a.min == 10
+
+
+class TestRollingHistogram:
+    """RollingHistogram tests"""
+
+    def test_old_slices_dropped(self):
+        rolling = RollingHistogram(window_sec=10, slices=2)
+        rolling.record(100, now=0.0)
+        rolling.record(200, now=6.0)
+        assert rolling.snapshot(now=7.0).count == 2
+        # 最初のスライスは期間外
+        assert rolling.snapshot(now=11.0).count == 1
+
+
+class TestLatencyTracker:
+    """LatencyTracker tests"""
+
+    def test_per_stage_and_source(self):
+        tracker = LatencyTracker()
+        for source, llm_ms in (("youtube", 800), ("youtube", 1200), ("priority", 400)):
+            trace = LatencyTrace(source=source, spans={"queue_wait": 50, "llm": llm_ms})
+            trace.outcome = "ok"
+            tracker.record(trace, now=0.0)
+
+        snapshot = tracker.snapshot(now=1.0)
+        assert snapshot["stages"]["llm"]["count"] == 3
+        assert snapshot["sources"]["youtube"]["llm"]["max"] == 1200
+        assert snapshot["sources"]["priority"]["total"]["count"] == 1
+        assert [t["source"] for t in snapshot["traces"]] == ["priority", "youtube", "youtube"]
+
+    def test_add_span_after_record(self):
+        tracker = LatencyTracker()
+        trace = LatencyTrace(source="twitch", spans={"llm": 100})
+        tracker.record(trace, now=0.0)
+        tracker.add_span(trace, "broadcast", 5.0, now=0.0)
+
+        snapshot = tracker.snapshot(now=0.0)
+        assert snapshot["stages"]["broadcast"]["count"] == 1
+        assert snapshot["traces"][0]["spans_ms"]["broadcast"] == 5.0
+
+    def test_nested_span_not_in_total(self):
+        trace = LatencyTrace(source="youtube", spans={"llm": 900, "tts": 300})
+        trace.add_nested("llm_ttft", 200)
+        assert trace.total_ms == 1200
+
+    def test_total_waits_for_pending_span(self):
+        tracker = LatencyTracker()
+        trace = LatencyTrace(source="twitch", spans={"llm": 100})
+        trace.pending.add("broadcast")
+        tracker.record(trace, now=0.0)
+        assert "total" not in tracker.snapshot(now=0.0)["stages"]
+
+        tracker.add_span(trace, "broadcast", 50.0, now=0.0)
+        snapshot = tracker.snapshot(now=0.0)
+        assert snapshot["stages"]["total"]["max"] == 150
+        assert snapshot["stages"]["broadcast"]["count"] == 1
+
+    def test_disabled(self):
+        tracker = LatencyTracker(LatencyConfig(enabled=False))
+        tracker.record(LatencyTrace(source="youtube", spans={"llm": 1}))
+        assert tracker.snapshot()["stages"] == {}
+
+
+class TestLiveModeLatency:
+    """LiveMode integration"""
+
+    @pytest.fixture
+    def live(self, tmp_path):
+        return LiveMode(LiveModeConfig(
+            openclaw=OpenClawConfig(stream=False),
+            audio_output_dir=tmp_path / "audio",
+            generate_live2d=False,
+            generate_subtitles=False,
+            persist_audio=False,
+        ))
+
+    @pytest.mark.asyncio
+    async def test_process_input_traced(self, live, monkeypatch):
+        live._tts.synthesize = AsyncMock(return_value=b"audio")
+        live._openclaw.chat = AsyncMock(return_value=CompletionResult(text="どうもっす"))
+        live.add_input(LiveInput(text="こんにちは", source=InputSource.TWITCH_COMMENT))
+
+        await live._process_input(live._dequeue())
+
+        monkeypatch.setattr(live_api, "_registry", _registry_with(live))
+        metrics = await live_api.get_metrics(traces=5)
+        trace = metrics["traces"][0]
+        assert trace["outcome"] == "ok"
+        assert trace["source"] == "twitch"
+        assert {"queue_wait", "llm", "emotion", "tts", "deliver"} <= set(trace["spans_ms"])
+        assert metrics["sources"]["twitch"]["tts"]["count"] == 1
+
+    @pytest.mark.asyncio
+    async def test_streaming_ttft(self, live):
+        async def chat_stream(text):
+            await asyncio.sleep(0.02)
+            yield "どうも"
+            await asyncio.sleep(0.05)
+            yield "っす"
+
+        live.config.openclaw.stream = True
+        live._openclaw.chat_stream = chat_stream
+        live._tts.synthesize = AsyncMock(return_value=b"audio")
+        callback = MagicMock()
+        live.set_output_callback(callback)
+
+        await live._process_input(LiveInput(text="こんにちは", source=InputSource.YOUTUBE_COMMENT))
+
+        assert callback.call_args[0][0].response_text == "どうもっす"
+        trace = live.latency.snapshot()["traces"][0]
+        spans = trace["spans_ms"]
+        assert 15 <= spans["llm_ttft"] < spans["llm"]
+        assert trace["total_ms"] == pytest.approx(sum(ms for stage, ms in spans.items() if stage != "llm_ttft"), abs=0.5)
+
+    @pytest.mark.asyncio
+    async def test_error_outcome(self, live):
+        live._openclaw.chat = AsyncMock(side_effect=RuntimeError("gateway down"))
+        await live._process_input(LiveInput(text="こんにちは", source=InputSource.YOUTUBE_COMMENT))
+
+        trace = live.latency.snapshot()["traces"][0]
+        assert trace["outcome"] == "error"
+        assert "llm" in trace["spans_ms"]
+
+
+def _registry_with(live: LiveMode) -> LiveInstanceRegistry:
+    registry = LiveInstanceRegistry()
+    registry.register(LiveInstance(name=live_api.DEFAULT_INSTANCE, mode=live))
+    return registry
@@ -1,6 +1,5 @@
 """Tests for Live2D module"""
 
-
 from backend.core.emotion import Emotion
 from backend.core.live2d import (
     EmotionDrivenConfig,
@@ -12,6 +11,7 @@ from backend.core.live2d import (
     Live2DParameters,
     emotion_to_live2d_expression,
 )
+from backend.core.warmup import warmup_wav
 
 
 class TestLive2DParameters:
@@ -145,6 +145,15 @@ class TestLive2DLipsyncAnalyzer:
         # Happy表情はmouthFormが正
         assert happy_params.param_mouth_form > neutral_params.param_mouth_form
 
+    def test_wav_bytes_without_ffmpeg(self, monkeypatch):
+        """WAVはffmpegを使わずにメモリ上で解析する"""
+        monkeypatch.setattr("shutil.which", lambda name: None)
+        analyzer = Live2DLipsyncAnalyzer()
+        frames = analyzer.analyze_audio_bytes(warmup_wav(duration_sec=0.5))
+
+        # 0.5秒分（アイドルフレームの1秒分ではない）
+        assert len(frames) == 500 // (1000 // analyzer.config.fps) + 1
+
 
 class TestLive2DFrame:
     """Live2DFrame tests"""
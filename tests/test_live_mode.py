@@ -0,0 +1,127 @@
+"""Tests for LiveMode load control (deadlines, stats)"""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from backend.core.openclaw import CompletionResult, OpenClawConfig
+from backend.modes.live import (
+    DeadlineExceededError,
+    InputSource,
+    LiveInput,
+    LiveMode,
+    LiveModeConfig,
+)
+
+
+@pytest.fixture
+def live(tmp_path):
+    config = LiveModeConfig(
+        openclaw=OpenClawConfig(stream=False),
+        audio_output_dir=tmp_path / "audio",
+        generate_live2d=False,
+        generate_subtitles=False,
+    )
+    return LiveMode(config)
+
+
+def _comment(text: str = "こんにちは", author: str = "User", **metadata) -> LiveInput:
+    return LiveInput(text=text, source=InputSource.YOUTUBE_COMMENT, author=author, metadata=metadata)
+
+
+class TestDeadlines:
+    """入力期限テスト"""
+
+    def test_deadline_by_kind(self, live):
+        comment = _comment()
+        superchat = _comment("スパチャ", type="superChatEvent", amount=1000)
+        manual = LiveInput(text="手動", source=InputSource.MANUAL)
+
+        for item in (comment, superchat, manual):
+            live._stamp_deadline(item)
+
+        assert comment.remaining_sec() == pytest.approx(20.0, abs=0.5)
+        assert superchat.kind == "priority"
+        assert superchat.remaining_sec() == pytest.approx(300.0, abs=0.5)
+        assert manual.deadline is None
+        assert manual.remaining_sec() is None
+
+    @pytest.mark.asyncio
+    async def test_expired_in_queue_is_dropped(self, live):
+        live._openclaw.chat = AsyncMock()
+        item = _comment()
+        live.add_input(item)
+        item.deadline = time.monotonic() - 1.0
+
+        await live._process_input(live._dequeue())
+
+        live._openclaw.chat.assert_not_called()
+        assert live.stats["dropped"]["expired_queue"] == 1
+        assert live.stats["queue_wait_ms"]["samples"] == 1
+
+    @pytest.mark.asyncio
+    async def test_llm_cancelled_past_deadline(self, live):
+        async def slow_chat(text):
+            await asyncio.sleep(5)
+            return CompletionResult(text="遅い応答")
+
+        live._openclaw.chat = slow_chat
+        live._tts.synthesize = AsyncMock()
+        item = _comment()
+        live.add_input(item)
+        item.deadline = time.monotonic() + 0.05
+
+        await live._process_input(live._dequeue())
+
+        live._tts.synthesize.assert_not_called()
+        assert live.stats["dropped"] == {"expired_llm": 1}
+        assert live.stats["processed"] == 0
+
+    @pytest.mark.asyncio
+    async def test_within_deadline_passes_result(self, live):
+        item = _comment()
+        item.deadline = time.monotonic() + 10
+
+        async def work():
+            return 42
+
+        assert await live._within_deadline(item, work(), "llm") == 42
+
+        item.deadline = time.monotonic() - 1
+        with pytest.raises(DeadlineExceededError):
+            await live._within_deadline(item, work(), "tts")
+
+    @pytest.mark.asyncio
+    async def test_processed_counted(self, live):
+        live._openclaw.chat = AsyncMock(return_value=CompletionResult(text="了解っす！"))
+        live._tts.synthesize = AsyncMock(return_value=b"")
+        callback = MagicMock()
+        live.set_output_callback(callback)
+
+        live.add_input(_comment())
+        await live._process_input(live._dequeue())
+
+        callback.assert_called_once()
+        assert live.stats["processed"] == 1
+        assert live.stats["dropped"] == {}
+
+
+class TestDropStats:
+    """破棄統計テスト"""
+
+    def test_filtered_and_queue_full(self, tmp_path):
+        live = LiveMode(LiveModeConfig(
+            audio_output_dir=tmp_path,
+            generate_live2d=False,
+            max_queue_size=2,
+            blocked_words=["NG"],
+        ))
+
+        live.add_input(_comment("NGワード"))
+        for i in range(4):
+            live.add_input(_comment(f"コメント{i}", author=f"User{i}"))
+
+        assert live.queue_size == 2
+        assert live.stats["dropped"] == {"filtered": 1, "queue_full": 2}
@@ -0,0 +1,299 @@
+"""Tests for multi-platform ingest (FairScheduler / attach_source)"""
+
+import asyncio
+from datetime import datetime
+from unittest.mock import AsyncMock
+
+import pytest
+
+from backend.core.openclaw import OpenClawConfig
+from backend.core.scheduler import FairScheduler, RateCap
+from backend.integrations.twitch import TwitchChatMock, TwitchMessage, TwitchMessageType
+from backend.integrations.youtube import CommentType, YouTubeChatMock, YouTubeComment
+from backend.modes.live import (
+    InputSource,
+    LiveInput,
+    LiveMode,
+    LiveModeConfig,
+    twitch_message_to_input,
+    youtube_comment_to_input,
+)
+
+
+class TestFairScheduler:
+    """FairScheduler tests"""
+
+    def test_round_robin_across_platforms(self):
+        scheduler = FairScheduler()
+        for i in range(3):
+            scheduler.push(f"yt{i}", "youtube")
+        scheduler.push("tw0", "twitch")
+
+        order = [scheduler.pop(now=0.0) for _ in range(4)]
+        assert order == ["yt0", "tw0", "yt1", "yt2"]
+        assert scheduler.pop(now=0.0) is None
+
+    def test_priority_first(self):
+        scheduler = FairScheduler()
+        scheduler.push("comment", "youtube")
+        scheduler.push("bits", "twitch", priority=True, weight=1.5)
+        scheduler.push("superchat", "youtube", priority=True, weight=2.0)
+
+        assert [scheduler.pop(now=0.0) for _ in range(3)] == ["superchat", "bits", "comment"]
+
+    def test_eviction_from_busiest_platform(self):
+        scheduler = FairScheduler(max_size=3)
+        scheduler.push("yt0", "youtube")
+        scheduler.push("yt1", "youtube")
+        scheduler.push("tw0", "twitch")
+
+        assert scheduler.push("tw1", "twitch") == "yt0"
+        assert scheduler.stats["youtube"]["evicted"] == 1
+
+    def test_rate_cap(self):
+        scheduler = FairScheduler()
+        scheduler.set_rate_limit("youtube", per_min=60, burst=1)
+        for i in range(3):
+            scheduler.push(f"yt{i}", "youtube")
+        scheduler.push("tw0", "twitch")
+
+        assert scheduler.pop(now=0.0) == "yt0"
+        # YouTubeは上限に達したのでTwitchが先
+        assert scheduler.pop(now=0.1) == "tw0"
+        assert scheduler.pop(now=0.2) is None
+        assert scheduler.pop(now=1.2) == "yt1"
+        assert scheduler.stats["youtube"]["rate_limited"] >= 1
+
+    def test_rate_cap_refill(self):
+        cap = RateCap(per_min=6, burst=2)
+        cap.consume(0.0)
+        cap.consume(0.0)
+        assert not cap.available(5.0)
+        assert cap.available(10.0)
+
+
+class TestWeightedScheduling:
+    """重み付き優先入力と投稿者ごとの流量制限"""
+
+    def test_higher_weight_first(self):
+        scheduler = FairScheduler()
+        scheduler.push("100yen", "youtube", priority=True, weight=1.3, now=0.0)
+        scheduler.push("10000yen", "youtube", priority=True, weight=3.0, now=0.0)
+        scheduler.push("1000yen", "twitch", priority=True, weight=2.0, now=0.0)
+
+        assert [scheduler.pop(now=0.0) for _ in range(3)] == ["10000yen", "1000yen", "100yen"]
+
+    def test_aging_prevents_starvation(self):
+        scheduler = FairScheduler(aging_per_sec=0.1)
+        scheduler.push("old_small", "youtube", priority=True, weight=1.0, now=0.0)
+        # 30秒後の高額スパチャ（1.0 + 0.1 * 30 = 4.0 > 3.0）
+        scheduler.push("new_large", "youtube", priority=True, weight=3.0, now=30.0)
+
+        assert scheduler.pop(now=30.0) == "old_small"
+
+    def test_full_lane_evicts_lowest_weight(self):
+        scheduler = FairScheduler(priority_max_size=2)
+        scheduler.push("small", "youtube", priority=True, weight=1.0, now=0.0)
+        scheduler.push("large", "youtube", priority=True, weight=3.0, now=0.0)
+
+        assert scheduler.push("medium", "youtube", priority=True, weight=2.0, now=0.0) == "small"
+        # 既存より小さい入力は受け付けない
+        assert scheduler.push("tiny", "youtube", priority=True, weight=0.5, now=0.0) == "tiny"
+        assert scheduler.priority_size == 2
+        assert scheduler.stats["youtube"]["evicted"] == 2
+        assert [scheduler.pop(now=0.0) for _ in range(2)] == ["large", "medium"]
+
+    def test_author_rate_limit(self):
+        scheduler = FairScheduler(author_rate_per_min=6, author_burst=2)
+        results = [scheduler.push(f"spam{i}", "youtube", author="yt:spammer", now=0.0) for i in range(4)]
+        assert results == [None, None, "spam2", "spam3"]
+        assert scheduler.push("hello", "youtube", author="yt:other", now=0.0) is None
+        # 10秒で1件分回復
+        assert scheduler.push("spam4", "youtube", author="yt:spammer", now=10.0) is None
+
+        assert scheduler.normal_size == 4
+        assert scheduler.stats["youtube"]["author_limited"] == 2
+
+    def test_author_buckets_bounded(self):
+        scheduler = FairScheduler(max_size=10, author_rate_per_min=6, max_authors=3)
+        for i in range(10):
+            scheduler.push(f"c{i}", "youtube", author=f"yt:{i}", now=0.0)
+        assert len(scheduler._authors) == 3
+
+    def test_priority_lane_view(self):
+        scheduler = FairScheduler()
+        lane = scheduler.lane("youtube", priority=True)
+        lane.append("superchat", weight=2.0)
+
+        assert len(lane) == 1
+        assert list(lane) == ["superchat"]
+        assert scheduler.pop(now=0.0) == "superchat"
+        assert not lane
+
+    def test_many_operations(self):
+        scheduler = FairScheduler(max_size=1000, priority_max_size=500)
+        for i in range(20000):
+            scheduler.push(i, f"p{i % 4}", priority=i % 3 == 0, weight=(i % 7) + 1.0, now=i * 0.01)
+            if i % 2:
+                scheduler.pop(now=i * 0.01)
+
+        assert scheduler.priority_size <= 500 * 4
+        assert all(len(heap) <= 2 * 500 + 64 + 500 for heap in scheduler._platform_heaps.values())
+
+    def test_priority_flood_bounded(self):
+        scheduler = FairScheduler(priority_max_size=20, aging_per_sec=0.0)
+        # 取り出しのない優先入力の洪水（重みが増え続けるので毎回押し出しが起きる）
+        for i in range(10000):
+            scheduler.push(i, "youtube", priority=True, weight=1.0 + i, now=0.0)
+
+        assert scheduler.priority_size == 20
+        assert len(scheduler._priority_heap) <= 2 * 20 + 64 + 1
+        assert scheduler.pop(now=0.0) == 9999
+
+
+class TestConverters:
+    """chat item → LiveInput"""
+
+    def test_youtube_super_chat(self):
+        comment = YouTubeComment(
+            id="1", text="頑張って！", author_name="A", author_channel_id="UC1",
+            author_profile_image="", published_at=datetime.now(),
+            comment_type=CommentType.SUPER_CHAT, amount=500, currency="JPY",
+        )
+        live_input = youtube_comment_to_input(comment)
+        assert live_input.is_priority
+        assert live_input.metadata["amount"] == 500
+
+    def test_twitch_chat_and_raid(self):
+        chat = TwitchMessage(
+            id="1", text="こんにちは", author_name="a", author_id="1",
+            author_display_name="A", channel="c", timestamp=datetime.now(),
+            message_type=TwitchMessageType.CHAT,
+        )
+        assert not twitch_message_to_input(chat).is_priority
+
+        raid = TwitchMessage(
+            id="2", text="", author_name="r", author_id="2",
+            author_display_name="R", channel="c", timestamp=datetime.now(),
+            message_type=TwitchMessageType.RAID, raid_viewer_count=30,
+        )
+        live_input = twitch_message_to_input(raid)
+        assert live_input.metadata["type"] == "raid"
+        assert "30人" in live_input.text
+
+
+class TestLiveModeMultiSource:
+    """LiveMode + attach_source"""
+
+    @pytest.fixture
+    def live(self, tmp_path):
+        live = LiveMode(LiveModeConfig(
+            openclaw=OpenClawConfig(stream=False),
+            audio_output_dir=tmp_path / "audio",
+            generate_live2d=False,
+            generate_subtitles=False,
+            persist_audio=False,
+        ))
+        live.config.filler.enabled = False
+        return live
+
+    @pytest.mark.asyncio
+    async def test_simulcast_shares_one_pipeline(self, live, monkeypatch):
+        monkeypatch.setattr(asyncio, "sleep", _fast_sleep)
+        processed: list[LiveInput] = []
+
+        async def fake_process(input_data):
+            processed.append(input_data)
+
+        live._process_input = fake_process
+        live.attach_source(YouTubeChatMock([
+            {"author": "y1", "text": "おはロビィ"},
+            {"author": "y2", "text": "かわいい"},
+        ]))
+        live.attach_source(TwitchChatMock([
+            {"author": "t1", "text": "hello lobby"},
+            {"author": "t2", "text": "Cheer100 頑張れ", "bits": 100},
+        ]))
+        assert len(live.sources) == 2
+
+        await live.start()
+        for _ in range(50):
+            if len(processed) == 4:
+                break
+            await _real_sleep(0.01)
+        await live.close()
+
+        assert {i.platform for i in processed} == {"youtube", "twitch"}
+        bits = next(i for i in processed if i.metadata.get("type") == "bits")
+        assert bits.metadata["bits"] == 100
+
+    def test_named_source_lane(self, live):
+        live.attach_source(YouTubeChatMock([]), name="youtube_sub", rate_limit_per_min=10)
+        assert live.scheduler_stats["youtube_sub"]["rate_limit_per_min"] == 10
+
+        with pytest.raises(ValueError):
+            live.attach_source(YouTubeChatMock([]), name="youtube_sub")
+
+    def test_priority_weight(self):
+        small = LiveInput(text="a", source=InputSource.YOUTUBE_COMMENT,
+                          metadata={"type": "superChatEvent", "amount": 100, "currency": "JPY"})
+        large = LiveInput(text="b", source=InputSource.YOUTUBE_COMMENT,
+                          metadata={"type": "superChatEvent", "amount": 50, "currency": "USD"})
+        bits = LiveInput(text="c", source=InputSource.TWITCH_COMMENT, metadata={"type": "bits", "bits": 1000})
+        tier3 = LiveInput(text="d", source=InputSource.TWITCH_COMMENT, metadata={"type": "sub", "sub_tier": "3000"})
+
+        assert small.priority_weight < bits.priority_weight < tier3.priority_weight < large.priority_weight
+        assert LiveInput(text="e", source=InputSource.MANUAL).priority_weight == 1.0
+
+    def test_new_membership_weight(self):
+        # 新規メンバーシップ（newSponsorEvent）には継続月数がない
+        comment = YouTubeComment(
+            id="1", text="", author_name="A", author_channel_id="UC1",
+            author_profile_image="", published_at=datetime.now(),
+            comment_type=CommentType.MEMBERSHIP,
+        )
+        membership = youtube_comment_to_input(comment)
+        milestone = LiveInput(text="f", source=InputSource.YOUTUBE_COMMENT,
+                              metadata={"type": CommentType.MEMBER_MILESTONE.value})
+
+        assert "membership_months" not in membership.metadata
+        assert membership.priority_weight == milestone.priority_weight > 1.0
+
+    def test_author_rate_limited_drop(self, live):
+        for i in range(5):
+            live.add_input(LiveInput(text=f"連投{i}", source=InputSource.YOUTUBE_COMMENT,
+                                     author="Spammer", author_id="UCspam"))
+        live.add_input(LiveInput(text="手動", source=InputSource.MANUAL, author="Spammer"))
+
+        assert live.queue_size == 4
+        assert live.stats["dropped"]["author_rate_limited"] == 2
+
+    def test_priority_input_via_add_input(self, live):
+        live.add_input(LiveInput(text="普通のコメント", source=InputSource.YOUTUBE_COMMENT))
+        live.add_input(LiveInput(
+            text="スパチャ", source=InputSource.YOUTUBE_COMMENT,
+            metadata={"type": "superChatEvent", "amount": 1000},
+        ))
+
+        assert live.queue_size == 1
+        assert live.priority_queue_size == 1
+        assert live._dequeue().text == "スパチャ"
+
+    @pytest.mark.asyncio
+    async def test_processing_uses_single_llm(self, live):
+        live._openclaw.chat = AsyncMock(side_effect=RuntimeError("offline"))
+        live.add_input(LiveInput(text="youtube", source=InputSource.YOUTUBE_COMMENT))
+        live.add_input(LiveInput(text="twitch", source=InputSource.TWITCH_COMMENT))
+
+        while (item := live._dequeue()) is not None:
+            await live._process_input(item)
+
+        assert live._openclaw.chat.call_count == 2
+
+
+_real_sleep = asyncio.sleep
+
+
+async def _fast_sleep(delay, *args, **kwargs):
+    """モックチャットの1秒間隔を短縮"""
+    await _real_sleep(min(delay, 0.001), *args, **kwargs)
@@ -0,0 +1,183 @@
+"""Tests for session recording and replay"""
+
+import json
+
+import pytest
+from typer.testing import CliRunner
+
+from backend.bench.replay import (
+    RecordedInput,
+    RecordedOutput,
+    RecordedSession,
+    SessionRecorder,
+    SessionReplayer,
+    load_session,
+    scale_live_config,
+)
+from backend.cli import app
+from backend.core.emotion import EmotionAnalyzer
+from backend.modes.instances import LiveInstanceRegistry
+from backend.modes.live import InputSource, LiveInput, LiveMode, LiveModeConfig, LiveOutput
+
+
+@pytest.fixture
+def live(tmp_path):
+    return LiveMode(LiveModeConfig(
+        audio_output_dir=tmp_path / "audio",
+        generate_live2d=False,
+        generate_subtitles=False,
+        persist_audio=False,
+        blocked_words=["NG"],
+    ))
+
+
+def _session(n: int = 6, gap: float = 0.5) -> RecordedSession:
+    inputs = [
+        RecordedInput(at=i * gap, text=f"質問{i}です", source="youtube", author=f"viewer{i}", author_id=f"UC{i}")
+        for i in range(n)
+    ]
+    outputs = [
+        RecordedOutput(at=i * gap + 0.3, input_text=f"質問{i}です", response_text=f"回答{i}っす",
+                       spans_ms={"llm": 200.0, "tts": 100.0})
+        for i in range(n)
+    ]
+    return RecordedSession(started_at="2026-10-18T20:00:00", inputs=inputs, outputs=outputs)
+
+
+class TestSessionRecorder:
+    """SessionRecorder tests"""
+
+    def test_records_inputs_and_outputs(self, live, tmp_path):
+        path = tmp_path / "sessions" / "s.jsonl"
+        recorder = SessionRecorder(path, capture_audio=True)
+        recorder.attach(live)
+        forwarded = []
+        live.set_output_callback(recorder.wrap_output(forwarded.append))
+
+        comment = LiveInput(text="こんにちは", source=InputSource.YOUTUBE_COMMENT, author="A", author_id="UC1",
+                            metadata={"type": "superChatEvent", "amount": 500})
+        live.add_input(comment)
+        live.add_input(LiveInput(text="NGワード", source=InputSource.TWITCH_COMMENT, author="B"))
+
+        audio_id = live.audio_store.put(b"mp3-bytes")
+        output = LiveOutput(
+            input=comment, response_text="ありがとうっす！",
+            emotion=EmotionAnalyzer().analyze("ありがとうっす！"), audio_id=audio_id,
+        )
+        live._on_output(output)
+        live._on_output(LiveOutput(input=comment, response_text="えっと", emotion=output.emotion, is_filler=True))
+        recorder.close()
+
+        assert forwarded == [output, forwarded[1]]
+        # フィルタで落ちた入力も到着として記録する
+        session = load_session(path)
+        assert [i.text for i in session.inputs] == ["こんにちは", "NGワード"]
+        assert session.inputs[0].metadata["amount"] == 500
+        assert len(session.outputs) == 1
+        assert session.outputs[0].response_text == "ありがとうっす！"
+        assert session.outputs[0].audio == b"mp3-bytes"
+
+        # close後は記録しない
+        live.add_input(LiveInput(text="後から", source=InputSource.MANUAL))
+        assert recorder.inputs == 2
+
+    @pytest.mark.asyncio
+    async def test_registry_closes_recorder(self, tmp_path):
+        registry = LiveInstanceRegistry()
+        instance = registry.create("rec", LiveModeConfig(audio_output_dir=tmp_path, generate_live2d=False))
+        instance.recorder = SessionRecorder(tmp_path / "rec.jsonl")
+        instance.recorder.attach(instance.mode)
+        assert instance.to_dict()["recording"]["inputs"] == 0
+
+        await registry.remove("rec")
+        assert instance.recorder._file is None
+
+
+class TestLoadSession:
+    """load_session tests"""
+
+    def test_invalid_json(self, tmp_path):
+        path = tmp_path / "bad.jsonl"
+        path.write_text('{"type": "session", "version": 1}\nnot json\n')
+        with pytest.raises(ValueError, match=":2:"):
+            load_session(path)
+
+    def test_future_version(self, tmp_path):
+        path = tmp_path / "future.jsonl"
+        path.write_text(json.dumps({"type": "session", "version": 99}) + "\n")
+        with pytest.raises(ValueError):
+            load_session(path)
+
+    def test_to_input_drops_coalesced_metadata(self):
+        recorded = RecordedInput(at=0, text="草", source="twitch",
+                                 metadata={"platform": "twitch", "coalesced_count": 3})
+        live_input = recorded.to_input()
+        assert live_input.source == InputSource.TWITCH_COMMENT
+        assert live_input.metadata == {"platform": "twitch"}
+        assert recorded.to_input() is not live_input
+
+
+class TestSessionReplayer:
+    """SessionReplayer tests"""
+
+    def test_scale_live_config(self):
+        config = LiveModeConfig(platform_rate_limits={"youtube": 10})
+        scale_live_config(config, 10)
+
+        assert config.input_deadlines["youtube"] == pytest.approx(2.0)
+        assert config.platform_rate_limits["youtube"] == 100
+        assert config.author_rate_per_min == 60
+        assert config.coalescer.window_sec == pytest.approx(1.0)
+
+    def test_schedule_and_recorded_responses(self):
+        replayer = SessionReplayer(_session(), speed=10)
+
+        assert [round(t, 3) for t, _ in replayer.schedule()][:3] == [0.0, 0.05, 0.1]
+        assert replayer._llm_delay("質問1です") == pytest.approx(0.02)
+        assert replayer._respond("質問1です") == "回答1っす"
+        assert replayer._tts_delay("回答1っす") == pytest.approx(0.01)
+        # 記録にない入力は記録済みの応答を順に使う
+        assert replayer._respond("未知の入力").endswith("っす")
+
+        with pytest.raises(ValueError):
+            SessionReplayer(_session(), speed=0)
+
+    @pytest.mark.asyncio
+    async def test_run_accelerated(self):
+        report = await SessionReplayer(_session(), speed=20).run(drain_sec=60, sample_interval_sec=0.5)
+
+        assert report.offered == 6
+        assert report.outputs == 6
+        assert report.time_scale == 20
+        # 元の時間軸に換算（記録上のOpenClaw 200ms + TTS 100ms 以上）
+        assert report.latency.min >= 250
+        assert report.stages["llm"]["p50"] >= 190
+
+
+class TestReplayCLI:
+    """lobby replay-live"""
+
+    def test_replay_live(self, tmp_path):
+        path = tmp_path / "s.jsonl"
+        lines = [{"type": "session", "version": 1}]
+        for i in range(3):
+            lines.append({"type": "input", "t": i * 0.2, "text": f"コメント{i}です", "source": "youtube",
+                          "author": f"v{i}", "author_id": f"UC{i}", "metadata": {}})
+        path.write_text("\n".join(json.dumps(line, ensure_ascii=False) for line in lines))
+        out = tmp_path / "report.json"
+
+        result = CliRunner().invoke(app, [
+            "replay-live", str(path), "--speed", "20", "--llm-ms", "20", "--tts-ms", "10",
+            "--drain", "60", "--json", str(out),
+        ])
+
+        assert result.exit_code == 0, result.output
+        data = json.loads(out.read_text())
+        assert data["offered"] == 3
+        assert data["time_scale"] == 20
+
+    def test_invalid_speed(self, tmp_path):
+        path = tmp_path / "s.jsonl"
+        path.write_text('{"type": "session", "version": 1}\n')
+        result = CliRunner().invoke(app, ["replay-live", str(path), "--speed", "100"])
+        assert result.exit_code == 1
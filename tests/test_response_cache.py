@@ -0,0 +1,150 @@
+"""Tests for Response Cache"""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from backend.core.emotion import Emotion, EmotionResult
+from backend.core.response_cache import (
+    CachedResponse,
+    ResponseCache,
+    ResponseCacheConfig,
+    load_warm_entries,
+)
+from backend.modes.live import InputSource, LiveInput, LiveMode, LiveModeConfig
+
+
+def _response(text: str, created_at: float = 0.0) -> CachedResponse:
+    return CachedResponse(
+        text=text,
+        emotion=EmotionResult(primary=Emotion.HAPPY, intensity=0.8),
+        created_at=created_at,
+    )
+
+
+class TestResponseCache:
+    """ResponseCache tests"""
+
+    def test_hit_on_normalized_text(self):
+        cache = ResponseCache()
+        cache.put("おはロビィ！", _response("おはロビィっす！"))
+
+        assert cache.get("おはロビィ!!!", now=1.0).text == "おはロビィっす！"
+        assert cache.get(" おはロビィ ", now=1.0).text == "おはロビィっす！"
+        assert cache.get("こんばんは", now=1.0) is None
+        assert cache.stats["hits"] == 2
+        assert cache.stats["misses"] == 1
+
+    def test_variants_rotate(self):
+        cache = ResponseCache()
+        cache.put("おはよう", _response("A"))
+        cache.put("おはよう", _response("B"))
+
+        texts = [cache.get("おはよう", now=1.0).text for _ in range(4)]
+        assert texts == ["A", "B", "A", "B"]
+
+    def test_max_variants(self):
+        cache = ResponseCache(ResponseCacheConfig(max_variants=2))
+        for text in ("A", "B", "C"):
+            cache.put("おはよう", _response(text))
+        texts = {cache.get("おはよう", now=1.0).text for _ in range(4)}
+        assert texts == {"B", "C"}
+
+    def test_ttl_expiry(self):
+        cache = ResponseCache(ResponseCacheConfig(ttl_sec=10.0))
+        cache.put("おはよう", _response("A", created_at=0.0))
+        assert cache.get("おはよう", now=5.0) is not None
+        assert cache.get("おはよう", now=11.0) is None
+        assert len(cache) == 0
+
+    def test_max_entries(self):
+        cache = ResponseCache(ResponseCacheConfig(max_entries=2))
+        cache.put("一", _response("1"))
+        cache.put("二", _response("2"))
+        cache.put("三", _response("3"))
+        assert len(cache) == 2
+        assert cache.get("一", now=1.0) is None
+
+    def test_disabled(self):
+        cache = ResponseCache(ResponseCacheConfig(enabled=False))
+        cache.put("おはよう", _response("A"))
+        assert cache.get("おはよう", now=1.0) is None
+
+
+class TestLoadWarmEntries:
+    """load_warm_entries tests"""
+
+    def test_entries_mapping(self, tmp_path):
+        path = tmp_path / "cache.yaml"
+        path.write_text(
+            "entries:\n"
+            "  - inputs: [おはロビィ, おはよう]\n"
+            "    responses: [おはロビィっす！]\n"
+            "  - input: 何歳？\n"
+            "    response: 16歳っす！\n"
+            "  - inputs: [応答なし]\n",
+            encoding="utf-8",
+        )
+        entries = load_warm_entries(path)
+        assert len(entries) == 2
+        assert entries[0].inputs == ["おはロビィ", "おはよう"]
+        assert entries[1].responses == ["16歳っす！"]
+
+    def test_top_level_list(self, tmp_path):
+        path = tmp_path / "cache.yaml"
+        path.write_text("- inputs: [草]\n  responses: [笑ってくれて嬉しいっす！]\n", encoding="utf-8")
+        assert len(load_warm_entries(path)) == 1
+
+
+class TestLiveModeResponseCache:
+    """LiveMode integration"""
+
+    @pytest.fixture
+    def live(self, tmp_path):
+        return LiveMode(LiveModeConfig(
+            audio_output_dir=tmp_path / "audio",
+            generate_live2d=False,
+            generate_subtitles=False,
+        ))
+
+    @pytest.mark.asyncio
+    async def test_warm_and_hit(self, live, tmp_path):
+        path = tmp_path / "cache.yaml"
+        path.write_text(
+            "- inputs: [おはロビィ]\n  responses: [おはロビィっす！, 今日も元気っす！]\n",
+            encoding="utf-8",
+        )
+        live._tts.synthesize = AsyncMock(return_value=b"audio")
+        live._openclaw.chat = AsyncMock()
+
+        assert await live.warm_response_cache(path) == 2
+        assert live._tts.synthesize.call_count == 2
+
+        callback = MagicMock()
+        live.set_output_callback(callback)
+        await live._process_input(LiveInput(text="おはロビィ！", source=InputSource.YOUTUBE_COMMENT))
+
+        live._openclaw.chat.assert_not_called()
+        output = callback.call_args[0][0]
+        assert output.response_text == "おはロビィっす！"
+        assert output.audio_path.name == "cache_000_00.mp3"
+        assert live.response_cache.stats["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_emotion_updates_analyzed_once(self, live, tmp_path):
+        path = tmp_path / "cache.yaml"
+        path.write_text("- inputs: [草]\n  responses: [寂しいっす...。でも嬉しいっす！]\n", encoding="utf-8")
+        live._tts.synthesize = AsyncMock(return_value=b"audio")
+        live._openclaw.chat = AsyncMock()
+        await live.warm_response_cache(path)
+        expected = live._emotion_updates("寂しいっす...。でも嬉しいっす！")
+
+        live._emotion_updates = MagicMock(side_effect=live._emotion_updates)
+        callback = MagicMock()
+        live.set_output_callback(callback)
+        await live._process_input(LiveInput(text="草", source=InputSource.YOUTUBE_COMMENT))
+
+        # 文ごとの切り替えはウォームアップ時に計算済み
+        live._emotion_updates.assert_not_called()
+        updates = callback.call_args[0][0].emotion_updates
+        assert updates and updates == expected
@@ -1,12 +1,43 @@
 """Tests for TTS (Text-to-Speech) Client"""
 
 import base64
+import json
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import httpx
 import pytest
+from fastapi import FastAPI
+from fastapi.responses import Response
 
-from backend.core.tts import DEFAULT_CONFIG, TTSClient, TTSConfig
+from backend.bench import StubServer, create_tts_stub
+from backend.core.http_pool import get_http_pool
+from backend.core.tts import DEFAULT_CONFIG, TTSClient, TTSConfig, _binary_support
+
+
+class _Chunks(httpx.AsyncByteStream):
+    """本文を ``size`` バイトずつ返すストリーム"""
+
+    def __init__(self, data: bytes, size: int):
+        self.data = data
+        self.size = size
+
+    async def __aiter__(self):
+        for i in range(0, len(self.data), self.size):
+            yield self.data[i:i + self.size]
+
+
+def _client_with(config: TTSConfig, *responses) -> tuple[TTSClient, list[httpx.Request]]:
+    """応答（例外なら送出）を順に返すクライアント（最後の応答は繰り返す）と送ったリクエスト"""
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        response = responses[min(len(requests), len(responses)) - 1]
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    return TTSClient(config, client=httpx.AsyncClient(transport=httpx.MockTransport(handler))), requests
 
 
 class TestTTSConfig:
@@ -65,62 +96,61 @@ class TestTTSClientMioTTS:
     """TTSClient MioTTS provider tests"""
 
     @pytest.fixture
-    def client(self):
-        return TTSClient(TTSConfig(provider="miotts"))
+    def config(self):
+        return TTSConfig(provider="miotts")
 
     @pytest.mark.asyncio
-    async def test_synthesize_miotts_success(self, client):
-        audio_bytes = b"fake-audio-data"
-        audio_b64 = base64.b64encode(audio_bytes).decode()
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {"audio": audio_b64}
-        mock_response.raise_for_status = MagicMock()
+    async def test_synthesize_miotts_success(self, config):
+        audio_b64 = base64.b64encode(b"fake-audio-data").decode()
+        client, requests = _client_with(config, httpx.Response(200, json={"audio": audio_b64}))
 
-        with patch.object(client._client, "post", new_callable=AsyncMock, return_value=mock_response) as mock_post:
-            result = await client.synthesize("テスト")
-            assert result == audio_bytes
-            mock_post.assert_called_once()
-            call_kwargs = mock_post.call_args
-            payload = call_kwargs.kwargs.get("json") or call_kwargs[1].get("json")
-            assert payload["text"] == "テスト"
-            assert payload["reference"]["preset_id"] == "lobby"
+        result = await client.synthesize("テスト")
+        assert result == b"fake-audio-data"
+        assert len(requests) == 1
+        payload = json.loads(requests[0].content)
+        assert payload["text"] == "テスト"
+        assert payload["reference"]["preset_id"] == "lobby"
 
     @pytest.mark.asyncio
-    async def test_synthesize_miotts_unexpected_response(self, client):
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {"error": "no audio"}
-        mock_response.raise_for_status = MagicMock()
+    async def test_synthesize_miotts_unexpected_response(self, config):
+        client, _ = _client_with(config, httpx.Response(200, json={"error": "no audio"}))
 
-        with patch.object(client._client, "post", new_callable=AsyncMock, return_value=mock_response):
-            with pytest.raises(ValueError, match="Unexpected MioTTS response"):
-                await client.synthesize("テスト")
+        with pytest.raises(ValueError, match="Unexpected MioTTS response"):
+            await client.synthesize("テスト")
 
     @pytest.mark.asyncio
-    async def test_synthesize_miotts_http_error(self, client):
-        with patch.object(
-            client._client, "post", side_effect=httpx.HTTPError("Connection refused")
-        ):
-            with pytest.raises(httpx.HTTPError):
-                await client.synthesize("テスト")
+    async def test_synthesize_miotts_http_error(self, config):
+        config.max_retries = 0
+        client, _ = _client_with(config, httpx.ConnectError("Connection refused"))
 
-    @pytest.mark.asyncio
-    async def test_synthesize_with_output_path(self, client, tmp_path):
-        audio_bytes = b"fake-audio-data"
-        audio_b64 = base64.b64encode(audio_bytes).decode()
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {"audio": audio_b64}
-        mock_response.raise_for_status = MagicMock()
+        with pytest.raises(httpx.HTTPError):
+            await client.synthesize("テスト")
 
+    @pytest.mark.asyncio
+    async def test_synthesize_with_output_path(self, config, tmp_path):
+        audio_b64 = base64.b64encode(b"fake-audio-data").decode()
+        client, _ = _client_with(config, httpx.Response(200, json={"audio": audio_b64}))
         output = tmp_path / "subdir" / "output.wav"
 
-        with patch.object(client._client, "post", return_value=mock_response):
-            result = await client.synthesize("テスト", output_path=output)
-            assert result == audio_bytes
-            assert output.exists()
-            assert output.read_bytes() == audio_bytes
+        result = await client.synthesize("テスト", output_path=output)
+        assert result == b"fake-audio-data"
+        assert output.exists()
+        assert output.read_bytes() == b"fake-audio-data"
+
+    @pytest.mark.asyncio
+    async def test_binary_body_streamed(self):
+        audio = bytes(range(256)) * 64
+        client, _ = _client_with(
+            TTSConfig(base_url="http://tts-streamed"),
+            httpx.Response(200, stream=_Chunks(audio, 1000), headers={
+                "content-type": "audio/wav", "content-length": str(len(audio)),
+            }),
+            httpx.Response(200, stream=_Chunks(audio, 1000), headers={"content-type": "audio/wav"}),
+        )
+
+        # Content-Length があれば確保したバッファに、なければ順に連結して読む
+        assert await client.synthesize("一回目") == audio
+        assert await client.synthesize("二回目") == audio
 
 
 class TestTTSClientOpenAI:
@@ -284,114 +314,57 @@ class TestTTSClientRetry:
     async def test_retry_on_502(self):
         """502 Bad Gatewayでリトライする"""
         config = TTSConfig(max_retries=2, retry_base_delay=0.01)
-        client = TTSClient(config)
 
         # 1回目502、2回目成功
-        mock_response_fail = MagicMock()
-        mock_response_fail.status_code = 502
-        mock_response_fail.raise_for_status.side_effect = httpx.HTTPStatusError(
-            "502", request=MagicMock(), response=mock_response_fail
-        )
-
         audio_b64 = base64.b64encode(b"audio-data").decode()
-        mock_response_ok = MagicMock()
-        mock_response_ok.status_code = 200
-        mock_response_ok.raise_for_status.return_value = None
-        mock_response_ok.json.return_value = {"audio": audio_b64}
+        client, _ = _client_with(config, httpx.Response(502), httpx.Response(200, json={"audio": audio_b64}))
 
-        with patch.object(
-            client._client, "post",
-            new_callable=AsyncMock,
-            side_effect=[mock_response_fail, mock_response_ok],
-        ):
-            result = await client.synthesize("test")
-            assert result == b"audio-data"
+        result = await client.synthesize("test")
+        assert result == b"audio-data"
 
     @pytest.mark.asyncio
     async def test_retry_on_503(self):
         """503 Service Unavailableでリトライする"""
         config = TTSConfig(max_retries=1, retry_base_delay=0.01)
-        client = TTSClient(config)
-
-        mock_response_fail = MagicMock()
-        mock_response_fail.status_code = 503
-        mock_response_fail.raise_for_status.side_effect = httpx.HTTPStatusError(
-            "503", request=MagicMock(), response=mock_response_fail
-        )
 
         audio_b64 = base64.b64encode(b"ok").decode()
-        mock_response_ok = MagicMock()
-        mock_response_ok.status_code = 200
-        mock_response_ok.raise_for_status.return_value = None
-        mock_response_ok.json.return_value = {"audio": audio_b64}
+        client, _ = _client_with(config, httpx.Response(503), httpx.Response(200, json={"audio": audio_b64}))
 
-        with patch.object(
-            client._client, "post",
-            new_callable=AsyncMock,
-            side_effect=[mock_response_fail, mock_response_ok],
-        ):
-            result = await client.synthesize("test")
-            assert result == b"ok"
+        result = await client.synthesize("test")
+        assert result == b"ok"
 
     @pytest.mark.asyncio
     async def test_no_retry_on_400(self):
         """400 Bad Requestではリトライしない"""
         config = TTSConfig(max_retries=3, retry_base_delay=0.01)
-        client = TTSClient(config)
+        client, requests = _client_with(config, httpx.Response(400))
 
-        mock_response = MagicMock()
-        mock_response.status_code = 400
-        mock_response.raise_for_status.side_effect = httpx.HTTPStatusError(
-            "400", request=MagicMock(), response=mock_response
-        )
-
-        with patch.object(
-            client._client, "post",
-            new_callable=AsyncMock,
-            return_value=mock_response,
-        ):
-            with pytest.raises(httpx.HTTPStatusError):
-                await client.synthesize("test")
+        with pytest.raises(httpx.HTTPStatusError):
+            await client.synthesize("test")
+        assert len(requests) == 1
 
     @pytest.mark.asyncio
     async def test_retry_exhausted_raises(self):
         """リトライ回数を使い切ったらエラーを送出"""
         config = TTSConfig(max_retries=2, retry_base_delay=0.01)
-        client = TTSClient(config)
+        client, requests = _client_with(config, httpx.Response(502))
 
-        mock_response = MagicMock()
-        mock_response.status_code = 502
-        mock_response.raise_for_status.side_effect = httpx.HTTPStatusError(
-            "502", request=MagicMock(), response=mock_response
-        )
-
-        with patch.object(
-            client._client, "post",
-            new_callable=AsyncMock,
-            return_value=mock_response,
-        ):
-            with pytest.raises(httpx.HTTPStatusError):
-                await client.synthesize("test")
+        with pytest.raises(httpx.HTTPStatusError):
+            await client.synthesize("test")
+        assert len(requests) == 3
 
     @pytest.mark.asyncio
     async def test_retry_on_connection_error(self):
         """接続エラーでリトライする"""
         config = TTSConfig(max_retries=1, retry_base_delay=0.01)
-        client = TTSClient(config)
 
         audio_b64 = base64.b64encode(b"recovered").decode()
-        mock_response_ok = MagicMock()
-        mock_response_ok.status_code = 200
-        mock_response_ok.raise_for_status.return_value = None
-        mock_response_ok.json.return_value = {"audio": audio_b64}
+        client, _ = _client_with(
+            config, httpx.ConnectError("refused"), httpx.Response(200, json={"audio": audio_b64}),
+        )
 
-        with patch.object(
-            client._client, "post",
-            new_callable=AsyncMock,
-            side_effect=[httpx.ConnectError("refused"), mock_response_ok],
-        ):
-            result = await client.synthesize("test")
-            assert result == b"recovered"
+        result = await client.synthesize("test")
+        assert result == b"recovered"
 
     @pytest.mark.asyncio
     async def test_retry_openai_provider(self):
@@ -427,21 +400,11 @@ class TestTTSClientRetry:
     async def test_no_retry_when_max_retries_zero(self):
         """max_retries=0の場合リトライしない"""
         config = TTSConfig(max_retries=0, retry_base_delay=0.01)
-        client = TTSClient(config)
-
-        mock_response = MagicMock()
-        mock_response.status_code = 502
-        mock_response.raise_for_status.side_effect = httpx.HTTPStatusError(
-            "502", request=MagicMock(), response=mock_response
-        )
+        client, requests = _client_with(config, httpx.Response(502))
 
-        with patch.object(
-            client._client, "post",
-            new_callable=AsyncMock,
-            return_value=mock_response,
-        ):
-            with pytest.raises(httpx.HTTPStatusError):
-                await client.synthesize("test")
+        with pytest.raises(httpx.HTTPStatusError):
+            await client.synthesize("test")
+        assert len(requests) == 1
 
     def test_retry_config_defaults(self):
         """リトライ設定のデフォルト値"""
@@ -455,14 +418,162 @@ class TestTTSClientLifecycle:
     """Context manager and close tests"""
 
     @pytest.mark.asyncio
-    async def test_close(self):
+    async def test_close_keeps_pooled_client(self):
         client = TTSClient()
-        with patch.object(client._client, "aclose", new_callable=AsyncMock) as mock_close:
+        pooled = client._client
+        assert pooled is get_http_pool().client(timeout=client.config.request_timeout)
+        assert TTSClient(TTSConfig(provider="openai"))._client is pooled
+        with patch.object(pooled, "aclose", new_callable=AsyncMock) as mock_close:
             await client.close()
-            mock_close.assert_called_once()
+            mock_close.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_async_context_manager(self):
         async with TTSClient() as client:
             assert client is not None
             assert isinstance(client, TTSClient)
+
+
+class TestTTSClientStream:
+    """synthesize_stream tests"""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("provider", ["miotts", "openai"])
+    async def test_stream_chunks(self, provider):
+        audio = bytes(range(256)) * 64  # 16KB
+        async with StubServer(create_tts_stub(audio_for=lambda text: audio)) as tts:
+            client = TTSClient(TTSConfig(provider=provider, base_url=tts.base_url, stream_chunk_size=4096))
+            chunks = [chunk async for chunk in client.synthesize_stream("こんにちは", emotion="happy")]
+            await client.close()
+
+        assert len(chunks) > 1
+        assert b"".join(chunks) == audio
+
+    @pytest.mark.asyncio
+    async def test_stream_falls_back_to_json(self):
+        app = FastAPI()
+
+        @app.post("/v1/tts")
+        async def tts():
+            return {"audio": base64.b64encode(b"whole-audio").decode()}
+
+        async with StubServer(app) as server:
+            client = TTSClient(TTSConfig(base_url=server.base_url))
+            chunks = [chunk async for chunk in client.synthesize_stream("テスト")]
+            await client.close()
+
+        assert chunks == [b"whole-audio"]
+
+    @pytest.mark.asyncio
+    async def test_stream_retries_before_first_chunk(self):
+        calls = []
+        app = FastAPI()
+
+        @app.post("/v1/audio/speech")
+        async def speech():
+            calls.append(1)
+            if len(calls) == 1:
+                return Response(status_code=503)
+            return Response(b"audio", media_type="audio/wav")
+
+        async with StubServer(app) as server:
+            client = TTSClient(TTSConfig(
+                provider="openai", base_url=server.base_url, retry_base_delay=0.01,
+            ))
+            chunks = [chunk async for chunk in client.synthesize_stream("テスト")]
+            await client.close()
+
+        assert b"".join(chunks) == b"audio"
+        assert len(calls) == 2
+
+
+class TestTTSClientBinaryTransport:
+    """MioTTSのバイナリ応答（形式の自動判定）"""
+
+    @pytest.mark.asyncio
+    async def test_binary_wav_requested(self):
+        app = create_tts_stub(audio_for=lambda text: b"RIFF-binary")
+        async with StubServer(app) as tts:
+            client = TTSClient(TTSConfig(base_url=tts.base_url))
+            audio = await client.synthesize("テスト")
+            await client.close()
+
+        assert audio == b"RIFF-binary"
+        assert _binary_support[tts.base_url] is True
+
+    @pytest.mark.asyncio
+    async def test_json_only_server_uses_base64(self):
+        app = create_tts_stub(audio_for=lambda text: b"from-json", binary_output=False)
+        async with StubServer(app) as tts:
+            client = TTSClient(TTSConfig(base_url=tts.base_url))
+            first = await client.synthesize("一回目")
+            second = await client.synthesize("二回目")
+            await client.close()
+
+        assert first == second == b"from-json"
+        assert _binary_support[tts.base_url] is False
+
+    @pytest.mark.asyncio
+    async def test_rejected_format_falls_back(self):
+        formats = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            output_format = json.loads(request.content)["output"]["format"]
+            formats.append(output_format)
+            if output_format == "wav":
+                return httpx.Response(422, json={"detail": "unsupported format"})
+            return httpx.Response(200, json={"audio": base64.b64encode(b"audio").decode()})
+
+        http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        client = TTSClient(TTSConfig(base_url="http://tts-no-binary"), client=http)
+        assert await client.synthesize("一回目") == b"audio"
+        assert await client.synthesize("二回目") == b"audio"
+        await http.aclose()
+
+        assert formats == ["wav", "base64", "base64"]
+
+    @pytest.mark.asyncio
+    async def test_unsupported_media_type_falls_back(self):
+        def handler(request: httpx.Request) -> httpx.Response:
+            if json.loads(request.content)["output"]["format"] == "wav":
+                return httpx.Response(415)
+            return httpx.Response(200, json={"audio": base64.b64encode(b"audio").decode()})
+
+        http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        client = TTSClient(TTSConfig(base_url="http://tts-415"), client=http)
+        assert await client.synthesize("テスト") == b"audio"
+        await http.aclose()
+
+        assert _binary_support["http://tts-415"] is False
+
+    @pytest.mark.asyncio
+    async def test_unrelated_bad_request_keeps_binary(self):
+        formats = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            body = json.loads(request.content)
+            formats.append(body["output"]["format"])
+            if len(body["text"]) > 5:
+                return httpx.Response(400, json={"detail": "text too long"})
+            return httpx.Response(200, content=b"RIFF-binary", headers={"content-type": "audio/wav"})
+
+        http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        client = TTSClient(TTSConfig(base_url="http://tts-400", max_retries=0), client=http)
+        with pytest.raises(httpx.HTTPStatusError):
+            await client.synthesize("とても長いテキストです")
+        assert await client.synthesize("短い") == b"RIFF-binary"
+        await http.aclose()
+
+        # 形式と無関係な400ではbase64専用と判定しない
+        assert formats == ["wav", "wav"]
+        assert _binary_support.get("http://tts-400", True) is True
+
+    @pytest.mark.asyncio
+    async def test_binary_transport_disabled(self):
+        app = create_tts_stub(audio_for=lambda text: b"audio")
+        async with StubServer(app) as tts:
+            client = TTSClient(TTSConfig(base_url=tts.base_url, binary_transport=False))
+            assert await client.synthesize("テスト") == b"audio"
+            await client.close()
+
+        assert tts.base_url not in _binary_support
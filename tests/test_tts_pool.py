@@ -0,0 +1,165 @@
+"""Tests for the load-balanced TTS server pool"""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from backend.bench import StubLatency, StubServer, create_tts_stub
+from backend.core.circuit_breaker import CircuitBreakerConfig
+from backend.core.config import build_tts_config
+from backend.core.tts import TTSClient, TTSConfig
+from backend.core.tts_pool import TTSEndpointPool, get_tts_pool
+from backend.core.tts_scheduler import get_tts_scheduler
+
+
+class FakeProber:
+    """ヘルスチェック結果・プリセットを指定できるプローブ"""
+
+    def __init__(self, healthy: dict[str, bool], presets: dict[str, list[str]]):
+        self.healthy = healthy
+        self.presets = presets
+
+    async def check_health(self, base_url: str) -> bool:
+        return self.healthy.get(base_url, True)
+
+    async def list_presets(self, base_url: str) -> list[str]:
+        return self.presets.get(base_url, [])
+
+
+def status_error(code: int) -> httpx.HTTPStatusError:
+    request = httpx.Request("POST", "http://tts/v1/tts")
+    return httpx.HTTPStatusError(str(code), request=request, response=httpx.Response(code, request=request))
+
+
+class TestTTSEndpointPool:
+    """TTSEndpointPool tests"""
+
+    @pytest.mark.asyncio
+    async def test_least_outstanding(self):
+        pool = TTSEndpointPool(["http://a", "http://b", "http://c"])
+        first = pool.acquire()
+        second = pool.acquire()
+        third = pool.acquire()
+        assert {first.url, second.url, third.url} == {"http://a", "http://b", "http://c"}
+
+        pool.release(second)
+        assert pool.acquire() is second
+
+    @pytest.mark.asyncio
+    async def test_round_robin_when_idle(self):
+        pool = TTSEndpointPool(["http://a", "http://b"])
+        urls = []
+        for _ in range(4):
+            urls.append(await pool.call(lambda url: asyncio.sleep(0, url)))
+        assert urls == ["http://a", "http://b", "http://a", "http://b"]
+
+    @pytest.mark.asyncio
+    async def test_preset_affinity(self):
+        pool = TTSEndpointPool(["http://a", "http://b"])
+        await pool.check_health(FakeProber({}, {"http://a": ["other"], "http://b": ["lobby"]}))
+
+        assert [pool.pick("lobby").url for _ in range(3)] == ["http://b"] * 3
+        # どのサーバーも持っていない声は全体から選ぶ
+        assert {pool.pick("unknown").url for _ in range(4)} == {"http://a", "http://b"}
+
+    @pytest.mark.asyncio
+    async def test_eject_and_reinstate(self):
+        pool = TTSEndpointPool(["http://a", "http://b"], CircuitBreakerConfig(failure_threshold=2, open_sec=60))
+        a = pool.endpoints[0]
+        for _ in range(2):
+            pool.acquire(exclude=pool.endpoints[1:])
+            pool.release(a, status_error(503))
+
+        assert not a.is_available(time.monotonic())
+        assert {pool.pick().url for _ in range(4)} == {"http://b"}
+
+        await pool.check_health(FakeProber({"http://a": True}, {}))
+        assert a.is_available(time.monotonic())
+        assert pool.stats["endpoints"][0]["ejections"] == 1
+
+    @pytest.mark.asyncio
+    async def test_health_check_ejects(self):
+        pool = TTSEndpointPool(["http://a", "http://b"])
+        await pool.check_health(FakeProber({"http://b": False}, {}))
+        assert {pool.pick().url for _ in range(4)} == {"http://a"}
+
+    @pytest.mark.asyncio
+    async def test_client_error_not_counted(self):
+        pool = TTSEndpointPool(["http://a", "http://b"])
+        calls = []
+
+        async def bad_request(url: str):
+            calls.append(url)
+            raise status_error(400)
+
+        with pytest.raises(httpx.HTTPStatusError):
+            await pool.call(bad_request)
+        assert len(calls) == 1
+        assert pool.endpoints[0].failures == 0
+
+
+class TestTTSClientPool:
+    """TTSClient + 複数TTSサーバー"""
+
+    @pytest.mark.asyncio
+    async def test_failover_to_healthy_server(self):
+        down = create_tts_stub(StubLatency(error_rate=1.0), audio_for=lambda text: b"down")
+        up = create_tts_stub(audio_for=lambda text: b"up")
+        async with StubServer(down) as a, StubServer(up) as b:
+            config = TTSConfig(
+                base_url=a.base_url, endpoints=[b.base_url],
+                max_retries=0, max_failures=1, health_check_interval=0,
+            )
+            client = TTSClient(config)
+            results = [await client.synthesize(f"文{i}") for i in range(4)]
+            stats = client.pool.stats
+            await client.close()
+
+        assert results == [b"up"] * 4
+        assert down.state.requests == 1
+        assert stats["failovers"] == 1
+        assert stats["endpoints"][0]["available"] is False
+
+    @pytest.mark.asyncio
+    async def test_throughput_scales_with_servers(self):
+        apps = [create_tts_stub(StubLatency(mean_ms=100)) for _ in range(2)]
+        async with StubServer(apps[0]) as a, StubServer(apps[1]) as b:
+            config = TTSConfig(base_url=a.base_url, endpoints=[b.base_url], max_in_flight=1, health_check_interval=0)
+            client = TTSClient(config)
+            start = time.monotonic()
+            await asyncio.gather(*(client.synthesize(f"行{i}") for i in range(4)))
+            elapsed = time.monotonic() - start
+            await client.close()
+
+        assert [app.state.requests for app in apps] == [2, 2]
+        # 1台なら0.4秒かかるところを2台で並行
+        assert elapsed < 0.35
+
+    @pytest.mark.asyncio
+    async def test_health_checks_use_presets(self):
+        other = create_tts_stub(presets=["other"], audio_for=lambda text: b"other")
+        lobby = create_tts_stub(presets=["lobby"], audio_for=lambda text: b"lobby")
+        async with StubServer(other) as a, StubServer(lobby) as b:
+            client = TTSClient(TTSConfig(base_url=a.base_url, endpoints=[b.base_url], health_check_interval=60))
+            pool = client.pool
+            await asyncio.sleep(0.2)
+            results = [await client.synthesize(f"文{i}") for i in range(3)]
+            await pool.stop()
+            await client.close()
+
+        assert results == [b"lobby"] * 3
+        assert pool.stats["endpoints"][1]["presets"] == ["lobby"]
+
+    @pytest.mark.asyncio
+    async def test_scheduler_limit_per_server(self):
+        config = TTSConfig(base_url="http://pool-a", endpoints=["http://pool-b", "http://pool-a"], max_in_flight=3)
+        assert config.urls == ["http://pool-a", "http://pool-b"]
+        assert get_tts_scheduler(config).max_in_flight == 6
+        assert len(get_tts_pool(config)) == 2
+
+    def test_build_config(self):
+        config = build_tts_config({"tts": {"base_url": "http://a", "endpoints": ["http://b"]}})
+        assert config.urls == ["http://a", "http://b"]
+        assert build_tts_config({}).endpoints == []
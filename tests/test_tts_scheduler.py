@@ -0,0 +1,202 @@
+"""Tests for the TTS request scheduler"""
+
+import asyncio
+
+import pytest
+
+from backend.bench import StubServer, create_tts_stub
+from backend.core.tts import TTSClient, TTSConfig
+from backend.core.tts_scheduler import TTSPriority, TTSScheduler, get_tts_scheduler
+
+
+class FakeTTS:
+    """合成の順序と同時実行数を記録するクライアント"""
+
+    def __init__(self, delay: float = 0.01, fail: bool = False):
+        self.config = TTSConfig()
+        self.supports_batch = False
+        self.delay = delay
+        self.fail = fail
+        self.calls: list[str] = []
+        self.running = 0
+        self.max_running = 0
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def _synthesize_with_retry(self, text: str, emotion: str, priority: TTSPriority) -> bytes:
+        self.calls.append(text)
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            await self.release.wait()
+            await asyncio.sleep(self.delay)
+            if self.fail:
+                raise RuntimeError("tts down")
+            return text.encode()
+        finally:
+            self.running -= 1
+
+
+class TestTTSScheduler:
+    """TTSScheduler tests"""
+
+    @pytest.mark.asyncio
+    async def test_max_in_flight(self):
+        scheduler = TTSScheduler(max_in_flight=2)
+        tts = FakeTTS()
+        results = await asyncio.gather(*(scheduler.submit(tts, f"文{i}") for i in range(6)))
+
+        assert results == [f"文{i}".encode() for i in range(6)]
+        assert tts.max_running == 2
+        assert scheduler.stats["in_flight"] == 0
+        assert scheduler.stats["max_pending"] == 4
+
+    @pytest.mark.asyncio
+    async def test_live_before_recording(self):
+        scheduler = TTSScheduler(max_in_flight=1)
+        tts = FakeTTS()
+        tts.release.clear()
+        blocker = asyncio.create_task(scheduler.submit(tts, "先行"))
+        await asyncio.sleep(0)
+        recording = asyncio.create_task(scheduler.submit(tts, "収録", priority=TTSPriority.RECORDING))
+        live = asyncio.create_task(scheduler.submit(tts, "配信", priority=TTSPriority.LIVE))
+        await asyncio.sleep(0)
+        tts.release.set()
+        await asyncio.gather(blocker, recording, live)
+
+        assert tts.calls == ["先行", "配信", "収録"]
+        assert set(scheduler.stats["queue_wait_ms"]) == {"normal", "live", "recording"}
+
+    @pytest.mark.asyncio
+    async def test_coalesce_and_upgrade(self):
+        scheduler = TTSScheduler(max_in_flight=1)
+        tts = FakeTTS()
+        tts.release.clear()
+        blocker = asyncio.create_task(scheduler.submit(tts, "先行"))
+        await asyncio.sleep(0)
+        other = asyncio.create_task(scheduler.submit(tts, "別件", priority=TTSPriority.NORMAL))
+        first = asyncio.create_task(scheduler.submit(tts, "草", priority=TTSPriority.RECORDING))
+        second = asyncio.create_task(scheduler.submit(tts, "草", priority=TTSPriority.LIVE))
+        await asyncio.sleep(0)
+        tts.release.set()
+        results = await asyncio.gather(blocker, other, first, second)
+
+        assert results[2] == results[3] == "草".encode()
+        # 同じ内容は1回だけ合成し、高い方の優先度で並び直す
+        assert tts.calls == ["先行", "草", "別件"]
+        assert scheduler.coalesced == 1
+
+    @pytest.mark.asyncio
+    async def test_cancel_pending(self):
+        scheduler = TTSScheduler(max_in_flight=1)
+        tts = FakeTTS()
+        tts.release.clear()
+        blocker = asyncio.create_task(scheduler.submit(tts, "先行"))
+        await asyncio.sleep(0)
+        waiting = asyncio.create_task(scheduler.submit(tts, "取り消し"))
+        await asyncio.sleep(0)
+        assert scheduler.pending == 1
+
+        waiting.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+        tts.release.set()
+        await blocker
+
+        assert tts.calls == ["先行"]
+        assert scheduler.pending == 0
+
+    @pytest.mark.asyncio
+    async def test_cancel_running(self):
+        scheduler = TTSScheduler(max_in_flight=1)
+        tts = FakeTTS()
+        tts.release.clear()
+        running = asyncio.create_task(scheduler.submit(tts, "中断"))
+        await asyncio.sleep(0)
+        waiting = asyncio.create_task(scheduler.submit(tts, "次"))
+        await asyncio.sleep(0)
+        assert tts.running == 1
+
+        running.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await running
+        await asyncio.sleep(0)
+        # 実行中の合成を中断して枠を空け、次の依頼を実行する
+        assert tts.calls == ["中断", "次"]
+        assert tts.running == 1
+
+        tts.release.set()
+        assert await waiting == "次".encode()
+        assert scheduler.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_running_kept_while_waited(self):
+        scheduler = TTSScheduler(max_in_flight=1)
+        tts = FakeTTS()
+        tts.release.clear()
+        first = asyncio.create_task(scheduler.submit(tts, "同じ"))
+        second = asyncio.create_task(scheduler.submit(tts, "同じ"))
+        await asyncio.sleep(0)
+
+        first.cancel()
+        await asyncio.sleep(0)
+        tts.release.set()
+
+        # まだ待っている呼び出しがあるので中断しない
+        assert await second == "同じ".encode()
+        assert tts.calls == ["同じ"]
+
+    @pytest.mark.asyncio
+    async def test_errors_reach_all_waiters(self):
+        scheduler = TTSScheduler()
+        tts = FakeTTS(fail=True)
+        results = await asyncio.gather(
+            scheduler.submit(tts, "同じ"), scheduler.submit(tts, "同じ"), return_exceptions=True,
+        )
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert tts.calls == ["同じ"]
+
+    @pytest.mark.asyncio
+    async def test_shared_per_endpoint(self):
+        a = get_tts_scheduler(TTSConfig(base_url="http://tts-a"))
+        assert get_tts_scheduler(TTSConfig(base_url="http://tts-a", voice="mio")) is a
+        assert get_tts_scheduler(TTSConfig(base_url="http://tts-b")) is not a
+
+    @pytest.mark.asyncio
+    async def test_cancel_aborts_request(self):
+        app = create_tts_stub(delay_for=lambda text: 30.0)
+        async with StubServer(app) as tts:
+            client = TTSClient(TTSConfig(base_url=tts.base_url))
+            task = asyncio.create_task(client.synthesize("終わらない"))
+            while app.state.requests == 0:
+                await asyncio.sleep(0.01)
+
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            # サーバー側でもリクエストが切断される
+            for _ in range(200):
+                if app.state.aborted:
+                    break
+                await asyncio.sleep(0.01)
+            assert app.state.aborted == 1
+            assert client.scheduler.in_flight == 0
+            await client.close()
+
+
+class TestTTSBatching:
+    """一括合成"""
+
+    @pytest.mark.asyncio
+    async def test_short_texts_batched(self):
+        app = create_tts_stub(audio_for=lambda text: text.encode())
+        async with StubServer(app) as tts:
+            client = TTSClient(TTSConfig(base_url=tts.base_url, max_in_flight=1, batch_size=4, batch_max_chars=10))
+            texts = ["おは", "こん", "ばん", "やあ", "これは長いテキストなので一括合成しません"]
+            results = await asyncio.gather(*(client.synthesize(t) for t in texts))
+            stats = client.scheduler.stats
+            await client.close()
+
+        assert results == [t.encode() for t in texts]
+        assert app.state.batches >= 1
+        assert stats["batched_items"] >= 2
@@ -0,0 +1,152 @@
+"""Tests for startup warm-up"""
+
+import asyncio
+import io
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from scipy.io import wavfile
+
+from backend.bench import StubLatency, StubServer, create_openclaw_stub, create_tts_stub
+from backend.core.avatar import AvatarParts
+from backend.core.emotion import Emotion
+from backend.core.openclaw import OpenClawClient, OpenClawConfig
+from backend.core.pipeline import PipelineConfig, RecordingPipeline
+from backend.core.tts import TTSClient, TTSConfig
+from backend.core.warmup import WarmupReport, run_warmup, warmup_wav
+from backend.modes.live import LiveMode, LiveModeConfig
+from backend.modes.recording import Script, ScriptLine
+
+FAST = StubLatency(mean_ms=1)
+
+
+class TestWarmupReport:
+    """WarmupReport tests"""
+
+    @pytest.mark.asyncio
+    async def test_measure_records_errors(self):
+        report = WarmupReport()
+
+        async def fail():
+            raise ValueError("boom")
+
+        assert await report.measure("ok", lambda: asyncio.sleep(0, "done")) == "done"
+        assert await report.measure("bad", fail) is None
+        data = report.finish("Test").to_dict()
+
+        assert set(data["steps"]) == {"ok", "bad"}
+        assert data["errors"] == {"bad": "ValueError: boom"}
+        assert data["total_ms"] is not None
+
+    @pytest.mark.asyncio
+    async def test_timeout(self):
+        report = WarmupReport()
+        await run_warmup("Test", [report.measure("slow", lambda: asyncio.sleep(5))], report, timeout=0.05)
+        assert "timeout" in report.errors
+
+    def test_warmup_wav(self):
+        sample_rate, samples = wavfile.read(io.BytesIO(warmup_wav()))
+        assert sample_rate == 16000
+        assert samples.any()
+
+
+class TestClientWarmup:
+    """TTSClient / OpenClawClient warm-up"""
+
+    @pytest.mark.asyncio
+    async def test_tts_every_server(self):
+        apps = [create_tts_stub(FAST) for _ in range(2)]
+        async with StubServer(apps[0]) as a, StubServer(apps[1]) as b:
+            client = TTSClient(TTSConfig(base_url=a.base_url, endpoints=[b.base_url], health_check_interval=0))
+            report = await client.warm_up()
+            await client.close()
+
+        # MioTTSは感情で声が変わらないのでサーバーごとに1回
+        assert [app.state.requests for app in apps] == [1, 1]
+        assert set(report.steps) == {f"tts {a.base_url} neutral", f"tts {b.base_url} neutral"}
+        assert not report.errors
+
+    @pytest.mark.asyncio
+    async def test_openai_per_emotion_prompt(self):
+        client = TTSClient(TTSConfig(provider="openai", base_url="http://tts"))
+        client._synthesize_openai = AsyncMock(return_value=b"audio")
+        report = await client.warm_up(emotions=["happy", "neutral", "happy"])
+        await client.close()
+
+        assert sorted(call.args[1] for call in client._synthesize_openai.call_args_list) == ["happy", "neutral"]
+        assert len(report.steps) == 2
+
+    @pytest.mark.asyncio
+    async def test_gateway_ping(self):
+        async with StubServer(create_openclaw_stub(FAST)) as llm:
+            client = OpenClawClient(OpenClawConfig(base_url=llm.base_url))
+            report = await client.warm_up()
+            await client.close()
+
+        assert list(report.steps) == [f"gateway {llm.base_url}"]
+        assert not report.errors
+
+    @pytest.mark.asyncio
+    async def test_unreachable_gateway_reported(self):
+        client = OpenClawClient(OpenClawConfig(base_url="http://127.0.0.1:9", timeout=1.0))
+        report = await client.warm_up()
+        await client.close()
+
+        assert "gateway http://127.0.0.1:9" in report.errors
+
+
+class TestLiveModeWarmup:
+    """LiveMode.start() のウォームアップ"""
+
+    @pytest.mark.asyncio
+    async def test_start_warms_up(self, tmp_path):
+        tts_app = create_tts_stub(FAST)
+        async with StubServer(create_openclaw_stub(FAST)) as llm, StubServer(tts_app) as tts:
+            config = LiveModeConfig(audio_output_dir=tmp_path, generate_subtitles=False, persist_audio=False)
+            config.openclaw.base_url = llm.base_url
+            config.tts.base_url = tts.base_url
+            config.filler.enabled = False
+            async with LiveMode(config) as live:
+                await live.start()
+                for _ in range(100):
+                    if live.warmup_report is not None:
+                        break
+                    await asyncio.sleep(0.05)
+                report = live.warmup_report
+
+        assert report is not None
+        assert {"emotion", "lipsync", f"gateway {llm.base_url}", f"tts {tts.base_url} neutral"} <= set(report.steps)
+        assert not report.errors
+        assert tts_app.state.requests == 1
+
+    @pytest.mark.asyncio
+    async def test_disabled(self, tmp_path):
+        config = LiveModeConfig(audio_output_dir=tmp_path, generate_live2d=False, persist_audio=False)
+        config.warmup.enabled = False
+        config.filler.enabled = False
+        async with LiveMode(config) as live:
+            await live.start()
+            await asyncio.sleep(0)
+            assert live._warmup_task is None
+
+
+class TestRecordingPipelineWarmup:
+    """RecordingPipeline のウォームアップ"""
+
+    @pytest.mark.asyncio
+    async def test_script_emotions(self):
+        pipeline = RecordingPipeline(PipelineConfig.default(MagicMock(spec=AvatarParts)))
+        pipeline._tts.warm_up = AsyncMock(return_value=WarmupReport())
+        pipeline._lipsync.analyze_audio = MagicMock(return_value=[])
+        script = Script(title="test", lines=[
+            ScriptLine(text="やっほー", emotion=Emotion.HAPPY),
+            ScriptLine(text="元気？", emotion=Emotion.HAPPY),
+            ScriptLine(text="またね", emotion=Emotion.NEUTRAL),
+        ])
+
+        report = await pipeline.warm_up(script)
+
+        assert pipeline._tts.warm_up.call_args.args[2] == ["happy", "neutral"]
+        pipeline._lipsync.analyze_audio.assert_called_once()
+        assert "lipsync" in report.steps
+        assert pipeline.warmup_report is report